@@ -15,8 +15,16 @@ from .naming_engine import (
     ReactComponentDetector,
     preview_naming_tree,
 )
-from .dom_extractor import extract_dom_tree, extract_dom_tree_sync, ExtractionConfig
+from .dom_extractor import (
+    BrowserPool,
+    extract_dom_tree,
+    extract_dom_tree_sync,
+    extract_dom_tree_viewports,
+    ExtractionConfig,
+)
 from .ir_builder import IRBuilderV2, build_ir_from_extraction, save_ir
+from .asset_store import AssetStore
+from .snapshot import SnapshotReader, load_snapshot
 
 # 對外 API 使用 IRBuilder（與 IRBuilderV2 為同一實作）
 IRBuilder = IRBuilderV2
@@ -27,6 +35,7 @@ from .pencil_mcp_tools import PencilMcpTools
 from .generator import generate_from_ir
 
 from .code_patcher import CodePatcher, find_files_by_selector, url_to_local_path
+from .source_index import SourceIndex
 from .config import load_config, validate_config
 from . import design_assets
 from .token_export import extract_tokens_from_ir, export_tokens
@@ -55,11 +64,16 @@ __all__ = [
     "preview_naming_tree",
     "extract_dom_tree",
     "extract_dom_tree_sync",
+    "extract_dom_tree_viewports",
     "ExtractionConfig",
+    "BrowserPool",
     "IRBuilder",
     "IRBuilderV2",
     "build_ir_from_extraction",
     "save_ir",
+    "AssetStore",
+    "SnapshotReader",
+    "load_snapshot",
     # Pencil AI（新工作流）
     "PencilToIR",
     "PencilMcpTools",
@@ -67,6 +81,7 @@ __all__ = [
     # Code patcher / Config
     "CodePatcher",
     "find_files_by_selector",
+    "SourceIndex",
     "url_to_local_path",
     "load_config",
     "validate_config",
@@ -0,0 +1,61 @@
+"""
+圖片資產庫：以內容雜湊為鍵的 on-disk store（``<snapshotDir>/assets/<hash>.png``）。
+
+``ExtractionConfig(capture_image_data=True, asset_dir=...)`` 時，DOM walker 不再把每張圖以
+base64 內嵌進 raw tree，而是在頁面內非同步編碼、計算 sha256，節點只帶 ``imageHash``；
+extract_dom_tree 再把尚未存在於 store 的圖片分批取回寫入。IR 的 ``image.hash`` 即指向此處，
+相同的 logo／icon 只存一份，也可跨次擷取重用。
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+
+from .snapshot import write_atomic
+
+HASH_LENGTH = 32
+
+
+def content_hash(data: bytes) -> str:
+    """sha256 前 32 碼（與 DOM walker 在頁面內計算的值相同）。"""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+class AssetStore:
+    """以內容雜湊去重的資產目錄；寫入為原子操作，已存在的雜湊不會重寫。"""
+
+    def __init__(self, directory: str | Path, ext: str = "png") -> None:
+        self.directory = Path(directory)
+        self.ext = ext
+        self.stats: Dict[str, int] = {"written": 0, "deduped": 0, "bytes": 0}
+
+    def path_for(self, asset_hash: str) -> Path:
+        return self.directory / f"{asset_hash}.{self.ext}"
+
+    def has(self, asset_hash: str) -> bool:
+        return self.path_for(asset_hash).exists()
+
+    def put(self, data: bytes, expected_hash: Optional[str] = None) -> str:
+        """寫入 ``data`` 並回傳其雜湊；``expected_hash`` 與內容不符時拋出 ValueError。"""
+        asset_hash = content_hash(data)
+        if expected_hash is not None and expected_hash != asset_hash:
+            raise ValueError(f"asset hash mismatch: expected {expected_hash}, got {asset_hash}")
+        path = self.path_for(asset_hash)
+        if path.exists():
+            self.stats["deduped"] += 1
+            return asset_hash
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, data)
+        self.stats["written"] += 1
+        self.stats["bytes"] += len(data)
+        return asset_hash
+
+    def put_base64(self, data: str, expected_hash: Optional[str] = None) -> str:
+        return self.put(base64.b64decode(data), expected_hash)
+
+    def read_base64(self, asset_hash: str) -> str:
+        """讀回 base64（供需要內嵌圖片的下游使用，例如 Figma plugin payload）。"""
+        return base64.b64encode(self.path_for(asset_hash).read_bytes()).decode("ascii")
@@ -20,6 +20,7 @@ import sys
 import time
 import re
 import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from watchdog.observers import Observer
 from airis_pdm import __version__
@@ -29,14 +30,21 @@ from watchdog.events import FileSystemEventHandler
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from .naming_engine import preview_naming_tree
-from .dom_extractor import extract_dom_tree, ExtractionConfig
+from .asset_store import AssetStore
+from .dom_extractor import BrowserPool, extract_dom_tree, extract_dom_tree_viewports, probe_dom_hash, ExtractionConfig
 from .ir_builder import build_ir_from_extraction, save_ir
+from .responsive import merge_breakpoints
+from .snapshot import PAYLOAD_FILENAME, dump_json, load_json, resolve_snapshot_path, snapshot_options
+from .readiness import format_report as format_ready_report
+from .network import BLOCK_TRACKERS
+from .hmr_watch import HmrWatchSession
 from .code_patcher import CodePatcher
 from .config import load_config
 from .generator import generate_from_ir
 from .pencil_reader import PencilToIR
 from .token_export import export_tokens
 from .design_assets import _count_nodes
+from .story_sync import StorySyncState, fingerprint, stories_for_changed_files
 
 
 EXIT_OK = 0
@@ -68,9 +76,58 @@ def _add_rpc_retry_args(parser) -> None:
     parser.add_argument("--verbose", action="store_true", help="輸出 figma-console / remote flow 詳細 timing log")
 
 
-async def process_url_to_ir(url: str, args, config: dict, viewport_override=None):
+def _parse_viewports(spec: str) -> list:
+    """``"375x812,768x1024"`` → ``[{"width": 375, "height": 812}, ...]``."""
+    viewports = []
+    for item in spec.split(","):
+        w, h = item.strip().lower().split("x")
+        viewports.append({"width": int(w), "height": int(h)})
+    return viewports
+
+
+def _print_assets(result: dict) -> None:
+    if result.get("assets"):
+        assets = result["assets"]
+        print(f"   🖼️  {assets['images']} images ({assets['written']} new) → {assets['dir']}")
+
+
+def _apply_network_args(extraction_config: ExtractionConfig, args, config: dict) -> None:
+    """``--block`` / ``--block-url`` / ``--replay`` / ``--offline`` / ``--har`` → ExtractionConfig."""
+    block = getattr(args, "block", None)
+    if block:
+        extraction_config.block_resource_types = tuple(t.strip() for t in block.split(",") if t.strip())
+    patterns = []
+    for pattern in getattr(args, "block_url", None) or []:
+        patterns.extend(BLOCK_TRACKERS if pattern == "trackers" else [pattern])
+    extraction_config.block_url_patterns = tuple(patterns)
+    replay = getattr(args, "replay", None)
+    if replay or getattr(args, "offline", False):
+        snapshot_dir = config.get("export", {}).get("snapshotDir", ".figma-sync")
+        extraction_config.replay_dir = os.path.join(snapshot_dir, "replay")
+        extraction_config.replay_all_origins = replay == "all"
+        extraction_config.replay_offline = bool(getattr(args, "offline", False))
+    extraction_config.har_path = getattr(args, "har", None)
+
+
+def _print_network(result: dict) -> None:
+    if result.get("network"):
+        n = result["network"]
+        print(f"   🌐 Network: {n['blocked']} blocked, {n['replayed']} replayed, {n['recorded']} recorded")
+
+
+def _print_readiness(result: dict) -> None:
+    if result.get("readiness"):
+        print(f"   ⏱️  {format_ready_report(result['readiness'])}")
+
+
+async def process_url_to_ir(url: str, args, config: dict, viewport_override=None, pool=None, viewports=None):
     """Helper: Extract DOM and build IR for a single URL.
 
+    ``pool`` is an optional ``BrowserPool`` to borrow the page from.
+    ``viewports`` (list of ``{"width", "height"}``, base first) loads the page
+    once and re-walks it per breakpoint; the IR is the base tree plus
+    ``ir_doc["responsive"]`` deltas (see ``responsive.py``).
+
     Returns:
         (ir_doc, extraction_result) tuple, or (None, None) on failure.
     """
@@ -86,10 +143,35 @@ async def process_url_to_ir(url: str, args, config: dict, viewport_override=None
         viewport_height=viewport.get("height", 900),
         framework=config.get("source", {}).get("framework", "html"),
         root_selector=args.selector or args.root or "#app, #root, #__nuxt, body",
+        chunk_nodes=getattr(args, "chunk_nodes", 0) or 0,
+        readiness=getattr(args, "ready", None) or "auto",
     )
+    _apply_network_args(extraction_config, args, config)
+
+    # 圖片以內容雜湊存到 snapshotDir/assets，IR 只引用 image.hash
+    asset_store = None
+    if getattr(args, "capture_images", False):
+        asset_dir = os.path.join(config.get("export", {}).get("snapshotDir", ".figma-sync"), "assets")
+        extraction_config.capture_image_data = True
+        extraction_config.asset_dir = asset_dir
+        asset_store = AssetStore(asset_dir)
+
+    if viewports and len(viewports) > 1:
+        return await _process_url_viewports(url, viewports, extraction_config, config, asset_store, pool)
+
+    # 分段擷取：IR 在 chunk 到達時逐步建構，不必先在記憶體中組出整棵 raw tree
+    consume = None
+    if extraction_config.chunk_nodes > 0:
+        ir_viewport = {"width": extraction_config.viewport_width, "height": extraction_config.viewport_height}
+
+        def consume(root, fetch_children):
+            return build_ir_from_extraction(
+                {"tree": root, "viewport": ir_viewport}, config,
+                fetch_children=fetch_children, asset_store=asset_store,
+            )
 
     try:
-        result = await extract_dom_tree(url, extraction_config)
+        result = await extract_dom_tree(url, extraction_config, pool=pool, consume=consume)
     except Exception as e:
         print(f"   ❌ Extraction failed for {url}: {e}")
         return None, None
@@ -97,15 +179,50 @@ async def process_url_to_ir(url: str, args, config: dict, viewport_override=None
     if not result["tree"]:
         return None, None
 
-    ir_doc = build_ir_from_extraction(result, config)
+    if consume is not None:
+        ir_doc = result["consumed"]
+    else:
+        ir_doc = build_ir_from_extraction(result, config, asset_store=asset_store)
+    _print_readiness(result)
+    _print_network(result)
+    _print_assets(result)
     return ir_doc, result
 
 
-async def perform_push(url: str, args, config: dict):
-    """Core push logic, extracted for reuse by push and watch commands."""
+async def _process_url_viewports(url, viewports, extraction_config, config, asset_store, pool):
+    """多 viewport：頁面只載入一次，第一個 viewport 為 base，其餘斷點併為 ``responsive`` 差異。"""
+    sizes = [(v["width"], v["height"]) for v in viewports]
+    extraction_config.viewport_width, extraction_config.viewport_height = sizes[0]
+    try:
+        results = await extract_dom_tree_viewports(url, sizes, extraction_config, pool=pool)
+    except Exception as e:
+        print(f"   ❌ Extraction failed for {url}: {e}")
+        return None, None
+
+    if not all(r["tree"] for r in results):
+        return None, None
+
+    docs = [build_ir_from_extraction(r, config, asset_store=asset_store) for r in results]
+    separator = config.get("naming", {}).get("separator") or "/"
+    ir_doc = merge_breakpoints(docs[0], docs[1:], separator)
+    result = results[0]
+    result["breakpoints"] = results[1:]
+    print("   📐 Viewports: " + ", ".join(f"{w}x{h}" for w, h in sizes) + f" (base {sizes[0][0]}x{sizes[0][1]})")
+    _print_readiness(result)
+    _print_network(result)
+    _print_assets(result)
+    return ir_doc, result
+
+
+async def perform_push(url: str, args, config: dict, pool=None):
+    """Core push logic, extracted for reuse by push and watch commands.
+
+    ``watch`` passes its long-lived ``BrowserPool`` so Chromium is not relaunched on every save.
+    """
     print(f"🚀 Pushing to Figma from: {url}")
 
-    ir_doc, result = await process_url_to_ir(url, args, config)
+    viewports = _parse_viewports(args.viewports) if getattr(args, "viewports", None) else None
+    ir_doc, result = await process_url_to_ir(url, args, config, pool=pool, viewports=viewports)
     if not ir_doc:
         print("   ❌ Failed to generate IR.")
         return
@@ -117,7 +234,7 @@ async def perform_push(url: str, args, config: dict):
     os.makedirs(output_dir, exist_ok=True)
 
     print("   [3/4] Saving IR snapshot...")
-    ir_path, mapping_path = save_ir(ir_doc, output_dir)
+    ir_path, mapping_path = save_ir(ir_doc, output_dir, **snapshot_options(config))
     print(f"   ✅ Saved to {ir_path}")
 
     # 寫出截圖
@@ -129,6 +246,40 @@ async def perform_push(url: str, args, config: dict):
         print(f"   📸 Screenshot saved to {screenshot_path}")
 
 
+def _build_story_root(extraction: dict, config: dict, figma_name: str, x_pos: int) -> dict:
+    """Build one story's IR frame (runs in a worker process when push-stories uses --workers)."""
+    ir_doc = build_ir_from_extraction(extraction, config)
+    story_root = ir_doc["tree"]
+    story_root["figmaName"] = figma_name
+    story_root["layout"]["x"] = x_pos
+    story_root["layout"]["y"] = 0
+    return story_root
+
+
+def _print_story_report(outcomes: list, elapsed: float, concurrency: int) -> None:
+    """push-stories 結束時的統計：成功／沿用／失敗／空白數量與擷取耗時。"""
+    ok = [o for o in outcomes if o["status"] == "ok"]
+    reused = [o for o in outcomes if o["status"] == "reused"]
+    failed = [o for o in outcomes if o["status"] == "failed"]
+    empty = [o for o in outcomes if o["status"] == "empty"]
+    print(
+        f"   ⏱  {len(ok) + len(reused)}/{len(outcomes)} stories in {elapsed:.1f}s "
+        f"(concurrency {concurrency}): {len(reused)} reused, {len(failed)} failed, {len(empty)} empty"
+    )
+    timed = sorted((o for o in outcomes if o["extract_s"]), key=lambda o: o["extract_s"], reverse=True)
+    if timed:
+        total = sum(o["extract_s"] for o in timed)
+        builds = [o["build_s"] for o in ok]
+        build_avg = sum(builds) / len(builds) if builds else 0.0
+        print(
+            f"      extract avg {total / len(timed):.2f}s, max {timed[0]['extract_s']:.2f}s; "
+            f"IR build avg {build_avg:.2f}s"
+        )
+        print("      slowest: " + ", ".join(f"{o['name']} {o['extract_s']:.2f}s" for o in timed[:5]))
+    for o in failed:
+        print(f"      ❌ {o['name']}: {o.get('error', '')}")
+
+
 async def cmd_push_stories(args, config: dict):
     """Fetch stories from Storybook and batch export."""
     import requests  # lazy import — legacy dependency
@@ -160,75 +311,141 @@ async def cmd_push_stories(args, config: dict):
     
     # 3. Process each story
     # 其他參數
-    combined_children = []
     comp_width = 800
     comp_height = 600
     # Storybook iframe 的根元素通常是 #root，用 local 變數避免污染 args
     sb_selector = "#root, #docs-root, body"
+    concurrency = max(1, int(getattr(args, "concurrency", 1) or 1))
+    workers = max(1, int(getattr(args, "workers", 1) or 1))
+    extraction_config = ExtractionConfig(
+        viewport_width=comp_width,
+        viewport_height=comp_height,
+        framework=config.get("source", {}).get("framework", "html"),
+        root_selector=sb_selector,
+        capture_probe=True,
+    )
+    output_dir = config.get("export", {}).get("snapshotDir", ".figma-sync")
 
-    for i, story in enumerate(stories_to_sync):
+    # 增量同步：--changed 提示的 story（或 DOM 探測雜湊改變者）才重新擷取，其餘沿用上一次的 IR 子樹
+    changed_files = getattr(args, "changed", None)
+    incremental = bool(getattr(args, "incremental", False)) or changed_files is not None
+    state = StorySyncState.load(output_dir)
+    previous_root = state.previous_root() if incremental else None
+    previous = state.previous_subtrees(previous_root)
+    hinted = stories_for_changed_files(stories_to_sync, changed_files) if changed_files is not None else None
+    if incremental:
+        mode = f"{len(hinted)} hinted by --changed" if hinted is not None else "DOM probe"
+        print(f"   ♻️  Incremental: {len(previous)} stories in previous snapshot ({mode})")
+
+    # 最多 concurrency 個 page 同時擷取（共用同一個 Chromium）；IR 建構在 workers 個 process 中進行，
+    # 結果依 story 順序（而非完成順序）組成 combined_children
+    semaphore = asyncio.Semaphore(concurrency)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+
+    async def sync_story(i: int, story: dict, pool: BrowserPool) -> dict:
         s_id = story["id"]
         s_name = story.get("name", s_id)
         s_kind = story.get("kind", "Stories")
         iframe_url = f"{sb_url}/iframe.html?id={s_id}&viewMode=story"
-        
-        print(f"   [{i+1}/{len(stories_to_sync)}] Processing {s_kind}/{s_name}...")
-        
-        # Reuse process_url_to_ir logic (inline here for safety)
-        # We need a fresh config for each? No, config is static.
-        
-        # We need to construct a "Frame" for this story
         # Layout them horizontally
         spacing = 100
         x_pos = i * (comp_width + spacing)
-        
-        extraction_config = ExtractionConfig(
-            viewport_width=comp_width,
-            viewport_height=comp_height,
-            framework=config.get("source", {}).get("framework", "html"),
-            root_selector=sb_selector,
-        )
-        
+        outcome = {
+            "id": s_id, "name": f"{s_kind}/{s_name}", "status": "empty",
+            "extract_s": 0.0, "build_s": 0.0, "root": None, "tree_hash": None, "probe": None,
+        }
+        prev = previous.get(s_id)
+        entry = state.stories.get(s_id) or {}
+
+        def reuse() -> dict:
+            prev["layout"]["x"] = x_pos
+            prev["layout"]["y"] = 0
+            outcome["root"] = prev
+            outcome["status"] = "reused"
+            return outcome
+
+        # 沒有 importPath 的 story 無法對應變更檔案，改用 DOM 探測
+        use_hint = hinted is not None and bool(story.get("importPath"))
         try:
-            result = await extract_dom_tree(iframe_url, extraction_config)
-            raw_tree = result["tree"]
-            if raw_tree:
-                # Build IR for this story
-                # We need to wrap it in a Frame named after the story
-                ir_doc = build_ir_from_extraction(result, config)
-                story_root = ir_doc["tree"]
-                
-                # Override name
-                story_root["figmaName"] = f"{s_kind}/{s_name}"
-                story_root["layout"]["x"] = x_pos
-                story_root["layout"]["y"] = 0
-                
-                combined_children.append(story_root)
+            if prev is not None and use_hint and s_id not in hinted:
+                return reuse()
+            async with semaphore:
+                print(f"   [{i+1}/{len(stories_to_sync)}] Processing {s_kind}/{s_name}...")
+                if prev is not None and not use_hint and entry.get("probe"):
+                    outcome["probe"] = await probe_dom_hash(iframe_url, extraction_config, pool=pool)
+                    if outcome["probe"] == entry["probe"]:
+                        return reuse()
+                t0 = time.perf_counter()
+                result = await extract_dom_tree(iframe_url, extraction_config, pool=pool)
+                outcome["extract_s"] = time.perf_counter() - t0
+            outcome["probe"] = result.get("probe")
+            if result["tree"]:
+                outcome["tree_hash"] = fingerprint(result["tree"])
+                if prev is not None and outcome["tree_hash"] == entry.get("treeHash"):
+                    return reuse()
+                t0 = time.perf_counter()
+                extraction = {"tree": result["tree"], "viewport": result["viewport"]}
+                if executor is None:
+                    story_root = _build_story_root(extraction, config, outcome["name"], x_pos)
+                else:
+                    story_root = await loop.run_in_executor(
+                        executor, _build_story_root, extraction, config, outcome["name"], x_pos
+                    )
+                outcome["build_s"] = time.perf_counter() - t0
+                outcome["root"] = story_root
+                outcome["status"] = "ok"
         except Exception as e:
-            print(f"      ⚠️ Failed: {e}")
+            print(f"      ⚠️ Failed: {s_kind}/{s_name}: {e}")
+            outcome["status"] = "failed"
+            outcome["error"] = str(e)
+            if prev is not None:
+                # 擷取失敗時保留上一次的子樹
+                prev["layout"]["x"] = x_pos
+                outcome["root"] = prev
+        return outcome
+
+    try:
+        # 同一個 Chromium 供所有 story 共用（依 viewport 重用 page）
+        async with BrowserPool(max_idle_pages=concurrency) as pool:
+            outcomes = await asyncio.gather(*(sync_story(i, story, pool) for i, story in enumerate(stories_to_sync)))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    kept = [o for o in outcomes if o["root"] is not None]
+    combined_children = [o["root"] for o in kept]
+    _print_story_report(outcomes, time.perf_counter() - started, concurrency)
 
     # 4. Save combined payload
     if not combined_children:
         print("   ❌ No stories extracted.")
         return
 
-    output_dir = config.get("export", {}).get("snapshotDir", ".figma-sync")
     os.makedirs(output_dir, exist_ok=True)
     
-    # Create a synthetic root
-    combined_root = {
-        "figmaName": "Storybook Sync",
-        "figmaType": "FRAME", # Or just a container
-        "htmlTag": "div",
-        "children": combined_children,
-        "layout": {"x":0, "y":0, "width": 1000, "height": 1000}
-    }
+    if previous_root is not None:
+        # 增量：沿用上一次 combined root，只換上依序拼接的 children
+        combined_root = previous_root
+        combined_root["children"] = combined_children
+    else:
+        # Create a synthetic root
+        combined_root = {
+            "figmaName": "Storybook Sync",
+            "figmaType": "FRAME", # Or just a container
+            "htmlTag": "div",
+            "children": combined_children,
+            "layout": {"x":0, "y":0, "width": 1000, "height": 1000}
+        }
     
     print("   [4/4] Saving Storybook snapshot...")
-    # Reuse save logic manually
-    plugin_path = os.path.join(output_dir, "plugin-payload.json")
-    with open(plugin_path, 'w', encoding='utf-8') as f:
-        json.dump(combined_root, f, indent=2, ensure_ascii=False)
+    plugin_path = dump_json(os.path.join(output_dir, PAYLOAD_FILENAME), combined_root, **snapshot_options(config))
+
+    state.order = [o["id"] for o in kept]
+    for o in kept:
+        state.record(o["id"], o["name"], o["root"], o["tree_hash"], o["probe"])
+    state.save()
         
     print(f"   ✅ Saved {len(combined_children)} stories to {plugin_path}")
     print("   Load this in Figma Plugin to see all components!")
@@ -243,19 +460,31 @@ _WATCHED_EXTENSIONS = (".vue", ".js", ".ts", ".jsx", ".tsx", ".css", ".scss", ".
 
 
 class ChangeHandler(FileSystemEventHandler):
-    """檔案變更事件處理器，帶 debounce 防抖。"""
+    """檔案變更事件處理器，帶 debounce 防抖。
+
+    ``with_path=True``（HMR watch）時不丟棄視窗內的事件：第一個事件開始計時，debounce 視窗內
+    變更的所有檔案於視窗結束時一次以 ``callback(paths)`` 送出（例如 save-all 同時存了兩個組件）。
+    """
 
-    def __init__(self, callback, loop: asyncio.AbstractEventLoop, debounce: float = 1.0):
+    def __init__(self, callback, loop: asyncio.AbstractEventLoop, debounce: float = 1.0, with_path: bool = False):
         self.callback = callback
         self.loop = loop
         self.last_trigger = 0.0
         self.debounce_seconds = debounce
+        # with_path：callback(paths)（HMR watch 需要知道是哪些檔案）
+        self.with_path = with_path
+        self._paths: list = []
+        self._flush_timer = None  # threading.Timer；視窗進行中時不為 None
+        self._paths_lock = threading.Lock()
 
     def on_modified(self, event):
         if event.is_directory:
             return
         if not event.src_path.endswith(_WATCHED_EXTENSIONS):
             return
+        if self.with_path:
+            self._collect(event.src_path)
+            return
         current_time = time.time()
         if current_time - self.last_trigger < self.debounce_seconds:
             return
@@ -264,6 +493,53 @@ class ChangeHandler(FileSystemEventHandler):
         # 透過 threadsafe 把 coroutine 丟進 loop（loop 在獨立執行緒中 run_forever）
         asyncio.run_coroutine_threadsafe(self.callback(), self.loop)
 
+    def _collect(self, path: str) -> None:
+        print(f"\n🔄 File changed: {path}")
+        with self._paths_lock:
+            if path not in self._paths:
+                self._paths.append(path)
+            if self._flush_timer is not None:
+                return
+            if self.debounce_seconds > 0:
+                self._flush_timer = threading.Timer(self.debounce_seconds, self._flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+                return
+        self._flush()
+
+    def _flush(self) -> None:
+        with self._paths_lock:
+            paths, self._paths = self._paths, []
+            self._flush_timer = None
+        if paths:
+            asyncio.run_coroutine_threadsafe(self.callback(paths), self.loop)
+
+
+def _hmr_session(url: str, args, config: dict) -> HmrWatchSession:
+    viewport = config.get("viewport", {})
+    if args.viewport:
+        w, h = args.viewport.split("x")
+        viewport = {"width": int(w), "height": int(h)}
+    extraction_config = ExtractionConfig(
+        viewport_width=viewport.get("width", 1440),
+        viewport_height=viewport.get("height", 900),
+        framework=config.get("source", {}).get("framework", "html"),
+        root_selector=args.selector or args.root or "#app, #root, #__nuxt, body",
+        readiness=getattr(args, "ready", None) or "auto",
+    )
+    _apply_network_args(extraction_config, args, config)
+    output_dir = config.get("export", {}).get("snapshotDir", ".figma-sync")
+    return HmrWatchSession(url, config, extraction_config, output_dir)
+
+
+def _print_hmr_report(report: dict) -> None:
+    if report["mode"] == "patch":
+        print(f"   ✅ Patched {report['patched']} subtree(s) of {report['components'][0]} "
+              f"in {report['ms']:.0f}ms ({report['nodeCount']} nodes)")
+    else:
+        reason = f" ({report['reason']})" if report["reason"] else ""
+        print(f"   ✅ Full re-walk{reason} in {report['ms']:.0f}ms ({report['nodeCount']} nodes)")
+
 
 def cmd_watch(args, config: dict):
     """Watch: 監聽檔案變更並自動執行 push."""
@@ -275,9 +551,31 @@ def cmd_watch(args, config: dict):
 
     # 在獨立執行緒中運行 event loop，避免主執行緒與 coroutine_threadsafe 競爭
     loop = asyncio.new_event_loop()
+    # Chromium 只在第一次 push 時啟動，之後每次存檔都重用（watch 結束時關閉）
+    pool = BrowserPool()
 
     async def push_task():
-        await perform_push(url, args, config)
+        await perform_push(url, args, config, pool=pool)
+
+    session = None
+    if getattr(args, "hmr", False):
+        if getattr(args, "viewports", None):
+            print("   ⚠️  --hmr 不支援 --viewports，改為每次完整 push")
+        else:
+            session = _hmr_session(url, args, config)
+            print("   🔥 HMR mode: page stays open, only changed components are re-walked")
+
+    async def hmr_start():
+        report = await session.start(pool)
+        _print_hmr_report(report)
+
+    async def hmr_task(paths):
+        try:
+            report = await session.on_change(paths)
+            if report is not None:
+                _print_hmr_report(report)
+        except Exception as e:
+            print(f"   ❌ HMR update failed: {e}")
 
     def run_loop():
         asyncio.set_event_loop(loop)
@@ -287,13 +585,17 @@ def cmd_watch(args, config: dict):
     loop_thread.start()
 
     # 初始執行一次 push（等待完成）
-    future = asyncio.run_coroutine_threadsafe(push_task(), loop)
+    future = asyncio.run_coroutine_threadsafe(hmr_start() if session else push_task(), loop)
     try:
         future.result(timeout=120)  # 最多等 2 分鐘
     except Exception as e:
         print(f"   ⚠️  Initial push failed: {e}")
+        session = None
 
-    event_handler = ChangeHandler(push_task, loop)
+    if session:
+        event_handler = ChangeHandler(hmr_task, loop, with_path=True)
+    else:
+        event_handler = ChangeHandler(push_task, loop)
     observer = Observer()
     observer.schedule(event_handler, path=src_dir, recursive=True)
     observer.start()
@@ -306,6 +608,12 @@ def cmd_watch(args, config: dict):
         observer.stop()
     finally:
         observer.join()
+        try:
+            if session:
+                asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=10)
+            asyncio.run_coroutine_threadsafe(pool.close(), loop).result(timeout=10)
+        except Exception as e:
+            print(f"   ⚠️  Browser shutdown failed: {e}")
         loop.call_soon_threadsafe(loop.stop)
 
 
@@ -315,16 +623,18 @@ def cmd_preview(args, config: dict):
     print(f"👁️  Preview naming tree: {url}")
 
     async def run():
-        return await extract_dom_tree(
-            url,
-            ExtractionConfig(
-                viewport_width=config.get("viewport", {}).get("width", 1440),
-                viewport_height=config.get("viewport", {}).get("height", 900),
-                framework=config.get("source", {}).get("framework", "html"),
-                # P3 #15：與 push/watch 一致，支援 --selector
-                root_selector=getattr(args, "selector", None) or "#app, #root, #__nuxt, body",
-            ),
-        )
+        async with BrowserPool() as pool:
+            return await extract_dom_tree(
+                url,
+                ExtractionConfig(
+                    viewport_width=config.get("viewport", {}).get("width", 1440),
+                    viewport_height=config.get("viewport", {}).get("height", 900),
+                    framework=config.get("source", {}).get("framework", "html"),
+                    # P3 #15：與 push/watch 一致，支援 --selector
+                    root_selector=getattr(args, "selector", None) or "#app, #root, #__nuxt, body",
+                ),
+                pool=pool,
+            )
 
     result = asyncio.run(run())
     if not result["tree"]:
@@ -341,12 +651,13 @@ def cmd_codegen(args, config: dict):
     target = (args.target or "html").lower()
     output_dir = args.output or "./generated"
 
-    if not os.path.exists(ir_path):
+    # snapshot 目錄、.json 或壓縮的 .json.gz／.json.zst 皆可
+    resolved = resolve_snapshot_path(ir_path)
+    if resolved is None:
         print(f"❌ 找不到 IR 檔案：{ir_path}")
         return
 
-    with open(ir_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = load_json(resolved)
 
     # 判斷是 IR 格式還是 .pen batch_get 格式
     if "version" in data and "tree" in data:
@@ -370,6 +681,9 @@ def cmd_codegen(args, config: dict):
             output_dir=output_dir,
             page_name=page_name,
             with_utility_css=args.with_utility_css,
+            dedupe_styles=args.dedupe_styles,
+            workers=args.workers,
+            cache_dir=args.cache_dir,
         )
         files = result.get("files", [])
         print(f"✅ 已產生 {target} 專案至 {output_dir}（{len(files)} 個檔案）")
@@ -464,6 +778,7 @@ def cmd_figma_mai(args):
                 output_dir=args.output,
                 page_name=args.page,
                 with_utility_css=args.with_utility_css,
+                dedupe_styles=args.dedupe_styles,
             )
         except Exception as e:
             print(f"❌ codegen 失敗：{e}")
@@ -551,6 +866,7 @@ def cmd_figma_mai(args):
                     rpc_retry_backoff_max_s=args.rpc_backoff_max,
                     trace_id=args.trace_id,
                     verbose=args.verbose,
+                    workers=getattr(args, "workers", 1),
                 )
             else:
                 if not args.json_file:
@@ -562,6 +878,7 @@ def cmd_figma_mai(args):
                     pattern=args.pattern,
                     framework=args.framework,
                     fidelity=args.fidelity,
+                    workers=getattr(args, "workers", 1),
                 )
         except Exception as e:
             print(f"❌ flow 失敗：{e}")
@@ -658,32 +975,74 @@ def main():
     sub = parser.add_subparsers(dest="command")
 
     push_p = sub.add_parser("push", help="Code → Figma",
-        epilog="Examples:\n  aipdm push http://localhost:5173\n  aipdm push http://localhost:5173 --viewport 375x812\n  aipdm push http://localhost:5173 --selector '#login-form'",
+        epilog="Examples:\n  aipdm push http://localhost:5173\n  aipdm push http://localhost:5173 --viewport 375x812\n  aipdm push http://localhost:5173 --viewports 375x812,768x1024,1440x900\n  aipdm push http://localhost:5173 --selector '#login-form'",
         formatter_class=argparse.RawDescriptionHelpFormatter)
     push_p.add_argument("url", help="App URL (e.g. http://localhost:5173)")
     push_p.add_argument("--viewport", help="WxH e.g. 375x812")
+    push_p.add_argument("--viewports", metavar="WxH,WxH,...",
+                        help="一次擷取多個斷點（例如 375x812,768x1024,1440x900；第一個為 base），IR 只存各斷點差異")
     push_p.add_argument("--root", help="Root selector (deprecated, use --selector)")
     push_p.add_argument("--selector", help="Partial sync: CSS selector to capture (e.g. '#login-form')")
     push_p.add_argument("--erslice", action="store_true", help="Write ErSlice manifest & completeness")
     push_p.add_argument("--erslice-module", default="default", help="Module name for manifest")
     push_p.add_argument("--erslice-page", default="page", help="Page slug for manifest")
+    push_p.add_argument("--chunk-nodes", type=int, default=0, metavar="N",
+                        help="超大頁面：每次 evaluate 最多取回約 N 個節點，IR 邊收邊建（0 = 一次取回）")
+    push_p.add_argument("--capture-images", action="store_true",
+                        help="擷取圖片內容，依內容雜湊去重存到 snapshotDir/assets（IR 以 image.hash 引用）")
+    push_p.add_argument("--ready", default="auto", metavar="STEPS",
+                        help="頁面就緒偵測步驟：auto（hydration,mutation,raf）、mutation,raf、selector、networkidle（舊行為）")
+    push_p.add_argument("--block", metavar="TYPES",
+                        help="擷取時封鎖的資源類型（逗號分隔，例如 media,websocket）")
+    push_p.add_argument("--block-url", action="append", metavar="PATTERN",
+                        help="封鎖符合 glob 的 URL（可重複；'trackers' 為常見分析／廣告服務）")
+    push_p.add_argument("--replay", nargs="?", const="third-party", choices=["third-party", "all"],
+                        help="回應存到 snapshotDir/replay，之後的 push 直接由磁碟供應（預設只含第三方；all 連同頁面本身）")
+    push_p.add_argument("--offline", action="store_true",
+                        help="只由 snapshotDir/replay 供應（先以 --replay all 錄製），未命中的請求中止，不連網")
+    push_p.add_argument("--har", metavar="FILE", help="由既有 HAR 檔供應符合的請求")
 
     watch_p = sub.add_parser("watch", help="Watch for file changes and auto-push",
-        epilog="Examples:\n  aipdm watch http://localhost:5173\n  aipdm watch http://localhost:5173 --viewport 375x812",
+        epilog="Examples:\n  aipdm watch http://localhost:5173\n  aipdm watch http://localhost:5173 --viewport 375x812\n  aipdm watch http://localhost:5173 --hmr",
         formatter_class=argparse.RawDescriptionHelpFormatter)
     watch_p.add_argument("url", help="App URL (e.g. http://localhost:5173)")
     watch_p.add_argument("--viewport", help="WxH e.g. 375x812")
+    watch_p.add_argument("--viewports", metavar="WxH,WxH,...",
+                        help="一次擷取多個斷點（例如 375x812,768x1024,1440x900；第一個為 base），IR 只存各斷點差異")
     watch_p.add_argument("--root", help="Root selector (deprecated, use --selector)")
     watch_p.add_argument("--selector", help="Partial sync: CSS selector to capture (e.g. '#login-form')")
     watch_p.add_argument("--erslice", action="store_true", help="Write ErSlice manifest & completeness")
     watch_p.add_argument("--erslice-module", default="default", help="Module name for manifest")
     watch_p.add_argument("--erslice-page", default="page", help="Page slug for manifest")
+    watch_p.add_argument("--chunk-nodes", type=int, default=0, metavar="N",
+                        help="超大頁面：每次 evaluate 最多取回約 N 個節點，IR 邊收邊建（0 = 一次取回）")
+    watch_p.add_argument("--capture-images", action="store_true",
+                        help="擷取圖片內容，依內容雜湊去重存到 snapshotDir/assets（IR 以 image.hash 引用）")
+    watch_p.add_argument("--ready", default="auto", metavar="STEPS",
+                        help="頁面就緒偵測步驟：auto（hydration,mutation,raf）、mutation,raf、selector、networkidle（舊行為）")
+    watch_p.add_argument("--block", metavar="TYPES",
+                        help="擷取時封鎖的資源類型（逗號分隔，例如 media,websocket）")
+    watch_p.add_argument("--block-url", action="append", metavar="PATTERN",
+                        help="封鎖符合 glob 的 URL（可重複；'trackers' 為常見分析／廣告服務）")
+    watch_p.add_argument("--replay", nargs="?", const="third-party", choices=["third-party", "all"],
+                        help="回應存到 snapshotDir/replay，之後的 push 直接由磁碟供應（預設只含第三方；all 連同頁面本身）")
+    watch_p.add_argument("--offline", action="store_true",
+                        help="只由 snapshotDir/replay 供應（先以 --replay all 錄製），未命中的請求中止，不連網")
+    watch_p.add_argument("--har", metavar="FILE", help="由既有 HAR 檔供應符合的請求")
+    watch_p.add_argument("--hmr", action="store_true",
+                        help="頁面保持開啟，依 dev server 的 hot update 只重新走訪變更組件的子樹並原地更新 IR")
 
     stories_p = sub.add_parser("push-stories", help="Batch sync from Storybook",
-        epilog="Examples:\n  aipdm push-stories http://localhost:6006\n  aipdm push-stories http://localhost:6006 --filter 'Button'",
+        epilog="Examples:\n  aipdm push-stories http://localhost:6006\n  aipdm push-stories http://localhost:6006 --filter 'Button'\n  aipdm push-stories http://localhost:6006 --concurrency 8 --workers 4\n  aipdm push-stories http://localhost:6006 --changed src/components/Button.vue",
         formatter_class=argparse.RawDescriptionHelpFormatter)
     stories_p.add_argument("url", help="Storybook URL (e.g. http://localhost:6006)")
     stories_p.add_argument("--filter", help="Filter stories by name (regex)")
+    stories_p.add_argument("--concurrency", type=int, default=1, help="同時擷取的 story 數（共用一個瀏覽器的 N 個 page）")
+    stories_p.add_argument("--workers", type=int, default=1, help="各 story 的 IR 以 N 個 process 平行建構")
+    stories_p.add_argument("--incremental", action="store_true",
+                           help="只重新擷取 DOM 探測雜湊改變的 story，其餘沿用 snapshotDir 中上一次的結果")
+    stories_p.add_argument("--changed", nargs="*", metavar="FILE",
+                           help="變更檔案提示（隱含 --incremental）：只重新擷取 importPath／檔名對應的 story")
 
     preview_p = sub.add_parser("preview", help="Preview naming tree",
         epilog="Examples:\n  aipdm preview http://localhost:5173\n  aipdm preview http://localhost:5173 --selector '#sidebar'",
@@ -704,6 +1063,9 @@ def main():
     codegen_p.add_argument("--output", default="./generated", help="輸出目錄")
     codegen_p.add_argument("--page", help="Page name")
     codegen_p.add_argument("--with-utility-css", action="store_true", help="產出 utility.css")
+    codegen_p.add_argument("--workers", type=int, default=1, help="多頁 IR 以 N 個 process 平行產生（輸出與單 process 一致）")
+    codegen_p.add_argument("--cache-dir", default=None, help="子樹渲染快取目錄（例如 .pdm/codegen-cache）；未變更的子樹直接重用")
+    codegen_p.add_argument("--dedupe-styles", action="store_true", help="相同宣告的節點共用 class，跨頁重複規則合併至 app.css")
 
     export_p = sub.add_parser("export-tokens", help="從 IR 產出 design tokens (tokens.json 或 CSS)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -769,6 +1131,7 @@ def main():
     fm_gen.add_argument("--target", choices=["react", "vue", "html", "flutter"], default="html")
     fm_gen.add_argument("--output", "-o", default="./generated", help="輸出目錄")
     fm_gen.add_argument("--with-utility-css", action="store_true", help="產出 utility.css")
+    fm_gen.add_argument("--dedupe-styles", action="store_true", help="相同宣告的節點共用 class，跨頁重複規則合併至 app.css")
     fm_gen.add_argument("--page", default=None, help="覆寫單頁 IR 的顯示名稱（多為除錯用）")
     fm_chain = fm_sub.add_parser(
         "chain-local",
@@ -815,6 +1178,7 @@ def main():
     fm_flow.add_argument("--exclude", default="", help="名稱 exclude 關鍵字，逗號分隔（live 模式）")
     fm_flow.add_argument("--depth", type=int, default=8, help="getNode 深度（live 模式）")
     fm_flow.add_argument("--notify", action="store_true", help="完成後送 notify（live 模式）")
+    fm_flow.add_argument("--workers", type=int, default=1, help="各頁轉碼以 N 個 process 平行執行")
     _add_rpc_retry_args(fm_flow)
 
     args = parser.parse_args()
@@ -6,9 +6,14 @@ Code Patcher — 將 Figma 變更回寫到原始碼
 
 import re
 import os
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from .snapshot import write_atomic
+from .source_index import SourceIndex, split_selector
+
 
 def url_to_local_path(url: str, src_root: str) -> Optional[str]:
     """將 entryUrl（如 http://localhost:5173）嘗試對應到本機 srcRoot 目錄。
@@ -173,8 +178,180 @@ class StyleConverter:
         return css_props
 
 
+_HTML_EXTENSIONS = {".vue", ".tsx", ".jsx", ".html"}
+_EDIT_EXTENSIONS = {
+    "tailwind": _HTML_EXTENSIONS,
+    "css": {".css", ".scss", ".module.css"},
+    "inline": _HTML_EXTENSIONS,
+}
+_WRITE_ATTEMPTS = 3
+
+_CLASS_DQ = re.compile(r'class="([^"]*)"')
+_CLASS_SQ = re.compile(r"class='([^']*)'")
+_STYLE_ATTR = re.compile(r'style=["\']([^"\']*)["\']')
+
+
+@lru_cache(maxsize=1024)
+def _selector_pattern(kind: str, name: str) -> re.Pattern:
+    """依 selector 編譯的 pattern（同一個 selector 在同一批次或多次 apply 間只編譯一次）."""
+    name = re.escape(name)
+    if kind == "id_tag":
+        # 含有 id="name" 的開始標籤（可跨行）
+        return re.compile(rf"<[a-zA-Z][^>]*\bid=['\"]?{name}['\"]?[^>]*>", re.DOTALL)
+    if kind == "id_attr":
+        return re.compile(rf'(id=["\']?{name}["\']?)')
+    if kind == "class_attr":
+        return re.compile(rf'class=["\']([^"\']*\b{name}\b[^"\']*)["\']')
+    if kind == "css_block":
+        return re.compile(rf"{name}\s*\{{([^}}]*)\}}", re.DOTALL)
+    if kind == "css_prop":
+        return re.compile(rf"({name}\s*:\s*)[^;]+;", re.MULTILINE)
+    if kind == "inline_tag":
+        return re.compile(rf"(<[a-zA-Z][^>]*\bid=['\"]?{name}['\"]?[^>]*?)(/?>)", re.DOTALL)
+    raise ValueError(kind)
+
+
+def _inject_tailwind_by_id(content: str, id_name: str, new_classes: list) -> str:
+    """在含有 id="id_name" 的元素中，把 new_classes 加進 class 屬性。"""
+    new_cls_str = " ".join(new_classes)
+
+    def replacer(m):
+        tag_content = m.group(0)
+        if 'class="' in tag_content:
+            return _CLASS_DQ.sub(lambda cm: f'class="{cm.group(1)} {new_cls_str}"', tag_content, count=1)
+        elif "class='" in tag_content:
+            return _CLASS_SQ.sub(lambda cm: f"class='{cm.group(1)} {new_cls_str}'", tag_content, count=1)
+        # 無 class 屬性 → 在 id 屬性後插入
+        return _selector_pattern("id_attr", id_name).sub(
+            lambda im: f'{im.group(1)} class="{new_cls_str}"', tag_content, count=1
+        )
+
+    return _selector_pattern("id_tag", id_name).sub(replacer, content)
+
+
+def _inject_tailwind_by_class(content: str, cls_name: str, new_classes: list, required: tuple = ()) -> str:
+    """在含有 class="... cls_name ..." 的元素中加入 new_classes；``required`` 的 class 須全部存在。"""
+    new_cls_str = " ".join(new_classes)
+
+    def replacer(m):
+        if required and not set(required) <= set(m.group(1).split()):
+            return m.group(0)
+        return m.group(0).replace(m.group(1), f"{m.group(1)} {new_cls_str}", 1)
+
+    return _selector_pattern("class_attr", cls_name).sub(replacer, content)
+
+
+def _update_css_block(content: str, selector: str, css_props: dict) -> str:
+    """在現有 selector 區塊內更新／新增屬性；找不到區塊時加在檔案末尾。"""
+    block_pattern = _selector_pattern("css_block", selector)
+    match = block_pattern.search(content)
+    if not match:
+        new_block = f"\n{selector} {{\n"
+        for prop, val in css_props.items():
+            new_block += f"  {prop}: {val};\n"
+        return content + new_block + "}\n"
+    block_body = match.group(1)
+    for prop, val in css_props.items():
+        prop_pattern = _selector_pattern("css_prop", prop)
+        if prop_pattern.search(block_body):
+            block_body = prop_pattern.sub(lambda m, val=val: f"{m.group(1)}{val};", block_body)
+        else:
+            block_body = block_body.rstrip() + f"\n  {prop}: {val};"
+    return content[:match.start()] + f"{selector} {{{block_body}}}" + content[match.end():]
+
+
+def _inject_inline_style(content: str, id_name: str, style_str: str) -> str:
+    def replacer(m):
+        tag, close = m.group(1), m.group(2)
+        if "style=" in tag:
+            tag = _STYLE_ATTR.sub(lambda sm: f'style="{sm.group(1)}; {style_str}"', tag, count=1)
+        else:
+            tag += f' style="{style_str}"'
+        return tag + close
+
+    return _selector_pattern("inline_tag", id_name).sub(replacer, content)
+
+
+def _style_string(css_props: dict) -> str:
+    return "; ".join(f"{k}: {v}" for k, v in css_props.items())
+
+
+def _patch_content(content: str, edits: list) -> tuple:
+    """依序套用同一檔案的所有 (selector, kind, payload)；回傳 (新內容, 套用說明)。"""
+    results = []
+    for selector, kind, payload in edits:
+        # ``div#login.card``（IRBuilderV2 的 selector）與 ``#login``／``.card`` 皆以 id 優先定位元素
+        ids, classes = split_selector(selector) or ([], [])
+        if kind == "tailwind":
+            if ids:
+                content = _inject_tailwind_by_id(content, ids[0], payload)
+            elif classes:
+                content = _inject_tailwind_by_class(content, classes[0], payload, tuple(classes))
+            results.append(f"  {selector}: +class {' '.join(payload)}")
+        elif kind == "css":
+            content = _update_css_block(content, selector, payload)
+            results.append(f"  {selector} {{ {'; '.join(f'{k}: {v}' for k, v in payload.items())} }}")
+        else:
+            style_str = _style_string(payload)
+            if ids:
+                content = _inject_inline_style(content, ids[0], style_str)
+            results.append(f'  {selector}: style="{style_str}"')
+    return content, results
+
+
+def _unresolved_lines(kind: str, selector: str, payload) -> list:
+    """找不到原始檔時的說明（不寫檔）。"""
+    if kind == "tailwind":
+        return [
+            f"  [DRY] selector={selector}: class += {' '.join(payload)}"
+            " (找不到原始檔，請確認 source.srcRoot 設定)"
+        ]
+    if kind == "css":
+        lines = [f"  [DRY] {selector} {{"]
+        for k, v in payload.items():
+            lines.append(f"    {k}: {v};")
+        lines.append("  } (找不到原始檔)")
+        return lines
+    return [f'  [DRY] style="{_style_string(payload)}" (找不到原始檔)']
+
+
+class MappingSuffixIndex:
+    """``CodePatcher._find_mapping`` 的後綴索引，結果與依序掃描 name_mapping 相同（第一個符合的 key）.
+
+    - ``key.endswith(name)``：反轉後的 key 排序，以 bisect 找出以反轉 name 開頭的區間
+    - ``name.endswith(key 的最後一段)``：最後一段 → 第一個 key 的位置；查詢 name 的每個後綴
+    """
+
+    def __init__(self, name_mapping) -> None:
+        self.keys = list(name_mapping)
+        ordered = sorted((key[::-1], i) for i, key in enumerate(self.keys))
+        self._reversed = [r for r, _ in ordered]
+        self._positions = [i for _, i in ordered]
+        self._last_segment: dict = {}
+        for i, key in enumerate(self.keys):
+            self._last_segment.setdefault(key.split("/")[-1], i)
+
+    def find(self, figma_name: str) -> Optional[str]:
+        best = None
+        target = figma_name[::-1]
+        lo = bisect_left(self._reversed, target)
+        hi = bisect_left(self._reversed, target + "\U0010ffff", lo)
+        if lo < hi:
+            best = min(self._positions[lo:hi])
+        for start in range(len(figma_name) + 1):
+            i = self._last_segment.get(figma_name[start:])
+            if i is not None and (best is None or i < best):
+                best = i
+        return None if best is None else self.keys[best]
+
+
 class CodePatcher:
-    """依 nameMapping 將 Figma diff 套回原始碼（Tailwind / CSS / inline）."""
+    """依 nameMapping 將 Figma diff 套回原始碼（Tailwind / CSS / inline）.
+
+    每次 ``apply_changes`` 建立一次 ``SourceIndex``（srcRoot 的 id／class → 檔案），各節點的
+    selector 查詢不再重新走訪、讀取整個 srcRoot；``index_path`` 指定時索引會存檔，下次只重新讀取
+    mtime 改變的檔案。
+    """
 
     def __init__(
         self,
@@ -182,16 +359,27 @@ class CodePatcher:
         style_strategy: str = "tailwind",
         src_root: str = "",
         dry_run: bool = False,
+        index_path: Optional[str] = None,
     ):
         self.name_mapping = name_mapping
         self.style_strategy = style_strategy
         self.src_root = src_root
         self.dry_run = dry_run  # True = 只產報告，不寫檔
+        self.index_path = index_path
         self.converter = StyleConverter()
+        self._source_index: Optional[SourceIndex] = None
+        self._mapping_index: Optional[MappingSuffixIndex] = None
 
     def apply_changes(self, diff: dict) -> dict:
-        """套用 diff，真正寫回原始檔。回傳 { filepath: [套用說明] }."""
+        """套用 diff，真正寫回原始檔。回傳 { filepath: [套用說明] }.
+
+        先解析每個節點的目標檔案並依檔案分組，每個檔案只讀一次、依序套用該檔所有 selector 的變更，
+        再以暫存檔 + ``os.replace`` 原子寫回一次。找不到原始檔的節點以 sourceFile／selector 為 key。
+        """
         summary = {}
+        self._mapping_index = None
+        self._source_index = SourceIndex(self.src_root, cache_path=self.index_path).build() if self.src_root else None
+        batches: dict = {}  # filepath → [(selector, kind, payload)]
         for figma_name, changes in diff.items():
             if changes.get("_status") in ("added", "deleted"):
                 continue
@@ -203,220 +391,79 @@ class CodePatcher:
             if not selector:
                 continue
 
+            edit = self._plan_edit(changes)
+            if edit is None:
+                continue
+            kind, payload = edit
+
             # 解析本機檔案路徑
             local_path = url_to_local_path(source_file, self.src_root)
-
-            if self.style_strategy == "tailwind":
-                applied = self._apply_tailwind(local_path, selector, changes)
-            elif self.style_strategy in ("css-modules", "scss"):
-                applied = self._apply_css(local_path, selector, changes)
-            else:
-                applied = self._apply_inline(local_path, selector, changes)
-
-            if applied:
+            filepath = self._resolve_file(local_path, selector, _EDIT_EXTENSIONS[kind])
+            if not filepath:
                 key = local_path or source_file or selector
-                summary.setdefault(key, []).extend(applied)
+                summary.setdefault(key, []).extend(_unresolved_lines(kind, selector, payload))
+                continue
+            batches.setdefault(filepath, []).append((selector, kind, payload))
+
+        for filepath, edits in batches.items():
+            summary.setdefault(filepath, []).extend(self._apply_file(filepath, edits))
         return summary
 
+    def _plan_edit(self, changes: dict) -> Optional[tuple]:
+        """單一節點的變更 → (kind, payload)；沒有可套用的樣式時回傳 None."""
+        if self.style_strategy == "tailwind":
+            classes = StyleConverter.ir_styles_to_tailwind(changes)
+            return ("tailwind", classes) if classes else None
+        css_props = StyleConverter.ir_styles_to_css(changes)
+        if not css_props:
+            return None
+        return ("css", css_props) if self.style_strategy in ("css-modules", "scss") else ("inline", css_props)
+
     def _find_mapping(self, figma_name: str) -> Optional[dict]:
-        for key, mapping in self.name_mapping.items():
-            if key.endswith(figma_name) or figma_name.endswith(key.split("/")[-1]):
-                return mapping
-        return None
+        """名稱不完全相同時，找第一個 key 以 figma_name 結尾、或 figma_name 以 key 最後一段結尾者."""
+        if self._mapping_index is None or len(self._mapping_index.keys) != len(self.name_mapping):
+            self._mapping_index = MappingSuffixIndex(self.name_mapping)
+        key = self._mapping_index.find(figma_name)
+        return None if key is None else self.name_mapping[key]
 
     def _resolve_file(self, local_path: Optional[str], selector: str, exts=None) -> Optional[str]:
         """嘗試找到實際可讀寫的本機檔案路徑."""
         if local_path and Path(local_path).exists():
             return local_path
-        # 透過 selector 在 srcRoot 搜尋
+        # 透過 selector 在 srcRoot 的索引查詢
         if self.src_root:
-            matches = find_files_by_selector(self.src_root, selector, exts)
+            if self._source_index is None:
+                self._source_index = SourceIndex(self.src_root, cache_path=self.index_path).build()
+            matches = self._source_index.find(selector, exts)
             if matches:
                 return matches[0]
         return None
 
-    def _apply_tailwind(
-        self, local_path: Optional[str], selector: str, changes: dict
-    ) -> list:
-        """在 Vue/JSX/HTML 檔案中依 selector 找到元素，新增 Tailwind class。"""
-        new_classes = StyleConverter.ir_styles_to_tailwind(changes)
-        if not new_classes:
-            return []
-
-        filepath = self._resolve_file(
-            local_path, selector, {".vue", ".tsx", ".jsx", ".html"}
-        )
-        if not filepath:
-            return [
-                f"  [DRY] selector={selector}: class += {' '.join(new_classes)}"
-                " (找不到原始檔，請確認 source.srcRoot 設定)"
-            ]
-
-        # 讀取原始檔
-        content = Path(filepath).read_text(encoding="utf-8")
-        original = content
-
-        # 依 selector 類型找目標元素並加入 class
-        if selector.startswith("#"):
-            id_name = selector[1:]
-            # 找 id="xxx" 並在同行的 class="..." 中加入新 class
-            content = self._inject_tailwind_by_id(content, id_name, new_classes)
-        elif selector.startswith("."):
-            cls_name = selector[1:]
-            content = self._inject_tailwind_by_class(content, cls_name, new_classes)
-
-        results = [f"  {selector}: +class {' '.join(new_classes)}"]
-        if content != original and not self.dry_run:
-            Path(filepath).write_text(content, encoding="utf-8")
-            results.append(f"  ✅ Written to {filepath}")
-        elif self.dry_run:
-            results.append(f"  [DRY-RUN] Would write to {filepath}")
-        return results
-
-    def _inject_tailwind_by_id(self, content: str, id_name: str, new_classes: list) -> str:
-        """在含有 id="id_name" 的元素行中，把 new_classes 加進 class 屬性。"""
-        new_cls_str = " ".join(new_classes)
-
-        def replacer(m):
-            tag_content = m.group(0)
-            if 'class="' in tag_content:
-                return re.sub(
-                    r'class="([^"]*)"',
-                    lambda cm: f'class="{cm.group(1)} {new_cls_str}"',
-                    tag_content,
-                    count=1,
-                )
-            elif "class='" in tag_content:
-                return re.sub(
-                    r"class='([^']*)'",
-                    lambda cm: f"class='{cm.group(1)} {new_cls_str}'",
-                    tag_content,
-                    count=1,
-                )
-            # 無 class 屬性 → 在 id 屬性後插入
-            return re.sub(
-                rf'(id=["\']?{re.escape(id_name)}["\']?)',
-                rf'\1 class="{new_cls_str}"',
-                tag_content,
-                count=1,
-            )
-
-        # 匹配含有 id="id_name" 的開始標籤（跨行上限 3 行）
-        pattern = re.compile(
-            rf"<[a-zA-Z][^>]*\bid=['\"]?{re.escape(id_name)}['\"]?[^>]*>",
-            re.DOTALL,
-        )
-        return pattern.sub(replacer, content)
-
-    def _inject_tailwind_by_class(self, content: str, cls_name: str, new_classes: list) -> str:
-        """在含有 class="... cls_name ..." 的元素行中加入 new_classes。"""
-        new_cls_str = " ".join(new_classes)
+    def _apply_file(self, filepath: str, edits: list) -> list:
+        """讀一次檔案、依序套用 ``edits``、原子寫回一次；回傳該檔的套用說明.
 
-        def replacer(m):
-            return m.group(0).replace(
-                m.group(1), f"{m.group(1)} {new_cls_str}", 1
-            )
-
-        pattern = re.compile(
-            rf'class=["\']([^"\']*\b{re.escape(cls_name)}\b[^"\']*)["\']'
-        )
-        return pattern.sub(replacer, content)
-
-    def _apply_css(
-        self, local_path: Optional[str], selector: str, changes: dict
-    ) -> list:
-        """在 CSS/SCSS 檔案中找到 selector 段落並插入/更新屬性。"""
-        css_props = StyleConverter.ir_styles_to_css(changes)
-        if not css_props:
-            return []
-
-        filepath = self._resolve_file(
-            local_path, selector, {".css", ".scss", ".module.css"}
-        )
-        if not filepath:
-            lines = [f"  [DRY] {selector} {{"]
-            for k, v in css_props.items():
-                lines.append(f"    {k}: {v};")
-            lines.append("  } (找不到原始檔)")
-            return lines
-
-        content = Path(filepath).read_text(encoding="utf-8")
-        original = content
-
-        # 嘗試在現有 selector 區塊內更新屬性
-        block_pattern = re.compile(
-            rf"{re.escape(selector)}\s*\{{([^}}]*)\}}", re.DOTALL
-        )
-        match = block_pattern.search(content)
-        if match:
-            block_body = match.group(1)
-            for prop, val in css_props.items():
-                prop_pattern = re.compile(
-                    rf"({re.escape(prop)}\s*:\s*)[^;]+;", re.MULTILINE
-                )
-                if prop_pattern.search(block_body):
-                    block_body = prop_pattern.sub(rf"\g<1>{val};", block_body)
-                else:
-                    block_body = block_body.rstrip() + f"\n  {prop}: {val};"
-            new_block = f"{selector} {{{block_body}}}"
-            content = block_pattern.sub(new_block, content, count=1)
-        else:
-            # 找不到現有區塊 → 在檔案末尾加入
-            new_block = f"\n{selector} {{\n"
-            for prop, val in css_props.items():
-                new_block += f"  {prop}: {val};\n"
-            new_block += "}\n"
-            content += new_block
-
-        results = [f"  {selector} {{ {'; '.join(f'{k}: {v}' for k, v in css_props.items())} }}"]
-        if content != original and not self.dry_run:
-            Path(filepath).write_text(content, encoding="utf-8")
-            results.append(f"  ✅ Written to {filepath}")
-        elif self.dry_run:
-            results.append(f"  [DRY-RUN] Would write to {filepath}")
-        return results
-
-    def _apply_inline(
-        self, local_path: Optional[str], selector: str, changes: dict
-    ) -> list:
-        """將樣式以 inline style 方式寫入元素。"""
-        css_props = StyleConverter.ir_styles_to_css(changes)
-        if not css_props:
-            return []
-
-        style_str = "; ".join(f"{k}: {v}" for k, v in css_props.items())
-        filepath = self._resolve_file(
-            local_path, selector, {".vue", ".tsx", ".jsx", ".html"}
-        )
-        if not filepath:
-            return [f'  [DRY] style="{style_str}" (找不到原始檔)']
-
-        content = Path(filepath).read_text(encoding="utf-8")
-        original = content
-
-        if selector.startswith("#"):
-            id_name = selector[1:]
-            pattern = re.compile(
-                rf"(<[a-zA-Z][^>]*\bid=['\"]?{re.escape(id_name)}['\"]?[^>]*?)(/?>)",
-                re.DOTALL,
-            )
-            def replacer(m):
-                tag = m.group(1)
-                close = m.group(2)
-                if "style=" in tag:
-                    tag = re.sub(r'style=["\']([^"\']*)["\']',
-                                 lambda sm: f'style="{sm.group(1)}; {style_str}"', tag, count=1)
-                else:
-                    tag += f' style="{style_str}"'
-                return tag + close
-            content = pattern.sub(replacer, content)
-
-        results = [f'  {selector}: style="{style_str}"']
-        if content != original and not self.dry_run:
-            Path(filepath).write_text(content, encoding="utf-8")
+        讀取後若檔案在寫回前被其他流程（watch／另一個 pull）修改，以新內容重新套用，
+        不會覆蓋對方的寫入。
+        """
+        path = Path(filepath)
+        for _ in range(_WRITE_ATTEMPTS):
+            before = path.stat()
+            content = path.read_text(encoding="utf-8")
+            patched, results = _patch_content(content, edits)
+            if self.dry_run:
+                results.append(f"  [DRY-RUN] Would write to {filepath}")
+                return results
+            if patched == content:
+                return results
+            after = path.stat()
+            if (after.st_mtime_ns, after.st_size) != (before.st_mtime_ns, before.st_size):
+                continue
+            write_atomic(path, patched, before.st_mode)
+            if self._source_index is not None:
+                self._source_index.refresh(filepath)
             results.append(f"  ✅ Written to {filepath}")
-        elif self.dry_run:
-            results.append(f"  [DRY-RUN] Would write to {filepath}")
+            return results
+        results.append(f"  ⚠️  {filepath} 在套用期間持續被修改，未寫入")
         return results
 
     def generate_patch_report(self, diff: dict) -> str:
@@ -0,0 +1,321 @@
+"""
+Codegen render cache — reuse rendered markup for unchanged IR subtrees.
+
+Each IR subtree is fingerprinted by a Merkle hash: sha256 of the node's own
+fields as canonical JSON plus its children's hashes. For every rendered
+subtree the cache stores a *template* keyed by
+(target, render variant, theme fingerprint, subtree hash):
+
+- the markup with one ``\\x00s<i>\\x00`` marker per CSS class the node adds
+  (in ``add_node`` call order) and one ``\\x00c<key>\\x00`` marker per child
+  subtree, so each node's text is stored once;
+- the ``(class base, _style_dict result)`` of each class slot.
+
+Replaying a template allocates class names on the real ``StyleSheet`` in the
+same order a fresh render would, so output is byte-identical while
+``_style_dict`` and the per-node formatting are skipped for clean subtrees.
+
+The file is kept in least-recently-used order and capped at ``max_entries``:
+templates replayed or recorded in a run move to the end, and the oldest
+entries not used by the run are evicted on save. A template is always used
+after its parent, so eviction from the front never strands a child marker.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+from .ir_walk import iter_postorder
+from .snapshot import write_atomic
+
+if TYPE_CHECKING:
+    from .theme_manager import ThemeManager
+
+CACHE_FILENAME = "render-cache.json"
+# Bump when renderer output changes so stale templates are discarded.
+CACHE_VERSION = 1
+MAX_ENTRIES = 20000
+_MARK = "\x00"
+
+# Parsed cache files per process, keyed by path: (mtime_ns, size, entries).
+# Pool workers get one RenderCache per page job; this parses the file once.
+_loaded: Dict[str, tuple] = {}
+
+
+def _stat_key(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class _RecordingSheet:
+    """Stand-in for ``StyleSheet`` while a template is recorded."""
+
+    def __init__(self, theme_manager: Optional["ThemeManager"]) -> None:
+        self.theme_manager = theme_manager
+        self.slots: List[list] = []
+
+    def add_node(self, node: dict) -> str:
+        from .generator import _kebab, _style_dict
+
+        self.slots.append([_kebab(node.get("figmaName", "node")), _style_dict(node, self.theme_manager)])
+        return f"{_MARK}s{len(self.slots) - 1}{_MARK}"
+
+
+class RenderCache:
+    """On-disk subtree template cache shared by the ``_emit_*`` renderers.
+
+    ``cache_dir=None`` keeps the cache in memory only. Instances pickle as
+    their directory and reload lazily, so they can be handed to pool workers;
+    ``added`` holds the entries recorded by this instance and ``used`` the
+    keys it replayed (in recency order), both merged back via ``usage``.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = MAX_ENTRIES) -> None:
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entries: Optional[Dict[str, dict]] = None
+        self.added: Dict[str, dict] = {}
+        self.used: Dict[str, None] = {}
+        self.hits = 0
+        self.misses = 0
+        self._hashes: Dict[int, Optional[str]] = {}
+        self._themes: Dict[int, str] = {}
+        self._complete: set = set()
+
+    def __getstate__(self) -> dict:
+        return {"cache_dir": self.cache_dir, "max_entries": self.max_entries}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["cache_dir"], state.get("max_entries", MAX_ENTRIES))
+
+    @property
+    def path(self) -> Optional[Path]:
+        return Path(self.cache_dir) / CACHE_FILENAME if self.cache_dir else None
+
+    @property
+    def entries(self) -> Dict[str, dict]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> Dict[str, dict]:
+        path = self.path
+        if path is None:
+            return {}
+        stat_key = _stat_key(path)
+        memo = _loaded.get(str(path))
+        if stat_key is not None and memo is not None and memo[:2] == stat_key:
+            return dict(memo[2])
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+        if stat_key is not None:
+            _loaded[str(path)] = (*stat_key, entries)
+        return dict(entries)
+
+    def _touch(self, key: str) -> None:
+        self.used.pop(key, None)
+        self.used[key] = None
+
+    def usage(self) -> tuple:
+        """(added entries, used keys) of this instance, for ``merge``."""
+        return self.added, list(self.used)
+
+    def merge(self, added: Dict[str, dict], used: Iterable[str] = ()) -> None:
+        """Adopt entries recorded and keys used by another instance (e.g. a pool worker)."""
+        if added is not self.added:
+            for key, entry in added.items():
+                if key not in self.entries:
+                    self.entries[key] = entry
+                    self.added[key] = entry
+        for key in used:
+            if key in self.entries:
+                self._touch(key)
+
+    def _ordered(self) -> Dict[str, dict]:
+        """Entries in recency order, trimmed to ``max_entries`` (entries used this run are kept)."""
+        entries = self.entries
+        used = [key for key in self.used if key in entries]
+        stale = [key for key in entries if key not in self.used]
+        room = max(self.max_entries - len(used), 0)
+        keep = stale[len(stale) - room:] if room else []
+        return {key: entries[key] for key in keep + used}
+
+    def save(self) -> None:
+        """Write the cache if this run recorded templates, changed recency order or evicted entries."""
+        path = self.path
+        if path is None:
+            return
+        ordered = self._ordered()
+        if not self.added and list(ordered) == list(self.entries):
+            return
+        self._entries = ordered
+        self._complete = set()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"version": CACHE_VERSION, "entries": ordered}, ensure_ascii=False)
+        write_atomic(path, payload)
+        stat_key = _stat_key(path)
+        if stat_key is not None:
+            _loaded[str(path)] = (*stat_key, ordered)
+
+    def subtree_hash(self, node: dict) -> Optional[str]:
+        """Merkle hash of ``node``; None if the subtree cannot be templated.
+
+        Hashes every descendant bottom-up (``ir_walk.iter_postorder``) and
+        memoizes them; already hashed subtrees are not descended into.
+        """
+        hashes = self._hashes
+        if id(node) in hashes:
+            return hashes[id(node)]
+
+        def unhashed_children(current: dict) -> list:
+            return [child for child in current.get("children") or [] if id(child) not in hashes]
+
+        for current in iter_postorder(node, unhashed_children):
+            if id(current) in hashes:
+                continue
+            own = {k: v for k, v in current.items() if k != "children"}
+            own_json = json.dumps(own, sort_keys=True, ensure_ascii=False, default=str)
+            digest: Optional[str] = None
+            # json.dumps escapes NUL, so a raw _MARK in the node's text shows up as \u0000;
+            # such subtrees would corrupt the template markers and are rendered fresh.
+            if "\\u0000" not in own_json:
+                child_hashes = [hashes[id(child)] for child in current.get("children") or []]
+                if None not in child_hashes:
+                    h = hashlib.sha256(own_json.encode("utf-8"))
+                    for ch in child_hashes:
+                        h.update(b"|" + ch.encode("ascii"))
+                    digest = h.hexdigest()
+            hashes[id(current)] = digest
+        return hashes[id(node)]
+
+    def _theme_fingerprint(self, theme_manager: Optional["ThemeManager"]) -> str:
+        if theme_manager is None:
+            return "-"
+        fp = self._themes.get(id(theme_manager))
+        if fp is None:
+            fp = theme_manager.fingerprint()
+            self._themes[id(theme_manager)] = fp
+        return fp
+
+    def replayer(
+        self,
+        target: str,
+        extra: tuple,
+        shell_fn: Callable[[dict, Any, int], Any],
+        sheet: Any,
+    ) -> Callable[[dict, int, Callable[[str], Any]], bool]:
+        """Return ``replay(node, indent, write)`` for ``generator._emit_tree``.
+
+        ``replay`` writes the subtree from its template (recording it first on
+        a miss) and returns True, or returns False when the subtree cannot be
+        templated. ``extra`` holds every render argument besides the node and
+        indent that affects the markup (e.g. css_module).
+        """
+        theme_fp = self._theme_fingerprint(getattr(sheet, "theme_manager", None))
+
+        def key_for(digest: str, indent: int) -> str:
+            return f"{target}:{','.join(map(str, (indent,) + extra))}:{theme_fp}:{digest}"
+
+        def replay(node: dict, indent: int, write: Callable[[str], Any]) -> bool:
+            digest = self.subtree_hash(node)
+            if digest is None:
+                return False
+            key = key_for(digest, indent)
+            if self._is_complete(key):
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._record(key, node, indent, shell_fn, key_for, getattr(sheet, "theme_manager", None))
+            self._replay(key, sheet, write)
+            return True
+
+        return replay
+
+    def _record(
+        self,
+        key: str,
+        node: dict,
+        indent: int,
+        shell_fn: Callable[[dict, Any, int], Any],
+        key_for: Callable[[str, int], str],
+        theme_manager: Optional["ThemeManager"],
+    ) -> None:
+        """Record templates for ``node`` and every child subtree not cached yet."""
+        todo = [(key, node, indent)]
+        queued = {key}
+        while todo:
+            key, node, indent = todo.pop()
+            recorder = _RecordingSheet(theme_manager)
+            shell = shell_fn(node, recorder, indent)
+            if isinstance(shell, str):
+                text = shell
+            else:
+                open_, sep, close, child_indent, children = shell
+                markers = []
+                for child in children:
+                    child_key = key_for(self._hashes[id(child)], child_indent)
+                    markers.append(f"{_MARK}c{child_key}{_MARK}")
+                    if child_key in queued or self._is_complete(child_key):
+                        self.hits += 1
+                    else:
+                        self.misses += 1
+                        queued.add(child_key)
+                        todo.append((child_key, child, child_indent))
+                text = open_ + sep.join(markers) + close
+            entry = {"text": text, "slots": recorder.slots}
+            self.entries[key] = entry
+            self.added[key] = entry
+
+    def _is_complete(self, key: str) -> bool:
+        """True if ``key`` and every child template it references are cached."""
+        seen = []
+        stack = [key]
+        while stack:
+            current = stack.pop()
+            if current in self._complete:
+                continue
+            entry = self.entries.get(current)
+            if entry is None:
+                return False
+            seen.append(current)
+            stack.extend(part[1:] for part in entry["text"].split(_MARK)[1::2] if part[0] == "c")
+        self._complete.update(seen)
+        return True
+
+    def _replay(self, key: str, sheet: Any, write: Callable[[str], Any]) -> None:
+        # Explicit stack of (kind, value): 0 = text, 1 = class slot, 2 = child key.
+        stack: List[tuple] = [(2, key)]
+        while stack:
+            kind, value = stack.pop()
+            if kind == 0:
+                write(value)
+            elif kind == 1:
+                base, styles = value
+                write(sheet.add_rule(base, dict(styles)))
+            else:
+                self._touch(value)
+                entry = self.entries[value]
+                slots = entry["slots"]
+                parts = entry["text"].split(_MARK)
+                for i in range(len(parts) - 1, -1, -1):
+                    part = parts[i]
+                    if i % 2 == 0:
+                        if part:
+                            stack.append((0, part))
+                    elif part[0] == "s":
+                        stack.append((1, slots[int(part[1:])]))
+                    else:
+                        stack.append((2, part[1:]))
@@ -13,11 +13,13 @@ _KNOWN_SECTION_KEYS = {
     "source": {"framework", "styleStrategy", "entryUrl", "srcRoot"},
     "viewport": {"width", "height", "deviceName"},
     "naming": {"separator", "ignoreClasses"},
-    "export": {"snapshotDir", "cjkFontFamily"},
+    "export": {"snapshotDir", "cjkFontFamily", "snapshotFormat", "snapshotCompression"},
 }
 
 _VALID_FRAMEWORKS = {"html", "vue", "react", "svelte", "next", "nuxt"}
 _VALID_STRATEGIES = {"tailwind", "css-modules", "scss", "inline"}
+_VALID_SNAPSHOT_FORMATS = {"pretty", "compact"}
+_VALID_SNAPSHOT_COMPRESSIONS = {"gzip", "zstd"}
 
 
 def _warn(msg: str) -> None:
@@ -61,6 +63,17 @@ def validate_config(cfg: dict) -> None:
         valid = ", ".join(sorted(_VALID_STRATEGIES))
         _warn(f"source.styleStrategy '{strategy}' 不在已知值中（{valid}）")
 
+    # export.snapshotFormat／snapshotCompression 值驗證
+    export = cfg.get("export", {})
+    fmt = export.get("snapshotFormat")
+    if fmt and fmt not in _VALID_SNAPSHOT_FORMATS:
+        valid = ", ".join(sorted(_VALID_SNAPSHOT_FORMATS))
+        _warn(f"export.snapshotFormat '{fmt}' 不在已知值中（{valid}）")
+    compression = export.get("snapshotCompression")
+    if compression and compression not in _VALID_SNAPSHOT_COMPRESSIONS:
+        valid = ", ".join(sorted(_VALID_SNAPSHOT_COMPRESSIONS))
+        _warn(f"export.snapshotCompression '{compression}' 不在已知值中（{valid}）")
+
     # viewport 值類型
     for dim in ("width", "height"):
         val = cfg.get("viewport", {}).get(dim)
@@ -10,6 +10,8 @@ import os
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+from .ir_walk import iter_nodes
+
 
 def write_erslice_manifest(
     output_dir: str,
@@ -50,9 +52,7 @@ def write_completeness(
     寫入 completeness.json（簡化版完整度指標，對齊 ErSlice）。
     """
     tree = ir_doc.get("tree") or {}
-    node_count = _count_nodes(tree)
-    has_styles = _has_any_styles(tree)
-    has_text = _has_any_text(tree)
+    node_count, has_styles, has_text = _tree_stats(tree)
 
     completeness = {
         "score": min(100, (node_count * 2 + (10 if has_styles else 0) + (10 if has_text else 0) + (10 if has_screenshot else 0))),
@@ -84,33 +84,36 @@ def extract_design_tokens_from_ir(ir_tree: dict) -> dict:
 
 
 def _count_nodes(node: Optional[dict]) -> int:
-    if not node:
-        return 0
-    n = 1
-    for child in node.get("children", []):
-        n += _count_nodes(child)
-    return n
+    return sum(1 for n in iter_nodes(node) if n)
 
 
 def _has_any_styles(node: dict) -> bool:
-    if node.get("styles"):
-        return True
-    for child in node.get("children", []):
-        if _has_any_styles(child):
-            return True
-    return False
+    return any(n.get("styles") for n in iter_nodes(node))
 
 
 def _has_any_text(node: dict) -> bool:
-    if node.get("text", {}).get("characters"):
-        return True
-    for child in node.get("children", []):
-        if _has_any_text(child):
-            return True
-    return False
+    return any(n.get("text", {}).get("characters") for n in iter_nodes(node))
+
+
+def _tree_stats(node: Optional[dict]) -> tuple[int, bool, bool]:
+    """(節點數, 是否有 styles, 是否有文字)，單趟走訪算出。"""
+    count = 0
+    has_styles = has_text = False
+    for n in iter_nodes(node):
+        if not n:
+            continue
+        count += 1
+        has_styles = has_styles or bool(n.get("styles"))
+        has_text = has_text or bool(n.get("text", {}).get("characters"))
+    return count, has_styles, has_text
 
 
 def _collect_tokens(node: dict, tokens: dict) -> None:
+    for n in iter_nodes(node):
+        _collect_node_tokens(n, tokens)
+
+
+def _collect_node_tokens(node: dict, tokens: dict) -> None:
     styles = node.get("styles") or {}
     if styles.get("backgroundColor"):
         tokens["colors"].append(styles["backgroundColor"])
@@ -123,5 +126,3 @@ def _collect_tokens(node: dict, tokens: dict) -> None:
         tokens["fontFamilies"].append(text["fontFamily"])
     if text.get("color"):
         tokens["colors"].append(text["color"])
-    for child in node.get("children", []):
-        _collect_tokens(child, tokens)
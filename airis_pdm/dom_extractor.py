@@ -48,8 +48,13 @@ Coverage comparison:
 import asyncio
 import json
 import base64
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Callable, Optional
+
+from .asset_store import AssetStore
+from .network import routing, routing_enabled
+from .readiness import load_and_wait, settle
 
 
 @dataclass
@@ -71,6 +76,19 @@ class ExtractionConfig:
     detect_components: bool = True
     detect_grid: bool = True           # detect CSS Grid → Figma Auto Layout
     framework: str = "vue"
+    capture_probe: bool = False        # also return a cheap DOM/CSS hash (see probe_dom_hash)
+    chunk_nodes: int = 0               # >0: walk in chunks of ~N nodes (see extract_dom_tree)
+    asset_dir: Optional[str] = None    # with capture_image_data: content-addressed image store (see AssetStore)
+    resize_settle_ms: int = 250        # extract_dom_tree_viewports: max wait after each resize
+    readiness: str = "auto"            # page-ready steps, e.g. "auto", "mutation,raf", "networkidle" (see readiness.py)
+    ready_quiet_ms: int = 100          # mutation step: DOM quiet window
+    ready_timeout_ms: int = 3000       # hydration / mutation steps: upper bound
+    block_resource_types: tuple = ()   # e.g. ("media", "font"); aborted during extraction (see network.py)
+    block_url_patterns: tuple = ()     # fnmatch globs on the full URL, e.g. network.BLOCK_TRACKERS
+    replay_dir: Optional[str] = None   # serve GET responses from / record them to this directory
+    replay_all_origins: bool = False   # replay the page's own origin too (default: third-party only)
+    replay_offline: bool = False       # replay cache misses are aborted instead of fetched
+    har_path: Optional[str] = None     # serve matching requests from an existing HAR file
 
 
 # ════════════════════════════════════════════════════════════════
@@ -469,9 +487,33 @@ DOM_WALKER_V2_JS = """
     // ────────────────────────────────────────
     // CSS Variable Resolution ✨ NEW
     // ────────────────────────────────────────
+    // Common design token variables (Tailwind CSS v4, shadcn/ui)
+    const COMMON_CSS_VARS = [
+        '--primary', '--secondary', '--accent', '--background', '--foreground',
+        '--border', '--radius', '--font-sans', '--font-mono',
+        // Tailwind CSS v4 tokens
+        '--color-primary', '--color-secondary',
+        // shadcn/ui tokens
+        '--ring', '--input', '--card', '--popover', '--muted', '--destructive',
+    ];
+
+    // Root computed style is resolved once per extraction, not per element
+    let rootStylesCache = null;
+    const rootVarCache = new Map();
+    function rootVar(prop) {
+        let val = rootVarCache.get(prop);
+        if (val === undefined) {
+            if (!rootStylesCache) {
+                rootStylesCache = window.getComputedStyle(document.documentElement);
+            }
+            val = rootStylesCache.getPropertyValue(prop).trim();
+            rootVarCache.set(prop, val);
+        }
+        return val;
+    }
+
     function extractCSSVariables(el) {
         if (!config.captureCssVars) return null;
-        const rootStyles = window.getComputedStyle(document.documentElement);
         const vars = {};
 
         // Get all CSS custom properties from the element's style
@@ -479,21 +521,13 @@ DOM_WALKER_V2_JS = """
         for (let i = 0; i < elStyles.length; i++) {
             const prop = elStyles[i];
             if (prop.startsWith('--')) {
-                vars[prop] = rootStyles.getPropertyValue(prop).trim();
+                vars[prop] = rootVar(prop);
             }
         }
 
         // Also check common design token variables
-        const commonVars = [
-            '--primary', '--secondary', '--accent', '--background', '--foreground',
-            '--border', '--radius', '--font-sans', '--font-mono',
-            // Tailwind CSS v4 tokens
-            '--color-primary', '--color-secondary',
-            // shadcn/ui tokens
-            '--ring', '--input', '--card', '--popover', '--muted', '--destructive',
-        ];
-        for (const v of commonVars) {
-            const val = rootStyles.getPropertyValue(v).trim();
+        for (const v of COMMON_CSS_VARS) {
+            const val = rootVar(v);
             if (val) vars[v] = val;
         }
 
@@ -503,8 +537,75 @@ DOM_WALKER_V2_JS = """
     // ────────────────────────────────────────
     // Pseudo Element Capture ✨ NEW
     // ────────────────────────────────────────
+    // Elements whose UA stylesheet generates ::before/::after content
+    const UA_PSEUDO_TAGS = new Set(['Q']);
+    const PSEUDO_RE = /::?(?:before|after)\\b/i;
+
+    // One pass over the stylesheets: collect the selectors that declare
+    // ::before/::after rules, with the pseudo part stripped, so walkDOM only
+    // pays for getComputedStyle(el, pseudo) on elements that can match one.
+    // null = unknown (cross-origin sheet, nested CSS, unparsable selector):
+    // fall back to checking every element.
+    let pseudoHostSelector;
+    function buildPseudoHostSelector() {
+        const hosts = [];
+        const probe = document.createDocumentFragment();
+        function visit(rules) {
+            for (const rule of rules) {
+                const text = rule.selectorText;
+                if (text && PSEUDO_RE.test(text)) {
+                    if (text.includes('&')) return false;
+                    for (const part of text.split(',')) {
+                        if (!PSEUDO_RE.test(part)) continue;
+                        const host = part.replace(/::?(?:before|after)\\b/gi, '').trim() || '*';
+                        try {
+                            probe.querySelector(host);
+                        } catch (e) {
+                            return false;
+                        }
+                        hosts.push(host);
+                    }
+                }
+                if (rule.cssRules && visit(rule.cssRules) === false) return false;
+                if (rule.styleSheet && !visitSheet(rule.styleSheet)) return false;
+            }
+            return true;
+        }
+        function visitSheet(sheet) {
+            let rules;
+            try {
+                rules = sheet.cssRules;
+            } catch (e) {
+                return false;
+            }
+            return !rules || visit(rules) !== false;
+        }
+        const sheets = [...document.styleSheets, ...(document.adoptedStyleSheets || [])];
+        for (const sheet of sheets) {
+            if (!visitSheet(sheet)) return null;
+        }
+        return hosts.length ? hosts.join(',') : '';
+    }
+
+    function mayHavePseudo(el) {
+        // :host::before rules live in the shadow root's own sheets
+        if (UA_PSEUDO_TAGS.has(el.tagName) || el.shadowRoot) return true;
+        if (pseudoHostSelector === undefined) {
+            pseudoHostSelector = buildPseudoHostSelector();
+        }
+        if (pseudoHostSelector === null) return true;
+        if (pseudoHostSelector === '') return false;
+        try {
+            return el.matches(pseudoHostSelector);
+        } catch (e) {
+            pseudoHostSelector = null;
+            return true;
+        }
+    }
+
     function capturePseudo(el) {
         if (!config.capturePseudo) return null;
+        if (!mayHavePseudo(el)) return null;
         const pseudos = [];
 
         for (const pseudo of ['::before', '::after']) {
@@ -615,6 +716,90 @@ DOM_WALKER_V2_JS = """
         return null;
     }
 
+    // ────────────────────────────────────────
+    // Out-of-band image capture (config.imageAssets)
+    // ────────────────────────────────────────
+    // Instead of inlining base64, each image is drawn to an OffscreenCanvas
+    // and PNG-encoded asynchronously while the walk continues; identical
+    // <img> sources are encoded once. finishImageAssets() sets
+    // node.imageHash (sha256 of the PNG, first 32 hex) and keeps the bytes
+    // in window.__airisImageAssets for DOM_IMAGE_TAKE_JS. Without
+    // OffscreenCanvas / crypto.subtle (insecure origin) images are inlined.
+    const imageAssets = !!(config.imageAssets && config.captureImageData &&
+        typeof OffscreenCanvas !== 'undefined' && window.crypto && window.crypto.subtle);
+    let imageJobs = [];
+    const imageJobBySource = new Map();
+
+    function imageCaptureSize(el) {
+        const MAX_DIM = 1024;
+        let w, h;
+        if (el.tagName === 'IMG' && el.complete && el.naturalWidth > 0) {
+            w = el.naturalWidth;
+            h = el.naturalHeight;
+        } else if (el.tagName === 'CANVAS' && config.captureCanvas) {
+            w = el.width;
+            h = el.height;
+        } else {
+            return null;
+        }
+        if (w > MAX_DIM || h > MAX_DIM) {
+            const scale = Math.min(MAX_DIM / w, MAX_DIM / h);
+            w *= scale;
+            h *= scale;
+        }
+        return { w, h };
+    }
+
+    function bytesToBase64(bytes) {
+        let binary = '';
+        for (let i = 0; i < bytes.length; i += 0x8000) {
+            binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+        }
+        return btoa(binary);
+    }
+
+    async function storeImageAsset(blob) {
+        const bytes = new Uint8Array(await blob.arrayBuffer());
+        const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', bytes));
+        let hash = '';
+        for (let i = 0; i < 16; i++) hash += digest[i].toString(16).padStart(2, '0');
+        if (!window.__airisImageAssets.has(hash)) {
+            window.__airisImageAssets.set(hash, bytesToBase64(bytes));
+        }
+        return hash;
+    }
+
+    function queueImageAsset(el, node) {
+        const size = imageCaptureSize(el);
+        if (!size) return;
+        // <canvas> content is live, so only <img> sources are shared
+        const key = el.tagName === 'IMG'
+            ? `${el.currentSrc || el.src}|${Math.floor(size.w)}x${Math.floor(size.h)}` : null;
+        let job = key ? imageJobBySource.get(key) : undefined;
+        if (!job) {
+            try {
+                const canvas = new OffscreenCanvas(size.w, size.h);
+                canvas.getContext('2d').drawImage(el, 0, 0, size.w, size.h);
+                // A tainted (CORS) canvas rejects here, like toDataURL throws inline
+                job = canvas.convertToBlob({ type: 'image/png' }).then(storeImageAsset).catch(() => null);
+            } catch (e) {
+                return;
+            }
+            if (key) imageJobBySource.set(key, job);
+        }
+        imageJobs.push({ node, job });
+    }
+
+    async function finishImageAssets(result) {
+        const jobs = imageJobs;
+        imageJobs = [];
+        for (const { node, job } of jobs) {
+            const hash = await job;
+            if (hash) node.imageHash = hash;
+        }
+        return result;
+    }
+
     // ────────────────────────────────────────
     // Component Detection (Vue/React/Svelte)
     // ────────────────────────────────────────
@@ -721,37 +906,55 @@ DOM_WALKER_V2_JS = """
     function getSiblingInfo(el) {
         const parent = el.parentElement;
         if (!parent) return { index: 0, tagCount: 1 };
-        let index = 0, tagCount = 0;
-        for (const child of parent.children) {
-            if (child.tagName === el.tagName) {
-                if (child === el) index = tagCount;
-                tagCount++;
-            }
+        return childSiblingInfos(parent)[Array.prototype.indexOf.call(parent.children, el)];
+    }
+
+    // Sibling index / same-tag count for every child of a parent in two passes
+    // (a per-child rescan of parent.children is O(n²) on wide lists)
+    function childSiblingInfos(parent) {
+        const children = parent.children;
+        const counts = new Map();
+        const infos = new Array(children.length);
+        for (let i = 0; i < children.length; i++) {
+            const tag = children[i].tagName;
+            const index = counts.get(tag) || 0;
+            counts.set(tag, index + 1);
+            infos[i] = { index, tagCount: 0 };
+        }
+        for (let i = 0; i < children.length; i++) {
+            infos[i].tagCount = counts.get(children[i].tagName);
         }
-        return { index, tagCount };
+        return infos;
     }
 
     // ────────────────────────────────────────
     // Main Walk Function
     // ────────────────────────────────────────
-    function walkDOM(el, depth = 0, parentX = 0, parentY = 0) {
+    // Skip invisible
+    function hiddenByStyle(el, styles) {
+        if (!config.skipInvisible) return false;
+        if (styles.display === 'none') return true;
+        if (styles.visibility === 'hidden' && !el.children.length) return true;
+        if (parseFloat(styles.opacity) === 0 && !el.children.length) return true;
+        return false;
+    }
+
+    function emptyBox(el, rect) {
+        return rect.width === 0 && rect.height === 0 && !el.children.length;
+    }
+
+    function walkDOM(el, depth = 0, parentX = 0, parentY = 0, siblingInfo = null) {
         if (depth > config.maxDepth) return null;
         if (SKIP_TAGS.has(el.tagName)) return null;
 
         const styles = window.getComputedStyle(el);
-
-        // Skip invisible
-        if (config.skipInvisible) {
-            if (styles.display === 'none') return null;
-            if (styles.visibility === 'hidden' && !el.children.length) return null;
-            if (parseFloat(styles.opacity) === 0 && !el.children.length) return null;
-        }
+        if (hiddenByStyle(el, styles)) return null;
 
         const rect = el.getBoundingClientRect();
-        if (rect.width === 0 && rect.height === 0 && !el.children.length) return null;
+        if (emptyBox(el, rect)) return null;
 
         const layout = detectLayout(styles);
-        const siblingInfo = getSiblingInfo(el);
+        if (!siblingInfo) siblingInfo = getSiblingInfo(el);
 
         // ─── Build node ───
         const node = {
@@ -919,7 +1122,11 @@ DOM_WALKER_V2_JS = """
         }
 
         // ─── Image data capture ───
-        node.imageData = captureImageData(el);
+        if (imageAssets) {
+            queueImageAsset(el, node);
+        } else {
+            node.imageData = captureImageData(el);
+        }
 
         // ─── Pseudo elements ───
         node.pseudoElements = capturePseudo(el);
@@ -931,17 +1138,123 @@ DOM_WALKER_V2_JS = """
 
         // ─── Recursively walk children ───
         if (!node.isTextNode && !node.isSVG) {
-            for (const child of el.children) {
-                const childNode = walkDOM(child, depth + 1, rect.x, rect.y);
+            const children = el.children;
+            const siblingInfos = children.length ? childSiblingInfos(el) : null;
+            if (chunked) chunkBudget -= nodeCost(node);
+            for (let i = 0; i < children.length; i++) {
+                if (chunked && chunkBudget <= 0) {
+                    // Out of budget: the rest of this element's children
+                    // are walked by a later __airisDomChunks.next() call
+                    node.childrenPending = deferChildren(el, depth, rect, i, siblingInfos);
+                    break;
+                }
+                const childNode = walkDOM(children[i], depth + 1, rect.x, rect.y, siblingInfos[i]);
                 if (childNode) {
                     node.children.push(childNode);
                 }
             }
+        } else if (chunked) {
+            chunkBudget -= nodeCost(node);
         }
 
         return node;
     }
 
+    // ────────────────────────────────────────
+    // Chunked walk (config.chunkNodes > 0)
+    // ────────────────────────────────────────
+    // Each evaluate returns at most ~chunkNodes nodes (inline image data
+    // counts one node per 4 KB); the remaining children of an element are
+    // marked `childrenPending: id` and fetched with
+    // window.__airisDomChunks.next(id) → { children, more }.
+    const chunked = config.chunkNodes > 0;
+    let chunkBudget = 0;
+    const pendingChildren = new Map();
+    let nextPendingId = 1;
+
+    function nodeCost(node) {
+        return 1 + (node.imageData ? Math.floor(node.imageData.length / 4096) : 0);
+    }
+
+    function deferChildren(el, depth, rect, start, siblingInfos) {
+        const id = nextPendingId++;
+        pendingChildren.set(id, { el, depth, x: rect.x, y: rect.y, start, siblingInfos });
+        return id;
+    }
+
+    function nextChunk(id) {
+        const entry = pendingChildren.get(id);
+        if (!entry) return { children: [], more: false };
+        const children = entry.el.children;
+        const out = [];
+        chunkBudget = config.chunkNodes;
+        let i = entry.start;
+        // Always walk at least one child so every call makes progress
+        for (; i < children.length && (i === entry.start || chunkBudget > 0); i++) {
+            const childNode = walkDOM(children[i], entry.depth + 1, entry.x, entry.y, entry.siblingInfos[i]);
+            if (childNode) out.push(childNode);
+        }
+        if (i < children.length) {
+            entry.start = i;
+            return finish({ children: out, more: true });
+        }
+        pendingChildren.delete(id);
+        return finish({ children: out, more: false });
+    }
+
+    function finish(result) {
+        return imageAssets ? finishImageAssets(result) : result;
+    }
+
+    // ────────────────────────────────────────
+    // Component subtrees (config.subtreeComponents)
+    // ────────────────────────────────────────
+    // Walks only the root elements of the named components (elements owned
+    // by the component whose parent is not) and returns
+    // { subtrees: [{ path, node }] }. `path` is the child-index path from
+    // the walk root in the *walked* tree (skipped siblings not counted), so
+    // it addresses the same node in a previous full walk; null when the
+    // element would not appear in a full walk at all.
+    function walkedPath(el) {
+        const path = [];
+        for (let cur = el; cur !== root; cur = cur.parentElement) {
+            const parent = cur.parentElement;
+            if (!parent || !walked(cur)) return null;
+            if (isTextOnlyNode(parent) || parent.tagName === 'SVG') return null;
+            let index = 0;
+            for (const sibling of parent.children) {
+                if (sibling === cur) break;
+                if (walked(sibling)) index++;
+            }
+            path.unshift(index);
+        }
+        return path.length > config.maxDepth ? null : path;
+    }
+
+    function walked(el) {
+        if (SKIP_TAGS.has(el.tagName)) return false;
+        if (hiddenByStyle(el, window.getComputedStyle(el))) return false;
+        return !emptyBox(el, el.getBoundingClientRect());
+    }
+
+    function walkComponentSubtrees(names) {
+        const wanted = new Set(names);
+        const subtrees = [];
+        const stack = [root];
+        while (stack.length) {
+            const el = stack.pop();
+            const name = getComponentName(el);
+            if (wanted.has(name) && (el === root || getComponentName(el.parentElement) !== name)) {
+                const path = el === root ? [] : walkedPath(el);
+                const node = path ? walkDOM(el, path.length, 0, 0, el === root ? null : getSiblingInfo(el)) : null;
+                subtrees.push({ path, node });
+                continue;
+            }
+            for (let i = el.children.length - 1; i >= 0; i--) stack.push(el.children[i]);
+        }
+        return { subtrees };
+    }
+
     // ─── Find root ───
     const selectors = config.rootSelector.split(',').map(s => s.trim());
     let root = null;
@@ -951,7 +1264,78 @@ DOM_WALKER_V2_JS = """
     }
     if (!root) root = document.body;
 
-    return walkDOM(root);
+    if (chunked) {
+        window.__airisDomChunks = { next: nextChunk };
+        chunkBudget = config.chunkNodes;
+    }
+    // Kept across walks of the same page until DOM_IMAGE_TAKE_JS(null)
+    if (imageAssets && !window.__airisImageAssets) window.__airisImageAssets = new Map();
+    if (config.subtreeComponents) return finish(walkComponentSubtrees(config.subtreeComponents));
+    return finish(walkDOM(root));
+}
+"""
+
+# Hashes of the images captured by an ``imageAssets`` walker run on this page.
+DOM_IMAGE_LIST_JS = """
+() => window.__airisImageAssets ? [...window.__airisImageAssets.keys()] : []
+"""
+
+# Takes (and releases) captured images as {hash: base64}; ``null`` drops the rest.
+DOM_IMAGE_TAKE_JS = """
+(hashes) => {
+    const store = window.__airisImageAssets;
+    const out = {};
+    if (!store) return out;
+    if (hashes === null) {
+        delete window.__airisImageAssets;
+        return out;
+    }
+    for (const hash of hashes) {
+        const data = store.get(hash);
+        if (data !== undefined) {
+            out[hash] = data;
+            store.delete(hash);
+        }
+    }
+    return out;
+}
+"""
+
+# Fetches the next slice of an element's children left as ``childrenPending``
+# by a chunked ``DOM_WALKER_V2_JS`` run on the same page.
+DOM_CHUNK_NEXT_JS = """
+(id) => window.__airisDomChunks ? window.__airisDomChunks.next(id) : { children: [], more: false }
+"""
+
+
+# Cheap change probe: FNV-1a over the root's outerHTML and the text of every
+# readable stylesheet. Far cheaper than the walker (no getComputedStyle), so
+# incremental Storybook sync can skip stories whose markup and CSS are unchanged.
+DOM_PROBE_JS = """
+(rootSelector) => {
+    let root = null;
+    for (const sel of rootSelector.split(',')) {
+        root = document.querySelector(sel.trim());
+        if (root) break;
+    }
+    if (!root) root = document.body;
+    let h = 0x811c9dc5, len = 0;
+    const feed = (text) => {
+        for (let i = 0; i < text.length; i++) {
+            h ^= text.charCodeAt(i);
+            h = Math.imul(h, 0x01000193);
+        }
+        len += text.length;
+    };
+    feed(root ? root.outerHTML : '');
+    for (const sheet of document.styleSheets) {
+        try {
+            for (const rule of sheet.cssRules) feed(rule.cssText);
+        } catch (e) {
+            feed(sheet.href || '');  // cross-origin sheet: only its URL is readable
+        }
+    }
+    return (h >>> 0).toString(16).padStart(8, '0') + '-' + len.toString(16);
 }
 """
 
@@ -960,16 +1344,7 @@ DOM_WALKER_V2_JS = """
 # Python API (same interface as v1, drop-in replacement)
 # ════════════════════════════════════════════════════════════════
 
-async def extract_dom_tree(
-    url: str,
-    config: Optional[ExtractionConfig] = None,
-) -> dict:
-    """
-    Launch headless browser, navigate to URL, extract DOM tree.
-    Drop-in replacement for v1 with all enhanced capabilities.
-    """
-    config = config or ExtractionConfig()
-
+def _async_playwright():
     try:
         from playwright.async_api import async_playwright
     except ImportError:
@@ -978,55 +1353,332 @@ async def extract_dom_tree(
             "  pip install playwright --break-system-packages\n"
             "  playwright install chromium"
         )
+    return async_playwright()
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            viewport={
-                "width": config.viewport_width,
-                "height": config.viewport_height,
-            }
-        )
-        page = await context.new_page()
-
-        await page.goto(url, wait_until="networkidle", timeout=config.wait_timeout_ms)
-
-        if config.wait_for_selector:
-            await page.wait_for_selector(
-                config.wait_for_selector,
-                timeout=config.wait_timeout_ms
-            )
-
-        # Wait for framework hydration
-        await page.wait_for_timeout(500)
-
-        js_config = {
-            "rootSelector": config.root_selector,
-            "skipInvisible": config.skip_invisible,
-            "maxDepth": config.max_depth,
-            "detectComponents": config.detect_components,
-            "detectGrid": config.detect_grid,
-            "framework": config.framework,
-            "captureImageData": config.capture_image_data,
-            "captureCanvas": config.capture_canvas,
-            "captureSvgMarkup": config.capture_svg_markup,
-            "capturePseudo": config.capture_pseudo,
-            "captureCssVars": config.capture_css_vars,
-        }
 
-        raw_tree = await page.evaluate(DOM_WALKER_V2_JS, js_config)
-        screenshot_bytes = await page.screenshot(full_page=False)
+class BrowserPool:
+    """
+    Long-lived headless Chromium shared by successive extractions.
+
+    The browser is launched on first use and kept until ``close()``. One
+    browser context is kept per viewport size, and released pages are
+    returned to a per-viewport idle list (at most ``max_idle_pages`` each),
+    so ``watch`` / ``push-stories`` / visual compliance pay browser startup
+    once instead of on every call. Pages of the same viewport share cookies
+    and storage.
+
+        async with BrowserPool() as pool:
+            result = await extract_dom_tree(url, config, pool=pool)
 
-        await browser.close()
+    A pool belongs to the event loop it is first used on. If Chromium crashes
+    or disconnects, the next borrow drops the dead contexts and idle pages and
+    launches a new browser.
+    """
 
+    def __init__(self, headless: bool = True, max_idle_pages: int = 4):
+        self.headless = headless
+        self.max_idle_pages = max_idle_pages
+        self._playwright = None
+        self._browser = None
+        self._contexts: dict = {}
+        self._idle: dict = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self.launches = 0
+
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _context(self, viewport: tuple):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._browser is not None and not self._browser.is_connected():
+                await self._discard_browser()
+            if self._browser is None:
+                self._playwright = await _async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                self.launches += 1
+            context = self._contexts.get(viewport)
+            if context is None:
+                context = await self._browser.new_context(
+                    viewport={"width": viewport[0], "height": viewport[1]}
+                )
+                self._contexts[viewport] = context
+            return context
+
+    async def _discard_browser(self) -> None:
+        """Forget a crashed / disconnected browser so the next borrow relaunches."""
+        playwright = self._playwright
+        self._browser = self._playwright = None
+        self._contexts.clear()
+        self._idle.clear()
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception:
+                pass  # the driver may already be gone with the browser
+
+    def _take_idle(self, viewport: tuple):
+        """An idle page that is still usable, or None; closed pages are dropped."""
+        if self._browser is None or not self._browser.is_connected():
+            return None
+        idle = self._idle.get(viewport, [])
+        while idle:
+            page = idle.pop()
+            if not page.is_closed():
+                return page
+        return None
+
+    @asynccontextmanager
+    async def page(self, viewport_width: int, viewport_height: int):
+        """Borrow a page with the given viewport; it is returned to the pool on exit.
+
+        A page whose block raised is closed instead of reused.
+        """
+        viewport = (viewport_width, viewport_height)
+        page = self._take_idle(viewport) or await (await self._context(viewport)).new_page()
+        try:
+            yield page
+        except BaseException:
+            if not page.is_closed():
+                await page.close()
+            raise
+        if self._browser is None or not self._browser.is_connected() or page.is_closed():
+            return
+        idle = self._idle.setdefault(viewport, [])
+        if len(idle) < self.max_idle_pages:
+            idle.append(page)
+        else:
+            await page.close()
+
+    async def close(self) -> None:
+        """Close every context, the browser and Playwright; the pool may be reused afterwards."""
+        browser, playwright = self._browser, self._playwright
+        self._browser = self._playwright = None
+        self._contexts.clear()
+        self._idle.clear()
+        if browser is not None:
+            await browser.close()
+        if playwright is not None:
+            await playwright.stop()
+
+
+def walker_config(config: ExtractionConfig) -> dict:
+    """ExtractionConfig → ``DOM_WALKER_V2_JS`` 的 config 參數。"""
     return {
+        "rootSelector": config.root_selector,
+        "skipInvisible": config.skip_invisible,
+        "maxDepth": config.max_depth,
+        "detectComponents": config.detect_components,
+        "detectGrid": config.detect_grid,
+        "framework": config.framework,
+        "captureImageData": config.capture_image_data,
+        "captureCanvas": config.capture_canvas,
+        "captureSvgMarkup": config.capture_svg_markup,
+        "capturePseudo": config.capture_pseudo,
+        "captureCssVars": config.capture_css_vars,
+        "chunkNodes": config.chunk_nodes,
+        "imageAssets": bool(config.asset_dir),
+    }
+
+
+async def _load_page(page, url: str, config: ExtractionConfig) -> dict:
+    """Navigate and wait per ``config.readiness``; returns the per-step timing report."""
+    return await load_and_wait(page, url, config)
+
+
+def _chunk_fetcher(page, loop: asyncio.AbstractEventLoop) -> Callable[[int], list]:
+    """Blocking ``fetch_children(pending_id)`` for a worker thread; evaluates on ``loop``."""
+    def fetch_children(pending_id: int) -> list:
+        children: list = []
+        while True:
+            chunk = asyncio.run_coroutine_threadsafe(
+                page.evaluate(DOM_CHUNK_NEXT_JS, pending_id), loop
+            ).result()
+            children.extend(chunk["children"])
+            if not chunk["more"]:
+                return children
+    return fetch_children
+
+
+async def _collect_image_assets(page, store: AssetStore, batch_size: int = 16) -> dict:
+    """Move images captured by an ``imageAssets`` walk into ``store``.
+
+    Only hashes missing from the store are transferred, ``batch_size`` at a
+    time; each batch is written in a worker thread while the next one is
+    fetched.
+    """
+    def write(batch: dict) -> None:
+        for asset_hash, data in batch.items():
+            store.put_base64(data, expected_hash=asset_hash)
+
+    hashes = await page.evaluate(DOM_IMAGE_LIST_JS)
+    missing = [h for h in hashes if not store.has(h)]
+    writes = []
+    for start in range(0, len(missing), batch_size):
+        taken = await page.evaluate(DOM_IMAGE_TAKE_JS, missing[start:start + batch_size])
+        writes.append(asyncio.create_task(asyncio.to_thread(write, taken)))
+    await asyncio.gather(*writes)
+    await page.evaluate(DOM_IMAGE_TAKE_JS, None)
+    return {"dir": str(store.directory), "images": len(hashes), "written": len(missing)}
+
+
+def assemble_tree(node: dict, fetch_children: Callable[[int], list]) -> dict:
+    """Resolve every ``childrenPending`` under ``node`` in place (the default chunked consumer)."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        pending = current.pop("childrenPending", None)
+        if pending is not None:
+            current.setdefault("children", []).extend(fetch_children(pending))
+        stack.extend(current.get("children") or [])
+    return node
+
+
+async def extract_dom_tree(
+    url: str,
+    config: Optional[ExtractionConfig] = None,
+    pool: Optional[BrowserPool] = None,
+    consume: Optional[Callable[[dict, Callable[[int], list]], Any]] = None,
+) -> dict:
+    """
+    Navigate to URL in a headless browser and extract the DOM tree.
+    Drop-in replacement for v1 with all enhanced capabilities.
+
+    With ``pool`` the page is borrowed from a long-lived ``BrowserPool``;
+    otherwise a browser is launched for this call and closed afterwards.
+
+    With ``config.chunk_nodes > 0`` the walker returns at most ~N nodes per
+    ``page.evaluate``; elements whose remaining children were not walked
+    carry ``childrenPending: id``. ``consume(root, fetch_children)`` then
+    runs in a worker thread while the page is still open —
+    ``fetch_children(id)`` blocks until that element's remaining children
+    arrive — and its return value is stored as ``result["consumed"]``, so
+    callers can build IR as chunks arrive instead of holding the whole raw
+    tree (``IRBuilderV2(fetch_children=...)``). Without ``consume`` the
+    chunks are assembled into ``result["tree"]`` as usual.
+
+    With ``config.capture_image_data`` and ``config.asset_dir`` images are
+    not inlined: nodes carry ``imageHash`` and the PNGs are written once per
+    content hash to ``asset_dir`` (``result["assets"]`` has the counts).
+
+    Resource blocking and the replay cache (``config.block_*``,
+    ``config.replay_*``, ``config.har_path``) apply while the page is
+    borrowed; their counters are in ``result["network"]``.
+    """
+    config = config or ExtractionConfig()
+
+    if pool is None:
+        async with BrowserPool() as own_pool:
+            return await extract_dom_tree(url, config, pool=own_pool, consume=consume)
+
+    consumed = None
+    async with pool.page(config.viewport_width, config.viewport_height) as page, \
+            routing(page, config, url) as network:
+        ready = await _load_page(page, url, config)
+
+        raw_tree = await page.evaluate(DOM_WALKER_V2_JS, walker_config(config))
+        if config.chunk_nodes > 0 and raw_tree:
+            fetch_children = _chunk_fetcher(page, asyncio.get_running_loop())
+            if consume is None:
+                raw_tree = await asyncio.to_thread(assemble_tree, raw_tree, fetch_children)
+            else:
+                consumed = await asyncio.to_thread(consume, raw_tree, fetch_children)
+        assets = None
+        if config.asset_dir and config.capture_image_data:
+            assets = await _collect_image_assets(page, AssetStore(config.asset_dir))
+        screenshot_bytes = await page.screenshot(full_page=False)
+        probe = await page.evaluate(DOM_PROBE_JS, config.root_selector) if config.capture_probe else None
+
+    result = {
         "tree": raw_tree,
         "screenshot": screenshot_bytes,
         "viewport": {
             "width": config.viewport_width,
             "height": config.viewport_height,
-        }
+        },
+        "readiness": ready,
     }
+    if routing_enabled(config):
+        result["network"] = network
+    if probe is not None:
+        result["probe"] = probe
+    if consume is not None and config.chunk_nodes > 0:
+        result["consumed"] = consumed
+    if assets is not None:
+        result["assets"] = assets
+    return result
+
+
+async def extract_dom_tree_viewports(
+    url: str,
+    viewports: "list[tuple[int, int]]",
+    config: Optional[ExtractionConfig] = None,
+    pool: Optional[BrowserPool] = None,
+) -> list:
+    """
+    Load URL once and walk it at each of ``viewports`` ((width, height) pairs).
+
+    The page is opened at the first viewport, then resized with
+    ``set_viewport_size`` and re-walked for every further breakpoint once
+    media-query driven re-renders settle (``readiness.settle``, at most
+    ``config.resize_settle_ms``). Returns
+    one ``extract_dom_tree``-style result per viewport, in order; chunked
+    walks are assembled and image assets are collected once at the end
+    (``"assets"`` on the first result). The page is returned to the pool at
+    its original size.
+    """
+    config = config or ExtractionConfig()
+    if not viewports:
+        raise ValueError("viewports must not be empty")
+
+    if pool is None:
+        async with BrowserPool() as own_pool:
+            return await extract_dom_tree_viewports(url, viewports, config, pool=own_pool)
+
+    base_width, base_height = viewports[0]
+    results = []
+    async with pool.page(base_width, base_height) as page, routing(page, config, url) as network:
+        ready = await _load_page(page, url, config)
+        for index, (width, height) in enumerate(viewports):
+            if index:
+                await page.set_viewport_size({"width": width, "height": height})
+                ready = await settle(page, config)
+            raw_tree = await page.evaluate(DOM_WALKER_V2_JS, walker_config(config))
+            if config.chunk_nodes > 0 and raw_tree:
+                fetch_children = _chunk_fetcher(page, asyncio.get_running_loop())
+                raw_tree = await asyncio.to_thread(assemble_tree, raw_tree, fetch_children)
+            results.append({
+                "tree": raw_tree,
+                "screenshot": await page.screenshot(full_page=False),
+                "viewport": {"width": width, "height": height},
+                "readiness": ready,
+            })
+        if config.asset_dir and config.capture_image_data:
+            results[0]["assets"] = await _collect_image_assets(page, AssetStore(config.asset_dir))
+        if len(viewports) > 1:
+            await page.set_viewport_size({"width": base_width, "height": base_height})
+    if routing_enabled(config):
+        results[0]["network"] = network
+    return results
+
+
+async def probe_dom_hash(
+    url: str,
+    config: Optional[ExtractionConfig] = None,
+    pool: Optional[BrowserPool] = None,
+) -> str:
+    """Load URL like ``extract_dom_tree`` but return only the ``DOM_PROBE_JS`` hash."""
+    config = config or ExtractionConfig()
+    if pool is None:
+        async with BrowserPool() as own_pool:
+            return await probe_dom_hash(url, config, pool=own_pool)
+    async with pool.page(config.viewport_width, config.viewport_height) as page, routing(page, config, url):
+        await _load_page(page, url, config)
+        return await page.evaluate(DOM_PROBE_JS, config.root_selector)
 
 
 def extract_dom_tree_sync(
@@ -19,10 +19,10 @@ from typing import Optional
 from .figma_reader import FigmaAPIClient, FigmaToIR, IRDiffer
 from .design_assets import (
     extract_design_tokens_from_ir,
-    _count_nodes,
-    _has_any_styles,
-    _has_any_text,
+    _tree_stats,
 )
+from .ir_walk import iter_nodes
+from .snapshot import load_json, resolve_snapshot_path
 
 
 def _ok(data: object) -> str:
@@ -111,7 +111,7 @@ class FigmaMcpTools:
             file_key — Figma 檔案 Key（如 'abc123XYZ'）
             node_id  — 節點 ID（如 '1:2'）
 
-        快照位置：{snapshot_dir}/{node_id_safe}/ir.json
+        快照位置：{snapshot_dir}/{node_id_safe}/ir.json（亦接受 ir.json.gz／ir.json.zst）
         （node_id 的 ':' 會被替換為 '_'）
 
         回傳 JSON：
@@ -141,12 +141,12 @@ class FigmaMcpTools:
             snapshot_path = os.path.join(
                 self._snapshot_dir, node_id_safe, "ir.json"
             )
-            if not os.path.exists(snapshot_path):
+            resolved = resolve_snapshot_path(snapshot_path)
+            if resolved is None:
                 return _err(
                     f"快照不存在：{snapshot_path}，請先執行 push 建立快照。"
                 )
-            with open(snapshot_path, "r", encoding="utf-8") as f:
-                before_ir = json.load(f)
+            before_ir = load_json(resolved)
 
             # Diff
             changes = self._differ.diff(before_ir, after_ir)
@@ -228,9 +228,7 @@ class FigmaMcpTools:
                 return _err(f"找不到節點 {node_id}（file_key={file_key}）")
             ir = self._to_ir.convert(document)
 
-            node_count = _count_nodes(ir)
-            has_styles = _has_any_styles(ir)
-            has_text = _has_any_text(ir)
+            node_count, has_styles, has_text = _tree_stats(ir)
             layout_warnings = _count_layout_warnings(ir)
 
             score = min(
@@ -292,7 +290,7 @@ class FigmaMcpTools:
                 if not os.path.isdir(entry_path):
                     continue
                 node_id = entry.replace("_", ":", 1)
-                has_ir = os.path.exists(os.path.join(entry_path, "ir.json"))
+                has_ir = resolve_snapshot_path(os.path.join(entry_path, "ir.json")) is not None
                 has_screenshot = any(
                     f.endswith((".png", ".jpg", ".webp"))
                     for f in os.listdir(entry_path)
@@ -313,10 +311,5 @@ class FigmaMcpTools:
 # ─────────────────────────────────────────────────────────────────────────────
 
 def _count_layout_warnings(node: Optional[dict]) -> int:
-    """遞迴統計 IR 樹中 NO_AUTO_LAYOUT 警告的數量。"""
-    if not node:
-        return 0
-    count = 1 if node.get("_layoutWarning") == "NO_AUTO_LAYOUT" else 0
-    for child in node.get("children", []):
-        count += _count_layout_warnings(child)
-    return count
+    """統計 IR 樹中 NO_AUTO_LAYOUT 警告的數量。"""
+    return sum(1 for n in iter_nodes(node) if n and n.get("_layoutWarning") == "NO_AUTO_LAYOUT")
@@ -9,6 +9,12 @@ from typing import Optional
 
 import requests
 
+from .ir_walk import build_tree, walk
+
+
+def _visible_children(figma_node: dict) -> list:
+    return [c for c in figma_node.get("children", []) if c.get("visible", True)]
+
 
 class FigmaAPIClient:
     """Figma REST API 唯讀封裝."""
@@ -54,6 +60,10 @@ class FigmaToIR:
         self.plugin_namespace = plugin_namespace
 
     def convert(self, figma_node: dict) -> dict:
+        return build_tree(figma_node, self._convert_one, _visible_children)
+
+    def _convert_one(self, figma_node: dict) -> tuple:
+        """轉換單一節點；回傳 (IR 節點, 承接子節點的 list 或 None)，供 ir_walk.build_tree 使用。"""
         node_type = figma_node.get("type", "FRAME")
         name = figma_node.get("name", "Unnamed")
         bbox = figma_node.get("absoluteBoundingBox", {})
@@ -90,11 +100,9 @@ class FigmaToIR:
         if our_data:
             ir_node["pluginData"] = our_data
         if children:
-            ir_node["children"] = [
-                self.convert(c) for c in children
-                if c.get("visible", True)
-            ]
-        return ir_node
+            ir_node["children"] = []
+            return ir_node, ir_node["children"]
+        return ir_node, None
 
     def _normalize_type(self, figma_type: str) -> str:
         type_map = {
@@ -245,11 +253,14 @@ class IRDiffer:
     def _flatten(self, node: dict, result: Optional[dict] = None, path: str = "") -> dict:
         if result is None:
             result = {}
-        name = node.get("figmaName", "?")
-        full_path = f"{path}/{name}" if path else name
-        result[full_path] = node
-        for child in node.get("children", []):
-            self._flatten(child, result, full_path)
+
+        def visit(current: dict, parent_path: str) -> str:
+            name = current.get("figmaName", "?")
+            full_path = f"{parent_path}/{name}" if parent_path else name
+            result[full_path] = current
+            return full_path
+
+        walk(node, visit, path)
         return result
 
     def _diff_node(self, before: dict, after: dict) -> Optional[dict]:
@@ -8,7 +8,7 @@ import json
 import logging
 import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from airis_pdm.figma_console_ws import request_sync
 from .from_figma import figma_node_to_ui_ir, select_figma_canvas
@@ -16,7 +16,7 @@ from .ir_contract import validate_ui_ir
 from .renderers.pixel_react import render_pixel_react_component
 from .renderers.pixel_vue import render_pixel_vue_sfc
 from .ui_ir_to_airis import ui_ir_to_airis_ir
-from airis_pdm.generator import generate_from_ir
+from airis_pdm.generator import generate_from_ir, map_in_pool
 
 log = logging.getLogger(__name__)
 
@@ -218,6 +218,28 @@ def _build_flow_manifest(
     return manifest
 
 
+def _render_flow_page(job: tuple) -> None:
+    """
+    單頁輸出（vue/react 各自寫入 page 目錄；可於 process pool 執行）。
+    job = (node, page_dir_vue | None, page_dir_react | None, fidelity)
+    """
+    node, page_dir_vue, page_dir_react, fidelity = job
+    if fidelity == "pixel":
+        if page_dir_vue:
+            (Path(page_dir_vue) / "Component.vue").write_text(render_pixel_vue_sfc(node), encoding="utf-8")
+        if page_dir_react:
+            p = render_pixel_react_component(node)
+            (Path(page_dir_react) / "Component.tsx").write_text(p["tsx"], encoding="utf-8")
+            (Path(page_dir_react) / "Component.css").write_text(p["css"], encoding="utf-8")
+        return
+    ui = figma_node_to_ui_ir(node)
+    ir = ui_ir_to_airis_ir(validate_ui_ir(ui).fixed)
+    if page_dir_vue:
+        generate_from_ir(ir, target="vue", output_dir=page_dir_vue)
+    if page_dir_react:
+        generate_from_ir(ir, target="react", output_dir=page_dir_react)
+
+
 def run_flow_from_file_json(
     *,
     figma_file_json_path: str,
@@ -225,14 +247,16 @@ def run_flow_from_file_json(
     pattern: str = "[Page]",
     framework: str = "both",
     fidelity: str = "semantic",
+    workers: int = 1,
 ) -> Dict[str, Any]:
-    """以 Figma file JSON（離線）批次輸出 flow。"""
+    """以 Figma file JSON（離線）批次輸出 flow；workers > 1 時以 process pool 平行輸出各頁。"""
     data = json.loads(Path(figma_file_json_path).read_text(encoding="utf-8"))
     canvas = select_figma_canvas(data, page_index=0)
     candidates = [n for n in (canvas.get("children") or []) if str(n.get("name", "")).startswith(pattern)]
 
     out_root = Path(output_dir) / "flow"
     generated: List[Dict[str, Any]] = []
+    jobs: List[tuple] = []
     for node in candidates:
         name = str(node.get("name") or "Page")
         display = _display_name_from_page(name, pattern)
@@ -241,22 +265,14 @@ def run_flow_from_file_json(
         page_dir_react = out_root / "react" / slug
         page_dir_vue.mkdir(parents=True, exist_ok=True)
         page_dir_react.mkdir(parents=True, exist_ok=True)
-
-        if fidelity == "pixel":
-            if framework in ("vue", "both"):
-                (page_dir_vue / "Component.vue").write_text(render_pixel_vue_sfc(node), encoding="utf-8")
-            if framework in ("react", "both"):
-                p = render_pixel_react_component(node)
-                (page_dir_react / "Component.tsx").write_text(p["tsx"], encoding="utf-8")
-                (page_dir_react / "Component.css").write_text(p["css"], encoding="utf-8")
-        else:
-            ui = figma_node_to_ui_ir(node)
-            ir = ui_ir_to_airis_ir(validate_ui_ir(ui).fixed)
-            if framework in ("vue", "both"):
-                generate_from_ir(ir, target="vue", output_dir=str(page_dir_vue))
-            if framework in ("react", "both"):
-                generate_from_ir(ir, target="react", output_dir=str(page_dir_react))
-
+        jobs.append(
+            (
+                node,
+                str(page_dir_vue) if framework in ("vue", "both") else None,
+                str(page_dir_react) if framework in ("react", "both") else None,
+                fidelity,
+            )
+        )
         generated.append(
             {
                 "nodeId": str(node.get("id") or ""),
@@ -267,6 +283,7 @@ def run_flow_from_file_json(
                 "collisions": 0,
             }
         )
+    map_in_pool(_render_flow_page, jobs, workers)
 
     manifest = _build_flow_manifest(
         pattern=pattern,
@@ -298,8 +315,13 @@ def run_flow_via_console(
     rpc_retry_backoff_max_s: float = 2.0,
     trace_id: str | None = None,
     verbose: bool = False,
+    workers: int = 1,
 ) -> Dict[str, Any]:
-    """以 figma-console live RPC 批次輸出 flow（對齊舊 TS runFlow）。"""
+    """
+    以 figma-console live RPC 批次輸出 flow（對齊舊 TS runFlow）。
+    getNode 依序拉取；workers <= 1 時每頁拉取後立即轉碼（不暫存節點），
+    workers > 1 時全部拉取後各頁轉碼以 process pool 平行執行。
+    """
     started = time.perf_counter()
     include = include or []
     exclude = exclude or []
@@ -331,6 +353,7 @@ def run_flow_via_console(
 
     out_root = Path(output_dir) / "flow"
     generated: List[Dict[str, Any]] = []
+    jobs: List[tuple] = []
     for n in prepared:
         node_id = str(n["id"])
         node = request_sync(
@@ -348,26 +371,24 @@ def run_flow_via_console(
         if not node:
             continue
         slug = str(n["slug"])
+        page_dir_vue: Optional[Path] = None
+        page_dir_react: Optional[Path] = None
         if framework in ("vue", "both"):
             page_dir_vue = out_root / "vue" / slug
             page_dir_vue.mkdir(parents=True, exist_ok=True)
-            if fidelity == "pixel":
-                (page_dir_vue / "Component.vue").write_text(render_pixel_vue_sfc(node), encoding="utf-8")
-            else:
-                ui = figma_node_to_ui_ir(node)
-                ir = ui_ir_to_airis_ir(validate_ui_ir(ui).fixed)
-                generate_from_ir(ir, target="vue", output_dir=str(page_dir_vue))
         if framework in ("react", "both"):
             page_dir_react = out_root / "react" / slug
             page_dir_react.mkdir(parents=True, exist_ok=True)
-            if fidelity == "pixel":
-                p = render_pixel_react_component(node)
-                (page_dir_react / "Component.tsx").write_text(p["tsx"], encoding="utf-8")
-                (page_dir_react / "Component.css").write_text(p["css"], encoding="utf-8")
-            else:
-                ui = figma_node_to_ui_ir(node)
-                ir = ui_ir_to_airis_ir(validate_ui_ir(ui).fixed)
-                generate_from_ir(ir, target="react", output_dir=str(page_dir_react))
+        job = (
+            node,
+            str(page_dir_vue) if page_dir_vue else None,
+            str(page_dir_react) if page_dir_react else None,
+            fidelity,
+        )
+        if workers > 1:
+            jobs.append(job)
+        else:
+            _render_flow_page(job)
         generated.append(
             {
                 "nodeId": node_id,
@@ -378,6 +399,7 @@ def run_flow_via_console(
                 "collisions": n["collisions"],
             }
         )
+    map_in_pool(_render_flow_page, jobs, workers)
 
     _write_flow_router_files(out_root, framework, generated)
     manifest = _build_flow_manifest(
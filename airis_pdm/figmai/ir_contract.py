@@ -4,10 +4,11 @@ IR contract 驗證與 auto-fix（Python 版）。
 
 from __future__ import annotations
 
-from copy import deepcopy
 from dataclasses import dataclass
 from typing import Any, Dict, List
 
+from airis_pdm.ir_walk import copy_tree, walk
+
 
 @dataclass
 class IRValidationResult:
@@ -21,7 +22,7 @@ def validate_ui_ir(root: Dict[str, Any] | None) -> IRValidationResult:
     驗證 UiIR 根節點並做最小必要 auto-fix。
     """
     errors: List[str] = []
-    fixed = deepcopy(root) if isinstance(root, dict) else {}
+    fixed = copy_tree(root) if isinstance(root, dict) else {}
 
     if not fixed:
         errors.append("IR root 必須存在")
@@ -33,7 +34,7 @@ def validate_ui_ir(root: Dict[str, Any] | None) -> IRValidationResult:
             "children": [],
         }
 
-    def visit(node: Dict[str, Any], is_root: bool) -> None:
+    def visit(node: Dict[str, Any], is_root: bool) -> bool:
         name = node.get("name")
         if not isinstance(name, str) or not name.strip():
             errors.append("IR node 缺少 name")
@@ -79,9 +80,8 @@ def validate_ui_ir(root: Dict[str, Any] | None) -> IRValidationResult:
                 errors.append(f"IR TEXT node {node.get('name','?')} text.characters 非字串")
                 text["characters"] = str(text.get("characters") or "")
 
-        for child in children:
-            if isinstance(child, dict):
-                visit(child, False)
+        # 子節點皆非根
+        return False
 
-    visit(fixed, True)
+    walk(fixed, visit, True, children=lambda node: [c for c in node["children"] if isinstance(c, dict)])
     return IRValidationResult(valid=len(errors) == 0, errors=errors, fixed=fixed)
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from typing import Any, Dict, Iterable, List
 
+from airis_pdm.ir_walk import iter_nodes
+
 
 def walk_ui_ir(node: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
-    yield node
-    for child in node.get("children") or []:
-        yield from walk_ui_ir(child)
+    return iter_nodes(node)
 
 
 def parse_variant_kv(name: str) -> Dict[str, str]:
@@ -9,9 +9,15 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from airis_pdm.ir_walk import build_tree
+
 
 def airis_ir_to_ui_ir(airis_node: dict) -> dict:
     """將 FigmaToIR／codegen 子樹轉成 UiIR 節點（多帶一份扁平 style）。"""
+    return build_tree(airis_node, _airis_node_to_ui)
+
+
+def _airis_node_to_ui(airis_node: dict) -> tuple:
     from airis_pdm.generator import _style_dict
 
     layout = airis_node.get("layout") or {}
@@ -36,7 +42,7 @@ def airis_ir_to_ui_ir(airis_node: dict) -> dict:
         "type": str(figma_type).lower(),
         "style": style_flat,
         "layout": layout,
-        "children": [airis_ir_to_ui_ir(c) for c in airis_node.get("children") or []],
+        "children": [],
     }
 
     if airis_node.get("styles") is not None:
@@ -55,16 +61,20 @@ def airis_ir_to_ui_ir(airis_node: dict) -> dict:
     if airis_node.get("_layoutWarning"):
         ui["_layoutWarning"] = airis_node["_layoutWarning"]
 
-    return ui
+    return ui, ui["children"]
 
 
 def ui_ir_to_airis_ir(ui_node: dict) -> dict:
     """將 UiIR 節點還原為 generate_from_ir 可用的 IR 子樹。"""
+    return build_tree(ui_node, _ui_node_to_airis)
+
+
+def _ui_node_to_airis(ui_node: dict) -> tuple:
     out: Dict[str, Any] = {
         "figmaName": ui_node.get("name", "Unnamed"),
         "figmaType": ui_node.get("sourceType", "FRAME"),
         "layout": ui_node.get("layout") or {},
-        "children": [ui_ir_to_airis_ir(c) for c in ui_node.get("children") or []],
+        "children": [],
     }
 
     styles = ui_node.get("styles")
@@ -87,7 +97,7 @@ def ui_ir_to_airis_ir(ui_node: dict) -> dict:
     if ui_node.get("_layoutWarning"):
         out["_layoutWarning"] = ui_node["_layoutWarning"]
 
-    return out
+    return out, out["children"]
 
 
 def ui_ir_roots_to_airis_pages(ui_roots: List[dict]) -> Dict[str, Any]:
@@ -6,13 +6,30 @@ Uses Figma layer name rules: Component/Variant.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import errno
+import hashlib
+import io
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Dict, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple, Union, TYPE_CHECKING
 
 from .figma_reader import FigmaAPIClient, FigmaToIR
+from .ir_walk import emit_tree, visit_all
+from .token_export import _collect_tokens_from_node, _empty_tokens, _finalize_tokens
 
 if TYPE_CHECKING:
+    from .codegen_cache import RenderCache
     from .theme_manager import ThemeManager
 
 
@@ -45,11 +62,13 @@ _CSS_PROP_ORDER = [
 ]
 
 
+# Precomputed rank per property; unknown properties sort after all known ones.
+_CSS_PROP_RANK: Dict[str, int] = {prop: i for i, prop in enumerate(_CSS_PROP_ORDER)}
+_CSS_PROP_UNRANKED = len(_CSS_PROP_ORDER)
+
+
 def _css_prop_sort_key(prop: str) -> tuple[int, str]:
-    try:
-        return (_CSS_PROP_ORDER.index(prop), prop)
-    except ValueError:
-        return (len(_CSS_PROP_ORDER), prop)
+    return (_CSS_PROP_RANK.get(prop, _CSS_PROP_UNRANKED), prop)
 
 
 @dataclass
@@ -58,47 +77,96 @@ class ComponentSpec:
     variants: Dict[str, dict]
 
 
+def _declaration_key(styles: Dict[str, str]) -> tuple:
+    """Content key of a declaration set; equal keys render to identical CSS bodies."""
+    return tuple(sorted(styles.items()))
+
+
+def _rule_css(selector: str, styles: Dict[str, str]) -> str:
+    body = "\n".join(
+        f"  {prop}: {styles[prop]};"
+        for prop in sorted(styles.keys(), key=_css_prop_sort_key)
+    )
+    return f"{selector} {{\n{body}\n}}"
+
+
 @dataclass
 class StyleSheet:
     prefix: str
     counter: int = 0
     rules: Dict[str, Dict[str, str]] = None
     theme_manager: Optional["ThemeManager"] = None
+    # dedupe=True: nodes with identical declarations share one class
+    dedupe: bool = False
+    _by_declarations: Dict[tuple, str] = field(default_factory=dict, repr=False, compare=False)
+    # class name -> serialized rule, built once when the rule is added (empty rules omitted)
+    _blocks: Dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    # to_css() output; reset whenever a rule is added
+    _css: Optional[str] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.rules is None:
             self.rules = {}
+        for class_name, styles in self.rules.items():
+            if styles:
+                self._blocks[class_name] = _rule_css(f".{class_name}", styles)
 
     def add_node(self, node: dict) -> str:
+        return self.add_rule(_kebab(node.get("figmaName", "node")), _style_dict(node, self.theme_manager))
+
+    def add_rule(self, base: str, styles: Dict[str, str]) -> str:
+        """Register ``styles`` under a new ``{prefix}-{base}-{n}`` class (or the shared one when deduping)."""
+        if self.dedupe:
+            key = _declaration_key(styles)
+            shared = self._by_declarations.get(key)
+            if shared is not None:
+                return shared
         self.counter += 1
-        base = _kebab(node.get("figmaName", "node"))
         class_name = f"{self.prefix}-{base}-{self.counter}"
-        self.rules[class_name] = _style_dict(node, self.theme_manager)
+        self.rules[class_name] = styles
+        if styles:
+            self._blocks[class_name] = _rule_css(f".{class_name}", styles)
+        self._css = None
+        if self.dedupe:
+            self._by_declarations[key] = class_name
         return class_name
 
     def to_css(self) -> str:
-        blocks = []
-        for class_name in sorted(self.rules.keys()):
-            styles = self.rules[class_name]
-            if not styles:
-                continue
-            body = "\n".join(
-                f"  {prop}: {styles[prop]};"
-                for prop in sorted(styles.keys(), key=_css_prop_sort_key)
-            )
-            blocks.append(f".{class_name} {{\n{body}\n}}")
-        return "\n\n".join(blocks) + "\n" if blocks else ""
+        """Rules sorted by class name; rendered once until the next ``add_node``."""
+        if self._css is None:
+            blocks = [self._blocks[class_name] for class_name in sorted(self._blocks)]
+            self._css = "\n\n".join(blocks) + "\n" if blocks else ""
+        return self._css
 
 
 @dataclass
 class StyleBundle:
     sheets: list
+    # dedupe=True: rules with identical declarations across sheets are hoisted
+    # into one grouped selector block (`.a-card-1, .b-card-3 { ... }`).
+    dedupe: bool = False
 
     def add(self, sheet: StyleSheet) -> None:
         self.sheets.append(sheet)
 
+    def _hoisted_css(self) -> str:
+        # declaration key -> (ordered selectors, declarations); first occurrence fixes position
+        groups: Dict[tuple, tuple[Dict[str, None], Dict[str, str]]] = {}
+        for sheet in self.sheets:
+            for class_name in sorted(sheet.rules.keys()):
+                styles = sheet.rules[class_name]
+                if not styles:
+                    continue
+                selectors, _ = groups.setdefault(_declaration_key(styles), ({}, styles))
+                selectors[f".{class_name}"] = None
+        blocks = [_rule_css(", ".join(selectors), styles) for selectors, styles in groups.values()]
+        return "\n\n".join(blocks) + "\n" if blocks else ""
+
     def to_css(self) -> str:
-        return "\n".join(sheet.to_css() for sheet in self.sheets if sheet.to_css())
+        if self.dedupe:
+            return self._hoisted_css()
+        # Each sheet caches its own output, so repeated calls do not re-render.
+        return "\n".join(css for css in (sheet.to_css() for sheet in self.sheets) if css)
 
 
 def _sanitize_name(name: str) -> str:
@@ -149,7 +217,8 @@ def select_pages(document: dict, page_name: Optional[str], page_index: Optional[
     return [pages[0]]
 
 
-def _collect_components(node: dict, components: Dict[str, ComponentSpec]) -> None:
+def _collect_component_node(node: dict, components: Dict[str, ComponentSpec]) -> None:
+    """Per-node step of ``_collect_components`` (an ``ir_walk.visit_all`` visitor)."""
     if not node:
         return
     figma_type = node.get("figmaType")
@@ -165,8 +234,9 @@ def _collect_components(node: dict, components: Dict[str, ComponentSpec]) -> Non
         if variant not in spec.variants:
             spec.variants[variant] = node
 
-    for child in node.get("children", []):
-        _collect_components(child, components)
+
+def _collect_components(node: dict, components: Dict[str, ComponentSpec]) -> None:
+    visit_all(node, [partial(_collect_component_node, components=components)])
 
 
 def _css_align(value: str, axis: str) -> str:
@@ -198,7 +268,86 @@ def _css_font_weight(value) -> str:
     return _FONT_WEIGHT_MAP.get(s, "400")
 
 
+# Bounded LRU memo for ``_style_dict``, shared by every caller (StyleSheet,
+# the Flutter shell, the render cache recorder and the UiIR style map).
+_STYLE_MEMO_MAX = 16384
+_style_memo: "OrderedDict[tuple, Dict[str, str]]" = OrderedDict()
+_style_memo_stats = {"hits": 0, "misses": 0}
+_NA = object()  # distinguishes an absent field from an explicit None
+
+
+def _style_key(node: dict, theme_manager: Optional["ThemeManager"]) -> tuple:
+    """Flat fingerprint of exactly the fields ``_compute_style_dict`` reads.
+
+    Keep in sync with ``_compute_style_dict``. Values that are formatted
+    verbatim (opacity, letterSpacing, shadow) go through ``repr`` so that
+    ``1`` and ``1.0`` do not share an entry; everything else is passed
+    through ``int()`` or a theme lookup, where equal numbers render alike.
+    Text content is not part of the key.
+    """
+    layout = node.get("layout", {})
+    s = node.get("styles", {}) or {}
+    br = s.get("borderRadius")
+    bd = s.get("border")
+    sh = s.get("shadow")
+    al = node.get("autoLayout")
+    t = node.get("text")
+    return (
+        # 以內容指紋而非實例為鍵：每次 generate_from_ir 的新 ThemeManager 仍可命中，memo 也不會留住舊實例
+        theme_manager.fingerprint() if theme_manager is not None else None,
+        layout.get("width"),
+        layout.get("height"),
+        s.get("backgroundColor"),
+        repr(s.get("opacity")),
+        (br.get("topLeft", _NA), br.get("topRight", _NA), br.get("bottomRight", _NA), br.get("bottomLeft", _NA))
+        if br else None,
+        (bd.get("width", _NA), bd.get("color", _NA), bd.get("style")) if bd else None,
+        repr(sh[0]) if sh else None,
+        (
+            al.get("direction"), al.get("spacing", _NA),
+            al.get("paddingTop", _NA), al.get("paddingRight", _NA),
+            al.get("paddingBottom", _NA), al.get("paddingLeft", _NA),
+            al.get("primaryAlign", _NA), al.get("counterAlign", _NA),
+        )
+        if al else None,
+        (
+            t.get("fontSize", _NA), t.get("fontFamily", _NA), t.get("fontWeight", _NA),
+            t.get("lineHeight"), repr(t.get("letterSpacing", _NA)), t.get("textAlign", _NA),
+            t.get("color", _NA),
+        )
+        if t else None,
+    )
+
+
 def _style_dict(node: dict, theme_manager: Optional["ThemeManager"] = None) -> Dict[str, str]:
+    """CSS declarations for ``node``, memoized per style fingerprint and theme.
+
+    Returns a fresh dict on every call. Nodes whose style fields cannot be
+    fingerprinted (unhashable values, malformed shapes) are computed directly.
+    """
+    try:
+        key = _style_key(node, theme_manager)
+        cached = _style_memo.get(key)
+    except Exception:
+        return _compute_style_dict(node, theme_manager)
+    if cached is not None:
+        _style_memo.move_to_end(key)
+        _style_memo_stats["hits"] += 1
+        return dict(cached)
+    styles = _compute_style_dict(node, theme_manager)
+    _style_memo_stats["misses"] += 1
+    _style_memo[key] = dict(styles)
+    if len(_style_memo) > _STYLE_MEMO_MAX:
+        _style_memo.popitem(last=False)
+    return styles
+
+
+def _clear_style_memo() -> None:
+    _style_memo.clear()
+    _style_memo_stats.update(hits=0, misses=0)
+
+
+def _compute_style_dict(node: dict, theme_manager: Optional["ThemeManager"] = None) -> Dict[str, str]:
     styles: Dict[str, str] = {"box-sizing": "border-box"}
     layout = node.get("layout", {})
     width = layout.get("width")
@@ -257,7 +406,47 @@ def _style_dict(node: dict, theme_manager: Optional["ThemeManager"] = None) -> D
     return styles
 
 
-def _render_html(node: dict, sheet: StyleSheet, indent: int = 0) -> str:
+# A node's "shell" is its markup around its children: either a leaf string, or
+# (open, separator, close, child indent, children). ``ir_walk.emit_tree`` writes
+# each piece to the sink once, so output size and tree depth no longer multiply
+# (no nested joins, no recursion limit).
+_Shell = Union[str, Tuple[str, str, str, int, list]]
+_ShellFn = Callable[[dict, Any, int], _Shell]
+# Anything with ``write(str)`` (an ``io.TextIOBase``, a file, ``io.StringIO``)
+# or a bare ``write`` callable.
+_Sink = Union[TextIO, Callable[[str], Any]]
+
+
+def _sink_write(out: _Sink) -> Callable[[str], Any]:
+    return out.write if hasattr(out, "write") else out
+
+
+def _emit_tree(
+    target: str,
+    extra: tuple,
+    shell_fn: _ShellFn,
+    node: dict,
+    sheet: Any,
+    indent: int,
+    out: _Sink,
+    cache: Optional["RenderCache"] = None,
+) -> None:
+    """Write the markup of ``node`` to ``out`` in document order.
+
+    Class names are allocated in the same pre-order as the string renderers.
+    With ``cache``, subtrees it can template are replayed from it instead.
+    """
+    replay = cache.replayer(target, extra, shell_fn, sheet) if cache is not None else None
+    emit_tree(node, lambda n, n_indent: shell_fn(n, sheet, n_indent), _sink_write(out), indent, replay)
+
+
+def _render_to_string(emit: Callable[[io.StringIO], None]) -> str:
+    buf = io.StringIO()
+    emit(buf)
+    return buf.getvalue()
+
+
+def _html_shell(node: dict, sheet: StyleSheet, indent: int) -> _Shell:
     pad = "  " * indent
     tag = "div"
     class_name = sheet.add_node(node)
@@ -279,11 +468,20 @@ def _render_html(node: dict, sheet: StyleSheet, indent: int = 0) -> str:
     children = node.get("children", []) or []
     if not children:
         return f"{pad}<{tag} {attrs}></{tag}>"
-    inner = "\n".join(_render_html(child, sheet, indent + 1) for child in children)
-    return f"{pad}<{tag} {attrs}>\n{inner}\n{pad}</{tag}>"
+    return (f"{pad}<{tag} {attrs}>\n", "\n", f"\n{pad}</{tag}>", indent + 1, children)
+
 
+def _emit_html(
+    node: dict, sheet: StyleSheet, out: _Sink, indent: int = 0, cache: Optional["RenderCache"] = None
+) -> None:
+    _emit_tree("html", (), _html_shell, node, sheet, indent, out, cache)
 
-def _render_vue(node: dict, sheet: StyleSheet, indent: int = 0) -> str:
+
+def _render_html(node: dict, sheet: StyleSheet, indent: int = 0, cache: Optional["RenderCache"] = None) -> str:
+    return _render_to_string(lambda buf: _emit_html(node, sheet, buf, indent, cache))
+
+
+def _vue_shell(node: dict, sheet: StyleSheet, indent: int) -> _Shell:
     pad = "  " * indent
     tag = "div"
     if node.get("figmaType") == "TEXT":
@@ -295,11 +493,20 @@ def _render_vue(node: dict, sheet: StyleSheet, indent: int = 0) -> str:
     children = node.get("children", []) or []
     if not children:
         return f"{pad}<{tag} class=\"{class_name}\"></{tag}>"
-    inner = "\n".join(_render_vue(child, sheet, indent + 1) for child in children)
-    return f"{pad}<{tag} class=\"{class_name}\">\n{inner}\n{pad}</{tag}>"
+    return (f"{pad}<{tag} class=\"{class_name}\">\n", "\n", f"\n{pad}</{tag}>", indent + 1, children)
+
+
+def _emit_vue(
+    node: dict, sheet: StyleSheet, out: _Sink, indent: int = 0, cache: Optional["RenderCache"] = None
+) -> None:
+    _emit_tree("vue", (), _vue_shell, node, sheet, indent, out, cache)
+
+
+def _render_vue(node: dict, sheet: StyleSheet, indent: int = 0, cache: Optional["RenderCache"] = None) -> str:
+    return _render_to_string(lambda buf: _emit_vue(node, sheet, buf, indent, cache))
 
 
-def _render_react(node: dict, sheet: StyleSheet, indent: int = 0, css_module: bool = False) -> str:
+def _react_shell(node: dict, sheet: StyleSheet, indent: int, css_module: bool) -> _Shell:
     pad = "  " * indent
     tag = "div"
     if node.get("figmaType") == "TEXT":
@@ -315,10 +522,39 @@ def _render_react(node: dict, sheet: StyleSheet, indent: int = 0, css_module: bo
         if css_module:
             return f"{pad}<{tag} className={{styles['{class_name}']}}></{tag}>"
         return f"{pad}<{tag} className=\"{class_name}\"></{tag}>"
-    inner = "\n".join(_render_react(child, sheet, indent + 1, css_module) for child in children)
     if css_module:
-        return f"{pad}<{tag} className={{styles['{class_name}']}}>\n{inner}\n{pad}</{tag}>"
-    return f"{pad}<{tag} className=\"{class_name}\">\n{inner}\n{pad}</{tag}>"
+        return (f"{pad}<{tag} className={{styles['{class_name}']}}>\n", "\n", f"\n{pad}</{tag}>", indent + 1, children)
+    return (f"{pad}<{tag} className=\"{class_name}\">\n", "\n", f"\n{pad}</{tag}>", indent + 1, children)
+
+
+def _react_module_shell(node: dict, sheet: StyleSheet, indent: int) -> _Shell:
+    return _react_shell(node, sheet, indent, True)
+
+
+def _react_plain_shell(node: dict, sheet: StyleSheet, indent: int) -> _Shell:
+    return _react_shell(node, sheet, indent, False)
+
+
+def _emit_react(
+    node: dict,
+    sheet: StyleSheet,
+    out: _Sink,
+    indent: int = 0,
+    css_module: bool = False,
+    cache: Optional["RenderCache"] = None,
+) -> None:
+    shell_fn = _react_module_shell if css_module else _react_plain_shell
+    _emit_tree("react", (css_module,), shell_fn, node, sheet, indent, out, cache)
+
+
+def _render_react(
+    node: dict,
+    sheet: StyleSheet,
+    indent: int = 0,
+    css_module: bool = False,
+    cache: Optional["RenderCache"] = None,
+) -> str:
+    return _render_to_string(lambda buf: _emit_react(node, sheet, buf, indent, css_module, cache))
 
 
 def _flutter_color(color: str) -> str:
@@ -335,7 +571,7 @@ def _flutter_color(color: str) -> str:
     return "Color(0xff000000)"
 
 
-def _render_flutter(node: dict, indent: int = 0) -> str:
+def _flutter_shell(node: dict, _sheet: Any, indent: int) -> _Shell:
     pad = "  " * indent
     if node.get("figmaType") == "TEXT":
         text = node.get("text", {})
@@ -356,18 +592,6 @@ def _render_flutter(node: dict, indent: int = 0) -> str:
     bg = styles.get("background-color")
     br = styles.get("border-radius")
 
-    children = node.get("children", []) or []
-    child_str = ""
-    if children:
-        rendered_children = ",\n".join(_render_flutter(child, indent + 2) for child in children)
-        axis = "Axis.horizontal" if node.get("autoLayout", {}).get("direction") == "HORIZONTAL" else "Axis.vertical"
-        child_str = (
-            f"{pad}  child: Flex(\n"
-            f"{pad}    direction: {axis},\n"
-            f"{pad}    children: [\n{rendered_children}\n{pad}    ],\n"
-            f"{pad}  ),\n"
-        )
-
     decoration = []
     if bg:
         decoration.append(f"color: {_flutter_color(bg)}")
@@ -384,28 +608,59 @@ def _render_flutter(node: dict, indent: int = 0) -> str:
     width_str = f"width: {width.replace('px','')}," if width else ""
     height_str = f"height: {height.replace('px','')}," if height else ""
 
-    return (
+    head = (
         f"{pad}Container(\n"
         f"{pad}  {width_str}\n"
         f"{pad}  {height_str}\n"
         f"{pad}  {decoration_str}\n"
-        f"{child_str}"
+    )
+    children = node.get("children", []) or []
+    if not children:
+        return f"{head}{pad})"
+    axis = "Axis.horizontal" if node.get("autoLayout", {}).get("direction") == "HORIZONTAL" else "Axis.vertical"
+    open_ = (
+        f"{head}"
+        f"{pad}  child: Flex(\n"
+        f"{pad}    direction: {axis},\n"
+        f"{pad}    children: [\n"
+    )
+    close = (
+        f"\n{pad}    ],\n"
+        f"{pad}  ),\n"
         f"{pad})"
     )
+    return (open_, ",\n", close, indent + 2, children)
+
+
+def _emit_flutter(node: dict, out: _Sink, indent: int = 0, cache: Optional["RenderCache"] = None) -> None:
+    _emit_tree("flutter", (), _flutter_shell, node, None, indent, out, cache)
+
+
+def _render_flutter(node: dict, indent: int = 0, cache: Optional["RenderCache"] = None) -> str:
+    return _render_to_string(lambda buf: _emit_flutter(node, buf, indent, cache))
 
 
 def _write(path: Path, content: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    # newline="": bytes on disk match the sha256/size in the manifest on every platform
+    path.write_text(content, encoding="utf-8", newline="")
 
 
-def _build_html_page(title: str, body: str, css_path: str) -> str:
-    return (
+def _html_page_parts(title: str, css_path: str) -> tuple[str, str]:
+    """The document around the body of ``_build_html_page``."""
+    head = (
         "<!doctype html>\n"
         "<html>\n<head>\n  <meta charset=\"utf-8\">\n  <title>" + title + "</title>\n"
         f"  <link rel=\"stylesheet\" href=\"{css_path}\">\n"
-        "</head>\n<body>\n" + body + "\n</body>\n</html>\n"
+        "</head>\n<body>\n"
     )
+    return head, "\n</body>\n</html>\n"
+
+
+def _build_html_page(title: str, body: str, css_path: str) -> str:
+    head, tail = _html_page_parts(title, css_path)
+    return head + body + tail
+
 
 def _visually_hidden_css() -> str:
     return (
@@ -423,20 +678,24 @@ def _visually_hidden_css() -> str:
     )
 
 
+_APP_CSS_TARGETS = ("html", "react", "vue")
+
+
 def _write_app_css(
     base: Path,
     content: str,
     include_utility_css: bool,
     theme_manager: Optional["ThemeManager"] = None,
+    write: Callable[[Path, str], None] = _write,
 ) -> None:
     if theme_manager:
         content = theme_manager.to_css_root() + "\n\n" + content
     if include_utility_css:
         app_css = "@import './utility.css';\n\n" + content
-        _write(base / "styles" / "utility.css", _visually_hidden_css())
+        write(base / "styles" / "utility.css", _visually_hidden_css())
     else:
         app_css = content
-    _write(base / "styles" / "app.css", app_css)
+    write(base / "styles" / "app.css", app_css)
 
 
 def generate_project(
@@ -516,6 +775,9 @@ def generate_from_ir(
     page_name: Optional[str] = None,
     with_utility_css: bool = False,
     use_design_tokens: bool = False,
+    dedupe_styles: bool = False,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
 ) -> dict:
     """Generate frontend code from IR data (no Figma API needed).
 
@@ -532,15 +794,28 @@ def generate_from_ir(
         with_utility_css: Include utility CSS.
         use_design_tokens: If True, extract design tokens from IR and output
                            :root CSS variables; generated CSS uses var(--token-*).
+        dedupe_styles: If True, nodes with identical declarations share one
+                       class per sheet, and rules repeated across pages are
+                       emitted once in app.css as grouped selectors.
+        workers: Render pages of a multi-page IR in a process pool of this
+                 size. Files and stylesheets are merged in page order, so the
+                 output is identical to ``workers=1``.
+        cache_dir: Keep rendered subtree templates in this directory (see
+                   ``codegen_cache``); unchanged subtrees are replayed instead
+                   of re-rendered on the next run. Output is unaffected.
 
     Returns:
-        dict with 'files' (list of relative paths written) and 'target'.
+        dict with 'files' (relative paths created by this run), 'changed'
+        (relative paths whose content was rewritten) and 'target'. Files
+        whose content is unchanged since the last run are not touched; see
+        ``_ManifestWriter``.
     """
+    from .codegen_cache import RenderCache
     from .theme_manager import ThemeManager
 
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
-    files_before = set(_list_files(output_path))
+    writer = _ManifestWriter(output_path)
 
     pages: list[tuple[str, dict]] = []
 
@@ -553,40 +828,342 @@ def generate_from_ir(
         name = page_name or ir_data.get("figmaName") or ir_data.get("name") or "Page"
         pages.append((name, ir_data))
 
+    # One IR pass per page collects its components; on the first page the
+    # same pass also gathers design tokens.
+    page_components: List[Dict[str, ComponentSpec]] = []
+    tokens = _empty_tokens() if use_design_tokens and pages else None
+    for i, (_, ir_page) in enumerate(pages):
+        components: Dict[str, ComponentSpec] = {}
+        visitors = [partial(_collect_component_node, components=components)]
+        if i == 0 and tokens is not None:
+            visitors.append(partial(_collect_tokens_from_node, out=tokens))
+        visit_all(ir_page, visitors)
+        page_components.append(components)
+
     theme_manager: Optional["ThemeManager"] = None
-    if use_design_tokens and pages:
+    if tokens is not None:
         theme_manager = ThemeManager()
-        theme_manager.load_from_ir({"tree": pages[0][1]})
-
-    bundle = StyleBundle(sheets=[])
-    for i, (pg_name, ir_page) in enumerate(pages):
-        components: Dict[str, ComponentSpec] = {}
-        _collect_components(ir_page, components)
-        _generate_target(
+        theme_manager.load_tokens(_finalize_tokens(tokens))
+
+    # Shared across pages; app.css is written once after the loop instead of
+    # being re-rendered and rewritten by every page.
+    bundle = StyleBundle(sheets=[], dedupe=dedupe_styles)
+    cache = RenderCache(cache_dir) if cache_dir else None
+    jobs = [
+        _PageJob(
             target=target,
             output_dir=output_dir,
             page_name=pg_name,
             ir_page=ir_page,
-            components=components,
+            components=page_components[i],
             include_utility_css=with_utility_css,
             theme_manager=theme_manager,
             is_first=(i == 0),
-            bundle=bundle,
+            dedupe_styles=dedupe_styles,
+            cache=cache,
         )
+        for i, (pg_name, ir_page) in enumerate(pages)
+    ]
+    for writes, sheets, cache_usage in map_in_pool(_render_page_job, jobs, workers):
+        writer.adopt(writes)
+        for sheet in sheets:
+            bundle.add(sheet)
+        if cache is not None:
+            cache.merge(*cache_usage)
+    if cache is not None:
+        cache.save()
+    if pages and target.lower() in _APP_CSS_TARGETS:
+        _write_app_css(output_path, bundle.to_css(), with_utility_css, theme_manager, write=writer.write)
 
-    files_after = set(_list_files(output_path))
-    new_files = sorted(str(f.relative_to(output_path)) for f in files_after - files_before)
+    new_files, changed_files = writer.flush()
 
     return {
         "files": new_files,
+        "changed": changed_files,
         "target": target,
         "output_dir": output_dir,
     }
 
 
-def _list_files(directory: Path) -> list:
-    """Recursively list all files under directory."""
-    return [p for p in directory.rglob("*") if p.is_file()]
+def map_in_pool(fn: Callable, items: list, workers: int = 1) -> list:
+    """``[fn(x) for x in items]``, run in a process pool when ``workers > 1``.
+
+    Results keep the order of ``items``; ``fn`` and the items must be picklable.
+    """
+    if workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ProcessPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+@dataclass
+class _PageJob:
+    target: str
+    output_dir: str
+    page_name: str
+    ir_page: dict
+    # Holds nodes of ir_page; pickled together with it, so identity survives.
+    components: Dict[str, ComponentSpec]
+    include_utility_css: bool
+    theme_manager: Optional["ThemeManager"] = None
+    is_first: bool = True
+    dedupe_styles: bool = False
+    cache: Optional["RenderCache"] = None
+
+
+def _render_page_job(job: _PageJob) -> tuple[List[tuple[Path, _Content]], list, tuple]:
+    """Render one page without touching its output files.
+
+    Returns (pending writes, sheets, ``RenderCache.usage()`` for this page);
+    streamed files are staged in the system temp directory, see ``_StagedFile``.
+    """
+    out = _CollectingOutput(Path(job.output_dir))
+    bundle = StyleBundle(sheets=[], dedupe=job.dedupe_styles)
+    _generate_target(
+        target=job.target,
+        output_dir=job.output_dir,
+        page_name=job.page_name,
+        ir_page=job.ir_page,
+        components=job.components,
+        include_utility_css=job.include_utility_css,
+        theme_manager=job.theme_manager,
+        is_first=job.is_first,
+        bundle=bundle,
+        dedupe_styles=job.dedupe_styles,
+        out=out,
+        cache=job.cache,
+    )
+    return out.writes, bundle.sheets, (job.cache.usage() if job.cache is not None else ({}, []))
+
+
+MANIFEST_FILENAME = ".aipdm-manifest.json"
+_staging_ids = itertools.count()
+
+
+def _staging_path(directory: Path, name: str) -> Path:
+    # Unique across pool workers and concurrent runs; opened with "x" so the umask applies.
+    return directory / f".{name}-{os.getpid()}-{next(_staging_ids)}-{uuid.uuid4().hex[:8]}.tmp"
+
+
+def _move_into_place(tmp: Path, path: Path) -> None:
+    """Atomically replace ``path`` with ``tmp``.
+
+    Streamed files are staged in the system temp directory, outside the
+    watched project tree. When that is on another filesystem the file is
+    copied next to ``path`` first so the final step is still a rename.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(tmp, path)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    local = _staging_path(path.parent, path.name)
+    try:
+        with tmp.open("rb") as src, local.open("xb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(local, path)
+    except BaseException:
+        try:
+            local.unlink()
+        except OSError:
+            pass
+        raise
+    tmp.unlink()
+
+
+@dataclass
+class _StagedFile:
+    """A generated file already streamed to ``tmp``, with its sha256 and size."""
+
+    tmp: Path
+    digest: str
+    size: int
+
+    def discard(self) -> None:
+        try:
+            self.tmp.unlink()
+        except OSError:
+            pass
+
+
+_Content = Union[str, _StagedFile]
+
+
+class _StagingSink(io.TextIOBase):
+    """Text sink that streams to a staging file while hashing what it writes.
+
+    The file lives in the system temp directory, so unchanged pages never
+    create or delete anything inside the output tree.
+    """
+
+    def __init__(self) -> None:
+        self.tmp = _staging_path(Path(tempfile.gettempdir()), "aipdm-staging")
+        self._file = self.tmp.open("x", encoding="utf-8", newline="")
+        self._hash = hashlib.sha256()
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        data = s.encode("utf-8")
+        self._hash.update(data)
+        self._size += len(data)
+        self._file.write(s)
+        return len(s)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+    def staged(self) -> _StagedFile:
+        self.close()
+        return _StagedFile(self.tmp, self._hash.hexdigest(), self._size)
+
+    def discard(self) -> None:
+        self.close()
+        _StagedFile(self.tmp, "", 0).discard()
+
+
+class _Output(ABC):
+    """Destination for generated files.
+
+    ``write`` takes a whole file; ``open`` is a context manager yielding a text
+    sink that page bodies are streamed into.
+    """
+
+    @abstractmethod
+    def write(self, path: Path, content: str) -> None:
+        ...
+
+    @contextmanager
+    def open(self, path: Path) -> Iterator[TextIO]:
+        buf = io.StringIO()
+        yield buf
+        self.write(path, buf.getvalue())
+
+
+class _DirectOutput(_Output):
+    """Writes straight to disk (``generate_project``)."""
+
+    def write(self, path: Path, content: str) -> None:
+        _write(path, content)
+
+    @contextmanager
+    def open(self, path: Path) -> Iterator[TextIO]:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8", newline="") as f:
+            yield f
+
+
+class _StagingOutput(_Output):
+    """Streams ``open`` files to staging files; ``base`` is the output directory."""
+
+    def __init__(self, base: Path) -> None:
+        self.base = base
+
+    @abstractmethod
+    def _put(self, path: Path, content: _Content) -> None:
+        ...
+
+    def write(self, path: Path, content: str) -> None:
+        self._put(path, content)
+
+    @contextmanager
+    def open(self, path: Path) -> Iterator[TextIO]:
+        sink = _StagingSink()
+        try:
+            yield sink
+        except BaseException:
+            sink.discard()
+            raise
+        self._put(path, sink.staged())
+
+
+class _CollectingOutput(_StagingOutput):
+    """Records writes in order so a pool worker can hand them to the parent."""
+
+    def __init__(self, base: Path) -> None:
+        super().__init__(base)
+        self.writes: List[tuple[Path, _Content]] = []
+
+    def _put(self, path: Path, content: _Content) -> None:
+        self.writes.append((path, content))
+
+
+class _ManifestWriter(_StagingOutput):
+    """Buffers generated files and writes only those whose content changed.
+
+    ``MANIFEST_FILENAME`` in the output directory maps each generated path
+    (posix, relative) to the sha256 of its content. A file is skipped when
+    the previous manifest has the same hash and the file on disk still has
+    the expected size, so dev-server watchers see no event for it. Streamed
+    files are held as ``_StagedFile`` and renamed into place.
+    """
+
+    def __init__(self, base: Path) -> None:
+        super().__init__(base)
+        self.manifest_path = base / MANIFEST_FILENAME
+        self.previous = self._load()
+        self.pending: Dict[Path, _Content] = {}
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        files = data.get("files") if isinstance(data, dict) else None
+        return files if isinstance(files, dict) else {}
+
+    def _put(self, path: Path, content: _Content) -> None:
+        # Later writes to the same path win, matching sequential overwrites.
+        previous = self.pending.get(path)
+        if isinstance(previous, _StagedFile):
+            previous.discard()
+        self.pending[path] = content
+
+    def adopt(self, writes: List[tuple[Path, _Content]]) -> None:
+        """Take over writes recorded by a ``_CollectingOutput``."""
+        for path, content in writes:
+            self._put(path, content)
+
+    def flush(self) -> tuple[List[str], List[str]]:
+        """Write pending files; return (created, changed) relative paths, sorted."""
+        created: List[str] = []
+        changed: List[str] = []
+        entries: Dict[str, str] = {}
+        for path, content in self.pending.items():
+            rel_path = path.relative_to(self.base)
+            key = rel_path.as_posix()
+            if isinstance(content, _StagedFile):
+                digest, length = content.digest, content.size
+            else:
+                data = content.encode("utf-8")
+                digest, length = hashlib.sha256(data).hexdigest(), len(data)
+            entries[key] = digest
+            try:
+                size = path.stat().st_size
+            except OSError:
+                size = None
+            if size is not None and size == length and self.previous.get(key) == digest:
+                if isinstance(content, _StagedFile):
+                    content.discard()
+                continue
+            if size is None:
+                created.append(str(rel_path))
+            changed.append(str(rel_path))
+            if isinstance(content, _StagedFile):
+                _move_into_place(content.tmp, path)
+            else:
+                _write(path, content)
+        self.pending.clear()
+        entries = dict(sorted(entries.items()))
+        if entries != self.previous or not self.manifest_path.exists():
+            _write(self.manifest_path, json.dumps({"files": entries}, ensure_ascii=False, indent=2) + "\n")
+        return sorted(created), sorted(changed)
 
 
 def _generate_target(
@@ -599,63 +1176,85 @@ def _generate_target(
     theme_manager: Optional["ThemeManager"] = None,
     is_first: bool = True,
     bundle: Optional["StyleBundle"] = None,
+    dedupe_styles: bool = False,
+    out: Optional[_Output] = None,
+    cache: Optional["RenderCache"] = None,
 ) -> None:
+    """Render one page for ``target``.
+
+    When ``bundle`` is given, the page's sheets are appended to it and the
+    caller owns writing ``styles/app.css``; otherwise the page gets its own
+    bundle and app.css is written here. All files go through ``out`` (disk by
+    default); markup is streamed into ``out.open`` sinks rather than built as
+    one string. Subtrees are rendered through ``cache`` when one is given.
+    """
+    if out is None:
+        out = _DirectOutput()
+    write = out.write
     target = target.lower()
     base = Path(output_dir)
     page_slug = _kebab(page_name)
     page_children = ir_page.get("children", []) or []
+    write_app_css = bundle is None
     if bundle is None:
-        bundle = StyleBundle(sheets=[])
+        bundle = StyleBundle(sheets=[], dedupe=dedupe_styles)
 
     if target == "html":
-        sheet = StyleSheet(prefix=page_slug, theme_manager=theme_manager)
-        body = _render_html(ir_page, sheet, 1)
+        sheet = StyleSheet(prefix=page_slug, theme_manager=theme_manager, dedupe=dedupe_styles)
         if is_first:
-            html = _build_html_page(page_name, body, "./styles/app.css")
-            _write(base / "index.html", html)
+            page_file, css_path = base / "index.html", "./styles/app.css"
         else:
-            (base / "pages").mkdir(parents=True, exist_ok=True)
-            html = _build_html_page(page_name, body, "../styles/app.css")
-            _write(base / "pages" / f"{page_slug}.html", html)
+            page_file, css_path = base / "pages" / f"{page_slug}.html", "../styles/app.css"
+        head, tail = _html_page_parts(page_name, css_path)
+        with out.open(page_file) as f:
+            f.write(head)
+            _emit_html(ir_page, sheet, f, 1, cache)
+            f.write(tail)
         bundle.add(sheet)
-        _write_app_css(base, bundle.to_css(), include_utility_css, theme_manager)
+        if write_app_css:
+            _write_app_css(base, bundle.to_css(), include_utility_css, theme_manager, write=write)
         return
 
     if target == "react":
         page_component_name = _sanitize_name(page_name)
         for spec in components.values():
             comp_file = base / "components" / f"{spec.name}.tsx"
-            sheet = StyleSheet(prefix=_kebab(spec.name), theme_manager=theme_manager)
-            variants = []
-            for variant_name, node in spec.variants.items():
-                variant_label = variant_name or "Default"
-                variants.append(
-                    f"    case '{variant_label}':\n      return (\n{_render_react(node, sheet, 4, True)}\n      );"
+            sheet = StyleSheet(prefix=_kebab(spec.name), theme_manager=theme_manager, dedupe=dedupe_styles)
+            with out.open(comp_file) as f:
+                f.write(
+                    f"import styles from './{spec.name}.module.css';\n\n"
+                    "type Props = { variant?: string };\n\n"
+                    f"export const {spec.name} = ({{ variant = 'Default' }}: Props) => {{\n"
+                    "  switch (variant) {\n"
                 )
-            comp_content = (
-                f"import styles from './{spec.name}.module.css';\n\n"
-                "type Props = { variant?: string };\n\n"
-                f"export const {spec.name} = ({{ variant = 'Default' }}: Props) => {{\n"
-                "  switch (variant) {\n"
-                + "\n".join(variants)
-                + "\n    default:\n      return (\n"
-                + _render_react(next(iter(spec.variants.values())), sheet, 4, True)
-                + "\n      );\n  }\n};\n"
-            )
-            _write(comp_file, comp_content)
-            _write(base / "components" / f"{spec.name}.module.css", sheet.to_css())
+                for i, (variant_name, node) in enumerate(spec.variants.items()):
+                    variant_label = variant_name or "Default"
+                    if i:
+                        f.write("\n")
+                    f.write(f"    case '{variant_label}':\n      return (\n")
+                    _emit_react(node, sheet, f, 4, True, cache)
+                    f.write("\n      );")
+                f.write("\n    default:\n      return (\n")
+                _emit_react(next(iter(spec.variants.values())), sheet, f, 4, True, cache)
+                f.write("\n      );\n  }\n};\n")
+            write(base / "components" / f"{spec.name}.module.css", sheet.to_css())
             bundle.add(sheet)
 
-        page_sheet = StyleSheet(prefix=page_slug, theme_manager=theme_manager)
-        page_body = "\n".join(_render_react(child, page_sheet, 2, True) for child in page_children)
-        page_content = (
-            f"import styles from './{_sanitize_name(page_name)}.module.css';\n\n"
-            f"export const {page_component_name}Page = () => (\n  <div>\n{page_body}\n  </div>\n);\n"
-        )
-        _write(base / "pages" / f"{page_component_name}.tsx", page_content)
-        _write(base / "pages" / f"{page_component_name}.module.css", page_sheet.to_css())
+        page_sheet = StyleSheet(prefix=page_slug, theme_manager=theme_manager, dedupe=dedupe_styles)
+        with out.open(base / "pages" / f"{page_component_name}.tsx") as f:
+            f.write(
+                f"import styles from './{_sanitize_name(page_name)}.module.css';\n\n"
+                f"export const {page_component_name}Page = () => (\n  <div>\n"
+            )
+            for i, child in enumerate(page_children):
+                if i:
+                    f.write("\n")
+                _emit_react(child, page_sheet, f, 2, True, cache)
+            f.write("\n  </div>\n);\n")
+        write(base / "pages" / f"{page_component_name}.module.css", page_sheet.to_css())
         bundle.add(page_sheet)
-        _write_app_css(base, bundle.to_css(), include_utility_css, theme_manager)
+        if write_app_css:
+            _write_app_css(base, bundle.to_css(), include_utility_css, theme_manager, write=write)
 
         main_content = (
             "import React from 'react';\n"
@@ -665,7 +1264,7 @@ def _generate_target(
             "const root = createRoot(document.getElementById('root') as HTMLElement);\n"
             f"root.render(<{page_component_name}Page />);\n"
         )
-        _write(base / "main.tsx", main_content)
+        write(base / "main.tsx", main_content)
 
         index_html = (
             "<!doctype html>\n"
@@ -673,46 +1272,47 @@ def _generate_target(
             f"  <title>{page_component_name}</title>\n"
             "</head>\n<body>\n  <div id=\"root\"></div>\n  <script type=\"module\" src=\"./main.tsx\"></script>\n</body>\n</html>\n"
         )
-        _write(base / "index.html", index_html)
+        write(base / "index.html", index_html)
         return
 
     if target == "vue":
         page_component_name = _sanitize_name(page_name)
         for spec in components.values():
             comp_file = base / "components" / f"{spec.name}.vue"
-            sheet = StyleSheet(prefix=_kebab(spec.name), theme_manager=theme_manager)
-            variant_blocks = []
-            for variant_name, node in spec.variants.items():
-                v = variant_name or "Default"
-                variant_blocks.append(
-                    f"  <template v-if=\"variant === '{v}'\">\n{_render_vue(node, sheet, 2)}\n  </template>"
+            sheet = StyleSheet(prefix=_kebab(spec.name), theme_manager=theme_manager, dedupe=dedupe_styles)
+            with out.open(comp_file) as f:
+                f.write("<template>\n  <div>\n")
+                for i, (variant_name, node) in enumerate(spec.variants.items()):
+                    v = variant_name or "Default"
+                    if i:
+                        f.write("\n")
+                    f.write(f"  <template v-if=\"variant === '{v}'\">\n")
+                    _emit_vue(node, sheet, f, 2, cache)
+                    f.write("\n  </template>")
+                f.write(
+                    "\n  </div>\n</template>\n\n"
+                    "<script setup>\n"
+                    "const props = defineProps({ variant: { type: String, default: 'Default' } });\n"
+                    "</script>\n\n"
+                    "<style scoped>\n"
                 )
-            template = "\n".join(variant_blocks)
-            comp_content = (
-                "<template>\n  <div>\n"
-                + template
-                + "\n  </div>\n</template>\n\n"
-                "<script setup>\n"
-                "const props = defineProps({ variant: { type: String, default: 'Default' } });\n"
-                "</script>\n\n"
-                "<style scoped>\n"
-                + sheet.to_css()
-                + "</style>\n"
-            )
-            _write(comp_file, comp_content)
+                f.write(sheet.to_css())
+                f.write("</style>\n")
             bundle.add(sheet)
 
-        page_sheet = StyleSheet(prefix=page_slug, theme_manager=theme_manager)
-        page_body = "\n".join(_render_vue(child, page_sheet, 2) for child in page_children)
-        page_content = (
-            f"<template>\n  <div>\n{page_body}\n  </div>\n</template>\n\n"
-            "<style scoped>\n"
-            + page_sheet.to_css()
-            + "</style>\n"
-        )
-        _write(base / "pages" / f"{page_component_name}.vue", page_content)
+        page_sheet = StyleSheet(prefix=page_slug, theme_manager=theme_manager, dedupe=dedupe_styles)
+        with out.open(base / "pages" / f"{page_component_name}.vue") as f:
+            f.write("<template>\n  <div>\n")
+            for i, child in enumerate(page_children):
+                if i:
+                    f.write("\n")
+                _emit_vue(child, page_sheet, f, 2, cache)
+            f.write("\n  </div>\n</template>\n\n<style scoped>\n")
+            f.write(page_sheet.to_css())
+            f.write("</style>\n")
         bundle.add(page_sheet)
-        _write_app_css(base, bundle.to_css(), include_utility_css, theme_manager)
+        if write_app_css:
+            _write_app_css(base, bundle.to_css(), include_utility_css, theme_manager, write=write)
 
         app_content = (
             "<template>\n"
@@ -723,7 +1323,7 @@ def _generate_target(
             "</script>\n\n"
             "<style src=\"./styles/app.css\"></style>\n"
         )
-        _write(base / "App.vue", app_content)
+        write(base / "App.vue", app_content)
 
         main_content = (
             "import { createApp } from 'vue';\n"
@@ -731,7 +1331,7 @@ def _generate_target(
             "import './styles/app.css';\n\n"
             "createApp(App).mount('#app');\n"
         )
-        _write(base / "main.ts", main_content)
+        write(base / "main.ts", main_content)
 
         index_html = (
             "<!doctype html>\n"
@@ -739,45 +1339,47 @@ def _generate_target(
             f"  <title>{page_component_name}</title>\n"
             "</head>\n<body>\n  <div id=\"app\"></div>\n  <script type=\"module\" src=\"./main.ts\"></script>\n</body>\n</html>\n"
         )
-        _write(base / "index.html", index_html)
+        write(base / "index.html", index_html)
         return
 
     if target == "flutter":
         for spec in components.values():
             comp_file = base / "lib" / "components" / f"{_kebab(spec.name)}.dart"
-            variant_cases = []
-            for variant_name, node in spec.variants.items():
-                v = variant_name or "Default"
-                variant_cases.append(
-                    f"      case '{v}':\n        return\n{_render_flutter(node, 4)};"
+            with out.open(comp_file) as f:
+                f.write(
+                    "import 'package:flutter/widgets.dart';\n\n"
+                    f"class {spec.name} extends StatelessWidget {{\n"
+                    "  final String variant;\n"
+                    f"  const {spec.name}({{super.key, this.variant = 'Default'}});\n\n"
+                    "  @override\n  Widget build(BuildContext context) {\n"
+                    "    switch (variant) {\n"
                 )
-            comp_content = (
+                for i, (variant_name, node) in enumerate(spec.variants.items()):
+                    v = variant_name or "Default"
+                    if i:
+                        f.write("\n")
+                    f.write(f"      case '{v}':\n        return\n")
+                    _emit_flutter(node, f, 4, cache)
+                    f.write(";")
+                f.write("\n      default:\n        return\n")
+                _emit_flutter(next(iter(spec.variants.values())), f, 4, cache)
+                f.write(";\n    }\n  }\n}\n")
+
+        page_file = base / "lib" / "pages" / f"{_kebab(page_name)}.dart"
+        with out.open(page_file) as f:
+            f.write(
                 "import 'package:flutter/widgets.dart';\n\n"
-                f"class {spec.name} extends StatelessWidget {{\n"
-                "  final String variant;\n"
-                f"  const {spec.name}({{super.key, this.variant = 'Default'}});\n\n"
+                f"class { _sanitize_name(page_name) }Page extends StatelessWidget {{\n"
+                f"  const { _sanitize_name(page_name) }Page({{super.key}});\n\n"
                 "  @override\n  Widget build(BuildContext context) {\n"
-                "    switch (variant) {\n"
-                + "\n".join(variant_cases)
-                + "\n      default:\n        return\n"
-                + _render_flutter(next(iter(spec.variants.values())), 4)
-                + ";\n    }\n  }\n}\n"
+                "    return Column(\n"
+                "      children: [\n"
             )
-            _write(comp_file, comp_content)
-
-        page_file = base / "lib" / "pages" / f"{_kebab(page_name)}.dart"
-        page_children_rendered = ",\n".join(_render_flutter(child, 2) for child in page_children)
-        page_content = (
-            "import 'package:flutter/widgets.dart';\n\n"
-            f"class { _sanitize_name(page_name) }Page extends StatelessWidget {{\n"
-            f"  const { _sanitize_name(page_name) }Page({{super.key}});\n\n"
-            "  @override\n  Widget build(BuildContext context) {\n"
-            "    return Column(\n"
-            "      children: [\n"
-            + page_children_rendered
-            + "\n      ],\n    );\n  }\n}\n"
-        )
-        _write(page_file, page_content)
+            for i, child in enumerate(page_children):
+                if i:
+                    f.write(",\n")
+                _emit_flutter(child, f, 2, cache)
+            f.write("\n      ],\n    );\n  }\n}\n")
         return
 
     raise ValueError(f"Unsupported target: {target}")
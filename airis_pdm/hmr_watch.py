@@ -0,0 +1,277 @@
+"""
+HMR watch：頁面保持開啟，依 Vite／webpack 的 hot update 只重新走訪變更組件的 DOM 子樹。
+
+``aipdm watch URL --hmr`` 時：
+
+1. 啟動時開一個專用 page 完整擷取一次，IR 以 ``index_paths=True`` 建構（記錄 raw path → IR 節點）。
+2. 檔案變更 → 等待 dev server 的 hot update（console 的 ``[vite] hot updated`` ／ ``[HMR] Updated modules``
+   等），再等 DOM 靜止（readiness 的 mutation＋raf）。
+3. 以 ``VueComponentDetector`` ／ ``ReactComponentDetector`` 把變更檔案對應到組件名稱，DOM walker 以
+   ``subtreeComponents`` 只走訪這些組件的 root 元素，``IRBuilderV2.patch_subtree`` 原地替換快取 IR
+   中的對應節點。
+4. 寫出 snapshot 與 ``hmr-patch.json``（本次替換的子樹，供下游只套用差異）。
+
+更新一次只處理一批：``on_change`` 以 ``asyncio.Lock`` 序列化，執行中到達的變更檔案併入下一批，
+不會有兩次更新同時讀寫 page、``builder`` 與 ``ir_doc``。
+
+以下情況改為在同一個 page 上完整重新走訪（仍不重新啟動瀏覽器）：變更檔案不是組件（.css、store …）、
+組件不在頁面上、子樹外框尺寸改變（其他節點位置也會變）、dev server 觸發整頁 reload。
+等不到 hot update（``hmr_timeout_ms``）時重新載入頁面再完整擷取。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .dom_extractor import DOM_WALKER_V2_JS, BrowserPool, ExtractionConfig, walker_config
+from .ir_builder import make_ir_builder, save_ir
+from .naming_engine import NamingEngine, ReactComponentDetector, VueComponentDetector
+from .network import routing
+from .readiness import load_and_wait, resolve_steps, run_steps
+from .snapshot import dump_json, snapshot_options
+
+# dev server 套用 hot update 後印出的 console 訊息
+HMR_UPDATE_MARKERS = (
+    "[vite] hot updated",
+    "[vite] css hot updated",
+    "[HMR] Updated modules",
+    "[HMR] App is up to date",
+    "[webpack-dev-server] App updated",
+)
+
+# watchdog 可能比 dev server 晚收到同一次存檔；這段時間內先到的 hot update 也算數
+HMR_EARLY_S = 1.0
+
+_VUE_FRAMEWORKS = ("vue", "nuxt")
+_REACT_FRAMEWORKS = ("react", "next")
+
+
+class ComponentFileIndex:
+    """原始碼檔案 → 執行期組件名稱候選（detector 解析的名稱、檔名主幹與其 PascalCase）。"""
+
+    def __init__(self, src_root: str, framework: str) -> None:
+        self.src_root = src_root
+        self.framework = framework
+        self._names: Dict[str, str] = {}
+
+    def _detectors(self, path: str) -> list:
+        if path.endswith(".vue"):
+            return [VueComponentDetector(self.src_root)]
+        if path.endswith((".tsx", ".jsx")):
+            return [ReactComponentDetector(self.src_root)]
+        return []
+
+    def scan(self) -> None:
+        self._names = {}
+        detectors = []
+        if self.framework not in _REACT_FRAMEWORKS:
+            detectors.append(VueComponentDetector(self.src_root))
+        if self.framework not in _VUE_FRAMEWORKS:
+            detectors.append(ReactComponentDetector(self.src_root))
+        for detector in detectors:
+            for path, name in detector.scan_project().items():
+                self._names[os.path.abspath(path)] = name
+
+    def names_for(self, path: str) -> List[str]:
+        """變更檔案對應的組件名稱；非組件檔案回傳空 list。"""
+        path = os.path.abspath(path)
+        if path not in self._names:
+            # 新增的檔案：只解析這一個
+            for detector in self._detectors(path):
+                self._names[path] = detector.component_name(path)
+        name = self._names.get(path)
+        if name is None:
+            return []
+        stem = Path(path).name.split(".")[0]
+        candidates = [name, stem, NamingEngine.to_pascal_case(stem)]
+        return list(dict.fromkeys(c for c in candidates if c))
+
+
+class HmrWatchSession:
+    """一個常駐 page ＋快取 IR；``on_change(path)`` 依 hot update 增量更新 snapshot。"""
+
+    def __init__(
+        self,
+        url: str,
+        config: dict,
+        extraction_config: ExtractionConfig,
+        output_dir: str,
+        hmr_timeout_ms: int = 2000,
+    ) -> None:
+        self.url = url
+        self.config = config
+        # 子樹走訪需要一次回傳完整子樹；圖片資產庫需要額外的收集流程，HMR 模式不使用
+        extraction_config.chunk_nodes = 0
+        extraction_config.asset_dir = None
+        self.extraction_config = extraction_config
+        self.output_dir = output_dir
+        self.hmr_timeout_ms = hmr_timeout_ms
+        src_root = config.get("source", {}).get("srcRoot", ".") or "."
+        self.components = ComponentFileIndex(src_root, extraction_config.framework)
+        self.page = None
+        self.builder = None
+        self.ir_doc: Optional[dict] = None
+        self.seq = 0
+        self._stack: Optional[AsyncExitStack] = None
+        self._update = asyncio.Event()
+        self._last_update = float("-inf")
+        self._reloaded = False
+        self._lock = asyncio.Lock()
+        self._pending: Dict[str, float] = {}  # 等待處理的變更檔案 → 收到時間
+
+    # ─── page lifecycle ───
+
+    async def start(self, pool: BrowserPool) -> dict:
+        """開啟專用 page、完整擷取一次並寫出 snapshot。"""
+        cfg = self.extraction_config
+        self.components.scan()
+        self._stack = AsyncExitStack()
+        self.page = await self._stack.enter_async_context(pool.page(cfg.viewport_width, cfg.viewport_height))
+        await self._stack.enter_async_context(routing(self.page, cfg, self.url))
+        self.page.on("console", self._on_console)
+        self.page.on("load", self._on_load)
+        async with self._lock:
+            start = time.perf_counter()
+            await load_and_wait(self.page, self.url, cfg)
+            self._reloaded = False
+            return await self._full(start, changed=[], reason="initial")
+
+    async def close(self) -> None:
+        if self._stack is not None:
+            await self._stack.aclose()
+            self._stack = None
+
+    def _on_console(self, message) -> None:
+        text = message.text
+        if any(marker in text for marker in HMR_UPDATE_MARKERS):
+            self._last_update = time.monotonic()
+            self._update.set()
+
+    def _on_load(self, *_args) -> None:
+        self._reloaded = True
+        self._update.set()
+
+    async def _wait_for_update(self, changed_at: float) -> bool:
+        """等待本次存檔的 hot update（或整頁 reload）；逾時回傳 False。"""
+        deadline = changed_at + self.hmr_timeout_ms / 1000
+        while self._last_update < changed_at - HMR_EARLY_S and not self._reloaded:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._update.clear()
+            try:
+                await asyncio.wait_for(self._update.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    # ─── change handling ───
+
+    async def on_change(self, paths: Union[str, Iterable[str]]) -> Optional[dict]:
+        """處理變更檔案；回傳 ``{"mode", "reason", "components", "patched", "ms"}``.
+
+        另一次更新執行中時先登記、等待鎖；輪到時一次處理所有已登記的檔案。已由前一批一併處理時
+        回傳 None。
+        """
+        now = time.monotonic()
+        for path in [paths] if isinstance(paths, str) else paths:
+            self._pending[path] = now
+        async with self._lock:
+            if not self._pending:
+                return None
+            pending, self._pending = self._pending, {}
+            return await self._update_components(list(pending), max(pending.values()))
+
+    async def _update_components(self, paths: List[str], changed_at: float) -> dict:
+        start = time.perf_counter()
+        cfg = self.extraction_config
+        if not await self._wait_for_update(changed_at):
+            await self.page.reload(wait_until="load", timeout=cfg.wait_timeout_ms)
+            await self._settle_after_reload()
+            return await self._full(start, paths, "no hot update")
+        if self._reloaded:
+            await self._settle_after_reload()
+            return await self._full(start, paths, "page reload")
+        await run_steps(self.page, cfg, ["mutation", "raf"])
+
+        names: List[str] = []
+        for path in paths:
+            found = self.components.names_for(path)
+            if not found:
+                return await self._full(start, paths, "not a component")
+            names.extend(found)
+        names = list(dict.fromkeys(names))
+        walk = await self.page.evaluate(
+            DOM_WALKER_V2_JS, {**walker_config(cfg), "subtreeComponents": names}
+        )
+        subtrees = walk["subtrees"] if walk else []
+        if not subtrees:
+            return await self._full(start, paths, "component not on page", names)
+        if any(s["path"] is None or s["node"] is None for s in subtrees):
+            return await self._full(start, paths, "component root not walked", names)
+
+        for subtree in subtrees:
+            if not self.builder.patch_subtree(self.ir_doc, subtree["path"], subtree["node"]):
+                # 先前已替換的子樹一併由完整重新走訪取代
+                return await self._full(start, paths, "subtree size changed", names)
+
+        self.seq += 1
+        self._write(paths, names, subtrees)
+        return self._report("patch", start, "", names, len(subtrees))
+
+    async def _settle_after_reload(self) -> None:
+        self._reloaded = False
+        steps = [s for s in resolve_steps(self.extraction_config.readiness) if s != "networkidle"]
+        await run_steps(self.page, self.extraction_config, steps)
+
+    async def _full(self, start: float, changed: List[str], reason: str, names=()) -> dict:
+        cfg = self.extraction_config
+        raw_tree = await self.page.evaluate(DOM_WALKER_V2_JS, walker_config(cfg))
+        if not raw_tree:
+            raise RuntimeError(f"empty DOM tree at {self.url}")
+        self.builder = make_ir_builder(self.config, index_paths=True)
+        viewport = {"width": cfg.viewport_width, "height": cfg.viewport_height}
+        self.ir_doc = self.builder.build(raw_tree=raw_tree, viewport=viewport)
+        self.seq += 1
+        save_ir(self.ir_doc, self.output_dir, **snapshot_options(self.config))
+        screenshot = await self.page.screenshot(full_page=False)
+        with open(os.path.join(self.output_dir, "reference-screenshot.png"), "wb") as f:
+            f.write(screenshot)
+        self._write_patch(changed, list(names), [], full=True)
+        return self._report("full", start, reason, names, 0)
+
+    def _write(self, changed: List[str], names: List[str], subtrees: List[dict]) -> None:
+        save_ir(self.ir_doc, self.output_dir, **snapshot_options(self.config))
+        sep = self.builder.namer.config.separator
+        patched = []
+        for subtree in subtrees:
+            node, _, row = self.builder.path_index[tuple(subtree["path"])]
+            patched.append({"name": self.builder.name_mapping.path(row), "separator": sep, "node": node})
+        self._write_patch(changed, names, patched, full=False)
+
+    def _write_patch(self, changed: List[str], names: List[str], patched: List[dict], full: bool) -> None:
+        patch = {
+            "seq": self.seq,
+            "full": full,
+            "changedFile": changed[0] if changed else None,
+            "changedFiles": changed,
+            "components": names,
+            "subtrees": patched,
+        }
+        # 先寫暫存檔再 rename：輪詢此檔的下游不會讀到寫到一半的內容
+        dump_json(os.path.join(self.output_dir, "hmr-patch.json"), patch, compact=True)
+
+    def _report(self, mode: str, start: float, reason: str, names, patched: int) -> dict:
+        return {
+            "mode": mode,
+            "reason": reason,
+            "components": list(names),
+            "patched": patched,
+            "nodeCount": self.ir_doc["stats"]["nodeCount"],
+            "ms": round((time.perf_counter() - start) * 1000, 1),
+        }
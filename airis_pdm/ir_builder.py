@@ -17,12 +17,13 @@ Handles ALL data from dom_extractor_v2:
   ✅ z-index → layer order
 """
 
-import json
-import os
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Optional
 
+from .asset_store import AssetStore
+from .name_table import NameTable
 from .naming_engine import NamingEngine, NamingConfig
+from .snapshot import write_snapshot
 
 
 class IRBuilderV2:
@@ -35,6 +36,9 @@ class IRBuilderV2:
         entry_file: str = "",
         smart_flatten: bool = True,
         cjk_font_family: "list[str] | str" = "Noto Sans TC",
+        fetch_children: Optional[Callable[[int], list]] = None,
+        asset_store: Optional[AssetStore] = None,
+        index_paths: bool = False,
     ):
         self.namer = naming_engine or NamingEngine()
         self.framework = framework
@@ -46,13 +50,23 @@ class IRBuilderV2:
             self.cjk_font_family = [cjk_font_family]
         else:
             self.cjk_font_family = cjk_font_family
-        self.name_mapping: dict[str, dict] = {}
+        # 完整名稱 → sourceFile／selector／componentName；parent-pointer 表，JSON view 寫出時才組出
+        self.name_mapping = NameTable(self.namer.config.separator, entry_file)
         self._node_count = 0
+        # 分段擷取（ExtractionConfig.chunk_nodes）：遇到 childrenPending 時才向頁面取回其餘子節點，
+        # 並在轉換後清掉 raw 子樹，raw 記憶體只與目前路徑上的兄弟節點數有關
+        self.fetch_children = fetch_children
+        # 有 asset_store 時，仍內嵌於 raw tree 的圖片也改存入資產庫，IR 只留 image.hash
+        self.asset_store = asset_store
+        # HMR watch：記錄 raw child-index path → (IR 節點, 父節點列號, 名稱列號)，供 patch_subtree 原地替換
+        self.index_paths = index_paths
+        self.path_index: dict[tuple, tuple] = {}
 
     def build(self, raw_tree: dict, viewport: dict) -> dict:
-        self.name_mapping = {}
+        self.name_mapping = NameTable(self.namer.config.separator, self.entry_file)
         self._node_count = 0
-        ir_tree = self._convert_node(raw_tree, parent_path="")
+        self.path_index = {}
+        ir_tree = self._convert_node(raw_tree, parent=-1, raw_path=())
 
         return {
             "version": "2.0.0",
@@ -81,16 +95,23 @@ class IRBuilderV2:
                 return True
         return False
 
-    def _convert_node(self, raw: dict, parent_path: str) -> Optional[dict]:
+    def _convert_node(self, raw: dict, parent: int = -1, raw_path: tuple = ()) -> Optional[dict]:
         if not raw:
             return None
 
+        pending = raw.pop("childrenPending", None) if self.fetch_children else None
+        if pending is not None:
+            raw["children"] = list(raw.get("children") or []) + self.fetch_children(pending)
+
         # ─── Smart Flattening (Step 2) ───
         # If this node is a useless wrapper, skip it and process its child.
         if self.smart_flatten and self._should_flatten(raw):
             # Only one child (guaranteed by _should_flatten)
-            # Use the SAME parent_path so the child takes this node's place in hierarchy
-            return self._convert_node(raw["children"][0], parent_path)
+            # Use the SAME parent so the child takes this node's place in hierarchy
+            ir_node = self._convert_node(raw["children"][0], parent, raw_path + (0,))
+            if self.index_paths and ir_node is not None:
+                self.path_index[raw_path] = self.path_index[raw_path + (0,)]
+            return ir_node
 
         self._node_count += 1
         tag = raw.get("tag", "div")
@@ -98,8 +119,9 @@ class IRBuilderV2:
         component_name = raw.get("componentName")
 
         # ─── Naming ───
-        figma_name = self.namer.resolve_name(
-            parent_path=parent_path,
+        # 只解析本層名稱；完整路徑由 name_mapping 的 parent 指標組出
+        segment = self.namer.resolve_name(
+            parent_path="",
             tag=tag,
             attrs=attrs,
             component_name=component_name,
@@ -107,7 +129,7 @@ class IRBuilderV2:
             sibling_tag_count=raw.get("siblingTagCount", 1),
         )
         sep = self.namer.config.separator
-        local_name = figma_name.split(sep)[-1] if sep in figma_name else figma_name
+        local_name = segment.split(sep)[-1] if sep in segment else segment
 
         # ─── Type ───
         figma_type = self._determine_type(raw)
@@ -121,6 +143,11 @@ class IRBuilderV2:
         if component_name:
             ir_node["componentRef"] = component_name
 
+        # 同 tag 兄弟中的序號（含不可見者），responsive 斷點以此對應同名兄弟
+        sibling_index = raw.get("siblingIndex", 0)
+        if sibling_index:
+            ir_node["siblingIndex"] = sibling_index
+
         # ─── Layout ───
         layout = raw.get("layout", {"x": 0, "y": 0, "width": 100, "height": 100})
         ir_node["layout"] = layout
@@ -165,27 +192,25 @@ class IRBuilderV2:
             ir_node["clipsContent"] = True
 
         # ─── Plugin data ───
+        selector = self.name_mapping.intern(self._build_selector(tag, attrs))
         ir_node["pluginData"] = {
             "sourceFile": self.entry_file,
-            "selector": self._build_selector(tag, attrs),
+            "selector": selector,
             "cssClasses": attrs.get("class", ""),
             "originalTag": tag,
         }
 
-        self.name_mapping[figma_name] = {
-            "sourceFile": self.entry_file,
-            "selector": ir_node["pluginData"]["selector"],
-            "componentName": component_name or "",
-        }
+        row = self.name_mapping.add(parent, segment, selector, component_name or "")
 
         # ─── Pseudo elements → synthetic children ✨ NEW ───
-        pseudo_children = self._convert_pseudos(raw.get("pseudoElements"), figma_name)
+        pseudos = raw.get("pseudoElements")
+        pseudo_children = self._convert_pseudos(pseudos, self.name_mapping.path(row)) if pseudos else []
 
         # ─── Children ───
         raw_children = raw.get("children", [])
 
         # Sort by z-index if available
-        z_indexed = [(c, c.get("styles", {}).get("zIndex") or 0) for c in raw_children]
+        z_indexed = [(c, c.get("styles", {}).get("zIndex") or 0, i) for i, c in enumerate(raw_children)]
         z_indexed.sort(key=lambda x: x[1])
 
         all_children = []
@@ -197,10 +222,12 @@ class IRBuilderV2:
                 all_children.append(pc)
 
         # Real children
-        for child_raw, _ in z_indexed:
-            child_ir = self._convert_node(child_raw, parent_path=figma_name)
+        for child_raw, _, index in z_indexed:
+            child_ir = self._convert_node(child_raw, parent=row, raw_path=raw_path + (index,))
             if child_ir:
                 all_children.append(child_ir)
+            if self.fetch_children:
+                child_raw.clear()
 
         # Append ::after pseudo
         for pc in pseudo_children:
@@ -211,8 +238,67 @@ class IRBuilderV2:
         if all_children:
             ir_node["children"] = all_children
 
+        if self.index_paths:
+            self.path_index[raw_path] = (ir_node, parent, row)
         return ir_node
 
+    def patch_subtree(self, ir_doc: dict, raw_path: "list[int] | tuple", raw: dict) -> bool:
+        """以重新走訪的 raw 子樹原地替換 ``ir_doc`` 中對應的 IR 節點（需 ``index_paths=True`` 建構）。
+
+        ``raw_path`` 為 raw tree 的 child-index path（DOM walker 的 ``subtreeComponents`` 回傳值）。
+        找不到對應節點、子樹變為不可見、組件不同或外框尺寸改變（其他節點的位置也會跟著變）時
+        回傳 False 且不修改任何東西，呼叫端應改為完整重建。
+        """
+        raw_path = tuple(raw_path)
+        entry = self.path_index.get(raw_path)
+        if entry is None:
+            return False
+        old_node, parent, old_row = entry
+
+        # 新子樹的列先加在表尾，採用時由 replace_subtree 接回舊子樹的位置；不採用時截回 mark
+        mark = self.name_mapping.mark()
+        saved = (self._node_count, self.path_index)
+        self._node_count, self.path_index = 0, {}
+        try:
+            new_node = self._convert_node(raw, parent, raw_path)
+            new_count, new_index = self._node_count, self.path_index
+        except BaseException:
+            self.name_mapping.truncate(mark)
+            raise
+        finally:
+            self._node_count, self.path_index = saved
+        if (
+            new_node is None
+            or new_node.get("componentRef") != old_node.get("componentRef")
+            or new_node["layout"].get("width") != old_node["layout"].get("width")
+            or new_node["layout"].get("height") != old_node["layout"].get("height")
+        ):
+            self.name_mapping.truncate(mark)
+            return False
+
+        remap = self.name_mapping.replace_subtree(old_row, mark)
+        stale = [p for p in self.path_index if p[:len(raw_path)] == raw_path]
+        # 被 smart flatten 略過的外層與 raw_path 共用同一筆 entry
+        wrappers = [p for p, e in self.path_index.items() if e[2] == old_row and p not in stale]
+        old_count = len({id(self.path_index[p][0]) for p in stale})
+        for path in stale:
+            del self.path_index[path]
+        old_node.clear()
+        old_node.update(new_node)
+        for path, (node, node_parent, node_row) in new_index.items():
+            self.path_index[path] = (old_node if node is new_node else node, node_parent, node_row)
+        for path in wrappers:
+            self.path_index[path] = self.path_index[raw_path]
+        if remap is not None:
+            # 表已壓縮：列號重新編號
+            for path, (node, node_parent, node_row) in self.path_index.items():
+                self.path_index[path] = (node, remap[node_parent] if node_parent >= 0 else -1, remap[node_row])
+
+        self._node_count += new_count - old_count
+        ir_doc["nameMapping"] = self.name_mapping
+        ir_doc.setdefault("stats", {})["nodeCount"] = self._node_count
+        return True
+
     def _should_flatten(self, raw: dict) -> bool:
         """
         Smart Flattening: Determine if a node is a useless wrapper.
@@ -530,8 +616,13 @@ class IRBuilderV2:
         }
         if raw.get("imageSrc"):
             img["src"] = raw["imageSrc"]
-        if raw.get("imageData"):
-            img["base64"] = raw["imageData"]
+        if raw.get("imageHash"):
+            img["hash"] = raw["imageHash"]
+        elif raw.get("imageData"):
+            if self.asset_store is not None:
+                img["hash"] = self.asset_store.put_base64(raw["imageData"])
+            else:
+                img["base64"] = raw["imageData"]
         if raw.get("imageAlt"):
             img["alt"] = raw["imageAlt"]
         return img
@@ -618,7 +709,13 @@ class IRBuilderV2:
 # High-level API (drop-in replacement for v1)
 # ════════════════════════════════════════════════════════════
 
-def build_ir_from_extraction(extraction_result: dict, config: dict) -> dict:
+def make_ir_builder(
+    config: dict,
+    fetch_children: Optional[Callable[[int], list]] = None,
+    asset_store: Optional[AssetStore] = None,
+    index_paths: bool = False,
+) -> IRBuilderV2:
+    """依 pencil.config 建立 IRBuilderV2（naming、framework、CJK 字型等設定）。"""
     naming_config = NamingConfig()
     naming_section = config.get("naming", {})
     if naming_section.get("separator"):
@@ -630,33 +727,36 @@ def build_ir_from_extraction(extraction_result: dict, config: dict) -> dict:
     source_config = config.get("source", {})
     export_config = config.get("export", {})
 
-    builder = IRBuilderV2(
+    return IRBuilderV2(
         naming_engine=naming_engine,
         framework=source_config.get("framework", "html"),
         style_strategy=source_config.get("styleStrategy", "inline"),
         entry_file=source_config.get("entryUrl", ""),
         cjk_font_family=export_config.get("cjkFontFamily", ["PingFang TC", "Microsoft JhengHei", "Noto Sans TC", "sans-serif"]),
+        fetch_children=fetch_children,
+        asset_store=asset_store,
+        index_paths=index_paths,
     )
 
+
+def build_ir_from_extraction(
+    extraction_result: dict,
+    config: dict,
+    fetch_children: Optional[Callable[[int], list]] = None,
+    asset_store: Optional[AssetStore] = None,
+) -> dict:
+    builder = make_ir_builder(config, fetch_children=fetch_children, asset_store=asset_store)
     return builder.build(
         raw_tree=extraction_result["tree"],
         viewport=extraction_result["viewport"],
     )
 
 
-def save_ir(ir_doc: dict, output_dir: str = ".figma-sync") -> tuple[str, str]:
-    os.makedirs(output_dir, exist_ok=True)
-
-    ir_path = os.path.join(output_dir, "figma-import-payload.json")
-    with open(ir_path, 'w', encoding='utf-8') as f:
-        json.dump(ir_doc, f, indent=2, ensure_ascii=False)
-
-    mapping_path = os.path.join(output_dir, "name-mapping.json")
-    with open(mapping_path, 'w', encoding='utf-8') as f:
-        json.dump(ir_doc.get("nameMapping", {}), f, indent=2, ensure_ascii=False)
-
-    plugin_path = os.path.join(output_dir, "plugin-payload.json")
-    with open(plugin_path, 'w', encoding='utf-8') as f:
-        json.dump(ir_doc["tree"], f, indent=2, ensure_ascii=False)
-
-    return ir_path, mapping_path
+def save_ir(
+    ir_doc: dict,
+    output_dir: str = ".figma-sync",
+    compact: bool = False,
+    compression: Optional[str] = None,
+) -> tuple[str, str]:
+    """寫出 snapshot（見 ``snapshot.write_snapshot``）；回傳 (IR 路徑, name-mapping 路徑)。"""
+    return write_snapshot(ir_doc, output_dir, compact=compact, compression=compression)
@@ -0,0 +1,170 @@
+"""
+IR 樹走訪 — 共用的顯式堆疊（非遞迴）traversal。
+
+所有 IR／UiIR walker（元件收集、token 萃取、節點計數、contract 驗證、
+FigmaToIR／PencilToIR／UiIR 轉換、codegen 渲染）都經由本模組走訪，
+因此樹深度不受 Python 遞迴上限限制；多個 per-node visitor 亦可用
+``visit_all`` 在同一趟走訪中完成，不必各自掃一次整棵樹。
+
+走訪順序一律為前序（pre-order，子節點依原順序），與原本的遞迴實作一致。
+"""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+Node = Dict[str, Any]
+ChildrenFn = Callable[[Node], Sequence[Any]]
+
+
+def children_of(node: Node) -> Sequence[Any]:
+    """預設的子節點取法：``node["children"]``；缺少、為 None 或節點本身非 dict 時視為空。"""
+    if not isinstance(node, dict):
+        return []
+    return node.get("children") or []
+
+
+def iter_nodes(root: Optional[Node], children: ChildrenFn = children_of) -> Iterator[Node]:
+    """前序列舉 ``root`` 及其所有子孫；``root`` 為 None 時不產出任何節點。"""
+    if root is None:
+        return
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        kids = children(node)
+        if kids:
+            stack.extend(reversed(kids))
+
+
+def iter_postorder(root: Optional[Node], children: ChildrenFn = children_of) -> Iterator[Node]:
+    """後序列舉：每個節點都在其所有子節點之後產出（供 Merkle 雜湊等由下而上計算）。"""
+    if root is None:
+        return
+    stack: List[Tuple[Node, bool]] = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            yield node
+            continue
+        stack.append((node, True))
+        kids = children(node)
+        if kids:
+            stack.extend((child, False) for child in reversed(kids))
+
+
+def walk(
+    root: Optional[Node],
+    visit: Callable[[Node, Any], Any],
+    state: Any = None,
+    children: ChildrenFn = children_of,
+) -> None:
+    """前序走訪並向下傳遞狀態：``visit(node, state)`` 的回傳值即為子節點的 state。
+
+    子節點在 ``visit`` 之後才取得，因此 ``visit`` 可先修正節點（例如補上 children）。
+    """
+    if root is None:
+        return
+    stack: List[Tuple[Node, Any]] = [(root, state)]
+    while stack:
+        node, node_state = stack.pop()
+        child_state = visit(node, node_state)
+        kids = children(node)
+        if kids:
+            stack.extend((child, child_state) for child in reversed(kids))
+
+
+def visit_all(
+    root: Optional[Node],
+    visitors: Iterable[Callable[[Node], Any]],
+    children: ChildrenFn = children_of,
+) -> None:
+    """單趟前序走訪，對每個節點依序呼叫所有 ``visitors``。"""
+    visitors = list(visitors)
+    for node in iter_nodes(root, children):
+        for visitor in visitors:
+            visitor(node)
+
+
+def build_tree(
+    root: Any,
+    convert: Callable[[Any], Optional[Tuple[Any, Optional[list]]]],
+    children: ChildrenFn = children_of,
+) -> Any:
+    """以前序轉換整棵樹並回傳新根節點。
+
+    ``convert(node)`` 回傳 ``(new_node, child_list)``：``child_list`` 是新節點上
+    用來承接轉換後子節點的 list（None 表示不轉換子節點）；回傳 None 則捨棄該節點
+    （不加入父節點）。``convert`` 的呼叫順序與遞迴版相同。
+    """
+    out: list = []
+    stack: List[Tuple[Any, list]] = [(root, out)]
+    while stack:
+        node, sink = stack.pop()
+        converted = convert(node)
+        if converted is None:
+            continue
+        new_node, child_list = converted
+        sink.append(new_node)
+        if child_list is not None:
+            kids = children(node)
+            if kids:
+                stack.extend((child, child_list) for child in reversed(kids))
+    return out[0] if out else None
+
+
+def copy_tree(root: Any) -> Any:
+    """IR 樹的 deepcopy；``children`` 以 ``build_tree`` 複製，其餘欄位各自 deepcopy。"""
+
+    def convert(node: Any) -> Tuple[Any, Optional[list]]:
+        if not isinstance(node, dict):
+            return deepcopy(node), None
+        copied: Dict[str, Any] = {}
+        child_list: Optional[list] = None
+        for key, value in node.items():
+            if key == "children" and isinstance(value, list):
+                child_list = copied[key] = []
+            else:
+                copied[key] = deepcopy(value)
+        return copied, child_list
+
+    return build_tree(root, convert)
+
+
+# 節點外殼：葉節點為字串；否則為 (開頭, 子節點分隔, 結尾, 子節點 state, 子節點)。
+Shell = Union[str, Tuple[str, str, str, Any, Sequence[Node]]]
+
+
+def emit_tree(
+    root: Node,
+    shell: Callable[[Node, Any], Shell],
+    write: Callable[[str], Any],
+    state: Any = None,
+    replay: Optional[Callable[[Node, Any, Callable[[str], Any]], bool]] = None,
+) -> None:
+    """依文件順序將 ``root`` 的標記逐段寫入 ``write``（子樹不組成中間字串）。
+
+    ``shell(node, state)`` 依前序呼叫。``replay(node, state, write)`` 若回傳 True，
+    表示該子樹已由呼叫端（例如 render cache）寫出，略過其展開。
+    """
+    stack: list = [(root, state)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            write(item)
+            continue
+        node, node_state = item
+        if replay is not None and replay(node, node_state, write):
+            continue
+        result = shell(node, node_state)
+        if isinstance(result, str):
+            write(result)
+            continue
+        open_, sep, close, child_state, kids = result
+        write(open_)
+        stack.append(close)
+        for i in range(len(kids) - 1, -1, -1):
+            stack.append((kids[i], child_state))
+            if i:
+                stack.append(sep)
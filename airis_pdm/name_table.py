@@ -0,0 +1,161 @@
+"""
+nameMapping 的精簡表示：parent-pointer 路徑表。
+
+``IRBuilderV2`` 過去為每個節點保存完整的階層名稱（``Page/Main/Card/Title``），深層樹的總記憶體為
+O(n·depth)。``NameTable`` 每個節點只存一列：
+
+    parent     父節點列號（根為 -1）
+    segment    本層名稱（``NamingEngine`` 的 local name，字串 intern）
+    selector   CSS selector（intern；``pluginData.selector`` 共用同一個字串物件）
+    component  組件名稱
+
+``sourceFile`` 整份文件只存一次。完整路徑與 ``{"sourceFile", "selector", "componentName"}`` 的
+JSON view 只在讀取（``Mapping`` 介面）或寫出 snapshot 時才組出，並快取到下一次修改。
+同名路徑與舊版 dict 相同：位置取第一次出現、內容取最後一次。
+
+``_order`` 為列的前序順序（JSON view 的 key 順序）。``replace_subtree`` 把新子樹接在舊子樹的位置，
+key 順序與完整重建相同；舊子樹的列標記為 dead，超過全表一半時 ``compact`` 依 ``_order`` 重新編號，
+長時間的 HMR watch 記憶體不會無限增長。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional
+
+
+class NameTable(Mapping):
+    """完整名稱 → ``{"sourceFile", "selector", "componentName"}`` 的唯讀 Mapping。"""
+
+    def __init__(self, separator: str = "/", source_file: str = "") -> None:
+        self.separator = separator
+        self.source_file = source_file
+        self._parents: List[int] = []
+        self._segments: List[str] = []
+        self._selectors: List[str] = []
+        self._components: List[str] = []
+        self._dead: set = set()
+        self._order: List[int] = []
+        self._strings: Dict[str, str] = {}
+        self._view: Optional[Dict[str, dict]] = None
+
+    def intern(self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+
+    def add(self, parent: int, segment: str, selector: str, component: str = "") -> int:
+        """新增一列並回傳列號；``parent`` 必須是已存在的列（或 -1）。"""
+        self._parents.append(parent)
+        self._segments.append(self.intern(segment))
+        self._selectors.append(self.intern(selector))
+        self._components.append(self.intern(component))
+        self._view = None
+        row = len(self._parents) - 1
+        self._order.append(row)
+        return row
+
+    def mark(self) -> int:
+        return len(self._parents)
+
+    def truncate(self, mark: int) -> None:
+        """移除 ``mark()`` 之後新增的列（子樹轉換失敗時還原）。"""
+        for rows in (self._parents, self._segments, self._selectors, self._components):
+            del rows[mark:]
+        self._dead = {row for row in self._dead if row < mark}
+        self._order = [row for row in self._order if row < mark]
+        self._view = None
+
+    def remove_subtree(self, row: int) -> None:
+        """移除 ``row`` 與其所有子孫列（子列號一律大於父列號，單次順向掃描）。"""
+        dead = self._dead
+        dead.add(row)
+        parents = self._parents
+        for i in range(row + 1, len(parents)):
+            if parents[i] in dead:
+                dead.add(i)
+        self._view = None
+
+    def replace_subtree(self, row: int, mark: int) -> Optional[Dict[int, int]]:
+        """以 ``mark()`` 之後新增的列（新子樹）取代 ``row`` 的子樹，位置沿用舊子樹.
+
+        表被壓縮時回傳舊列號 → 新列號（呼叫端需更新自己保存的列號），否則回傳 None。
+        """
+        order = self._order
+        count = len(self._parents) - mark
+        new_rows = order[len(order) - count:] if count else []
+        del order[len(order) - count:]
+        start = order.index(row)
+        self.remove_subtree(row)
+        # 前序順序中 row 之後連續的 dead 列即其子孫（先前的 dead 列已自 _order 移除）
+        end = start + 1
+        while end < len(order) and order[end] in self._dead:
+            end += 1
+        order[start:end] = new_rows
+        self._view = None
+        if len(self._dead) * 2 > len(self._parents):
+            return self.compact()
+        return None
+
+    def compact(self) -> Dict[int, int]:
+        """移除 dead 列並依 ``_order`` 重新編號；回傳舊列號 → 新列號。"""
+        live = [row for row in self._order if row not in self._dead]
+        remap = {old: new for new, old in enumerate(live)}
+        self._parents = [remap[self._parents[old]] if self._parents[old] >= 0 else -1 for old in live]
+        self._segments = [self._segments[old] for old in live]
+        self._selectors = [self._selectors[old] for old in live]
+        self._components = [self._components[old] for old in live]
+        self._dead = set()
+        self._order = list(range(len(live)))
+        self._view = None
+        return remap
+
+    def path(self, row: int) -> str:
+        """``row`` 的完整名稱。"""
+        segments = []
+        while row >= 0:
+            segments.append(self._segments[row])
+            row = self._parents[row]
+        path = ""
+        for segment in reversed(segments):
+            path = f"{path}{self.separator}{segment}" if path else segment
+        return path
+
+    def _paths(self) -> List[Optional[str]]:
+        paths: List[Optional[str]] = [None] * len(self._parents)
+        sep = self.separator
+        parents, segments, dead = self._parents, self._segments, self._dead
+        for i in self._order:
+            if i in dead:
+                continue
+            parent = parents[i]
+            prefix = paths[parent] if parent >= 0 else ""
+            paths[i] = f"{prefix}{sep}{segments[i]}" if prefix else segments[i]
+        return paths
+
+    def to_dict(self) -> Dict[str, dict]:
+        """JSON view（``figma-import-payload.json`` 的 ``nameMapping``）。"""
+        if self._view is None:
+            view: Dict[str, dict] = {}
+            paths = self._paths()
+            for i in self._order:
+                path = paths[i]
+                if path is None:
+                    continue
+                view[path] = {
+                    "sourceFile": self.source_file,
+                    "selector": self._selectors[i],
+                    "componentName": self._components[i],
+                }
+            self._view = view
+        return self._view
+
+    def __getitem__(self, name: str) -> dict:
+        return self.to_dict()[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"NameTable({len(self._parents) - len(self._dead)} rows)"
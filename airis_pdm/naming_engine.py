@@ -4,9 +4,11 @@
 優先順序：data-figma-name → 組件名 → id → 語意 class → ARIA/tag → fallback
 """
 
+import os
 import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, Tuple
 
 
 @dataclass
@@ -47,11 +49,31 @@ class NamingConfig:
 
 
 class NamingEngine:
-    """將 DOM 節點轉成可完全控制的 Figma 圖層名稱."""
+    """將 DOM 節點轉成可完全控制的 Figma 圖層名稱.
+
+    ``ignore_class_prefixes`` 於建構時編譯成小寫 prefix tuple（單次 ``str.startswith``），
+    ``semantic_tags`` 複製一份；名稱依 (tag, data-figma-name, 組件名, id, class, role) 快取於
+    ``OrderedDict`` LRU（最多 ``NAME_CACHE_SIZE`` 筆，命中時移到最後、超過時淘汰最久未用的一筆；
+    可 pickle，能隨 IRBuilderV2 交給 process pool），Tailwind 頁面上大量重複的 class 組合只解析一次。
+
+    重新指定 ``config.ignore_class_prefixes``／``config.semantic_tags`` 會自動生效；就地修改這兩者
+    （``append``、``[tag] = ...``）不會被偵測，修改後請呼叫 ``clear_cache()``。
+    """
+
+    NAME_CACHE_SIZE = 8192
 
     def __init__(self, config: Optional[NamingConfig] = None):
         self.config = config or NamingConfig()
         self._sibling_counters: dict[str, dict[str, int]] = {}
+        self.clear_cache()
+
+    def clear_cache(self) -> None:
+        """重新讀取 ``ignore_class_prefixes``／``semantic_tags`` 並清除名稱快取。"""
+        self._prefix_source = self.config.ignore_class_prefixes
+        self._utility_prefixes = tuple(prefix.lower() for prefix in self._prefix_source)
+        self._semantic_source = self.config.semantic_tags
+        self._semantic_tags = dict(self._semantic_source)
+        self._names: "OrderedDict[tuple, tuple[str, bool]]" = OrderedDict()
 
     def resolve_name(
         self,
@@ -85,35 +107,68 @@ class NamingEngine:
         sibling_index: int,
         sibling_tag_count: int,
     ) -> str:
+        if (
+            self.config.ignore_class_prefixes is not self._prefix_source
+            or self.config.semantic_tags is not self._semantic_source
+        ):
+            self.clear_cache()
+        key = (
+            tag,
+            attrs.get("data-figma-name", ""),
+            component_name,
+            attrs.get("id", ""),
+            attrs.get("class", ""),
+            attrs.get("role", ""),
+        )
+        cached = self._names.get(key)
+        if cached is None:
+            cached = self._resolve_base_name(*key)
+            if len(self._names) >= self.NAME_CACHE_SIZE:
+                self._names.popitem(last=False)
+            self._names[key] = cached
+        else:
+            self._names.move_to_end(key)
+        name, numbered = cached
+        # 6／7 的 tag 名稱在同層有多個同 tag 兄弟時加上序號
+        if numbered and sibling_tag_count > 1:
+            return f"{name}_{sibling_index + 1}"
+        return name
+
+    def _resolve_base_name(
+        self,
+        tag: str,
+        explicit_name: str,
+        component_name: Optional[str],
+        node_id: str,
+        class_string: str,
+        role: str,
+    ) -> Tuple[str, bool]:
+        """不含兄弟序號的名稱；第二個值表示名稱來自 tag（需依兄弟數量加序號）。"""
         # 1. data-figma-name
-        explicit_name = attrs.get("data-figma-name", "").strip()
+        explicit_name = explicit_name.strip()
         if explicit_name:
-            return self._sanitize(explicit_name)
+            return self._sanitize(explicit_name), False
         # 2. Vue/React 組件名
         if component_name and component_name not in ("div", "span", "template"):
-            return self._to_pascal_case(component_name)
+            return self._to_pascal_case(component_name), False
         # 3. id
-        node_id = attrs.get("id", "").strip()
+        node_id = node_id.strip()
         if node_id:
-            return self._to_pascal_case(node_id)
+            return self._to_pascal_case(node_id), False
         # 4. 語意 class
-        class_name = self._extract_semantic_class(attrs.get("class", ""))
+        class_name = self._extract_semantic_class(class_string)
         if class_name:
-            return self._to_pascal_case(class_name)
+            return self._to_pascal_case(class_name), False
         # 5. ARIA role
-        role = attrs.get("role", "").strip()
+        role = role.strip()
         if role:
-            return self._to_pascal_case(role)
+            return self._to_pascal_case(role), False
         # 6. 語意 HTML tag
-        semantic = self.config.semantic_tags.get(tag.lower())
+        semantic = self._semantic_tags.get(tag.lower())
         if semantic:
-            if sibling_tag_count > 1:
-                return f"{semantic}_{sibling_index + 1}"
-            return semantic
+            return semantic, True
         # 7. fallback
-        if sibling_tag_count > 1:
-            return f"{tag}_{sibling_index + 1}"
-        return tag
+        return tag, True
 
     def _extract_semantic_class(self, class_string: str) -> Optional[str]:
         if not class_string:
@@ -124,19 +179,22 @@ class NamingEngine:
         return None
 
     def _is_utility_class(self, cls: str) -> bool:
-        cls_lower = cls.lower()
-        for prefix in self.config.ignore_class_prefixes:
-            if cls_lower.startswith(prefix.lower()):
-                return True
+        if cls.lower().startswith(self._utility_prefixes):
+            return True
         if len(cls) <= 2 or cls.isdigit():
             return True
         return False
 
-    def _to_pascal_case(self, s: str) -> str:
+    @staticmethod
+    def to_pascal_case(s: str) -> str:
+        """``product-card`` → ``ProductCard``（非英數字元視為分隔）."""
         s = re.sub(r'[^a-zA-Z0-9]', ' ', s)
         words = s.split()
         return ''.join(w.capitalize() for w in words) if words else s
 
+    def _to_pascal_case(self, s: str) -> str:
+        return self.to_pascal_case(s)
+
     def _sanitize(self, name: str) -> str:
         return name.strip()
 
@@ -149,7 +207,6 @@ class VueComponentDetector:
         self._component_map: dict[str, str] = {}
 
     def scan_project(self) -> dict[str, str]:
-        import os
         for root, _, files in os.walk(self.src_root):
             for f in files:
                 if f.endswith('.vue'):
@@ -157,6 +214,10 @@ class VueComponentDetector:
                     self._component_map[filepath] = self._extract_component_name(filepath, f)
         return self._component_map
 
+    def component_name(self, filepath: str) -> str:
+        """單一檔案的組件名稱（不掃描整個專案）."""
+        return self._extract_component_name(filepath, os.path.basename(filepath))
+
     def _extract_component_name(self, filepath: str, filename: str) -> str:
         try:
             with open(filepath, 'r', encoding='utf-8') as fh:
@@ -169,7 +230,7 @@ class VueComponentDetector:
                 return match.group(1)
         except (IOError, UnicodeDecodeError):
             pass
-        return NamingEngine()._to_pascal_case(filename.replace('.vue', ''))
+        return NamingEngine.to_pascal_case(filename.replace('.vue', ''))
 
 
 class ReactComponentDetector:
@@ -180,7 +241,6 @@ class ReactComponentDetector:
         self._component_map: dict[str, str] = {}
 
     def scan_project(self) -> dict[str, str]:
-        import os
         for root, _, files in os.walk(self.src_root):
             for f in files:
                 if f.endswith(('.tsx', '.jsx')) and not f.endswith('.test.tsx'):
@@ -188,6 +248,10 @@ class ReactComponentDetector:
                     self._component_map[filepath] = self._extract_component_name(filepath, f)
         return self._component_map
 
+    def component_name(self, filepath: str) -> str:
+        """單一檔案的組件名稱（不掃描整個專案）."""
+        return self._extract_component_name(filepath, os.path.basename(filepath))
+
     def _extract_component_name(self, filepath: str, filename: str) -> str:
         try:
             with open(filepath, 'r', encoding='utf-8') as fh:
@@ -202,7 +266,7 @@ class ReactComponentDetector:
                     return match.group(1)
         except (IOError, UnicodeDecodeError):
             pass
-        return NamingEngine()._to_pascal_case(re.sub(r'\.(tsx|jsx)$', '', filename))
+        return NamingEngine.to_pascal_case(re.sub(r'\.(tsx|jsx)$', '', filename))
 
 
 def preview_naming_tree(ir_tree: dict, indent: int = 0) -> str:
@@ -0,0 +1,158 @@
+"""
+擷取期間的網路攔截：依資源類型／URL 樣式封鎖請求，並可由本機重播快取或 HAR 供應回應。
+
+``ExtractionConfig`` 相關欄位：
+
+    block_resource_types  封鎖的 Playwright resource type（例如 ``("media", "font")``）
+    block_url_patterns    封鎖的 URL glob（``fnmatch``，比對完整 URL；``BLOCK_TRACKERS`` 為常見分析／廣告服務）
+    replay_dir            本機重播快取目錄：GET 回應依 method＋URL 存檔，之後的擷取直接由磁碟供應；
+                          只記錄 2xx／3xx（4xx／5xx 多為暫時狀態，每次仍走網路），磁碟 I/O 在 thread 中執行
+    replay_all_origins    預設只快取與頁面不同 origin 的請求（CDN 字型、圖片、第三方 script），
+                          頁面自身的 HTML／bundle 仍走網路，修改程式碼後 push 不會拿到舊版；
+                          CI／離線的固定頁面可設為 True 連同頁面本身一起重播
+    replay_offline        快取未命中時直接中止請求，不連網（確定性的 CI 執行）；隱含 replay_all_origins
+    har_path              由既有 HAR 檔供應回應（``page.route_from_har``，未命中的請求照常處理）
+
+封鎖與重播在 ``routing(page, config)`` 期間生效，結束時移除，pool 中的 page 不受前一次設定影響。
+統計（blocked／replayed／recorded／passed）記錄於 ``extract_dom_tree`` 的 ``result["network"]``。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import hashlib
+import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+from .snapshot import write_atomic
+
+RESOURCE_TYPES = frozenset({
+    "document", "stylesheet", "image", "media", "font", "script", "texttrack",
+    "xhr", "fetch", "eventsource", "websocket", "manifest", "other",
+})
+
+BLOCK_TRACKERS = (
+    "*://*.google-analytics.com/*",
+    "*://*.googletagmanager.com/*",
+    "*://*.doubleclick.net/*",
+    "*://*.facebook.net/*",
+    "*://*.hotjar.com/*",
+    "*://*.segment.io/*",
+    "*://*.sentry.io/*",
+    "*://*.clarity.ms/*",
+)
+
+
+def validate_resource_types(types: Iterable[str]) -> None:
+    unknown = sorted(set(types) - RESOURCE_TYPES)
+    if unknown:
+        raise ValueError(f"unknown resource types: {', '.join(unknown)} (known: {', '.join(sorted(RESOURCE_TYPES))})")
+
+
+class ReplayCache:
+    """``<dir>/<key>.json``（url／status／headers）＋ ``<key>.body``；key 為 method＋URL 的 sha256 前 32 碼。"""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        return hashlib.sha256(f"{method} {url}".encode("utf-8")).hexdigest()[:32]
+
+    def get(self, method: str, url: str) -> Optional[dict]:
+        """回傳 ``{"status", "headers", "body"}``；未命中時為 None。"""
+        key = self.key(method, url)
+        meta_path = self.directory / f"{key}.json"
+        body_path = self.directory / f"{key}.body"
+        if not (meta_path.exists() and body_path.exists()):
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return {"status": meta["status"], "headers": meta["headers"], "body": body_path.read_bytes()}
+
+    def put(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        key = self.key(method, url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # body 先寫：get() 以 meta 存在與否判斷命中
+        write_atomic(self.directory / f"{key}.body", body)
+        meta = {"url": url, "status": status, "headers": headers}
+        write_atomic(self.directory / f"{key}.json", json.dumps(meta, ensure_ascii=False))
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def is_blocked(url: str, resource_type: str, config) -> bool:
+    if resource_type in config.block_resource_types:
+        return True
+    return any(fnmatch.fnmatchcase(url, pattern) for pattern in config.block_url_patterns)
+
+
+def routing_enabled(config) -> bool:
+    return bool(config.block_resource_types or config.block_url_patterns or config.replay_dir or config.har_path)
+
+
+# Replayed responses must not carry transfer encodings of the original body
+_DROP_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+
+@asynccontextmanager
+async def routing(page, config, page_url: str):
+    """在 block 期間對 ``page`` 套用封鎖／重播規則，yield 統計 dict。"""
+    stats = {"blocked": 0, "replayed": 0, "recorded": 0, "passed": 0}
+    if not routing_enabled(config):
+        yield stats
+        return
+
+    validate_resource_types(config.block_resource_types)
+    cache = ReplayCache(config.replay_dir) if config.replay_dir else None
+    page_origin = _origin(page_url)
+    all_origins = config.replay_all_origins or config.replay_offline
+
+    async def handle(route) -> None:
+        request = route.request
+        if is_blocked(request.url, request.resource_type, config):
+            stats["blocked"] += 1
+            await route.abort("blockedbyclient")
+            return
+        cacheable = (
+            cache is not None
+            and request.method == "GET"
+            and request.url.startswith(("http://", "https://"))
+            and (all_origins or _origin(request.url) != page_origin)
+        )
+        if not cacheable:
+            stats["passed"] += 1
+            await route.fallback()
+            return
+        hit = await asyncio.to_thread(cache.get, request.method, request.url)
+        if hit is not None:
+            stats["replayed"] += 1
+            await route.fulfill(status=hit["status"], headers=hit["headers"], body=hit["body"])
+            return
+        if config.replay_offline:
+            stats["blocked"] += 1
+            await route.abort("internetdisconnected")
+            return
+        response = await route.fetch()
+        body = await response.body()
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS}
+        if response.status < 400:
+            await asyncio.to_thread(cache.put, request.method, request.url, response.status, headers, body)
+            stats["recorded"] += 1
+        await route.fulfill(status=response.status, headers=headers, body=body)
+
+    if config.har_path:
+        # 先註冊：Playwright 由後註冊的 handler 先處理，route.fallback() 才會交給 HAR
+        await page.route_from_har(config.har_path, not_found="abort" if config.replay_offline else "fallback")
+    await page.route("**/*", handle)
+    try:
+        yield stats
+    finally:
+        if not page.is_closed():
+            await page.unroute_all(behavior="ignoreErrors")
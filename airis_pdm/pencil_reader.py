@@ -18,6 +18,13 @@ import re
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+from .ir_walk import build_tree
+
+
+def _pen_children(node: dict) -> list:
+    children = node.get("children")
+    return children if isinstance(children, list) else []
+
 
 class PencilToIR:
     """將 Pencil AI (.pen) 節點資料轉為 IR v2.0 格式。
@@ -93,10 +100,14 @@ class PencilToIR:
         return self._convert_node(pen_node)
 
     # ──────────────────────────────────────────────
-    # 節點轉換（遞迴）
+    # 節點轉換（ir_walk.build_tree，非遞迴）
     # ──────────────────────────────────────────────
 
     def _convert_node(self, node: dict) -> Optional[dict]:
+        return build_tree(node, self._convert_one, _pen_children)
+
+    def _convert_one(self, node: dict) -> Optional[tuple]:
+        """轉換單一節點；回傳 (IR 節點, 承接子節點的 list 或 None)。"""
         if not node or not isinstance(node, dict):
             return None
 
@@ -120,7 +131,11 @@ class PencilToIR:
         if res and "metadata" in node:
             res["metadata"] = node["metadata"]
         
-        return res
+        if res is None:
+            return None
+        # frame / ref 先放空 children，由 build_tree 依序填入轉換後的子節點
+        child_list = res.get("children") if isinstance(node.get("children"), list) else None
+        return res, child_list
 
     def _convert_frame(self, node: dict) -> dict:
         """frame → FRAME / AUTO_LAYOUT"""
@@ -144,14 +159,13 @@ class PencilToIR:
         if node.get("clip"):
             result["clipsContent"] = True
 
-        # 遞迴處理子節點
+        # 子節點由 build_tree 填入
         children_raw = node.get("children")
         if children_raw == "...":
             # batch_get 未展開，標記需要深層讀取
             result["children"] = []
         elif isinstance(children_raw, list):
-            children = [self._convert_node(c) for c in children_raw]
-            result["children"] = [c for c in children if c is not None]
+            result["children"] = []
 
         return result
 
@@ -221,8 +235,7 @@ class PencilToIR:
 
         children_raw = node.get("children")
         if isinstance(children_raw, list):
-            children = [self._convert_node(c) for c in children_raw]
-            result["children"] = [c for c in children if c is not None]
+            result["children"] = []
 
         return result
 
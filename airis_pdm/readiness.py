@@ -0,0 +1,203 @@
+"""
+頁面就緒偵測：取代 ``wait_until="networkidle"`` ＋固定 500 ms 的等待。
+
+``ExtractionConfig.readiness`` 為以逗號串接的步驟名稱（或別名），依序執行：
+
+    networkidle  舊行為：goto 等到 networkidle，再固定等 500 ms
+    selector     等待 ``wait_for_selector``（有設定時一律最先執行）
+    hydration    框架 hydration 完成：Vue 3／2 掛載、Nuxt ``isHydrating`` 結束、React root 已渲染；
+                 頁面沒有任何框架／SSR 標記時立即通過（``framework == "html"`` 時略過）
+    mutation     DOM mutation 靜止 ``ready_quiet_ms``（忽略 style 屬性變動；最多 ``ready_timeout_ms``）
+    raf          ``requestAnimationFrame`` 兩次 tick（確保 layout／paint 已套用）
+
+    別名：auto = hydration,mutation,raf
+
+未包含 ``networkidle`` 時，goto 只等到 ``load``。long-polling 的 SPA 不會因為連線不斷而卡到逾時。
+``register_step`` 可加入自訂步驟。每一步的耗時都會記錄在回傳的報告中（``extract_dom_tree`` 的
+``result["readiness"]``）。
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+READY_ALIASES = {"auto": ("hydration", "mutation", "raf")}
+
+MUTATION_QUIET_JS = """
+({ quietMs, timeoutMs }) => new Promise((resolve) => {
+    const start = performance.now();
+    let done = false;
+    let quietTimer = null;
+    let capTimer = null;
+    let observer = null;
+    const finish = (quiet) => {
+        if (done) return;
+        done = true;
+        if (observer) observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve({ quiet, waitedMs: performance.now() - start });
+    };
+    observer = new MutationObserver((records) => {
+        // Inline style animations (carousels, tickers) never settle; ignore them
+        if (records.every(r => r.type === 'attributes' && r.attributeName === 'style')) return;
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    observer.observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+    quietTimer = setTimeout(() => finish(true), quietMs);
+    capTimer = setTimeout(() => finish(false), timeoutMs);
+})
+"""
+
+HYDRATION_JS = """
+({ timeoutMs }) => new Promise((resolve) => {
+    const start = performance.now();
+    function detect() {
+        // Nuxt 2
+        if (window.$nuxt && window.$nuxt.$root) return { framework: 'nuxt', hydrated: true };
+        for (const el of document.querySelectorAll('#__nuxt, #__next, #app, #root, [data-v-app], body > div')) {
+            // Vue 3 (Nuxt 3 exposes $nuxt on the app)
+            const app = el.__vue_app__;
+            if (app) {
+                const nuxt = app.$nuxt || (app.config && app.config.globalProperties && app.config.globalProperties.$nuxt);
+                if (nuxt) return { framework: 'nuxt', hydrated: !nuxt.isHydrating };
+                return { framework: 'vue', hydrated: true };
+            }
+            // Vue 2
+            if (el.__vue__) return { framework: 'vue', hydrated: true };
+            // React 18 createRoot / hydrateRoot, legacy ReactDOM.render
+            if (el._reactRootContainer || Object.keys(el).some(k => k.startsWith('__reactContainer$'))) {
+                return { framework: 'react', hydrated: !!el.firstElementChild };
+            }
+        }
+        // Server-rendered markup whose framework bundle has not mounted yet
+        if (window.__NUXT__ || window.__NEXT_DATA__ || document.getElementById('__NUXT_DATA__') ||
+            document.getElementById('__NEXT_DATA__') || document.querySelector('[data-server-rendered]')) {
+            return { framework: 'ssr', hydrated: false };
+        }
+        // No framework markers: static page, or a client-rendered app that mounted before load
+        return { framework: null, hydrated: true };
+    }
+    function poll() {
+        const state = detect();
+        const waitedMs = performance.now() - start;
+        if (state.hydrated || waitedMs >= timeoutMs) {
+            resolve({ ...state, waitedMs });
+        } else {
+            requestAnimationFrame(poll);
+        }
+    }
+    poll();
+})
+"""
+
+RAF_JS = """
+() => new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(() => resolve(true))))
+"""
+
+Step = Callable[[Any, Any], Awaitable[Any]]
+
+
+async def _networkidle(page, config) -> None:
+    await page.wait_for_timeout(500)
+
+
+async def _selector(page, config) -> None:
+    if config.wait_for_selector:
+        await page.wait_for_selector(config.wait_for_selector, timeout=config.wait_timeout_ms)
+
+
+async def _hydration(page, config) -> Any:
+    if config.framework == "html":
+        return None
+    return await page.evaluate(HYDRATION_JS, {"timeoutMs": config.ready_timeout_ms})
+
+
+async def _mutation(page, config) -> Any:
+    return await page.evaluate(
+        MUTATION_QUIET_JS, {"quietMs": config.ready_quiet_ms, "timeoutMs": config.ready_timeout_ms}
+    )
+
+
+async def _raf(page, config) -> None:
+    await page.evaluate(RAF_JS)
+
+
+STEPS: Dict[str, Step] = {
+    "networkidle": _networkidle,
+    "selector": _selector,
+    "hydration": _hydration,
+    "mutation": _mutation,
+    "raf": _raf,
+}
+
+
+def register_step(name: str, step: Step) -> None:
+    """加入自訂就緒步驟：``async step(page, config)``，回傳值會記錄在報告中。"""
+    STEPS[name] = step
+
+
+def resolve_steps(readiness: str) -> List[str]:
+    """``"auto"`` / ``"mutation,raf"`` → 步驟名稱列表；未知名稱拋出 ValueError。"""
+    steps: List[str] = []
+    for name in (part.strip() for part in readiness.split(",")):
+        if not name:
+            continue
+        for step in READY_ALIASES.get(name, (name,)):
+            if step not in STEPS:
+                raise ValueError(f"unknown readiness step: {step!r} (known: {', '.join(sorted(STEPS))})")
+            if step not in steps:
+                steps.append(step)
+    return steps
+
+
+async def run_steps(page, config, steps: List[str]) -> Dict[str, Any]:
+    """依序執行 ``steps``，回傳 ``{"steps": {name: ms}, "details": {...}}``。"""
+    timings: Dict[str, float] = {}
+    details: Dict[str, Any] = {}
+    for name in steps:
+        start = time.perf_counter()
+        detail = await STEPS[name](page, config)
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+        if detail is not None:
+            details[name] = detail
+    return {"steps": timings, "details": details}
+
+
+async def load_and_wait(page, url: str, config) -> Dict[str, Any]:
+    """goto ``url`` 並依 ``config.readiness`` 等待就緒；回傳各步驟耗時報告。"""
+    steps = resolve_steps(config.readiness)
+    if config.wait_for_selector and "selector" not in steps:
+        steps.insert(0, "selector")
+    wait_until = "networkidle" if "networkidle" in steps else "load"
+
+    start = time.perf_counter()
+    await page.goto(url, wait_until=wait_until, timeout=config.wait_timeout_ms)
+    goto_ms = round((time.perf_counter() - start) * 1000, 1)
+    report = await run_steps(page, config, steps)
+    report["steps"] = {"goto": goto_ms, **report["steps"]}
+    report["strategy"] = config.readiness
+    report["totalMs"] = round((time.perf_counter() - start) * 1000, 1)
+    return report
+
+
+async def settle(page, config) -> Dict[str, Any]:
+    """viewport 調整後等待重新渲染：mutation 靜止＋raf，最多 ``resize_settle_ms``。
+
+    ``readiness`` 含 ``networkidle``（舊行為）時維持固定等待 ``resize_settle_ms``。
+    """
+    if "networkidle" in resolve_steps(config.readiness):
+        start = time.perf_counter()
+        await page.wait_for_timeout(config.resize_settle_ms)
+        return {"steps": {"sleep": round((time.perf_counter() - start) * 1000, 1)}, "details": {}}
+    capped = dataclasses.replace(config, ready_timeout_ms=config.resize_settle_ms)
+    return await run_steps(page, capped, ["mutation", "raf"])
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """``ready in 182ms (goto 120, hydration 12, mutation 41, raf 9)``。"""
+    steps = ", ".join(f"{name} {ms:.0f}" for name, ms in report["steps"].items())
+    return f"ready in {report['totalMs']:.0f}ms ({steps})"
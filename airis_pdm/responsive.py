@@ -0,0 +1,157 @@
+"""
+多 viewport（responsive）IR：一份 base tree ＋ 各斷點相對於 base 的差異。
+
+``aipdm push --viewports 375x812,768x1024,1440x900`` 只載入頁面一次，依序調整 viewport
+重新走訪；第一個 viewport 為 base，其餘斷點只記錄差異，不重複整棵結構：
+
+    ir_doc["responsive"] = {
+        "base": {"width": 375, "height": 812},
+        "breakpoints": [
+            {
+                "viewport": {"width": 768, "height": 1024},
+                "nodes":  {path: delta},            # 節點欄位差異（layout／styles／text …）
+                "hidden": [path, ...],              # 此斷點不存在的 base 節點（僅最上層）
+                "added":  [{"parent": path, "index": i, "node": subtree}, ...],
+            },
+        ],
+    }
+
+``path`` 為自 root 起以 naming separator 串接的 ``figmaName``。同層同名者依 DOM 的同 tag 序號
+（``siblingIndex``，含不可見的兄弟）加 ``#2``、``#3``，某個斷點隱藏前一個兄弟時其餘節點的 path 不變；
+序號仍相同（不同 tag 同名）時才依出現順序再加序號。
+delta 為遞迴的 dict 差異：值為新值，``"$remove"`` 列出被移除的 key；list 整體替換。
+``apply_breakpoint`` 可由 base tree 與斷點差異還原該斷點的 IR tree（供日後 codegen 產生 media query）。
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+REMOVE_KEY = "$remove"
+
+
+def _child_paths(node: dict, path: str, sep: str) -> Iterator[Tuple[str, dict]]:
+    seen: Dict[str, int] = {}
+    for child in node.get("children") or []:
+        index = child.get("siblingIndex", 0)
+        key = child.get("figmaName", "") + (f"#{index + 1}" if index else "")
+        seen[key] = seen.get(key, 0) + 1
+        suffix = f"#{seen[key]}" if seen[key] > 1 else ""
+        yield f"{path}{sep}{key}{suffix}", child
+
+
+def index_tree(tree: dict, sep: str = "/") -> Dict[str, Tuple[dict, Optional[str], int]]:
+    """path → (node, parent path, index in parent's children)。"""
+    root_path = tree.get("figmaName", "")
+    out: Dict[str, Tuple[dict, Optional[str], int]] = {root_path: (tree, None, 0)}
+    stack = [(tree, root_path)]
+    while stack:
+        node, path = stack.pop()
+        for index, (child_path, child) in enumerate(_child_paths(node, path, sep)):
+            out[child_path] = (child, path, index)
+            stack.append((child, child_path))
+    return out
+
+
+def _own_fields(node: dict) -> dict:
+    return {k: v for k, v in node.items() if k != "children"}
+
+
+def diff_values(base: dict, other: dict) -> dict:
+    """``other`` 相對於 ``base`` 的遞迴差異；相同時回傳空 dict。"""
+    delta: Dict[str, Any] = {}
+    for key, value in other.items():
+        if key not in base:
+            delta[key] = value
+        elif base[key] != value:
+            if isinstance(base[key], dict) and isinstance(value, dict):
+                delta[key] = diff_values(base[key], value)
+            else:
+                delta[key] = value
+    removed = [key for key in base if key not in other]
+    if removed:
+        delta[REMOVE_KEY] = removed
+    return delta
+
+
+def apply_values(base: dict, delta: dict) -> dict:
+    out = dict(base)
+    for key in delta.get(REMOVE_KEY, ()):
+        out.pop(key, None)
+    for key, value in delta.items():
+        if key == REMOVE_KEY:
+            continue
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = apply_values(out[key], value)
+        else:
+            out[key] = copy.deepcopy(value)
+    return out
+
+
+def diff_breakpoint(base_tree: dict, tree: dict, sep: str = "/") -> dict:
+    """斷點 IR tree 相對於 base tree 的差異（不含 viewport）。"""
+    base_index = index_tree(base_tree, sep)
+    nodes: Dict[str, dict] = {}
+    added: List[dict] = []
+    present = set()
+
+    root_path = base_tree.get("figmaName", "")
+    stack = [(tree, root_path)]
+    while stack:
+        node, path = stack.pop()
+        present.add(path)
+        base_entry = base_index.get(path)
+        if base_entry is not None:
+            delta = diff_values(_own_fields(base_entry[0]), _own_fields(node))
+            if delta:
+                nodes[path] = delta
+        for index, (child_path, child) in enumerate(_child_paths(node, path, sep)):
+            if child_path in base_index:
+                stack.append((child, child_path))
+            else:
+                added.append({"parent": path, "index": index, "node": child})
+
+    hidden = [
+        path for path, (_, parent, _) in base_index.items()
+        if path not in present and parent in present
+    ]
+    added.sort(key=lambda entry: (entry["parent"], entry["index"]))
+    return {"nodes": nodes, "hidden": sorted(hidden), "added": added}
+
+
+def apply_breakpoint(base_tree: dict, breakpoint: dict, sep: str = "/") -> dict:
+    """由 base tree 與斷點差異還原該斷點的 IR tree（不修改 base_tree）。"""
+    nodes = breakpoint.get("nodes", {})
+    hidden = set(breakpoint.get("hidden", ()))
+    added: Dict[str, List[dict]] = {}
+    for entry in breakpoint.get("added", ()):
+        added.setdefault(entry["parent"], []).append(entry)
+
+    def build(node: dict, path: str) -> dict:
+        out = apply_values(_own_fields(node), nodes[path]) if path in nodes else copy.deepcopy(_own_fields(node))
+        children = [build(child, child_path) for child_path, child in _child_paths(node, path, sep)
+                    if child_path not in hidden]
+        for entry in sorted(added.get(path, ()), key=lambda e: e["index"]):
+            children.insert(entry["index"], copy.deepcopy(entry["node"]))
+        if children:
+            out["children"] = children
+        return out
+
+    return build(base_tree, base_tree.get("figmaName", ""))
+
+
+def merge_breakpoints(base_doc: dict, docs: List[dict], sep: str = "/") -> dict:
+    """以 ``base_doc`` 為基準，把其餘 viewport 的 IR 文件併成 ``responsive`` 差異。"""
+    merged = dict(base_doc)
+    name_mapping = dict(base_doc.get("nameMapping") or {})
+    breakpoints = []
+    for doc in docs:
+        entry = {"viewport": doc["viewport"]}
+        entry.update(diff_breakpoint(base_doc["tree"], doc["tree"], sep))
+        breakpoints.append(entry)
+        for name, mapping in (doc.get("nameMapping") or {}).items():
+            name_mapping.setdefault(name, mapping)
+    merged["nameMapping"] = name_mapping
+    merged["responsive"] = {"base": base_doc["viewport"], "breakpoints": breakpoints}
+    return merged
@@ -0,0 +1,221 @@
+"""
+Snapshot 讀寫：``figma-import-payload.json``、``name-mapping.json``、``plugin-payload.json``。
+
+寫入（``write_snapshot`` ／ ``save_ir``）：
+
+    - nameMapping 為 ``NameTable`` 時於此時才組出 JSON view
+    - tree 與 nameMapping 各只序列化一次：完整 IR 以佔位字串序列化後再把兩段文字接進去，
+      ``plugin-payload.json`` ／ ``name-mapping.json`` 直接寫出同一段文字（輸出與 ``json.dump`` 相同）
+    - ``compact=True``：不縮排、``separators=(",", ":")``（pencil.config ``export.snapshotFormat: "compact"``）
+    - ``compression="gzip" | "zstd"``：檔名加上 ``.gz`` ／ ``.zst``（``export.snapshotCompression``；
+      zstd 需要 ``pip install zstandard``）；同名的其他格式檔案會被移除，讀取端不會拿到舊檔
+    - 每個檔案先寫暫存檔再 ``os.replace``，中斷時不會留下寫一半的 snapshot
+
+讀取（``load_snapshot`` ／ ``SnapshotReader``）依副檔名與檔頭自動解壓，傳入目錄或不含副檔名的
+路徑時依序找 ``.json``、``.json.gz``、``.json.zst``。``SnapshotReader`` 只在存取時才讀對應的檔案：
+只需要 tree 的 Figma plugin 流程不必解析整份 IR，只需要 nameMapping 時也只讀小檔。
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from .name_table import NameTable
+
+IR_FILENAME = "figma-import-payload.json"
+MAPPING_FILENAME = "name-mapping.json"
+PAYLOAD_FILENAME = "plugin-payload.json"
+
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# 序列化時暫代 tree／nameMapping 的字串；JSON 內容本身不會出現未跳脫的 NUL
+_TREE_SENTINEL = "\x00airis-snapshot-tree\x00"
+_MAPPING_SENTINEL = "\x00airis-snapshot-mapping\x00"
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd 壓縮需要 zstandard。請執行: pip install zstandard")
+    return zstandard
+
+
+def _compress(data: bytes, compression: Optional[str]) -> bytes:
+    if compression is None:
+        return data
+    if compression == "gzip":
+        # mtime=0：內容相同時輸出位元組相同
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if compression == "zstd":
+        return _zstd().ZstdCompressor(level=3).compress(data)
+    raise ValueError(f"unknown snapshot compression: {compression!r} (gzip, zstd)")
+
+
+def _decompress(data: bytes) -> bytes:
+    if data.startswith(_GZIP_MAGIC):
+        return gzip.decompress(data)
+    if data.startswith(_ZSTD_MAGIC):
+        return _zstd().ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def _dumps(value: Any, compact: bool, level: int = 0) -> str:
+    """``json.dumps``；``level`` 為此值在外層文件中的巢狀深度（縮排模式下用於接回外層）。"""
+    if compact:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    # JSON 字串中的換行一律跳脫，因此 "\n" 只會是縮排換行
+    return text.replace("\n", "\n" + "  " * level) if level else text
+
+
+def write_atomic(path: str | Path, data: bytes | str, mode: Optional[int] = None) -> None:
+    """寫入同目錄的暫存檔後 ``os.replace``，讀取端不會看到寫到一半的檔案.
+
+    ``str`` 以 UTF-8 寫入且不轉換換行；``mode`` 為新檔權限（例如保留原檔的 ``st_mode``）。
+    父目錄需已存在。
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp, stat.S_IMODE(mode))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_json(path: str | Path, text: str, compression: Optional[str] = None) -> Path:
+    """原子寫入已序列化的 JSON 文字；回傳實際路徑（含壓縮副檔名），並移除其他格式的同名檔案。"""
+    base = Path(path)
+    target = base.with_name(base.name + COMPRESSION_SUFFIXES[compression])
+    target.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(target, _compress(text.encode("utf-8"), compression))
+    for other in COMPRESSION_SUFFIXES.values():
+        stale = base.with_name(base.name + other)
+        if stale != target and stale.exists():
+            stale.unlink()
+    return target
+
+
+def dump_json(path: str | Path, value: Any, compact: bool = False, compression: Optional[str] = None) -> Path:
+    return write_json(path, _dumps(value, compact), compression)
+
+
+def write_snapshot(
+    ir_doc: dict,
+    output_dir: str | Path,
+    compact: bool = False,
+    compression: Optional[str] = None,
+) -> tuple[str, str]:
+    """寫出三個 snapshot 檔；回傳 (IR 路徑, name-mapping 路徑)。"""
+    # 未知的壓縮格式在寫入任何檔案前就拋出
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"unknown snapshot compression: {compression!r} (gzip, zstd)")
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    tree_text = _dumps(ir_doc["tree"], compact, level=1)
+    mapping = ir_doc.get("nameMapping", {})
+    if isinstance(mapping, NameTable):
+        mapping = mapping.to_dict()
+    mapping_text = _dumps(mapping, compact, level=1)
+    shell = dict(ir_doc)
+    shell["tree"] = _TREE_SENTINEL
+    if "nameMapping" in shell:
+        shell["nameMapping"] = _MAPPING_SENTINEL
+    doc_text = _dumps(shell, compact)
+    doc_text = doc_text.replace(json.dumps(_TREE_SENTINEL), tree_text, 1)
+    doc_text = doc_text.replace(json.dumps(_MAPPING_SENTINEL), mapping_text, 1)
+
+    # 單獨的檔案位於最外層：把接回外層用的縮排拿掉
+    unindent = (lambda t: t) if compact else (lambda t: t.replace("\n  ", "\n"))
+    write_json(out / PAYLOAD_FILENAME, unindent(tree_text), compression)
+    mapping_path = write_json(out / MAPPING_FILENAME, unindent(mapping_text), compression)
+    # 完整 IR 最後寫：讀取端看到新的 IR 時，另外兩個檔案已是同一版
+    ir_path = write_json(out / IR_FILENAME, doc_text, compression)
+    return str(ir_path), str(mapping_path)
+
+
+def snapshot_options(config: dict) -> dict:
+    """pencil.config ``export.snapshotFormat`` ／ ``export.snapshotCompression`` → write_snapshot 參數。"""
+    export = config.get("export", {})
+    return {
+        "compact": export.get("snapshotFormat") == "compact",
+        "compression": export.get("snapshotCompression") or None,
+    }
+
+
+def resolve_snapshot_path(path: str | Path, filename: str = IR_FILENAME) -> Optional[Path]:
+    """目錄 → 其中的 ``filename``；找不到原路徑時依序嘗試壓縮格式；都沒有則回傳 None。"""
+    path = Path(path)
+    if path.is_dir():
+        path = path / filename
+    if path.is_file():
+        return path
+    for suffix in COMPRESSION_SUFFIXES.values():
+        candidate = path.with_name(path.name + suffix)
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def load_json(path: str | Path) -> Any:
+    return json.loads(_decompress(Path(path).read_bytes()).decode("utf-8"))
+
+
+def load_snapshot(path: str | Path, filename: str = IR_FILENAME) -> Any:
+    """讀取 snapshot 檔（目錄、檔案或不含壓縮副檔名的路徑皆可）；不存在時拋出 FileNotFoundError。"""
+    resolved = resolve_snapshot_path(path, filename)
+    if resolved is None:
+        raise FileNotFoundError(f"snapshot not found: {path}")
+    return load_json(resolved)
+
+
+class SnapshotReader:
+    """延遲讀取 snapshot 目錄：``doc`` ／ ``tree`` ／ ``name_mapping`` 只在第一次存取時讀對應的檔案。"""
+
+    def __init__(self, snapshot_dir: str | Path) -> None:
+        self.snapshot_dir = Path(snapshot_dir)
+        self._cache: dict = {}
+
+    def _load(self, filename: str) -> Any:
+        if filename not in self._cache:
+            self._cache[filename] = load_snapshot(self.snapshot_dir, filename)
+        return self._cache[filename]
+
+    def exists(self) -> bool:
+        return resolve_snapshot_path(self.snapshot_dir, IR_FILENAME) is not None
+
+    @property
+    def doc(self) -> dict:
+        return self._load(IR_FILENAME)
+
+    @property
+    def tree(self) -> dict:
+        """plugin-payload（只有 tree）；已讀過完整 IR 時直接取用其中的 tree。"""
+        if IR_FILENAME in self._cache:
+            return self._cache[IR_FILENAME]["tree"]
+        return self._load(PAYLOAD_FILENAME)
+
+    @property
+    def name_mapping(self) -> dict:
+        if IR_FILENAME in self._cache:
+            return self._cache[IR_FILENAME].get("nameMapping", {})
+        return self._load(MAPPING_FILENAME)
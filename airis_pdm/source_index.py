@@ -0,0 +1,238 @@
+"""
+原始碼 selector 索引：一次走訪 srcRoot，建立 id／class → 檔案的對照表。
+
+``find_files_by_selector`` 每次查詢都 ``rglob`` 整個 srcRoot 並讀取、regex 掃描每個檔案；
+``CodePatcher.apply_changes`` 對每個變更節點各查一次，300 個變更 × 5k 個檔案即 150 萬次讀檔。
+``SourceIndex`` 只讀一次：
+
+    - HTML 類（.vue／.tsx／.jsx／.html）：``id="…"``、``class="…"`` 中的每個 token
+    - CSS 類（.css／.scss／*.module.css）：``#name {``／``.name {`` 形式的 selector
+
+selector 以 ``split_selector`` 拆成 id／class token（``IRBuilderV2._build_selector`` 產生的
+``div#login.card`` 亦同），各 token 查表後取交集，依走訪順序回傳（與 ``find_files_by_selector``
+相同的「第一個符合」）；交集為空時只以 id 查表。無法拆解的 selector（只有標籤、含組合子）才退回
+逐檔文字搜尋，結果依 selector 快取。
+
+``cache_path``：索引存成 JSON，下次建立時 mtime 與大小未變的檔案直接沿用、不重新讀取。
+寫回檔案後呼叫 ``refresh(path)`` 只重新索引該檔。
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .snapshot import dump_json
+
+INDEX_VERSION = 1
+
+DEFAULT_EXTENSIONS = frozenset({".vue", ".tsx", ".jsx", ".html", ".css", ".scss", ".module.css"})
+_CSS_EXTS = frozenset({".css", ".scss"})
+
+_HTML_ID = re.compile(r'\bid=["\']?([^"\'\s>]+)')
+_HTML_CLASS = re.compile(r'\bclass=["\']([^"\']*)["\']')
+_CSS_ID = re.compile(r'#(-?[_a-zA-Z][\w-]*)\s*[{,]')
+_CSS_CLASS = re.compile(r'\.(-?[_a-zA-Z][\w-]*)(?=[\s{,:#])')
+_SELECTOR_TAG = re.compile(r"[a-zA-Z][\w-]*")
+
+
+def split_selector(selector: str) -> Optional[tuple[List[str], List[str]]]:
+    """``tag#id.a.b`` → (ids, classes)；沒有 id／class 或含空白（組合子）時回傳 None。
+
+    ``[...]`` 內的 ``#``／``.`` 不視為分隔（Tailwind 的 ``bg-[#fff]``、``w-[1.5rem]``）。
+    """
+    if not selector or any(ch.isspace() for ch in selector):
+        return None
+    match = _SELECTOR_TAG.match(selector)
+    pos = match.end() if match else 0
+    ids: List[str] = []
+    classes: List[str] = []
+    kind, start, depth = None, pos, 0
+    for i in range(pos, len(selector) + 1):
+        ch = selector[i] if i < len(selector) else None
+        if ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth = max(depth - 1, 0)
+        if ch is not None and (depth or ch not in "#."):
+            continue
+        if kind is None:
+            if i != pos:
+                return None
+        else:
+            token = selector[start:i]
+            if not token:
+                return None
+            (ids if kind == "#" else classes).append(token)
+        kind, start = ch, i + 1
+    if not ids and not classes:
+        return None
+    return ids, classes
+
+
+def _is_css(path: Path) -> bool:
+    return path.suffix in _CSS_EXTS or path.name.endswith(".module.css")
+
+
+def _eligible(path: Path, extensions: Iterable[str]) -> bool:
+    # 與 find_files_by_selector 相同：*.module.css 不論副檔名集合一律納入
+    return path.suffix in extensions or ".module.css" in path.name
+
+
+def scan_tokens(content: str, css: bool) -> tuple[List[str], List[str]]:
+    """單一檔案中的 (ids, classes)。"""
+    if css:
+        return sorted(set(_CSS_ID.findall(content))), sorted(set(_CSS_CLASS.findall(content)))
+    ids = set(_HTML_ID.findall(content))
+    classes: Set[str] = set()
+    for value in _HTML_CLASS.findall(content):
+        classes.update(value.split())
+    return sorted(ids), sorted(classes)
+
+
+class SourceIndex:
+    """srcRoot 下原始碼與樣式檔案的 id／class → 檔案索引。"""
+
+    def __init__(
+        self,
+        src_root: str,
+        extensions: Optional[Iterable[str]] = None,
+        cache_path: Optional[str] = None,
+    ) -> None:
+        self.src_root = src_root
+        self.extensions = frozenset(extensions) if extensions is not None else DEFAULT_EXTENSIONS
+        self.cache_path = cache_path
+        self.files: List[str] = []
+        self.stats = {"files": 0, "read": 0, "reused": 0}
+        self._order: Dict[str, int] = {}
+        self._entries: Dict[str, dict] = {}
+        self._ids: Dict[str, List[str]] = {}
+        self._classes: Dict[str, List[str]] = {}
+        self._text_hits: Dict[str, List[str]] = {}
+
+    # ─── build ───
+
+    def build(self) -> "SourceIndex":
+        root = Path(self.src_root) if self.src_root else None
+        self.files, self._order, self._entries = [], {}, {}
+        self._ids, self._classes, self._text_hits = {}, {}, {}
+        self.stats = {"files": 0, "read": 0, "reused": 0}
+        if root is None or not root.exists():
+            return self
+
+        cached = self._load_cache()
+        for path in root.rglob("*"):
+            if not _eligible(path, self.extensions) or not path.is_file():
+                continue
+            key = str(path)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entry = cached.get(key)
+            if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                self.stats["reused"] += 1
+            else:
+                entry = self._scan(path, st)
+                if entry is None:
+                    continue
+            self._order[key] = len(self.files)
+            self.files.append(key)
+            self._add(key, entry)
+        self.stats["files"] = len(self.files)
+        if self.cache_path and self.stats["read"]:
+            self._save_cache()
+        return self
+
+    def _scan(self, path: Path, st=None) -> Optional[dict]:
+        try:
+            content = path.read_text(encoding="utf-8")
+            st = st or path.stat()
+        except (OSError, UnicodeDecodeError):
+            return None
+        self.stats["read"] += 1
+        ids, classes = scan_tokens(content, _is_css(path))
+        return {"mtime": st.st_mtime_ns, "size": st.st_size, "ids": ids, "classes": classes}
+
+    def _add(self, key: str, entry: dict) -> None:
+        self._entries[key] = entry
+        for name in entry["ids"]:
+            self._ids.setdefault(name, []).append(key)
+        for name in entry["classes"]:
+            self._classes.setdefault(name, []).append(key)
+
+    def refresh(self, path: str) -> None:
+        """檔案寫回後重新索引（只讀這一個檔案）。"""
+        key = str(path)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            for table, names in ((self._ids, old["ids"]), (self._classes, old["classes"])):
+                for name in names:
+                    files = table.get(name, [])
+                    if key in files:
+                        files.remove(key)
+        self._text_hits = {}
+        entry = self._scan(Path(key))
+        if entry is None or key not in self._order:
+            return
+        self._entries[key] = entry
+        for table, names in ((self._ids, entry["ids"]), (self._classes, entry["classes"])):
+            for name in names:
+                files = table.setdefault(name, [])
+                files.append(key)
+                files.sort(key=self._order.__getitem__)
+
+    # ─── persisted cache ───
+
+    def _load_cache(self) -> Dict[str, dict]:
+        if not self.cache_path:
+            return {}
+        try:
+            data = json.loads(Path(self.cache_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != INDEX_VERSION or data.get("root") != str(Path(self.src_root).resolve()):
+            return {}
+        return data.get("files", {})
+
+    def _save_cache(self) -> None:
+        data = {"version": INDEX_VERSION, "root": str(Path(self.src_root).resolve()), "files": self._entries}
+        dump_json(self.cache_path, data, compact=True)
+
+    # ─── lookup ───
+
+    def find(self, selector: str, extensions: Optional[Iterable[str]] = None) -> List[str]:
+        """符合 ``selector`` 的檔案（走訪順序）；``extensions`` 預設為建立索引時的集合。"""
+        files = self._lookup(selector) if selector else []
+        if extensions is None:
+            return list(files)
+        return [f for f in files if _eligible(Path(f), extensions)]
+
+    def _lookup(self, selector: str) -> List[str]:
+        tokens = split_selector(selector)
+        if tokens is None:
+            return self._text_search(selector)
+        ids, classes = tokens
+        lists = [self._ids.get(name, []) for name in ids] + [self._classes.get(name, []) for name in classes]
+        files = min(lists, key=len)
+        for other in lists:
+            if other is not files:
+                members = set(other)
+                files = [f for f in files if f in members]
+        if not files and ids:
+            files = self._ids.get(ids[0], [])
+        return files
+
+    def _text_search(self, text: str) -> List[str]:
+        if text not in self._text_hits:
+            hits = []
+            for key in self.files:
+                try:
+                    if text in Path(key).read_text(encoding="utf-8"):
+                        hits.append(key)
+                except (OSError, UnicodeDecodeError):
+                    continue
+            self._text_hits[text] = hits
+        return self._text_hits[text]
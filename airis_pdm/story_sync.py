@@ -0,0 +1,146 @@
+"""
+Storybook 增量同步狀態（``aipdm push-stories --incremental``）。
+
+``snapshotDir/.stories-sync-state.json`` 依 story id 記錄：
+
+- ``probe``     — ``dom_extractor.DOM_PROBE_JS`` 的 DOM／CSS 雜湊（便宜的變更探測）
+- ``treeHash``  — 擷取到的 raw DOM tree 指紋
+- ``irHash``    — 產生的 IR 子樹指紋
+- ``name``      — ``Kind/Name``
+
+以及 ``order``：上一次 ``plugin-payload.json`` 中 children 對應的 story id 順序。
+增量同步時，未變更 story 的 IR 子樹直接取自上一次的 combined root，只有變更者重新擷取，
+再依 story 順序拼接回去。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .snapshot import SnapshotReader, write_atomic
+
+STATE_FILENAME = ".stories-sync-state.json"
+STATE_VERSION = 1
+
+
+def fingerprint(value: Any) -> str:
+    """canonical JSON 的 sha256（前 16 碼）。"""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _write_json_atomic(path: Path, data: Any, **dump_kwargs: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, json.dumps(data, ensure_ascii=False, **dump_kwargs))
+
+
+class StorySyncState:
+    """讀寫 ``.stories-sync-state.json``；檔案不存在、損毀或版本不符時視為空狀態。"""
+
+    def __init__(self, snapshot_dir: str | Path) -> None:
+        self.snapshot_dir = Path(snapshot_dir)
+        self.stories: Dict[str, Dict[str, Any]] = {}
+        self.order: List[str] = []
+
+    @property
+    def path(self) -> Path:
+        return self.snapshot_dir / STATE_FILENAME
+
+    @classmethod
+    def load(cls, snapshot_dir: str | Path) -> "StorySyncState":
+        state = cls(snapshot_dir)
+        try:
+            data = json.loads(state.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return state
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            return state
+        stories = data.get("stories")
+        order = data.get("order")
+        if isinstance(stories, dict) and isinstance(order, list):
+            state.stories = stories
+            state.order = [sid for sid in order if isinstance(sid, str)]
+        return state
+
+    def save(self) -> None:
+        _write_json_atomic(
+            self.path,
+            {"version": STATE_VERSION, "order": self.order, "stories": self.stories},
+            indent=2,
+            sort_keys=True,
+        )
+
+    def previous_root(self) -> Optional[dict]:
+        """上一次寫出的 combined root（``plugin-payload.json``）；與 ``order`` 對不上時回傳 None。"""
+        try:
+            # 只讀 plugin-payload（可為壓縮格式），不解析整份 IR
+            root = SnapshotReader(self.snapshot_dir).tree
+        except (OSError, ValueError):
+            return None
+        if not isinstance(root, dict) or not isinstance(root.get("children"), list):
+            return None
+        if len(root["children"]) != len(self.order):
+            return None
+        return root
+
+    def previous_subtrees(self, root: Optional[dict]) -> Dict[str, dict]:
+        """story id → 上一次的 IR 子樹（僅限指紋仍相符者，避免 payload 被手動修改後誤用）。"""
+        if root is None:
+            return {}
+        out: Dict[str, dict] = {}
+        for story_id, subtree in zip(self.order, root["children"]):
+            entry = self.stories.get(story_id) or {}
+            if isinstance(subtree, dict) and entry.get("irHash") == fingerprint(_without_position(subtree)):
+                out[story_id] = subtree
+        return out
+
+    def record(self, story_id: str, name: str, subtree: dict, tree_hash: Optional[str], probe: Optional[str]) -> None:
+        entry = self.stories.setdefault(story_id, {})
+        entry["name"] = name
+        entry["irHash"] = fingerprint(_without_position(subtree))
+        # None 表示本次未重新量測，沿用先前的值
+        if tree_hash is not None:
+            entry["treeHash"] = tree_hash
+        if probe is not None:
+            entry["probe"] = probe
+
+
+def _without_position(subtree: dict) -> dict:
+    """IR 子樹去掉根節點 layout.x／y（story 在 combined root 中的位置會隨順序改變）。"""
+    layout = subtree.get("layout")
+    if not isinstance(layout, dict):
+        return subtree
+    return {**subtree, "layout": {k: v for k, v in layout.items() if k not in ("x", "y")}}
+
+
+def _source_stem(path: str) -> str:
+    """``./src/Button.stories.tsx`` → ``button``；``src/Button.vue`` → ``button``。"""
+    name = PurePosixPath(path.replace("\\", "/")).name.lower()
+    return name.split(".", 1)[0]
+
+
+def stories_for_changed_files(stories: Iterable[dict], changed_files: Iterable[str]) -> Set[str]:
+    """依變更檔案提示挑出需重新擷取的 story id。
+
+    story 的 ``importPath`` 與變更檔案路徑相同（忽略開頭 ``./``），或兩者檔名主幹相同
+    （``Button.stories.ts`` 對應 ``Button.vue``／``Button.module.css``）即視為受影響。
+    """
+    changed = [c.replace("\\", "/") for c in changed_files if c]
+    changed_paths = {c[2:] if c.startswith("./") else c for c in changed}
+    changed_stems = {_source_stem(c) for c in changed}
+    selected: Set[str] = set()
+    for story in stories:
+        import_path = story.get("importPath") or ""
+        normalized = import_path[2:] if import_path.startswith("./") else import_path
+        if not normalized:
+            continue
+        if (
+            normalized in changed_paths
+            or any(p.endswith("/" + normalized) or normalized.endswith("/" + p) for p in changed_paths)
+            or _source_stem(normalized) in changed_stems
+        ):
+            selected.add(story["id"])
+    return selected
@@ -7,10 +7,11 @@ ThemeManager — 設計標記 (Design Tokens) 抽象化
 
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .token_export import extract_tokens_from_ir, tokens_to_css
 from .design_assets import extract_design_tokens_from_ir
@@ -61,10 +62,18 @@ class ThemeManager:
         self._font_size_to_var: Dict[Any, str] = {}
         self._spacing_to_var: Dict[Any, str] = {}
         self._raw_tokens: Dict[str, Any] = {}
+        # 每次載入 token 遞增；fingerprint() 依此重新計算
+        self.revision = 0
+        self._fingerprint: Optional[Tuple[int, str]] = None
 
     def load_from_ir(self, ir_doc: dict) -> None:
         """從 IR 文件萃取出 tokens 並建立 數值 → CSS 變數 對照。"""
-        self._raw_tokens = extract_tokens_from_ir(ir_doc)
+        self.load_tokens(extract_tokens_from_ir(ir_doc))
+
+    def load_tokens(self, tokens: dict) -> None:
+        """以已萃取的 tokens（``extract_tokens_from_ir`` 格式）建立 數值 → CSS 變數 對照。"""
+        self._raw_tokens = tokens
+        self.revision += 1
         colors = self._raw_tokens.get("colors") or []
         for i, c in enumerate(colors):
             key = _normalize_color_for_key(c)
@@ -82,6 +91,7 @@ class ThemeManager:
         從 Pencil AI 的 variables（若有）載入全域變數。
         預期格式例如 [{"name": "primaryColor", "value": "#137333"}, ...]。
         """
+        self.revision += 1
         for v in variables or []:
             name = v.get("name", "").replace(" ", "-").lower()
             if not name:
@@ -93,6 +103,29 @@ class ThemeManager:
                     self._color_to_var[key] = f"var({self.css_prefix}-{name})"
                     self._raw_tokens.setdefault("colors", []).append(val)
 
+    def fingerprint(self) -> str:
+        """穩定的 token 對照指紋；對照表內容相同即相同（供 codegen 快取與 ``_style_dict`` 記憶化的鍵使用）。
+
+        依 ``revision`` 快取，載入 token 後才重新計算。
+        """
+        if self._fingerprint is not None and self._fingerprint[0] == self.revision:
+            return self._fingerprint[1]
+        payload = json.dumps(
+            [
+                self.css_prefix,
+                sorted(self._color_to_var.items()),
+                sorted((repr(k), v) for k, v in self._font_size_to_var.items()),
+                sorted((repr(k), v) for k, v in self._spacing_to_var.items()),
+                self._raw_tokens,
+            ],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        self._fingerprint = (self.revision, digest)
+        return digest
+
     def resolve_color(self, color_value: str) -> str:
         """若該顏色已註冊為 token，回傳 var(--token-xxx)，否則回傳原值。"""
         key = _normalize_color_for_key(color_value)
@@ -8,6 +8,9 @@ import json
 import os
 from typing import Any, Optional
 
+from .ir_walk import iter_nodes
+from .snapshot import load_json, resolve_snapshot_path
+
 
 def _normalize_color(c: Any) -> Optional[str]:
     """將顏色正規化為字串（支援 rgb/rgba 字串或 {r,g,b,a} 物件）。"""
@@ -27,7 +30,7 @@ def _normalize_color(c: Any) -> Optional[str]:
 
 
 def _collect_tokens_from_node(node: dict, out: dict) -> None:
-    """遞迴走訪 IR 節點，收集 colors / typography / spacing。"""
+    """收集單一 IR 節點的 colors / typography / spacing（供 ir_walk 走訪時逐節點呼叫）。"""
     # 顏色：styles.fills (SOLID)、styles.backgroundColor（舊格式）、text.color
     styles = node.get("styles") or {}
     fills = styles.get("fills") or []
@@ -67,16 +70,9 @@ def _collect_tokens_from_node(node: dict, out: dict) -> None:
         if s is not None and s not in out["spacing"]:
             out["spacing"].append(s)
 
-    for child in node.get("children") or []:
-        _collect_tokens_from_node(child, out)
-
 
-def extract_tokens_from_ir(ir_doc: dict) -> dict:
-    """
-    從 IR 文件萃取出 design tokens（colors, typography, spacing）。
-    回傳結構：{ colors: [], typography: { fontFamilies, fontSizes, fontWeights, lineHeights }, spacing: [] }
-    """
-    out = {
+def _empty_tokens() -> dict:
+    return {
         "colors": [],
         "typography": {
             "fontFamilies": [],
@@ -86,14 +82,27 @@ def extract_tokens_from_ir(ir_doc: dict) -> dict:
         },
         "spacing": [],
     }
+
+
+def extract_tokens_from_ir(ir_doc: dict) -> dict:
+    """
+    從 IR 文件萃取出 design tokens（colors, typography, spacing）。
+    回傳結構：{ colors: [], typography: { fontFamilies, fontSizes, fontWeights, lineHeights }, spacing: [] }
+    """
+    out = _empty_tokens()
     tree = ir_doc.get("tree")
     # 相容：若檔案為單一節點（無 version/tree），則整份當作根節點
     if not tree and ("children" in ir_doc or "styles" in ir_doc):
         tree = ir_doc
     if not tree:
         return out
-    _collect_tokens_from_node(tree, out)
-    # 排序以便輸出穩定
+    for node in iter_nodes(tree):
+        _collect_tokens_from_node(node, out)
+    return _finalize_tokens(out)
+
+
+def _finalize_tokens(out: dict) -> dict:
+    """排序以便輸出穩定（``_collect_tokens_from_node`` 走訪完成後呼叫）。"""
     out["typography"]["fontSizes"] = sorted(out["typography"]["fontSizes"])
     out["typography"]["fontWeights"] = sorted(out["typography"]["fontWeights"])
     def _line_height_key(x):
@@ -134,19 +143,14 @@ def export_tokens(
     css_prefix: str = "--token",
 ) -> str:
     """
-    從 IR 檔案或目錄（內含 figma-import-payload.json）讀取，萃出 tokens 並寫入 output_path。
+    從 IR 檔案或目錄（內含 figma-import-payload.json，可為 .gz／.zst 壓縮）讀取，萃出 tokens 並寫入 output_path。
     format: "json" | "css"
     回傳寫入的絕對路徑。
     """
-    if os.path.isdir(ir_path_or_dir):
-        ir_path = os.path.join(ir_path_or_dir, "figma-import-payload.json")
-    else:
-        ir_path = ir_path_or_dir
-    if not os.path.isfile(ir_path):
-        raise FileNotFoundError(f"IR 檔案不存在: {ir_path}")
-
-    with open(ir_path, "r", encoding="utf-8") as f:
-        ir_doc = json.load(f)
+    ir_path = resolve_snapshot_path(ir_path_or_dir)
+    if ir_path is None:
+        raise FileNotFoundError(f"IR 檔案不存在: {ir_path_or_dir}")
+    ir_doc = load_json(ir_path)
 
     tokens = extract_tokens_from_ir(ir_doc)
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
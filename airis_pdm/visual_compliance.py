@@ -14,7 +14,10 @@ import logging
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from .dom_extractor import BrowserPool
 
 logger = logging.getLogger(__name__)
 
@@ -38,27 +41,29 @@ async def _screenshot_url(
     url: str,
     viewport_width: int = 1280,
     viewport_height: int = 720,
-    wait_until: str = "networkidle",
+    readiness: str = "auto",
     timeout_ms: int = 30000,
+    pool: Optional["BrowserPool"] = None,
 ) -> bytes:
-    """使用 Playwright 截取指定 URL 的畫面。"""
-    try:
-        from playwright.async_api import async_playwright
-    except ImportError:
-        raise ImportError(
-            "playwright 為必要依賴。請執行: pip install playwright && playwright install chromium"
-        )
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            viewport={"width": viewport_width, "height": viewport_height}
-        )
-        page = await context.new_page()
-        await page.goto(url, wait_until=wait_until, timeout=timeout_ms)
-        await page.wait_for_timeout(500)
-        screenshot_bytes = await page.screenshot(full_page=False)
-        await browser.close()
-    return screenshot_bytes
+    """使用 Playwright 截取指定 URL 的畫面；傳入 ``pool`` 時重用其瀏覽器，否則本次啟動後關閉。
+
+    ``readiness`` 同 ``ExtractionConfig.readiness``（``"networkidle"`` 為舊行為）。
+    """
+    from .dom_extractor import BrowserPool, ExtractionConfig
+    from .readiness import load_and_wait
+
+    if pool is None:
+        async with BrowserPool() as own_pool:
+            return await _screenshot_url(url, viewport_width, viewport_height, readiness, timeout_ms, pool=own_pool)
+    config = ExtractionConfig(
+        viewport_width=viewport_width,
+        viewport_height=viewport_height,
+        wait_timeout_ms=timeout_ms,
+        readiness=readiness,
+    )
+    async with pool.page(viewport_width, viewport_height) as page:
+        await load_and_wait(page, url, config)
+        return await page.screenshot(full_page=False)
 
 
 def _load_image(path_or_bytes: str | bytes) -> "Image.Image":
@@ -102,6 +107,8 @@ async def run_visual_compliance(
     viewport_width: int = 1280,
     viewport_height: int = 720,
     on_failure_analyze: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    pool: Optional["BrowserPool"] = None,
+    readiness: str = "auto",
 ) -> VisualComplianceResult:
     """
     執行視覺合規檢查：比對參考圖與實際渲染頁面。
@@ -112,6 +119,8 @@ async def run_visual_compliance(
     - pixel_diff_threshold: 可接受之像素差異比例上限（0.01 = 1%）
     - on_failure_analyze: 比對失敗時呼叫，傳入 error 字典（含 message、diff_ratio、paths），
                           可轉交 RootCauseAnalyzer.analyze(error, [], {})
+    - pool: 共用的 dom_extractor.BrowserPool；多次比對時避免每次重新啟動 Chromium
+    - readiness: 截圖前的就緒偵測步驟（見 readiness.py；"networkidle" 為舊行為）
     """
     if not os.path.isfile(reference_image_path):
         return VisualComplianceResult(
@@ -124,6 +133,8 @@ async def run_visual_compliance(
         live_url,
         viewport_width=viewport_width,
         viewport_height=viewport_height,
+        readiness=readiness,
+        pool=pool,
     )
     actual_img = _load_image(actual_bytes)
     diff_ratio, diff_image = _pixel_diff_ratio(ref_img, actual_img)
@@ -0,0 +1 @@
+"""效能 micro-benchmark（不隨套件發佈；於 repo root 以 ``python -m benchmarks.<name>`` 執行）。"""
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+css_serializer.py — StyleSheet CSS 序列化 micro-benchmark
+
+用途：
+  python -m benchmarks.css_serializer [--rules 100000] [--calls 5] [--seed 0]
+
+比較：
+  legacy    — 舊版 to_css：每次呼叫都排序所有 class 名稱，並以
+              ``_CSS_PROP_ORDER.index``（線性掃描）排序每條規則的屬性
+  compiled  — 現行 StyleSheet：屬性 rank 表、加入規則時即序列化、
+              to_css 輸出快取至下一次 add_node
+
+同一頁面 to_css 會被呼叫多次（元件檔、module.css、app.css），故以 ``--calls`` 次計時。
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from airis_pdm.generator import _CSS_PROP_ORDER, StyleSheet
+
+_EXTRA_PROPS = ["z-index", "overflow", "cursor", "transition"]
+
+
+def _legacy_sort_key(prop: str) -> tuple[int, str]:
+    try:
+        return (_CSS_PROP_ORDER.index(prop), prop)
+    except ValueError:
+        return (len(_CSS_PROP_ORDER), prop)
+
+
+def legacy_to_css(rules: Dict[str, Dict[str, str]]) -> str:
+    blocks = []
+    for class_name in sorted(rules.keys()):
+        styles = rules[class_name]
+        if not styles:
+            continue
+        body = "\n".join(f"  {prop}: {styles[prop]};" for prop in sorted(styles.keys(), key=_legacy_sort_key))
+        blocks.append(f".{class_name} {{\n{body}\n}}")
+    return "\n\n".join(blocks) + "\n" if blocks else ""
+
+
+def synthetic_rules(count: int, seed: int = 0) -> list[tuple[str, Dict[str, str]]]:
+    """``count`` 組 (class base, declarations)，屬性順序打亂、約 8 條宣告。"""
+    rng = random.Random(seed)
+    props = _CSS_PROP_ORDER + _EXTRA_PROPS
+    out = []
+    for i in range(count):
+        chosen = rng.sample(props, 8)
+        out.append((f"node-{i % 97}", {p: f"{rng.randint(0, 400)}px" for p in chosen}))
+    return out
+
+
+def run(rules: int = 100_000, calls: int = 5, seed: int = 0) -> dict:
+    data = synthetic_rules(rules, seed)
+
+    start = time.perf_counter()
+    sheet = StyleSheet(prefix="bench")
+    for base, styles in data:
+        sheet.add_rule(base, styles)
+    compiled_add = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(calls):
+        compiled_css = sheet.to_css()
+    compiled_css_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        legacy_css = legacy_to_css(sheet.rules)
+    legacy_time = time.perf_counter() - start
+
+    if legacy_css != compiled_css:
+        raise AssertionError("compiled serializer output differs from legacy output")
+    compiled_total = compiled_add + compiled_css_time
+    return {
+        "rules": rules,
+        "calls": calls,
+        "legacy_s": round(legacy_time, 4),
+        "compiled_add_s": round(compiled_add, 4),
+        "compiled_to_css_s": round(compiled_css_time, 4),
+        "speedup_to_css": round(legacy_time / compiled_css_time, 1) if compiled_css_time else None,
+        "speedup_total": round(legacy_time / compiled_total, 2) if compiled_total else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="StyleSheet CSS serializer micro-benchmark")
+    parser.add_argument("--rules", type=int, default=100_000, help="規則數（預設 100000）")
+    parser.add_argument("--calls", type=int, default=5, help="每頁 to_css 呼叫次數（預設 5）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = run(args.rules, args.calls, args.seed)
+    print(f"rules={result['rules']} calls={result['calls']}")
+    print(f"  legacy   to_css x{result['calls']}: {result['legacy_s']:.3f}s")
+    print(f"  compiled add_rule (serialize once): {result['compiled_add_s']:.3f}s")
+    print(f"  compiled to_css x{result['calls']}: {result['compiled_to_css_s']:.3f}s")
+    print(f"  speedup: to_css {result['speedup_to_css']}x, including add-time serialization {result['speedup_total']}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
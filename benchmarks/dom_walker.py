@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+dom_walker.py — DOM_WALKER_V2_JS in-browser walker benchmark
+
+用途：
+  python -m benchmarks.dom_walker [--elements 20000] [--repeat 3] [--seed 0]
+  python -m benchmarks.dom_walker --write-page page.html   # 只輸出測試頁面
+  python -m benchmarks.dom_walker --legacy-rev <rev>       # 改以 git 歷史中的版本為基準
+
+比較（同一個 headless Chromium 分頁、同一份頁面）：
+  legacy   — ``dom_walker_legacy.js``（單趟 walker 改寫前的 ``DOM_WALKER_V2_JS``）：每個子元素重掃
+             ``parent.children`` 算 sibling index、每個元素都呼叫 ``getComputedStyle(el, '::before' / '::after')``；
+             ``--legacy-rev`` 改由 ``git show <rev>:airis_pdm/dom_extractor.py`` 取出（需在 git checkout 中執行）
+  current  — ``dom_extractor.DOM_WALKER_V2_JS``：每個 parent 一次算完 sibling index、
+             root CSS 變數只解析一次、只有可能命中 ::before/::after 規則的元素才查 pseudo
+
+頁面為寬列表（數百個同層 ``li``）＋巢狀卡片，少數元素帶 ``::before``，
+並以 ``window.getComputedStyle`` 計數器回報兩版的呼叫次數。
+兩版輸出必須相同，否則視為失敗。需要 ``playwright`` 與已安裝的 Chromium。
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from airis_pdm.dom_extractor import DOM_WALKER_V2_JS, BrowserPool, ExtractionConfig, walker_config
+
+LEGACY_JS_PATH = Path(__file__).resolve().parent / "dom_walker_legacy.js"
+
+_PAGE_CSS = """
+:root { --primary: #2563eb; --secondary: #64748b; --radius: 8px; --font-sans: Inter, sans-serif; }
+body { margin: 0; font-family: var(--font-sans); }
+.list { display: flex; flex-direction: column; gap: 4px; padding: 8px; }
+.grid { display: grid; grid-template-columns: repeat(4, 1fr); gap: 8px; }
+.card { border: 1px solid #e2e8f0; border-radius: var(--radius); padding: 12px; box-shadow: 0 1px 2px rgba(0,0,0,.1); }
+.row { display: flex; align-items: center; gap: 8px; }
+.badge::before { content: "•"; color: var(--primary); margin-right: 4px; }
+.title { font-weight: 600; color: #0f172a; }
+.muted { color: var(--secondary); font-size: 12px; }
+"""
+
+# 每段 block 的元素數：section + ul + 每列 (li + span.badge + span.title + span.muted)
+_ROW_ELEMENTS = 4
+
+
+def synthetic_page(elements: int = 20_000, seed: int = 0) -> str:
+    """產生恰好 ``elements`` 個 ``<body>`` 內元素的 HTML（寬列表與卡片格交錯）。"""
+    rng = random.Random(seed)
+    parts: list[str] = ['<div id="app">']
+    count = 1
+    block = 0
+    while count < elements:
+        remaining = elements - count
+        if block % 2 == 0 and remaining >= 2 + _ROW_ELEMENTS:
+            rows = min(rng.randint(200, 600), (remaining - 2) // _ROW_ELEMENTS)
+            parts.append('<section class="list"><ul>')
+            for i in range(rows):
+                badge = ' class="badge"' if i % 10 == 0 else ""
+                parts.append(
+                    f'<li class="row"><span{badge}>{i}</span>'
+                    f'<span class="title">Item {block}-{i}</span>'
+                    f'<span class="muted">{rng.randint(1, 999)} views</span></li>'
+                )
+            parts.append("</ul></section>")
+            count += 2 + rows * _ROW_ELEMENTS
+        elif remaining >= 1 + 3:
+            cards = min(rng.randint(8, 32), (remaining - 1) // 3)
+            parts.append('<div class="grid">')
+            for i in range(cards):
+                parts.append(f'<div class="card"><h3 class="title">Card {i}</h3><p class="muted">Body</p></div>')
+            parts.append("</div>")
+            count += 1 + cards * 3
+        else:
+            parts.append("<div></div>" * remaining)
+            count += remaining
+        block += 1
+    parts.append("</div>")
+    return (
+        "<!doctype html><html><head><meta charset=\"utf-8\">"
+        f"<style>{_PAGE_CSS}</style></head><body>{''.join(parts)}</body></html>"
+    )
+
+
+def legacy_walker_js(rev: str | None = None) -> str:
+    """基準 walker：預設為 ``dom_walker_legacy.js``；指定 ``rev`` 時取該版本 ``dom_extractor.py`` 的
+    ``DOM_WALKER_V2_JS`` 字串（只解析，不 import）。"""
+    if rev is None:
+        return LEGACY_JS_PATH.read_text(encoding="utf-8")
+    source = subprocess.run(
+        ["git", "show", f"{rev}:airis_pdm/dom_extractor.py"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "DOM_WALKER_V2_JS" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"DOM_WALKER_V2_JS not found in {rev}:airis_pdm/dom_extractor.py")
+
+
+_COUNT_GCS_JS = """
+() => {
+    if (window.__gcsCount !== undefined) return;
+    const orig = window.getComputedStyle;
+    window.__gcsCount = 0;
+    window.getComputedStyle = function (...args) {
+        window.__gcsCount++;
+        return orig.apply(this, args);
+    };
+}
+"""
+
+
+async def _run_async(elements: int, repeat: int, seed: int, legacy_rev: str | None) -> dict:
+    config = ExtractionConfig(root_selector="#app")
+    js_config = walker_config(config)
+    walkers = {"legacy": legacy_walker_js(legacy_rev), "current": DOM_WALKER_V2_JS}
+    timings: dict[str, float] = {}
+    calls: dict[str, int] = {}
+    outputs: dict[str, str] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        page_path = Path(tmp) / "page.html"
+        page_path.write_text(synthetic_page(elements, seed), encoding="utf-8")
+        async with BrowserPool() as pool:
+            async with pool.page(config.viewport_width, config.viewport_height) as page:
+                await page.goto(page_path.as_uri(), wait_until="load")
+                await page.evaluate(_COUNT_GCS_JS)
+                for name, js in walkers.items():
+                    best = float("inf")
+                    for _ in range(repeat):
+                        await page.evaluate("() => { window.__gcsCount = 0; }")
+                        start = time.perf_counter()
+                        tree = await page.evaluate(js, js_config)
+                        best = min(best, time.perf_counter() - start)
+                    timings[name] = best
+                    calls[name] = await page.evaluate("() => window.__gcsCount")
+                    outputs[name] = json.dumps(tree, sort_keys=True)
+
+    if outputs["legacy"] != outputs["current"]:
+        raise AssertionError("current walker output differs from legacy output")
+    return {
+        "elements": elements,
+        "repeat": repeat,
+        "legacy_s": round(timings["legacy"], 4),
+        "current_s": round(timings["current"], 4),
+        "legacy_getComputedStyle": calls["legacy"],
+        "current_getComputedStyle": calls["current"],
+        "speedup": round(timings["legacy"] / timings["current"], 2) if timings["current"] else None,
+    }
+
+
+def run(elements: int = 20_000, repeat: int = 3, seed: int = 0, legacy_rev: str | None = None) -> dict:
+    return asyncio.run(_run_async(elements, repeat, seed, legacy_rev))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="In-browser DOM walker benchmark")
+    parser.add_argument("--elements", type=int, default=20_000, help="頁面元素數（預設 20000）")
+    parser.add_argument("--repeat", type=int, default=3, help="每版重複次數，取最快（預設 3）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--legacy-rev", help="以此 git revision 的 walker 為基準（預設 dom_walker_legacy.js）")
+    parser.add_argument("--write-page", metavar="PATH", help="只寫出測試頁面，不執行 benchmark")
+    args = parser.parse_args(argv)
+
+    if args.write_page:
+        Path(args.write_page).write_text(synthetic_page(args.elements, args.seed), encoding="utf-8")
+        print(f"wrote {args.write_page} ({args.elements} elements)")
+        return 0
+
+    result = run(args.elements, args.repeat, args.seed, args.legacy_rev)
+    print(f"elements={result['elements']} repeat={result['repeat']}")
+    print(f"  legacy : {result['legacy_s']:.3f}s  getComputedStyle x{result['legacy_getComputedStyle']}")
+    print(f"  current: {result['current_s']:.3f}s  getComputedStyle x{result['current_getComputedStyle']}")
+    print(f"  speedup: {result['speedup']}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
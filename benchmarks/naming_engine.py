@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+naming_engine.py — NamingEngine 命名 micro-benchmark（Tailwind 頁面，見 ``synthetic.tailwind_dom``）
+
+用途：
+  python -m benchmarks.naming_engine [--nodes 10000] [--shape balanced] [--repeat 3] [--seed 0]
+
+比較：
+  legacy    — 舊版：每個 class token 都把 ~90 個 ``ignore_class_prefixes`` 逐一 lower() 後 startswith，
+              每個節點都重新解析
+  compiled  — 現行 NamingEngine：prefix 編譯成單一 tuple、名稱依 (tag, class, id, 組件…) LRU 快取
+
+量測兩項（皆取 ``--repeat`` 次中最快；每次使用新的 engine，快取從空開始）：
+  resolve   — 對每個節點呼叫 ``resolve_name``
+  ir_build  — ``IRBuilderV2.build`` 全流程（命名為 ``_convert_node`` 中的一部分）
+
+兩種實作的名稱與 IR 必須完全相同，否則拋出 AssertionError。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from airis_pdm.ir_builder import IRBuilderV2
+from airis_pdm.naming_engine import NamingEngine
+from benchmarks import synthetic
+
+
+class LegacyNamingEngine(NamingEngine):
+    """舊版命名：不快取、逐一比對 prefix。"""
+
+    def _resolve_local_name(
+        self,
+        *,
+        tag: str,
+        attrs: dict,
+        component_name: Optional[str],
+        sibling_index: int,
+        sibling_tag_count: int,
+    ) -> str:
+        explicit_name = attrs.get("data-figma-name", "").strip()
+        if explicit_name:
+            return self._sanitize(explicit_name)
+        if component_name and component_name not in ("div", "span", "template"):
+            return self._to_pascal_case(component_name)
+        node_id = attrs.get("id", "").strip()
+        if node_id:
+            return self._to_pascal_case(node_id)
+        class_name = self._extract_semantic_class(attrs.get("class", ""))
+        if class_name:
+            return self._to_pascal_case(class_name)
+        role = attrs.get("role", "").strip()
+        if role:
+            return self._to_pascal_case(role)
+        semantic = self.config.semantic_tags.get(tag.lower())
+        if semantic:
+            if sibling_tag_count > 1:
+                return f"{semantic}_{sibling_index + 1}"
+            return semantic
+        if sibling_tag_count > 1:
+            return f"{tag}_{sibling_index + 1}"
+        return tag
+
+    def _is_utility_class(self, cls: str) -> bool:
+        cls_lower = cls.lower()
+        for prefix in self.config.ignore_class_prefixes:
+            if cls_lower.startswith(prefix.lower()):
+                return True
+        if len(cls) <= 2 or cls.isdigit():
+            return True
+        return False
+
+
+def _flatten(root: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("children") or [])
+    return nodes
+
+
+def _resolve_all(engine: NamingEngine, nodes: List[Dict[str, Any]]) -> List[str]:
+    return [
+        engine.resolve_name(
+            parent_path="",
+            tag=n["tag"],
+            attrs=n["attrs"],
+            component_name=n.get("componentName"),
+            sibling_index=n.get("siblingIndex", 0),
+            sibling_tag_count=n.get("siblingTagCount", 1),
+        )
+        for n in nodes
+    ]
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def run(nodes: int = 10_000, shape: str = "balanced", repeat: int = 3, seed: int = 0) -> dict:
+    root = synthetic.tailwind_dom(nodes, shape, seed)
+    flat = _flatten(root)
+    viewport = {"width": 1440, "height": 900}
+
+    legacy_resolve, legacy_names = _best(lambda: _resolve_all(LegacyNamingEngine(), flat), repeat)
+    compiled_resolve, compiled_names = _best(lambda: _resolve_all(NamingEngine(), flat), repeat)
+    if legacy_names != compiled_names:
+        raise AssertionError("compiled NamingEngine names differ from legacy names")
+
+    def build(engine_cls: type) -> dict:
+        doc = IRBuilderV2(naming_engine=engine_cls()).build(raw_tree=root, viewport=viewport)
+        doc["source"].pop("generatedAt")
+        return doc
+
+    legacy_build, legacy_doc = _best(lambda: build(LegacyNamingEngine), repeat)
+    compiled_build, compiled_doc = _best(lambda: build(NamingEngine), repeat)
+    if legacy_doc != compiled_doc:
+        raise AssertionError("IR built with compiled NamingEngine differs from legacy IR")
+
+    return {
+        "nodes": nodes,
+        "shape": shape,
+        "legacy_resolve_s": round(legacy_resolve, 4),
+        "compiled_resolve_s": round(compiled_resolve, 4),
+        "speedup_resolve": round(legacy_resolve / compiled_resolve, 1) if compiled_resolve else None,
+        "legacy_build_s": round(legacy_build, 4),
+        "compiled_build_s": round(compiled_build, 4),
+        "speedup_build": round(legacy_build / compiled_build, 2) if compiled_build else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="NamingEngine micro-benchmark on a Tailwind-heavy DOM")
+    parser.add_argument("--nodes", type=int, default=10_000, help="節點數（預設 10000）")
+    parser.add_argument("--shape", default="balanced", choices=synthetic.SHAPES)
+    parser.add_argument("--repeat", type=int, default=3, help="重複次數，取最快（預設 3）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = run(args.nodes, args.shape, args.repeat, args.seed)
+    print(f"nodes={result['nodes']} shape={result['shape']}")
+    print(f"  resolve_name  legacy {result['legacy_resolve_s']:.3f}s  compiled {result['compiled_resolve_s']:.3f}s"
+          f"  ({result['speedup_resolve']}x)")
+    print(f"  IR build      legacy {result['legacy_build_s']:.3f}s  compiled {result['compiled_build_s']:.3f}s"
+          f"  ({result['speedup_build']}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
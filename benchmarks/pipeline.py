@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+pipeline.py — IR → code 全流程 benchmark（合成大型輸入，見 ``benchmarks.synthetic``）
+
+用途：
+  python -m benchmarks.pipeline [--sizes 1000,10000] [--shapes wide,balanced,deep]
+                                [--cases pencil_to_ir,codegen_vue,...] [--repeat 3] [--seed 0]
+                                [--output results.json] [--baseline benchmarks/baseline.json]
+                                [--save-baseline benchmarks/baseline.json] [--tolerance 0.25]
+
+量測項目（``CASES``）：
+  pencil_to_ir             PencilToIR.convert（.pen batch_get）
+  figma_to_ir              FigmaToIR.convert（Figma file JSON）
+  codegen_<target>         generate_from_ir，target = vue／react／html／flutter（寫入暫存目錄）
+  validate_ui_ir           validate_ui_ir
+  skills                   AllInOneSkill（anatomy／api-spec／color／properties／structure／screen-reader）
+  skill_react／skill_vue    ReactGeneratorSkill／VueGeneratorSkill（於暫存目錄執行）
+  pixel_vue／pixel_react    pixel renderer（Figma frame）
+  stylesheet_css           StyleSheet.add_rule + to_css（規則數 = size，見 css_serializer）
+  ir_build                 IRBuilderV2.build（Tailwind raw DOM，見 synthetic.tailwind_dom／naming_engine）
+
+每項取 ``--repeat`` 次中最快的一次（輸入於計時外產生；每次前清除 _style_dict 記憶）。
+結果以 JSON 輸出；指定 ``--baseline`` 時與之比對，任一項慢於 baseline ×(1 + tolerance)
+且差距超過 ``--min-delta`` 秒即視為退步。
+
+``benchmarks/baseline.json`` 為在參考機器上以預設參數產出的結果，僅供同一台機器比對；
+換機器請以 ``--save-baseline`` 重新產生。
+
+退出碼：
+  0 = 無退步（或未指定 baseline）
+  1 = 有退步
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import synthetic
+
+RESULT_SCHEMA = 1
+DEFAULT_SIZES = (1_000, 10_000)
+MAX_SIZE = 1_000_000
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# case → (輸入格式, 以該輸入與暫存目錄執行一次的函式)
+Runner = Callable[[Any, Path], Any]
+
+
+def _pencil_to_ir(pen: Any, _tmp: Path) -> Any:
+    from airis_pdm.pencil_reader import PencilToIR
+
+    return PencilToIR().convert(pen)
+
+
+def _figma_to_ir(file_json: Any, _tmp: Path) -> Any:
+    from airis_pdm.figma_reader import FigmaToIR
+
+    return FigmaToIR().convert(synthetic.figma_frame(file_json))
+
+
+def _codegen(target: str) -> Runner:
+    def run(ir_doc: Any, tmp: Path) -> Any:
+        from airis_pdm.generator import generate_from_ir
+
+        return generate_from_ir(ir_doc["tree"], target=target, output_dir=str(tmp / "out"))
+
+    return run
+
+
+def _validate_ui_ir(root: Any, _tmp: Path) -> Any:
+    from airis_pdm.figmai.ir_contract import validate_ui_ir
+
+    return validate_ui_ir(root)
+
+
+def _skills(root: Any, _tmp: Path) -> Any:
+    from airis_pdm.figmai.skills import AllInOneSkill, SkillInput
+
+    return AllInOneSkill().execute(SkillInput(), root)
+
+
+def _generator_skill(name: str) -> Runner:
+    def run(root: Any, tmp: Path) -> Any:
+        from airis_pdm.figmai import skills
+
+        skill = getattr(skills, name)()
+        # 產生器 skill 固定寫入 ./generated/skill-*，於暫存目錄執行以免污染工作目錄
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            return skill.execute(skills.SkillInput(), root)
+        finally:
+            os.chdir(cwd)
+
+    return run
+
+
+def _pixel_vue(file_json: Any, _tmp: Path) -> Any:
+    from airis_pdm.figmai.renderers.pixel_vue import render_pixel_vue_sfc
+
+    return render_pixel_vue_sfc(synthetic.figma_frame(file_json))
+
+
+def _pixel_react(file_json: Any, _tmp: Path) -> Any:
+    from airis_pdm.figmai.renderers.pixel_react import render_pixel_react_component
+
+    return render_pixel_react_component(synthetic.figma_frame(file_json))
+
+
+def _stylesheet_css(rules: Any, _tmp: Path) -> Any:
+    from airis_pdm.generator import StyleSheet
+
+    sheet = StyleSheet(prefix="bench")
+    for base, styles in rules:
+        sheet.add_rule(base, styles)
+    return sheet.to_css()
+
+
+def _ir_build(raw_tree: Any, _tmp: Path) -> Any:
+    from airis_pdm.ir_builder import IRBuilderV2
+
+    return IRBuilderV2().build(raw_tree=raw_tree, viewport={"width": 1440, "height": 900})
+
+
+def _css_rules(n: int, _shape: str, seed: int) -> Any:
+    from benchmarks.css_serializer import synthetic_rules
+
+    return synthetic_rules(n, seed)
+
+
+INPUTS: Dict[str, Callable[[int, str, int], Any]] = {
+    "pen": synthetic.pen_nodes,
+    "figma": synthetic.figma_file,
+    "ir": synthetic.airis_ir,
+    "ui_ir": synthetic.ui_ir,
+    "css_rules": _css_rules,
+    "dom": synthetic.tailwind_dom,
+}
+
+CASES: Dict[str, Tuple[str, Runner]] = {
+    "pencil_to_ir": ("pen", _pencil_to_ir),
+    "figma_to_ir": ("figma", _figma_to_ir),
+    "codegen_vue": ("ir", _codegen("vue")),
+    "codegen_react": ("ir", _codegen("react")),
+    "codegen_html": ("ir", _codegen("html")),
+    "codegen_flutter": ("ir", _codegen("flutter")),
+    "validate_ui_ir": ("ui_ir", _validate_ui_ir),
+    "skills": ("ui_ir", _skills),
+    "skill_react": ("ui_ir", _generator_skill("ReactGeneratorSkill")),
+    "skill_vue": ("ui_ir", _generator_skill("VueGeneratorSkill")),
+    "pixel_vue": ("figma", _pixel_vue),
+    "pixel_react": ("figma", _pixel_react),
+    "stylesheet_css": ("css_rules", _stylesheet_css),
+    "ir_build": ("dom", _ir_build),
+}
+
+
+def _fresh_state() -> None:
+    from airis_pdm.generator import _clear_style_memo
+
+    _clear_style_memo()
+
+
+def time_case(runner: Runner, data: Any, repeat: int) -> List[float]:
+    """執行 ``repeat`` 次並回傳每次秒數；每次使用新的暫存目錄。"""
+    runs: List[float] = []
+    for _ in range(repeat):
+        tmp = Path(tempfile.mkdtemp(prefix="aipdm-bench-"))
+        try:
+            _fresh_state()
+            start = time.perf_counter()
+            runner(data, tmp)
+            runs.append(time.perf_counter() - start)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    return runs
+
+
+def run(
+    sizes: List[int],
+    shapes: List[str],
+    cases: List[str],
+    repeat: int = 3,
+    seed: int = 0,
+    log: Optional[Callable[[str], Any]] = None,
+) -> dict:
+    """依 size × shape × case 量測並回傳結果文件（``RESULT_SCHEMA`` 格式）。"""
+    results: List[dict] = []
+    for size in sizes:
+        for shape in shapes:
+            inputs: Dict[str, Any] = {}
+            for case in cases:
+                kind, runner = CASES[case]
+                if kind == "css_rules" and shape != shapes[0]:
+                    continue  # 規則列表與樹形無關，每個 size 只量一次
+                if kind not in inputs:
+                    inputs[kind] = INPUTS[kind](size, shape, seed)
+                entry: Dict[str, Any] = {"case": case, "size": size, "shape": shape}
+                try:
+                    runs = time_case(runner, inputs[kind], repeat)
+                except Exception as e:  # noqa: BLE001 — 記錄失敗（例如遞迴上限）而非中止整個 suite
+                    entry["error"] = f"{type(e).__name__}: {e}"[:200]
+                else:
+                    entry["seconds"] = round(min(runs), 6)
+                    entry["runs"] = [round(r, 6) for r in runs]
+                results.append(entry)
+                if log:
+                    log(_format_entry(entry))
+    return {
+        "schema": RESULT_SCHEMA,
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+def _key(entry: dict) -> Tuple[str, int, str]:
+    return entry["case"], entry["size"], entry["shape"]
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25, min_delta: float = 0.005) -> List[dict]:
+    """與 baseline 比對；回傳退步項目（含 ``baseline``／``ratio``）。
+
+    僅比對兩邊都有 ``seconds`` 的項目；新增或 baseline 缺少的項目不算退步，
+    但 baseline 成功而本次失敗（``error``）算退步。
+    """
+    base = {_key(e): e for e in baseline.get("results", [])}
+    regressions: List[dict] = []
+    for entry in current.get("results", []):
+        ref = base.get(_key(entry))
+        if ref is None or "seconds" not in ref:
+            continue
+        if "seconds" not in entry:
+            regressions.append({**entry, "baseline": ref["seconds"], "ratio": None})
+            continue
+        ratio = entry["seconds"] / ref["seconds"] if ref["seconds"] else float("inf")
+        if ratio > 1 + tolerance and entry["seconds"] - ref["seconds"] > min_delta:
+            regressions.append({**entry, "baseline": ref["seconds"], "ratio": round(ratio, 2)})
+    return regressions
+
+
+def _format_entry(entry: dict) -> str:
+    label = f"{entry['case']:<16} {entry['shape']:<9} {entry['size']:>9,}"
+    if "error" in entry:
+        return f"  {label}  ERROR {entry['error']}"
+    return f"  {label}  {entry['seconds']:.4f}s"
+
+
+def _csv(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def _sizes(value: str) -> List[int]:
+    sizes = [int(v.replace("_", "")) for v in _csv(value)]
+    for s in sizes:
+        if not 1 <= s <= MAX_SIZE:
+            raise argparse.ArgumentTypeError(f"size must be between 1 and {MAX_SIZE:,}")
+    return sizes
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="IR → code pipeline benchmark")
+    parser.add_argument("--sizes", type=_sizes, default=list(DEFAULT_SIZES), help="節點數，逗號分隔（1～1000000）")
+    parser.add_argument("--shapes", type=_csv, default=list(synthetic.SHAPES), help="樹形：wide,balanced,deep")
+    parser.add_argument("--cases", type=_csv, default=list(CASES), help="量測項目，逗號分隔（預設全部）")
+    parser.add_argument("--repeat", type=int, default=3, help="每項重複次數，取最快（預設 3）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="結果 JSON 輸出路徑（預設只印摘要）")
+    parser.add_argument("--baseline", help="與此 baseline JSON 比對，有退步時退出碼 1")
+    parser.add_argument("--save-baseline", help="將本次結果寫為 baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="容許變慢比例（預設 0.25）")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="忽略小於此秒數的差距（預設 0.005）")
+    args = parser.parse_args(argv)
+
+    unknown = [c for c in args.cases if c not in CASES] + [s for s in args.shapes if s not in synthetic.SHAPES]
+    if unknown:
+        parser.error(f"unknown case/shape: {', '.join(unknown)}")
+
+    result = run(args.sizes, args.shapes, args.cases, args.repeat, args.seed, log=print)
+    payload = json.dumps(result, indent=2, ensure_ascii=False) + "\n"
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).write_text(payload, encoding="utf-8")
+
+    if not args.baseline:
+        return 0
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    regressions = compare(result, baseline, args.tolerance, args.min_delta)
+    if not regressions:
+        print(f"no regressions against {args.baseline}")
+        return 0
+    print(f"{len(regressions)} regression(s) against {args.baseline}:")
+    for r in regressions:
+        ratio = f"{r['ratio']}x" if r["ratio"] is not None else r.get("error", "failed")
+        print(f"  {r['case']:<16} {r['shape']:<9} {r['size']:>9,}  {r['baseline']:.4f}s → {ratio}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
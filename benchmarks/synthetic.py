@@ -0,0 +1,352 @@
+"""
+synthetic.py — 可重現（seeded）的大型合成設計資料
+
+五種輸入格式，同一組 (n, shape, seed) 產生相同的樹形：
+
+  pen_nodes    — Pencil batch_get 回傳（``PencilToIR.convert`` 輸入）
+  figma_file   — Figma REST ``GET /files`` JSON（``FigmaToIR.convert``、pixel renderer 輸入）
+  airis_ir     — IR v2.0 文件（``tree`` 供 ``generate_from_ir``）
+  ui_ir        — UiIR 根節點（``validate_ui_ir``、skills 輸入）
+  tailwind_dom — DOM walker 輸出的 raw tree，class 為 Tailwind utility 組合（``IRBuilderV2.build`` 輸入）
+
+樹形（``SHAPES``）：
+  wide      — 每個節點最多 64 個子節點（淺而寬）
+  balanced  — 4 叉樹
+  deep      — 根節點下掛多條長度 ``deep_segment`` 的鏈（預設 200，低於遞迴上限，
+              以便遞迴實作的 skills／pixel renderer 也能量測）
+
+節點數 ``n`` 精確等於產出的節點數（含根節點）。
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Callable, Dict, List
+
+SHAPES = ("wide", "balanced", "deep")
+DEEP_SEGMENT = 200
+
+_PALETTE = ["#1a73e8", "#137333", "#d93025", "#f9ab00", "#202124", "#5f6368", "#ffffff", "#f1f3f4"]
+_FONT_SIZES = [12, 14, 16, 20, 24, 32]
+_SPACING = [0, 4, 8, 12, 16, 24]
+_COMPONENTS = ["Button", "Card", "Avatar", "Chip", "ListItem"]
+_VARIANTS = ["Primary", "Secondary", "Disabled"]
+
+
+def tree_parents(n: int, shape: str = "balanced", deep_segment: int = DEEP_SEGMENT) -> List[int]:
+    """各節點的父節點索引（根節點為 -1）；子節點索引一律大於父節點。"""
+    if n < 1:
+        raise ValueError("n must be >= 1")
+    if shape == "wide":
+        return [-1] + [(i - 1) // 64 for i in range(1, n)]
+    if shape == "balanced":
+        return [-1] + [(i - 1) // 4 for i in range(1, n)]
+    if shape == "deep":
+        return [-1] + [0 if (i - 1) % deep_segment == 0 else i - 1 for i in range(1, n)]
+    raise ValueError(f"unknown shape {shape!r}; expected one of {', '.join(SHAPES)}")
+
+
+def _build(
+    n: int,
+    shape: str,
+    seed: int,
+    make: Callable[[random.Random, int, bool], Dict[str, Any]],
+    deep_segment: int,
+) -> Dict[str, Any]:
+    """依 ``tree_parents`` 組樹；``make(rng, index, is_leaf)`` 產生單一節點（不含 children）。"""
+    parents = tree_parents(n, shape, deep_segment)
+    has_children = [False] * n
+    for p in parents[1:]:
+        has_children[p] = True
+    rng = random.Random(seed)
+    nodes: List[Dict[str, Any]] = []
+    for i in range(n):
+        node = make(rng, i, not has_children[i])
+        if has_children[i]:
+            node["children"] = []
+        nodes.append(node)
+        if i:
+            nodes[parents[i]]["children"].append(node)
+    return nodes[0]
+
+
+def _leaf_kind(rng: random.Random, i: int, is_leaf: bool) -> str:
+    if i == 0:
+        return "frame"
+    if not is_leaf:
+        return "instance" if i % 23 == 0 else "frame"
+    return rng.choice(("text", "text", "rect", "icon"))
+
+
+def _component_name(i: int) -> str:
+    return f"{_COMPONENTS[i % len(_COMPONENTS)]}/{_VARIANTS[i % len(_VARIANTS)]}"
+
+
+# ─── Pencil (.pen) ──────────────────────────────────────────────────────────
+
+
+def _pen_node(rng: random.Random, i: int, is_leaf: bool) -> Dict[str, Any]:
+    kind = _leaf_kind(rng, i, is_leaf)
+    base: Dict[str, Any] = {"id": f"p{i}", "x": rng.randint(0, 400), "y": rng.randint(0, 400)}
+    if kind == "text":
+        base.update(
+            type="text",
+            name=f"Label {i}",
+            content=f"Text {i}",
+            fontSize=rng.choice(_FONT_SIZES),
+            fontWeight=rng.choice((400, 500, 700)),
+            color=rng.choice(_PALETTE),
+            width="fill_container",
+        )
+    elif kind == "icon":
+        base.update(type="icon_font", name=f"Icon {i}", icon="star", fontSize=24, color=rng.choice(_PALETTE))
+    elif kind == "rect":
+        base.update(type="rectangle", name=f"Divider {i}", width=rng.randint(8, 320), height=1, fill=rng.choice(_PALETTE))
+    elif kind == "instance":
+        base.update(type="ref", ref=f"comp-{i % 7}", name=_component_name(i), width=rng.randint(80, 320), height=40)
+    else:
+        base.update(
+            type="frame",
+            name=f"Section {i}" if i else "Page",
+            width=1440 if i == 0 else rng.randint(80, 1200),
+            height=900 if i == 0 else rng.randint(24, 600),
+            layout=rng.choice(("vertical", "horizontal")),
+            gap=rng.choice(_SPACING),
+            padding=rng.choice(_SPACING),
+            fill=rng.choice(_PALETTE),
+            cornerRadius=rng.choice((0, 4, 8)),
+        )
+    return base
+
+
+def pen_nodes(n: int, shape: str = "balanced", seed: int = 0, deep_segment: int = DEEP_SEGMENT) -> List[Dict[str, Any]]:
+    """``n`` 個節點的 batch_get 回傳（單一根節點的列表）。"""
+    return [_build(n, shape, seed, _pen_node, deep_segment)]
+
+
+# ─── Figma file JSON ────────────────────────────────────────────────────────
+
+
+def _figma_color(rng: random.Random) -> Dict[str, float]:
+    return {"r": round(rng.random(), 3), "g": round(rng.random(), 3), "b": round(rng.random(), 3), "a": 1}
+
+
+def _figma_node(rng: random.Random, i: int, is_leaf: bool) -> Dict[str, Any]:
+    kind = _leaf_kind(rng, i, is_leaf)
+    box = {
+        "x": float(rng.randint(0, 1200)),
+        "y": float(rng.randint(0, 800)),
+        "width": float(rng.randint(8, 400)),
+        "height": float(rng.randint(8, 200)),
+    }
+    if i == 0:
+        box = {"x": 0.0, "y": 0.0, "width": 1440.0, "height": 900.0}
+    node: Dict[str, Any] = {"id": f"1:{i}", "absoluteBoundingBox": box}
+    fills = [{"type": "SOLID", "visible": True, "color": _figma_color(rng)}]
+    if kind in ("text", "icon"):
+        node.update(
+            type="TEXT",
+            name=f"Label {i}",
+            characters=f"Text {i}",
+            fills=fills,
+            style={
+                "fontFamily": "Inter",
+                "fontSize": rng.choice(_FONT_SIZES),
+                "fontWeight": rng.choice((400, 500, 700)),
+                "lineHeightPx": 20,
+                "textAlignHorizontal": "LEFT",
+            },
+        )
+    elif kind == "rect":
+        node.update(type="RECTANGLE", name=f"Divider {i}", fills=fills, cornerRadius=rng.choice((0, 4)))
+    else:
+        node.update(
+            type="INSTANCE" if kind == "instance" else "FRAME",
+            name=_component_name(i) if kind == "instance" else (f"Section {i}" if i else "Page"),
+            fills=fills,
+            cornerRadius=rng.choice((0, 4, 8)),
+            layoutMode=rng.choice(("VERTICAL", "HORIZONTAL", "NONE")),
+            itemSpacing=rng.choice(_SPACING),
+            paddingTop=rng.choice(_SPACING),
+            paddingRight=rng.choice(_SPACING),
+            paddingBottom=rng.choice(_SPACING),
+            paddingLeft=rng.choice(_SPACING),
+        )
+        if i % 11 == 0:
+            node["effects"] = [
+                {"type": "DROP_SHADOW", "visible": True, "color": {"r": 0, "g": 0, "b": 0, "a": 0.2},
+                 "offset": {"x": 0, "y": 2}, "radius": 4, "spread": 0}
+            ]
+            node["strokes"] = [{"type": "SOLID", "visible": True, "color": _figma_color(rng)}]
+            node["strokeWeight"] = 1
+    return node
+
+
+def figma_file(n: int, shape: str = "balanced", seed: int = 0, deep_segment: int = DEEP_SEGMENT) -> Dict[str, Any]:
+    """Figma ``GET /files`` JSON；頁面上唯一的 frame 含 ``n`` 個節點（見 ``figma_frame``）。"""
+    frame = _build(n, shape, seed, _figma_node, deep_segment)
+    return {
+        "name": "Synthetic",
+        "schemaVersion": 0,
+        "document": {
+            "id": "0:0",
+            "type": "DOCUMENT",
+            "name": "Document",
+            "children": [{"id": "0:1", "type": "CANVAS", "name": "Page 1", "children": [frame]}],
+        },
+    }
+
+
+def figma_frame(file_json: Dict[str, Any]) -> Dict[str, Any]:
+    return file_json["document"]["children"][0]["children"][0]
+
+
+# ─── IR v2.0 ────────────────────────────────────────────────────────────────
+
+
+def _ir_node(rng: random.Random, i: int, is_leaf: bool) -> Dict[str, Any]:
+    kind = _leaf_kind(rng, i, is_leaf)
+    layout = {"x": rng.randint(0, 1200), "y": rng.randint(0, 800), "width": rng.randint(8, 400), "height": rng.randint(8, 200)}
+    if i == 0:
+        layout = {"x": 0, "y": 0, "width": 1440, "height": 900}
+    if kind in ("text", "icon"):
+        return {
+            "figmaName": f"Label {i}",
+            "figmaType": "TEXT",
+            "layout": layout,
+            "text": {
+                "characters": f"Text {i}",
+                "fontSize": rng.choice(_FONT_SIZES),
+                "fontFamily": "Inter",
+                "fontWeight": rng.choice((400, 500, 700)),
+                "color": rng.choice(_PALETTE),
+                "textAlign": "LEFT",
+            },
+        }
+    if kind == "rect":
+        return {
+            "figmaName": f"Divider {i}",
+            "figmaType": "RECTANGLE",
+            "layout": layout,
+            "styles": {"backgroundColor": rng.choice(_PALETTE)},
+        }
+    node: Dict[str, Any] = {
+        "figmaName": _component_name(i) if kind == "instance" else (f"Section {i}" if i else "Page"),
+        "figmaType": "INSTANCE" if kind == "instance" else "AUTO_LAYOUT",
+        "layout": layout,
+        "styles": {"backgroundColor": rng.choice(_PALETTE)},
+        "autoLayout": {
+            "direction": rng.choice(("VERTICAL", "HORIZONTAL")),
+            "spacing": rng.choice(_SPACING),
+            "paddingTop": rng.choice(_SPACING),
+            "paddingRight": rng.choice(_SPACING),
+            "paddingBottom": rng.choice(_SPACING),
+            "paddingLeft": rng.choice(_SPACING),
+            "primaryAlign": rng.choice(("MIN", "CENTER", "SPACE_BETWEEN")),
+            "counterAlign": rng.choice(("MIN", "CENTER")),
+        },
+    }
+    radius = rng.choice((0, 4, 8))
+    if radius:
+        node["styles"]["borderRadius"] = {"topLeft": radius, "topRight": radius, "bottomRight": radius, "bottomLeft": radius}
+    return node
+
+
+def airis_ir(n: int, shape: str = "balanced", seed: int = 0, deep_segment: int = DEEP_SEGMENT) -> Dict[str, Any]:
+    """IR v2.0 文件；``generate_from_ir`` 使用其 ``tree``。"""
+    return {
+        "version": "2.0.0",
+        "source": {"framework": "synthetic", "tool": "benchmarks"},
+        "viewport": {"width": 1440, "height": 900},
+        "nameMapping": {},
+        "stats": {"nodeCount": n},
+        "tree": _build(n, shape, seed, _ir_node, deep_segment),
+    }
+
+
+# ─── UiIR ───────────────────────────────────────────────────────────────────
+
+
+def _ui_node(rng: random.Random, i: int, is_leaf: bool) -> Dict[str, Any]:
+    ir = _ir_node(rng, i, is_leaf)
+    source_type = ir["figmaType"]
+    node: Dict[str, Any] = {
+        "id": f"u{i}",
+        "name": ir["figmaName"],
+        "type": source_type.lower(),
+        "sourceType": source_type,
+        "layout": ir["layout"],
+        "style": {"box-sizing": "border-box", "width": f"{ir['layout']['width']}px"},
+    }
+    for key in ("styles", "text", "autoLayout"):
+        if key in ir:
+            node[key] = ir[key]
+    if is_leaf:
+        node["children"] = []
+    return node
+
+
+def ui_ir(n: int, shape: str = "balanced", seed: int = 0, deep_segment: int = DEEP_SEGMENT) -> Dict[str, Any]:
+    """UiIR 根節點（``validate_ui_ir``／skills 輸入）。"""
+    return _build(n, shape, seed, _ui_node, deep_segment)
+
+
+# ─── Raw DOM (Tailwind) ─────────────────────────────────────────────────────
+
+_TW_UTILITIES = [
+    "flex", "flex-col", "items-center", "justify-between", "grid", "grid-cols-3", "hidden", "block",
+    "relative", "absolute", "overflow-hidden", "w-full", "h-12", "min-h-screen", "max-w-7xl",
+    "p-4", "px-6", "py-2", "pt-8", "mx-auto", "mt-4", "mb-2", "gap-4", "space-y-2",
+    "text-sm", "text-gray-700", "font-semibold", "leading-6", "tracking-tight",
+    "bg-white", "bg-blue-600", "border", "border-gray-200", "rounded-lg", "shadow-sm", "ring-1",
+    "transition-colors", "duration-150", "cursor-pointer", "select-none",
+    "hover:bg-blue-700", "focus:outline-none", "md:flex", "lg:px-8", "dark:bg-gray-900", "sm:text-base",
+]
+_TW_SEMANTIC = ["card", "card-header", "nav-item", "hero-title", "price-tag", "user-avatar", "cta"]
+_TW_TAGS = ["div", "div", "div", "section", "span", "button", "p", "li", "a"]
+
+
+def _dom_node(rng: random.Random, i: int, is_leaf: bool) -> Dict[str, Any]:
+    tag = "div" if i == 0 else rng.choice(_TW_TAGS)
+    classes = rng.sample(_TW_UTILITIES, rng.randint(4, 10))
+    if rng.random() < 0.2:
+        # 語意 class 多半寫在 utility 之後
+        classes.append(rng.choice(_TW_SEMANTIC))
+    attrs: Dict[str, str] = {"class": " ".join(classes)}
+    if i % 50 == 0:
+        attrs["id"] = f"section-{i}"
+    node: Dict[str, Any] = {
+        "tag": tag,
+        "attrs": attrs,
+        "layout": {"x": rng.randint(0, 1200), "y": rng.randint(0, 800), "width": rng.randint(8, 400), "height": rng.randint(8, 200)},
+        "styles": {
+            "backgroundColor": rng.choice(_PALETTE),
+            "color": rng.choice(_PALETTE),
+            "fontSize": rng.choice(_FONT_SIZES),
+            "paddingTop": rng.choice(_SPACING),
+            "paddingLeft": rng.choice(_SPACING),
+        },
+    }
+    if i % 23 == 0 and i:
+        node["componentName"] = _COMPONENTS[i % len(_COMPONENTS)]
+    if is_leaf and tag in ("span", "button", "p", "a"):
+        node["textContent"] = f"Text {i}"
+    return node
+
+
+def tailwind_dom(n: int, shape: str = "balanced", seed: int = 0, deep_segment: int = DEEP_SEGMENT) -> Dict[str, Any]:
+    """DOM walker raw tree（含 ``siblingIndex``／``siblingTagCount``）。"""
+    root = _build(n, shape, seed, _dom_node, deep_segment)
+    stack = [root]
+    while stack:
+        children = stack.pop().get("children") or []
+        counts: Dict[str, int] = {}
+        for child in children:
+            counts[child["tag"]] = counts.get(child["tag"], 0) + 1
+        seen: Dict[str, int] = {}
+        for child in children:
+            child["siblingIndex"] = seen.get(child["tag"], 0)
+            child["siblingTagCount"] = counts[child["tag"]]
+            seen[child["tag"]] = child["siblingIndex"] + 1
+        stack.extend(children)
+    return root
@@ -99,6 +99,7 @@ interface IRNode {
   image?: {
     src?: string;
     base64?: string;
+    hash?: string;  // content hash of <snapshotDir>/assets/<hash>.png (--capture-images)
     alt?: string;
     scaleMode: 'FILL' | 'FIT' | 'CROP' | 'TILE';
   };
@@ -117,6 +118,7 @@ interface IRNode {
   };
   rotation?: number;
   clipsContent?: boolean;
+  siblingIndex?: number;  // index among same-tag DOM siblings (responsive breakpoint matching)
   pluginData?: Record<string, string>;
   children?: IRNode[];
 }
@@ -79,7 +79,7 @@ def run_chain_parity(baseline_dir: Path, output_dir: Path) -> list[str]:
 
             # 檔案樹比對
             tree = _file_tree(spec_out)
-            expected_tree = ["index.html", "styles/app.css"]
+            expected_tree = [".aipdm-manifest.json", "index.html", "styles/app.css"]
             if tree != expected_tree:
                 issues.append(f"[DIFF] {name} file tree: expected {expected_tree}, got {tree}")
 
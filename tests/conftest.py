@@ -0,0 +1,12 @@
+import pytest
+
+from airis_pdm import dom_extractor
+
+from tests.fake_playwright import FakePlaywright
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    log = {"launches": 0, "contexts": [], "pages": [], "closed": 0, "stopped": 0}
+    monkeypatch.setattr(dom_extractor, "_async_playwright", lambda: FakePlaywright(log))
+    return log
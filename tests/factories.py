@@ -0,0 +1,25 @@
+"""
+測試共用的 raw DOM 節點（``DOM_WALKER_V2_JS`` 輸出格式）工廠。
+"""
+
+
+def raw_node(tag, children=(), *, text=None, index=0, tag_count=1, cls=None, component=None,
+             width=100, height=20, styles=None, z=None, **extra):
+    """``tag`` 元素的 raw 節點；class 預設為 tag 名稱，``z`` 設定 ``styles.zIndex``."""
+    node = {
+        "tag": tag,
+        "attrs": {"class": cls or tag},
+        "siblingIndex": index,
+        "siblingTagCount": tag_count,
+        "layout": {"x": 0, "y": 0, "width": width, "height": height},
+        "styles": dict(styles or {}),
+        "isTextNode": text is not None,
+        "textContent": text,
+        "children": list(children),
+    }
+    if component is not None:
+        node["componentName"] = component
+    if z is not None:
+        node["styles"]["zIndex"] = z
+    node.update(extra)
+    return node
@@ -0,0 +1,170 @@
+"""
+假的 Playwright 物件（``dom_extractor._async_playwright`` 的替身）：記錄瀏覽器啟動、context 與 page，
+FakePage 依 script 回傳 readiness、圖片資產與分段擷取（``CHUNK_TREE``）的結果。
+"""
+import asyncio
+import base64
+
+from airis_pdm import dom_extractor, readiness
+from airis_pdm.asset_store import content_hash
+
+from tests.factories import raw_node
+
+
+class FakePage:
+    def __init__(self, viewport):
+        self.viewport = viewport
+        self.closed = False
+        self.visited = []
+        self.taken = []
+        self.resizes = []
+        self.ready_steps = []
+
+    async def goto(self, url, **kwargs):
+        self.visited.append(url)
+        self.wait_until = kwargs.get("wait_until")
+        await asyncio.sleep(0)
+
+    async def wait_for_selector(self, selector, **kwargs):
+        pass
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+    async def route(self, pattern, handler):
+        self.routes = [handler]
+
+    async def unroute_all(self, behavior=None):
+        self.routes = []
+
+    async def set_viewport_size(self, size):
+        self.viewport = size
+        self.resizes.append(size)
+
+    async def evaluate(self, script, config=None):
+        if script == readiness.HYDRATION_JS:
+            self.ready_steps.append("hydration")
+            return {"framework": "vue", "hydrated": True, "waitedMs": 0}
+        if script == readiness.MUTATION_QUIET_JS:
+            self.ready_steps.append(("mutation", config["timeoutMs"]))
+            return {"quiet": True, "waitedMs": config["quietMs"]}
+        if script == readiness.RAF_JS:
+            self.ready_steps.append("raf")
+            return True
+        if script == dom_extractor.DOM_PROBE_JS:
+            return "probe-hash"
+        if script == dom_extractor.DOM_IMAGE_LIST_JS:
+            return list(PAGE_IMAGES)
+        if script == dom_extractor.DOM_IMAGE_TAKE_JS:
+            self.taken.append(config)
+            return {h: PAGE_IMAGES[h] for h in config or []}
+        if script == dom_extractor.DOM_CHUNK_NEXT_JS:
+            return self.chunks.next(config)
+        if config.get("chunkNodes"):
+            self.chunks = FakeChunks(CHUNK_TREE, config["chunkNodes"])
+            return self.chunks.root()
+        if config.get("imageAssets"):
+            return {"tag": "img", "imageHash": next(iter(PAGE_IMAGES)), "children": []}
+        return {"tag": "div", "viewport": self.viewport, "children": []}
+
+    async def screenshot(self, **kwargs):
+        return b"png"
+
+    async def close(self):
+        self.closed = True
+
+    def is_closed(self):
+        return self.closed
+
+
+# chunk_nodes 時 FakePage 分段回傳的頁面
+CHUNK_TREE = raw_node("main", children=[
+    raw_node("header", children=[raw_node("h1", text="Title"), raw_node("p", text="Sub")]),
+    raw_node("ul", children=[raw_node("li", text=f"row {i}", index=i) for i in range(5)], z=2),
+    raw_node("section", children=[raw_node("div", children=[raw_node("span", text="only child")])], z=1),
+])
+
+
+class FakeChunks:
+    """In-page 分段狀態的 Python 模型：每次 next 最多回傳 budget 個子節點，子節點本身的 children 一律延後。"""
+
+    def __init__(self, tree, budget):
+        self.budget = budget
+        self.elements = {}
+        self.cursor = {}
+        self.calls = 0
+        self.next_id = 1
+        self._tree = tree
+
+    def _header(self, node):
+        header = {k: v for k, v in node.items() if k != "children"}
+        header["children"] = []
+        if node["children"]:
+            pending, self.next_id = self.next_id, self.next_id + 1
+            self.elements[pending] = node
+            header["childrenPending"] = pending
+        return header
+
+    def root(self):
+        return self._header(self._tree)
+
+    def next(self, pending):
+        self.calls += 1
+        node = self.elements[pending]
+        start = self.cursor.get(pending, 0)
+        batch = node["children"][start:start + self.budget]
+        self.cursor[pending] = start + len(batch)
+        more = self.cursor[pending] < len(node["children"])
+        if not more:
+            del self.elements[pending]
+        return {"children": [self._header(child) for child in batch], "more": more}
+
+
+PAGE_IMAGES = {
+    content_hash(data): base64.b64encode(data).decode("ascii")
+    for data in (b"logo-png", b"icon-png", b"photo-png")
+}
+
+
+class FakeContext:
+    def __init__(self, viewport, pages):
+        self.viewport = viewport
+        self.pages = pages
+
+    async def new_page(self):
+        page = FakePage(self.viewport)
+        self.pages.append(page)
+        return page
+
+
+class FakeBrowser:
+    def __init__(self, log):
+        self.log = log
+        self.connected = True
+        log.setdefault("browsers", []).append(self)
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, viewport):
+        self.log["contexts"].append(viewport)
+        return FakeContext(viewport, self.log["pages"])
+
+    async def close(self):
+        self.log["closed"] += 1
+
+
+class FakePlaywright:
+    def __init__(self, log):
+        self.log = log
+        self.chromium = self
+
+    async def start(self):
+        return self
+
+    async def launch(self, headless):
+        self.log["launches"] += 1
+        return FakeBrowser(self.log)
+
+    async def stop(self):
+        self.log["stopped"] += 1
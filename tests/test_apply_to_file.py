@@ -211,6 +211,69 @@ class TestApplyInlineToFile:
         assert "color" in content
 
 
+# ─── 同檔案批次寫入 ───────────────────────────────────────────────────────────
+
+class TestBatchedApply:
+    def _setup(self, tmp_path, count=5):
+        f = tmp_path / "List.vue"
+        f.write_text(
+            "\n".join(f'<li id="row-{i}" class="row">{i}</li>' for i in range(count)),
+            encoding="utf-8",
+        )
+        mapping = {f"Row{i}": {"selector": f"#row-{i}", "sourceFile": ""} for i in range(count)}
+        diff = {}
+        for i in range(count):
+            diff.update(make_diff(f"Row{i}", **{"text.fontSize": 10 + i}))
+        return f, mapping, diff
+
+    def test_one_write_per_file(self, tmp_path, monkeypatch):
+        import airis_pdm.code_patcher as code_patcher
+
+        f, mapping, diff = self._setup(tmp_path)
+        writes = []
+        original = code_patcher.write_atomic
+        monkeypatch.setattr(code_patcher, "write_atomic", lambda *a: (writes.append(a[0]), original(*a)))
+
+        summary = make_patcher(mapping, src_root=str(tmp_path)).apply_changes(diff)
+
+        assert writes == [f]
+        assert list(summary) == [str(f)]
+        assert summary[str(f)][-1] == f"  ✅ Written to {f}"
+        assert len(summary[str(f)]) == 6
+        content = f.read_text(encoding="utf-8")
+        for i in range(5):
+            assert f'<li id="row-{i}" class="row text-[{10 + i}px]">' in content
+
+    def test_file_mode_preserved(self, tmp_path):
+        f, mapping, diff = self._setup(tmp_path, count=1)
+        f.chmod(0o640)
+        make_patcher(mapping, src_root=str(tmp_path)).apply_changes(diff)
+        assert f.stat().st_mode & 0o777 == 0o640
+        assert not [p for p in tmp_path.iterdir() if p.name.startswith(".")]
+
+    def test_concurrent_edit_reapplied(self, tmp_path, monkeypatch):
+        import airis_pdm.code_patcher as code_patcher
+
+        f, mapping, diff = self._setup(tmp_path, count=2)
+        original = code_patcher._patch_content
+        calls = []
+
+        def racing_patch(content, edits):
+            # 第一次套用期間，另一個流程改寫了檔案
+            if not calls:
+                f.write_text(f.read_text(encoding="utf-8") + "\n<!-- watch -->\n", encoding="utf-8")
+            calls.append(1)
+            return original(content, edits)
+
+        monkeypatch.setattr(code_patcher, "_patch_content", racing_patch)
+        make_patcher(mapping, src_root=str(tmp_path)).apply_changes(diff)
+
+        content = f.read_text(encoding="utf-8")
+        assert len(calls) == 2
+        assert "<!-- watch -->" in content
+        assert "text-[10px]" in content and "text-[11px]" in content
+
+
 # ─── config 驗證整合 ───────────────────────────────────────────────────────────
 
 class TestValidateConfig:
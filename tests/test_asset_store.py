@@ -0,0 +1,62 @@
+"""
+AssetStore 測試：內容雜湊去重、原子寫入、雜湊驗證，以及 IRBuilderV2 以 image.hash 引用。
+"""
+import base64
+import hashlib
+
+import pytest
+
+from airis_pdm.asset_store import AssetStore, content_hash
+from airis_pdm.ir_builder import IRBuilderV2
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+class TestAssetStore:
+    def test_identical_content_stored_once(self, tmp_path):
+        store = AssetStore(tmp_path / "assets")
+        first = store.put(b"logo")
+        second = store.put_base64(_b64(b"logo"))
+        other = store.put(b"icon")
+
+        assert first == second == hashlib.sha256(b"logo").hexdigest()[:32]
+        assert other != first
+        assert sorted(p.name for p in (tmp_path / "assets").iterdir()) == sorted([f"{first}.png", f"{other}.png"])
+        assert store.stats == {"written": 2, "deduped": 1, "bytes": 8}
+        assert store.read_base64(first) == _b64(b"logo")
+
+    def test_expected_hash_mismatch(self, tmp_path):
+        store = AssetStore(tmp_path)
+        with pytest.raises(ValueError):
+            store.put(b"logo", expected_hash=content_hash(b"icon"))
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestIRImageAssets:
+    RAW = {
+        "tag": "div",
+        "children": [
+            {"tag": "img", "isImage": True, "imageSrc": "/logo.png", "imageData": _b64(b"logo")},
+            {"tag": "img", "isImage": True, "imageSrc": "/logo@2.png", "imageData": _b64(b"logo")},
+            {"tag": "img", "isImage": True, "imageHash": "f" * 32},
+        ],
+    }
+
+    def _images(self, builder):
+        tree = builder.build(self.RAW, {"width": 100, "height": 100})["tree"]
+        return [child["image"] for child in tree["children"]]
+
+    def test_inline_data_moved_to_store(self, tmp_path):
+        store = AssetStore(tmp_path)
+        images = self._images(IRBuilderV2(asset_store=store))
+        logo = content_hash(b"logo")
+        assert [img.get("hash") for img in images] == [logo, logo, "f" * 32]
+        assert not any("base64" in img for img in images)
+        assert store.stats["written"] == 1 and store.stats["deduped"] == 1
+
+    def test_without_store_keeps_base64(self):
+        images = self._images(IRBuilderV2())
+        assert images[0]["base64"] == _b64(b"logo")
+        assert images[2] == {"scaleMode": "FILL", "hash": "f" * 32}
@@ -0,0 +1,110 @@
+"""Tests for benchmarks — synthetic generators and baseline comparison."""
+
+import subprocess
+from html.parser import HTMLParser
+
+import pytest
+
+from airis_pdm.ir_walk import iter_nodes
+from benchmarks import dom_walker, naming_engine, pipeline, synthetic
+
+
+def _depth(root):
+    best, stack = 0, [(root, 1)]
+    while stack:
+        node, d = stack.pop()
+        best = max(best, d)
+        stack.extend((c, d + 1) for c in node.get("children") or [])
+    return best
+
+
+class TestSynthetic:
+    @pytest.mark.parametrize("shape", synthetic.SHAPES)
+    def test_exact_node_count(self, shape):
+        assert sum(1 for _ in iter_nodes(synthetic.pen_nodes(500, shape)[0])) == 500
+        assert sum(1 for _ in iter_nodes(synthetic.figma_frame(synthetic.figma_file(500, shape)))) == 500
+        assert sum(1 for _ in iter_nodes(synthetic.airis_ir(500, shape)["tree"])) == 500
+        assert sum(1 for _ in iter_nodes(synthetic.ui_ir(500, shape))) == 500
+
+    @pytest.mark.parametrize("shape", synthetic.SHAPES)
+    def test_tailwind_dom(self, shape):
+        root = synthetic.tailwind_dom(500, shape)
+        assert sum(1 for _ in iter_nodes(root)) == 500
+        for node in iter_nodes(root):
+            tags = [c["tag"] for c in node.get("children") or []]
+            for child in node.get("children") or []:
+                assert child["siblingTagCount"] == tags.count(child["tag"])
+
+    def test_seeded(self):
+        assert synthetic.airis_ir(200, seed=3) == synthetic.airis_ir(200, seed=3)
+        assert synthetic.airis_ir(200, seed=3) != synthetic.airis_ir(200, seed=4)
+
+    def test_shapes(self):
+        assert _depth(synthetic.ui_ir(1000, "wide")) == 3
+        assert _depth(synthetic.ui_ir(1000, "balanced")) == 6
+        assert _depth(synthetic.ui_ir(1000, "deep", deep_segment=100)) == 101
+
+    def test_unknown_shape(self):
+        with pytest.raises(ValueError):
+            synthetic.tree_parents(10, "tall")
+
+
+class TestPipeline:
+    def test_run_small(self):
+        cases = ["pencil_to_ir", "codegen_html", "skills", "stylesheet_css", "ir_build"]
+        result = pipeline.run([60], ["balanced"], cases, repeat=1)
+        assert [e["case"] for e in result["results"]] == cases
+        assert all("seconds" in e for e in result["results"]), result["results"]
+
+    def test_compare_flags_slowdowns_and_failures(self):
+        def doc(*entries):
+            return {"results": [dict(zip(("case", "size", "shape", "seconds"), e)) for e in entries]}
+
+        baseline = doc(("a", 1, "wide", 1.0), ("b", 1, "wide", 1.0), ("c", 1, "wide", 1.0))
+        current = doc(("a", 1, "wide", 1.2), ("b", 1, "wide", 1.5), ("d", 1, "wide", 9.0))
+        current["results"].append({"case": "c", "size": 1, "shape": "wide", "error": "RecursionError"})
+        regressions = pipeline.compare(current, baseline, tolerance=0.25)
+        assert [(r["case"], r["ratio"]) for r in regressions] == [("b", 1.5), ("c", None)]
+
+    def test_compare_ignores_tiny_deltas(self):
+        baseline = {"results": [{"case": "a", "size": 1, "shape": "wide", "seconds": 0.001}]}
+        current = {"results": [{"case": "a", "size": 1, "shape": "wide", "seconds": 0.003}]}
+        assert pipeline.compare(current, baseline) == []
+
+
+class TestNamingEngineBenchmark:
+    def test_compiled_matches_legacy(self):
+        # run() 在名稱或 IR 與舊版不同時拋出 AssertionError
+        result = naming_engine.run(nodes=300, repeat=1)
+        assert result["nodes"] == 300 and result["compiled_resolve_s"] > 0
+
+
+class TestDomWalkerPage:
+    def test_exact_element_count(self):
+        class Counter(HTMLParser):
+            def __init__(self):
+                super().__init__()
+                self.in_body = False
+                self.count = 0
+
+            def handle_starttag(self, tag, attrs):
+                if self.in_body:
+                    self.count += 1
+                self.in_body = self.in_body or tag == "body"
+
+        for elements in (20_000, 1234, 7):
+            counter = Counter()
+            counter.feed(dom_walker.synthetic_page(elements))
+            assert counter.count == elements
+
+    def test_legacy_walker_is_a_function_expression(self):
+        legacy = dom_walker.legacy_walker_js()
+        assert legacy.startswith("(config) => {")
+        assert legacy != dom_walker.DOM_WALKER_V2_JS
+
+    def test_legacy_walker_from_git_revision(self):
+        try:
+            from_git = dom_walker.legacy_walker_js("HEAD")
+        except (OSError, subprocess.CalledProcessError):
+            pytest.skip("git revision cannot be resolved (sdist or shallow clone)")
+        assert from_git.lstrip().startswith("(config) => {")
@@ -0,0 +1,170 @@
+"""
+BrowserPool 測試：以假的 Playwright 物件（``tests/fake_playwright.py``）驗證瀏覽器只啟動一次、page 依 viewport 重用。
+"""
+import asyncio
+
+import pytest
+
+from airis_pdm import dom_extractor
+from airis_pdm.asset_store import AssetStore
+from airis_pdm.dom_extractor import BrowserPool, ExtractionConfig, extract_dom_tree
+
+from tests.fake_playwright import PAGE_IMAGES
+
+
+class TestBrowserPool:
+    def test_launches_once_and_reuses_pages(self, fake_playwright):
+        async def run():
+            async with BrowserPool() as pool:
+                for url in ("http://a", "http://b", "http://c"):
+                    await extract_dom_tree(url, ExtractionConfig(), pool=pool)
+                await extract_dom_tree("http://d", ExtractionConfig(viewport_width=375, viewport_height=812), pool=pool)
+
+        asyncio.run(run())
+        assert fake_playwright["launches"] == 1
+        assert fake_playwright["contexts"] == [{"width": 1440, "height": 900}, {"width": 375, "height": 812}]
+        assert [p.visited for p in fake_playwright["pages"]] == [["http://a", "http://b", "http://c"], ["http://d"]]
+        assert fake_playwright["closed"] == fake_playwright["stopped"] == 1
+
+    def test_concurrent_borrowers_get_separate_pages(self, fake_playwright):
+        async def run():
+            async with BrowserPool(max_idle_pages=1) as pool:
+                await asyncio.gather(*(extract_dom_tree(f"http://{i}", pool=pool) for i in range(3)))
+
+        asyncio.run(run())
+        pages = fake_playwright["pages"]
+        assert len(pages) == 3
+        assert sum(p.closed for p in pages) == 2  # 超過 max_idle_pages 的 page 歸還時關閉
+
+    def test_failed_page_is_not_reused(self, fake_playwright):
+        async def run():
+            async with BrowserPool() as pool:
+                with pytest.raises(RuntimeError):
+                    async with pool.page(100, 100):
+                        raise RuntimeError("boom")
+                async with pool.page(100, 100) as page:
+                    return page
+
+        page = asyncio.run(run())
+        first = fake_playwright["pages"][0]
+        assert first.closed and page is not first
+
+    def test_without_pool_launches_per_call(self, fake_playwright):
+        result = asyncio.run(extract_dom_tree("http://a"))
+        assert result["tree"]["tag"] == "div"
+        assert result["screenshot"] == b"png"
+        assert fake_playwright["launches"] == fake_playwright["closed"] == 1
+
+    def test_probe_captured_on_same_page(self, fake_playwright):
+        async def run():
+            async with BrowserPool() as pool:
+                result = await extract_dom_tree("http://a", ExtractionConfig(capture_probe=True), pool=pool)
+                probe = await dom_extractor.probe_dom_hash("http://a", ExtractionConfig(), pool=pool)
+                return result, probe
+
+        result, probe = asyncio.run(run())
+        assert result["probe"] == probe == "probe-hash"
+        assert "probe" not in asyncio.run(extract_dom_tree("http://a"))
+        assert len(fake_playwright["pages"]) == 2  # 第二次呼叫未傳 pool，自行啟動
+
+    def test_routing_is_removed_before_page_is_reused(self, fake_playwright):
+        async def run():
+            async with BrowserPool() as pool:
+                blocked = await extract_dom_tree("http://a", ExtractionConfig(block_resource_types=("media",)), pool=pool)
+                plain = await extract_dom_tree("http://b", ExtractionConfig(), pool=pool)
+                return blocked, plain
+
+        blocked, plain = asyncio.run(run())
+        assert blocked["network"]["blocked"] == 0 and "network" not in plain
+        assert fake_playwright["pages"][0].routes == []
+
+    def test_visual_compliance_screenshot_uses_pool(self, fake_playwright):
+        from airis_pdm.visual_compliance import _screenshot_url
+
+        async def run():
+            async with BrowserPool() as pool:
+                await _screenshot_url("http://a", 1280, 720, pool=pool)
+                return await _screenshot_url("http://b", 1280, 720, pool=pool)
+
+        assert asyncio.run(run()) == b"png"
+        assert fake_playwright["launches"] == 1
+        assert len(fake_playwright["pages"]) == 1
+
+
+    def test_crashed_browser_is_relaunched(self, fake_playwright):
+        async def run():
+            async with BrowserPool() as pool:
+                async with pool.page(100, 100) as first:
+                    pass
+                browser = fake_playwright["browsers"][0]
+                browser.connected = False  # Chromium crashed
+                first.closed = True
+                async with pool.page(100, 100) as second:
+                    pass
+                return first, second
+
+        first, second = asyncio.run(run())
+        assert second is not first
+        assert fake_playwright["launches"] == 2
+        assert fake_playwright["stopped"] == 2  # 斷線後一次、close() 一次
+
+    def test_closed_idle_page_is_dropped(self, fake_playwright):
+        async def run():
+            async with BrowserPool() as pool:
+                async with pool.page(100, 100) as first:
+                    pass
+                await first.close()  # 例如頁面自行關閉
+                async with pool.page(100, 100) as second:
+                    return first, second
+
+        first, second = asyncio.run(run())
+        assert second is not first
+        assert fake_playwright["launches"] == 1
+
+
+class TestImageAssets:
+    def test_only_missing_images_are_transferred(self, fake_playwright, tmp_path):
+        existing = next(iter(PAGE_IMAGES))
+        AssetStore(tmp_path).put_base64(PAGE_IMAGES[existing])
+        config = ExtractionConfig(capture_image_data=True, asset_dir=str(tmp_path))
+
+        result = asyncio.run(extract_dom_tree("http://a", config))
+        page = fake_playwright["pages"][0]
+        assert result["tree"]["imageHash"] == existing
+        assert result["assets"] == {"dir": str(tmp_path), "images": 3, "written": 2}
+        assert sorted(page.taken[0]) == sorted(h for h in PAGE_IMAGES if h != existing)
+        assert page.taken[-1] is None  # 其餘圖片自頁面釋放
+        assert sorted(p.stem for p in tmp_path.glob("*.png")) == sorted(PAGE_IMAGES)
+
+    def test_without_asset_dir_nothing_is_collected(self, fake_playwright):
+        result = asyncio.run(extract_dom_tree("http://a", ExtractionConfig(capture_image_data=True)))
+        assert "assets" not in result
+        assert fake_playwright["pages"][0].taken == []
+
+
+class TestMultiViewport:
+    def test_loads_once_and_walks_each_viewport(self, fake_playwright):
+        from airis_pdm.dom_extractor import extract_dom_tree_viewports
+
+        async def run():
+            async with BrowserPool() as pool:
+                results = await extract_dom_tree_viewports("http://a", [(375, 812), (768, 1024), (1440, 900)], pool=pool)
+                await extract_dom_tree("http://b", ExtractionConfig(viewport_width=375, viewport_height=812), pool=pool)
+                return results
+
+        results = asyncio.run(run())
+        pages = fake_playwright["pages"]
+        assert len(pages) == 1 and pages[0].visited == ["http://a", "http://b"]
+        assert [r["viewport"]["width"] for r in results] == [375, 768, 1440]
+        assert [r["tree"]["viewport"]["width"] for r in results] == [375, 768, 1440]
+        # page 歸還 pool 前恢復原本的 viewport
+        assert pages[0].resizes[-1] == {"width": 375, "height": 812}
+
+    def test_resize_settles_on_mutation_quiet_capped_by_resize_settle_ms(self, fake_playwright):
+        from airis_pdm.dom_extractor import extract_dom_tree_viewports
+
+        config = ExtractionConfig(resize_settle_ms=180)
+        results = asyncio.run(extract_dom_tree_viewports("http://a", [(375, 812), (768, 1024)], config))
+        steps = fake_playwright["pages"][0].ready_steps
+        assert steps == ["hydration", ("mutation", 3000), "raf", ("mutation", 180), "raf"]
+        assert set(results[1]["readiness"]["steps"]) == {"mutation", "raf"}
@@ -0,0 +1,36 @@
+"""
+分段擷取測試：``chunk_nodes`` 時 walker 分批回傳子節點，組回完整 tree 或邊擷取邊建構 IR。
+"""
+import asyncio
+
+from airis_pdm.dom_extractor import ExtractionConfig, extract_dom_tree
+
+from tests.fake_playwright import CHUNK_TREE
+
+
+class TestChunkedExtraction:
+    def test_chunks_are_assembled_into_full_tree(self, fake_playwright):
+        result = asyncio.run(extract_dom_tree("http://a", ExtractionConfig(chunk_nodes=2)))
+        page = fake_playwright["pages"][0]
+        assert result["tree"] == CHUNK_TREE
+        assert "consumed" not in result
+        assert page.chunks.calls > 3 and not page.chunks.elements
+
+    def test_ir_built_incrementally_matches_full_build(self, fake_playwright):
+        from airis_pdm.ir_builder import build_ir_from_extraction
+
+        config = {"source": {"framework": "html"}}
+        viewport = {"width": 1440, "height": 900}
+
+        def consume(root, fetch_children):
+            return build_ir_from_extraction({"tree": root, "viewport": viewport}, config, fetch_children=fetch_children)
+
+        result = asyncio.run(extract_dom_tree("http://a", ExtractionConfig(chunk_nodes=2), consume=consume))
+        streamed = result["consumed"]
+        full = build_ir_from_extraction({"tree": CHUNK_TREE, "viewport": viewport}, config)
+        for doc in (streamed, full):
+            doc["source"].pop("generatedAt")
+        assert streamed == full
+        assert streamed["stats"]["nodeCount"] == 12  # section 單一子節點被攤平
+        # 已轉換的 raw 子樹會被釋放
+        assert all(child == {} for child in result["tree"]["children"])
@@ -112,6 +112,23 @@ class TestGetFigmaIR:
         assert result["status"] == "ok"
         assert result["data"]["figmaName"] == "Root"
 
+    def test_compressed_snapshot(self, tmp_path):
+        import gzip
+
+        tools, client, ir_conv, differ = _make_tools()
+        tools._snapshot_dir = str(tmp_path)
+        client.get_file_nodes.return_value = FIGMA_RAW_RESPONSE
+        ir_conv.convert.return_value = SAMPLE_IR
+        differ.diff.return_value = {}
+
+        snap_dir = tmp_path / "1_2"
+        snap_dir.mkdir()
+        (snap_dir / "ir.json.gz").write_bytes(gzip.compress(json.dumps(SAMPLE_IR).encode()))
+
+        result = json.loads(tools.diff_ir_with_snapshot("abc123", "1:2"))
+        assert result["status"] == "ok"
+        assert differ.diff.call_args[0][0] == SAMPLE_IR
+
     def test_node_not_found(self):
         tools, client, _, _ = _make_tools()
         client.get_file_nodes.return_value = {"nodes": {"1:2": {}}}
@@ -3,6 +3,8 @@ import logging
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 from airis_pdm.figmai import run_chain_pipeline, run_flow_from_file_json, run_flow_via_console
 from airis_pdm.figmai.renderers import render_pixel_react_component, render_pixel_vue_sfc
 from airis_pdm.figmai.spec_to_design_ops import spec_to_design_ops
@@ -143,6 +145,34 @@ def test_flow_live_console(monkeypatch, tmp_path: Path):
     assert (tmp_path / "live" / "flow" / "vue" / "router.ts").is_file()
 
 
+def test_flow_live_renders_each_page_before_next_fetch(monkeypatch, tmp_path: Path):
+    def fake_request_sync(method, params=None, **kwargs):
+        params = params or {}
+        if method == "searchNodes":
+            return [
+                {"id": "1:1", "name": "[Page] A", "type": "FRAME"},
+                {"id": "1:2", "name": "[Page] B", "type": "FRAME"},
+            ]
+        if method == "getNode":
+            if params["nodeId"] == "1:2":
+                raise RuntimeError("connection lost")
+            return {
+                "id": "1:1",
+                "name": "[Page] A",
+                "type": "FRAME",
+                "visible": True,
+                "absoluteBoundingBox": {"x": 0, "y": 0, "width": 320, "height": 640},
+                "children": [],
+            }
+        raise AssertionError(f"unexpected method {method}")
+
+    monkeypatch.setattr("airis_pdm.figmai.flow.request_sync", fake_request_sync)
+    with pytest.raises(RuntimeError):
+        run_flow_via_console(output_dir=str(tmp_path / "live"), framework="vue", fidelity="semantic")
+    # 第一頁已在拉取第二頁前輸出
+    assert list((tmp_path / "live" / "flow" / "vue").glob("*/*.vue"))
+
+
 def test_cli_flow_live_count_message(monkeypatch, capsys):
     args = SimpleNamespace(
         fm_cmd="flow",
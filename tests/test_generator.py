@@ -137,6 +137,37 @@ class TestStyleSheet:
         sheet = StyleSheet(prefix="x")
         assert sheet.to_css() == ""
 
+    def test_dedupe_shares_class_for_identical_declarations(self):
+        sheet = StyleSheet(prefix="list", dedupe=True)
+        card = {"figmaName": "Card", "layout": {"width": 100, "height": 40}}
+        classes = {sheet.add_node(dict(card)) for _ in range(500)}
+        other = sheet.add_node({"figmaName": "Card", "layout": {"width": 120}})
+        assert classes == {"list-card-1"}
+        assert other == "list-card-2"
+        assert sheet.to_css().count("{") == 2
+
+    def test_to_css_cached_until_add_node(self):
+        sheet = StyleSheet(prefix="c")
+        sheet.add_node({"figmaName": "B", "layout": {"width": 10}})
+        first = sheet.to_css()
+        assert sheet.to_css() is first
+        sheet.add_node({"figmaName": "A", "layout": {"width": 20}})
+        css = sheet.to_css()
+        assert css is not first
+        assert css.index(".c-a-2") < css.index(".c-b-1")
+
+    def test_declarations_in_property_order(self):
+        sheet = StyleSheet(prefix="o")
+        sheet.add_rule("x", {"color": "red", "zoom": "1", "width": "1px", "box-sizing": "border-box"})
+        assert sheet.to_css() == (
+            ".o-x-1 {\n  box-sizing: border-box;\n  width: 1px;\n  color: red;\n  zoom: 1;\n}\n"
+        )
+
+    def test_default_mode_keeps_one_class_per_node(self):
+        sheet = StyleSheet(prefix="list")
+        card = {"figmaName": "Card", "layout": {"width": 100}}
+        assert sheet.add_node(card) != sheet.add_node(card)
+
 
 # ─── StyleBundle ────────────────────────────────────────────────────────────
 
@@ -154,6 +185,45 @@ class TestStyleBundle:
         assert ".a-one-" in css
         assert ".b-two-" in css
 
+    def test_renders_each_sheet_once(self, monkeypatch):
+        import airis_pdm.generator as generator
+
+        s1 = StyleSheet(prefix="a")
+        s1.add_node({"figmaName": "One", "layout": {"width": 10}})
+        bundle = StyleBundle(sheets=[s1])
+        calls = []
+        original = generator._rule_css
+        monkeypatch.setattr(generator, "_rule_css", lambda sel, styles: calls.append(sel) or original(sel, styles))
+        first = bundle.to_css()
+        assert bundle.to_css() == first
+        assert calls == []
+        s1.add_node({"figmaName": "Two", "layout": {"width": 20}})
+        assert ".a-two-2" in bundle.to_css()
+        assert calls == [".a-two-2"]
+
+    def test_dedupe_hoists_rules_shared_across_sheets(self):
+        s1 = StyleSheet(prefix="a", dedupe=True)
+        s1.add_node({"figmaName": "Card", "layout": {"width": 10}})
+        s2 = StyleSheet(prefix="b", dedupe=True)
+        s2.add_node({"figmaName": "Card", "layout": {"width": 10}})
+        s2.add_node({"figmaName": "Other", "layout": {"width": 30}})
+        css = StyleBundle(sheets=[s1, s2], dedupe=True).to_css()
+        assert ".a-card-1, .b-card-1 {" in css
+        assert css.count("width: 10px") == 1
+        assert ".b-other-2 {" in css
+
+    def test_multi_page_app_css_covers_all_pages(self, tmp_path):
+        from airis_pdm.generator import generate_from_ir
+
+        ir = {"pages": [
+            {"figmaName": "Home", "figmaType": "FRAME", "children": [{"figmaName": "Hero", "layout": {"width": 10}}]},
+            {"figmaName": "About", "figmaType": "FRAME", "children": [{"figmaName": "Team", "layout": {"width": 20}}]},
+        ]}
+        generate_from_ir(ir, target="vue", output_dir=str(tmp_path))
+        css = (tmp_path / "styles" / "app.css").read_text(encoding="utf-8")
+        assert ".home-hero-" in css
+        assert ".about-team-" in css
+
 
 # ─── _style_dict ────────────────────────────────────────────────────────────
 
@@ -238,6 +308,85 @@ class TestStyleDict:
         assert "box-shadow" in d
 
 
+class TestStyleDictMemo:
+    @pytest.fixture(autouse=True)
+    def _fresh_memo(self):
+        from airis_pdm import generator
+
+        generator._clear_style_memo()
+        yield generator
+        generator._clear_style_memo()
+
+    def test_hit_returns_fresh_copy(self, _fresh_memo):
+        node = {"layout": {"width": 10}, "styles": {"backgroundColor": "#fff"}}
+        first = _style_dict(node)
+        first["width"] = "mutated"
+        second = _style_dict(dict(node))
+        assert second["width"] == "10px"
+        assert _fresh_memo._style_memo_stats == {"hits": 1, "misses": 1}
+
+    def test_text_characters_share_entry(self, _fresh_memo):
+        a = {"layout": {}, "text": {"characters": "A", "fontSize": 12}}
+        b = {"layout": {}, "text": {"characters": "B", "fontSize": 12}}
+        assert _style_dict(a) == _style_dict(b)
+        assert _fresh_memo._style_memo_stats["hits"] == 1
+
+    def test_numeric_type_kept_where_rendered_verbatim(self):
+        assert _style_dict({"styles": {"opacity": 1}})["opacity"] == "1"
+        assert _style_dict({"styles": {"opacity": 1.0}})["opacity"] == "1.0"
+
+    def test_missing_and_none_are_distinct(self):
+        assert _style_dict({"text": {"fontSize": 12}})["letter-spacing"] == "0px"
+        assert _style_dict({"text": {"fontSize": 12, "letterSpacing": None}})["letter-spacing"] == "Nonepx"
+
+    def test_theme_is_part_of_key(self):
+        from airis_pdm.theme_manager import ThemeManager
+
+        node = {"styles": {"backgroundColor": "#ff0000"}}
+        theme = ThemeManager()
+        assert _style_dict(node, theme)["background-color"] == "#ff0000"
+        theme.load_tokens({"colors": ["#ff0000"]})
+        assert _style_dict(node, theme)["background-color"].startswith("var(")
+        assert _style_dict(node)["background-color"] == "#ff0000"
+
+    def test_equal_themes_share_entries_without_holding_instances(self, _fresh_memo):
+        import gc
+        import weakref
+        from airis_pdm.theme_manager import ThemeManager
+
+        node = {"styles": {"backgroundColor": "#ff0000"}}
+        refs = []
+        for _ in range(2):
+            theme = ThemeManager()
+            theme.load_tokens({"colors": ["#ff0000"]})
+            assert _style_dict(node, theme)["background-color"].startswith("var(")
+            refs.append(weakref.ref(theme))
+            del theme
+        gc.collect()
+        assert _fresh_memo._style_memo_stats == {"hits": 1, "misses": 1}
+        assert all(ref() is None for ref in refs)
+
+    def test_unhashable_values_computed_directly(self, _fresh_memo):
+        node = {"styles": {"backgroundColor": {"r": 1}}}
+        assert _style_dict(node)["background-color"] == {"r": 1}
+        assert len(_fresh_memo._style_memo) == 0
+
+    def test_shared_with_ui_ir_style_map(self, _fresh_memo):
+        from airis_pdm.figmai.style_schema import compute_inline_style_map
+
+        fragment = {"layout": {"width": 40}, "styles": {"opacity": 0.5}}
+        compute_inline_style_map(fragment)
+        StyleSheet(prefix="app").add_node(fragment)
+        assert _fresh_memo._style_memo_stats == {"hits": 1, "misses": 1}
+
+    def test_lru_is_bounded(self, _fresh_memo, monkeypatch):
+        monkeypatch.setattr(_fresh_memo, "_STYLE_MEMO_MAX", 3)
+        for w in range(1, 6):
+            _style_dict({"layout": {"width": w}})
+        _style_dict({"layout": {"width": 5}})
+        assert [k[1] for k in _fresh_memo._style_memo] == [3, 4, 5]
+
+
 # ─── _collect_components ──────────────────────────────────────────────────────
 
 
@@ -344,3 +493,320 @@ class TestRenderFlutter:
         assert "Text(" in flutter
         assert "Hello World" in flutter
         assert "TextStyle(" in flutter
+
+
+# ─── streaming renderer ─────────────────────────────────────────────────────
+
+
+def _deep_chain(depth):
+    root = {"figmaType": "FRAME", "figmaName": "Root", "children": []}
+    node = root
+    for i in range(depth):
+        child = {"figmaType": "FRAME", "figmaName": f"Level {i % 3}", "children": []}
+        node["children"].append(child)
+        node = child
+    return root
+
+
+class TestStreamingRender:
+    def test_emit_to_sink_matches_render(self):
+        import io
+
+        from airis_pdm.generator import _emit_vue
+
+        sink = io.StringIO()
+        _emit_vue(RENDER_NODE, StyleSheet(prefix="v"), sink, 2)
+        assert sink.getvalue() == _render_vue(RENDER_NODE, StyleSheet(prefix="v"), 2)
+
+    def test_emit_accepts_write_callable(self):
+        from airis_pdm.generator import _emit_flutter
+
+        chunks = []
+        _emit_flutter(RENDER_NODE, chunks.append)
+        assert len(chunks) > 1
+        assert "".join(chunks) == _render_flutter(RENDER_NODE)
+
+    def test_deep_tree_beyond_recursion_limit(self, tmp_path):
+        import sys
+
+        from airis_pdm.generator import generate_from_ir
+
+        depth = sys.getrecursionlimit() + 500
+        html = _render_html(_deep_chain(depth), StyleSheet(prefix="d"))
+        assert html.count("<div") == depth + 1
+        generate_from_ir(_deep_chain(depth), target="react", output_dir=str(tmp_path), cache_dir=str(tmp_path / "c"))
+        page = (tmp_path / "pages" / "Root.tsx").read_text(encoding="utf-8")
+        assert page.count("<div") == depth + 1
+        assert not [p for p in tmp_path.rglob(".*") if p.name != ".aipdm-manifest.json" and not p.is_relative_to(tmp_path / "c")]
+
+    def test_staging_outside_output_tree(self, tmp_path, monkeypatch):
+        import os
+        from pathlib import Path
+
+        from airis_pdm import generator
+
+        created = []
+        original = generator._StagingSink.__init__
+
+        def recording_init(self):
+            original(self)
+            created.append(self.tmp)
+
+        monkeypatch.setattr(generator._StagingSink, "__init__", recording_init)
+        generator.generate_from_ir(_deep_chain(3), target="vue", output_dir=str(tmp_path / "out"))
+        assert created
+        assert not any(p.is_relative_to(tmp_path) for p in created)
+        assert not any(p.exists() for p in created)
+
+        # 暫存目錄在另一個檔案系統：複製到目標旁再 rename
+        real_replace = os.replace
+        refused = []
+
+        def cross_device(src, dst):
+            if Path(src).parent == Path(generator.tempfile.gettempdir()):
+                refused.append(dst)
+                raise OSError(generator.errno.EXDEV, "cross-device link")
+            return real_replace(src, dst)
+
+        monkeypatch.setattr(generator.os, "replace", cross_device)
+        edited = _deep_chain(4)
+        generator.generate_from_ir(edited, target="vue", output_dir=str(tmp_path / "out"))
+        page = (tmp_path / "out" / "pages" / "Root.vue").read_text(encoding="utf-8")
+        assert page.count("<div") == 5
+        assert refused and not [p for p in (tmp_path / "out").rglob("*.tmp")]
+
+    def test_outputs_are_abstract(self, tmp_path):
+        from airis_pdm.generator import _Output, _StagingOutput
+
+        class Incomplete(_StagingOutput):
+            pass
+
+        with pytest.raises(TypeError):
+            _Output()
+        with pytest.raises(TypeError):
+            Incomplete(tmp_path)
+
+
+# ─── generate_from_ir manifest ──────────────────────────────────────────────
+
+
+class TestGenerationManifest:
+    IR = {
+        "figmaName": "Home",
+        "figmaType": "FRAME",
+        "children": [
+            {"figmaName": "Title", "figmaType": "TEXT", "text": {"characters": "Hi", "fontSize": 16}},
+            {"figmaName": "Card/Default", "figmaType": "INSTANCE", "layout": {"width": 100}},
+        ],
+    }
+
+    def test_first_run_reports_new_files_and_writes_manifest(self, tmp_path):
+        import json
+        from airis_pdm.generator import MANIFEST_FILENAME, generate_from_ir
+
+        result = generate_from_ir(self.IR, target="vue", output_dir=str(tmp_path))
+        assert "App.vue" in result["files"]
+        assert result["changed"] == result["files"]
+        manifest = json.loads((tmp_path / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        assert sorted(manifest["files"]) == result["files"]
+
+    def test_rerun_leaves_unchanged_files_untouched(self, tmp_path):
+        import os
+        from airis_pdm.generator import generate_from_ir
+
+        generate_from_ir(self.IR, target="react", output_dir=str(tmp_path))
+        stamps = {p: p.stat().st_mtime_ns for p in tmp_path.rglob("*") if p.is_file()}
+        for p in stamps:
+            os.utime(p, ns=(0, 0))
+        result = generate_from_ir(self.IR, target="react", output_dir=str(tmp_path))
+        assert result["files"] == []
+        assert result["changed"] == []
+        assert all(p.stat().st_mtime_ns == 0 for p in stamps)
+
+    def test_only_changed_content_is_rewritten(self, tmp_path):
+        from airis_pdm.generator import generate_from_ir
+
+        generate_from_ir(self.IR, target="vue", output_dir=str(tmp_path))
+        edited = {**self.IR, "children": [self.IR["children"][0]]}
+        result = generate_from_ir(edited, target="vue", output_dir=str(tmp_path))
+        assert "pages/Home.vue" in result["changed"]
+        assert "App.vue" not in result["changed"]
+        assert result["files"] == []
+
+    def test_deleted_file_is_restored(self, tmp_path):
+        from airis_pdm.generator import generate_from_ir
+
+        generate_from_ir(self.IR, target="html", output_dir=str(tmp_path))
+        (tmp_path / "index.html").unlink()
+        result = generate_from_ir(self.IR, target="html", output_dir=str(tmp_path))
+        assert result["files"] == ["index.html"]
+        assert (tmp_path / "index.html").is_file()
+
+
+# ─── RenderCache ────────────────────────────────────────────────────────────
+
+
+class TestRenderCache:
+    IR = {
+        "pages": [
+            {
+                "figmaName": f"Page {i}",
+                "figmaType": "FRAME",
+                "children": [
+                    {
+                        "figmaName": "Card/Default",
+                        "figmaType": "INSTANCE",
+                        "layout": {"width": 100},
+                        "children": [{"figmaName": "Label", "figmaType": "TEXT", "text": {"characters": f"L{i}"}}],
+                    },
+                    {"figmaName": "Footer", "figmaType": "FRAME", "styles": {"backgroundColor": "#eee"}},
+                ],
+            }
+            for i in range(2)
+        ]
+    }
+
+    def _tree(self, root):
+        return {p.relative_to(root).as_posix(): p.read_bytes() for p in root.rglob("*") if p.is_file()}
+
+    def test_cached_output_matches_uncached(self, tmp_path):
+        import copy
+        from airis_pdm.generator import generate_from_ir
+
+        for target in ("html", "vue", "react", "flutter"):
+            generate_from_ir(copy.deepcopy(self.IR), target=target, output_dir=str(tmp_path / target / "plain"))
+            for run in ("cold", "warm"):
+                generate_from_ir(
+                    copy.deepcopy(self.IR),
+                    target=target,
+                    output_dir=str(tmp_path / target / run),
+                    cache_dir=str(tmp_path / "cache"),
+                )
+                assert self._tree(tmp_path / target / run) == self._tree(tmp_path / target / "plain")
+
+    def test_only_dirty_subtrees_are_rendered(self, tmp_path):
+        import copy
+        from airis_pdm.codegen_cache import RenderCache
+        from airis_pdm.generator import _render_vue
+
+        page = copy.deepcopy(self.IR["pages"][0])
+        cache = RenderCache(str(tmp_path))
+        first = _render_vue(page, StyleSheet(prefix="p"), 2, cache)
+        cache.save()
+
+        warm = RenderCache(str(tmp_path))
+        assert _render_vue(page, StyleSheet(prefix="p"), 2, warm) == first
+        assert (warm.hits, warm.misses) == (1, 0)
+
+        page["children"][1]["styles"]["backgroundColor"] = "#000"
+        edited = RenderCache(str(tmp_path))
+        out = _render_vue(page, StyleSheet(prefix="p"), 2, edited)
+        assert out == _render_vue(page, StyleSheet(prefix="p"), 2)
+        # root and the edited footer are re-rendered; the card subtree is replayed
+        assert (edited.hits, edited.misses) == (1, 2)
+
+    def test_unused_entries_evicted_beyond_cap(self, tmp_path):
+        import copy
+        import json
+        from airis_pdm.codegen_cache import CACHE_FILENAME, RenderCache
+        from airis_pdm.generator import _render_vue
+
+        def run(page, max_entries):
+            cache = RenderCache(str(tmp_path), max_entries=max_entries)
+            out = _render_vue(page, StyleSheet(prefix="p"), 2, cache)
+            cache.save()
+            return cache, out
+
+        pages = []
+        for i in range(4):
+            page = copy.deepcopy(self.IR["pages"][0])
+            page["children"][1]["styles"]["backgroundColor"] = f"#00000{i}"
+            pages.append(page)
+            run(page, max_entries=6)
+        saved = json.loads((tmp_path / CACHE_FILENAME).read_text(encoding="utf-8"))["entries"]
+        assert len(saved) == 6
+
+        # the last run's templates survive and come last; replay still matches a fresh render
+        cache, out = run(pages[-1], max_entries=6)
+        assert cache.misses == 0
+        assert out == _render_vue(pages[-1], StyleSheet(prefix="p"), 2)
+        assert list(saved)[-len(cache.used):] == list(cache.used)
+
+    def test_pure_hit_run_does_not_rewrite(self, tmp_path):
+        import copy
+        import os
+        from airis_pdm.codegen_cache import CACHE_FILENAME, RenderCache
+        from airis_pdm.generator import _render_vue
+
+        page = copy.deepcopy(self.IR["pages"][0])
+        cold = RenderCache(str(tmp_path))
+        _render_vue(page, StyleSheet(prefix="p"), 2, cold)
+        cold.save()
+        os.utime(tmp_path / CACHE_FILENAME, ns=(0, 0))
+        warm = RenderCache(str(tmp_path))
+        _render_vue(page, StyleSheet(prefix="p"), 2, warm)
+        warm.save()
+        assert (tmp_path / CACHE_FILENAME).stat().st_mtime_ns == 0
+
+    def test_file_parsed_once_per_process(self, tmp_path, monkeypatch):
+        import copy
+        import json as json_module
+        from airis_pdm import codegen_cache
+        from airis_pdm.generator import _render_vue
+
+        page = copy.deepcopy(self.IR["pages"][0])
+        cold = codegen_cache.RenderCache(str(tmp_path))
+        _render_vue(page, StyleSheet(prefix="p"), 2, cold)
+        cold.save()
+        codegen_cache._loaded.clear()
+
+        parses = []
+        real_loads = json_module.loads
+        monkeypatch.setattr(codegen_cache.json, "loads", lambda text: (parses.append(1), real_loads(text))[1])
+        for _ in range(3):
+            job_cache = codegen_cache.RenderCache(str(tmp_path))
+            _render_vue(page, StyleSheet(prefix="p"), 2, job_cache)
+            assert job_cache.misses == 0
+        assert len(parses) == 1
+
+    def test_nul_in_text_is_not_templated(self, tmp_path):
+        from airis_pdm.generator import generate_from_ir
+
+        ir = {"figmaType": "FRAME", "figmaName": "P", "children": [
+            {"figmaType": "TEXT", "figmaName": "T", "text": {"characters": "a\x00s5\x00b"}},
+        ]}
+        generate_from_ir(ir, target="html", output_dir=str(tmp_path / "plain"))
+        for run in ("cold", "warm"):
+            generate_from_ir(ir, target="html", output_dir=str(tmp_path / run), cache_dir=str(tmp_path / "cache"))
+            assert self._tree(tmp_path / run) == self._tree(tmp_path / "plain")
+
+    def test_missing_child_entry_is_rerendered(self, tmp_path):
+        import copy
+        from airis_pdm.codegen_cache import RenderCache
+        from airis_pdm.generator import _render_vue
+
+        page = copy.deepcopy(self.IR["pages"][0])
+        cache = RenderCache(str(tmp_path))
+        first = _render_vue(page, StyleSheet(prefix="p"), 2, cache)
+        cache.save()
+
+        partial = RenderCache(str(tmp_path))
+        child_key = next(key for key, entry in partial.entries.items() if "Label" in entry["text"] or "L0" in entry["text"])
+        del partial.entries[child_key]
+        assert _render_vue(page, StyleSheet(prefix="p"), 2, partial) == first
+        assert child_key in partial.entries
+
+    def test_theme_fingerprint_is_part_of_key(self, tmp_path):
+        from airis_pdm.codegen_cache import RenderCache
+        from airis_pdm.generator import _render_html
+        from airis_pdm.theme_manager import ThemeManager
+
+        node = {"figmaName": "Box", "styles": {"backgroundColor": "#ff0000"}}
+        theme = ThemeManager()
+        theme.load_from_pen_variables([{"name": "brand", "value": "#ff0000"}])
+        cache = RenderCache()
+        _render_html(node, StyleSheet(prefix="a"), 0, cache)
+        themed = StyleSheet(prefix="a", theme_manager=theme)
+        _render_html(node, themed, 0, cache)
+        assert cache.misses == 2
+        assert "var(--token-brand)" in themed.to_css()
@@ -0,0 +1,242 @@
+"""
+HMR watch 測試：IR 子樹原地替換與完整重建一致、檔案 → 組件名稱對應、hot update 時只走訪變更組件。
+"""
+import asyncio
+import copy
+import json
+
+from airis_pdm.dom_extractor import DOM_WALKER_V2_JS, ExtractionConfig
+from airis_pdm.hmr_watch import ComponentFileIndex, HmrWatchSession
+from airis_pdm.ir_builder import IRBuilderV2
+from airis_pdm import readiness
+
+from tests.factories import raw_node
+
+
+def _card(title, body="Body", height=80):
+    return raw_node("div", [raw_node("h3", text=title), raw_node("p", text=body)],
+                    component="ProductCard", width=300, height=height)
+
+
+def _page(first="First", second="Second", height=80):
+    return raw_node("main", width=300, children=[
+        raw_node("header", [raw_node("h1", text="Shop")], width=300),
+        # 單一子元素的 wrapper 會被 flatten：path (1,) 與 (1, 0) 指向同一個 IR 節點
+        raw_node("div", [_card(first, height=height)], width=300),
+        _card(second, height=height),
+    ])
+
+
+def _build(raw):
+    builder = IRBuilderV2(style_strategy="inline", index_paths=True)
+    return builder, builder.build(copy.deepcopy(raw), {"width": 300, "height": 600})
+
+
+def _comparable(ir_doc):
+    doc = copy.deepcopy(ir_doc)
+    doc["source"].pop("generatedAt")
+    doc["nameMapping"] = dict(doc["nameMapping"])
+    return json.dumps(doc, sort_keys=True)
+
+
+class TestPatchSubtree:
+    def test_patch_matches_full_rebuild(self):
+        builder, ir_doc = _build(_page())
+        tree = ir_doc["tree"]
+        second = tree["children"][2]
+
+        assert builder.patch_subtree(ir_doc, [1, 0], _card("First v2"))
+        assert builder.patch_subtree(ir_doc, [2], _card("Second v2"))
+
+        _, rebuilt = _build(_page("First v2", "Second v2"))
+        assert _comparable(ir_doc) == _comparable(rebuilt)
+        assert ir_doc["tree"] is tree and ir_doc["tree"]["children"][2] is second  # 原地替換
+
+    def test_patched_subtree_can_be_patched_again(self):
+        builder, ir_doc = _build(_page())
+        assert builder.patch_subtree(ir_doc, [2], _card("v2"))
+        assert builder.patch_subtree(ir_doc, [2], _card("v3"))
+        _, rebuilt = _build(_page(second="v3"))
+        assert _comparable(ir_doc) == _comparable(rebuilt)
+
+    def test_repeated_patches_keep_mapping_order_and_size(self):
+        builder, ir_doc = _build(_page())
+        for version in range(12):
+            assert builder.patch_subtree(ir_doc, [1, 0], _card(f"First v{version}"))
+            assert builder.patch_subtree(ir_doc, [2], _card(f"Second v{version}"))
+        _, rebuilt = _build(_page("First v11", "Second v11"))
+        assert list(ir_doc["nameMapping"]) == list(rebuilt["nameMapping"])
+        assert len(builder.name_mapping._parents) <= 2 * len(rebuilt["nameMapping"]._parents)
+        for path, (node, _, row) in builder.path_index.items():
+            assert builder.name_mapping.path(row).endswith(node["figmaName"])
+
+    def test_size_change_or_unknown_path_refused(self):
+        builder, ir_doc = _build(_page())
+        before = _comparable(ir_doc)
+        assert not builder.patch_subtree(ir_doc, [2], _card("Taller", height=120))
+        assert not builder.patch_subtree(ir_doc, [7], _card("Nowhere"))
+        assert _comparable(ir_doc) == before
+
+
+class TestComponentFileIndex:
+    def test_maps_sfc_to_runtime_names(self, tmp_path):
+        (tmp_path / "product-card.vue").write_text("<script>export default { name: 'ProductCard' }</script>")
+        (tmp_path / "store.ts").write_text("export const x = 1")
+        index = ComponentFileIndex(str(tmp_path), "vue")
+        index.scan()
+        assert index.names_for(str(tmp_path / "product-card.vue")) == ["ProductCard", "product-card"]
+        assert index.names_for(str(tmp_path / "store.ts")) == []
+
+    def test_new_file_resolved_on_demand(self, tmp_path):
+        index = ComponentFileIndex(str(tmp_path), "react")
+        index.scan()
+        (tmp_path / "Badge.tsx").write_text("export default function Badge() { return null }")
+        assert index.names_for(str(tmp_path / "Badge.tsx")) == ["Badge"]
+
+
+class ConsoleMessage:
+    def __init__(self, text):
+        self.text = text
+
+
+class HmrPage:
+    """page.evaluate 依腳本回傳目前的 raw tree 或組件子樹。"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.handlers = {}
+        self.walks = []
+        self.reloads = 0
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def hot_update(self, raw):
+        self.raw = raw
+        self.handlers["console"](ConsoleMessage("[vite] hot updated: /src/components/ProductCard.vue"))
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def reload(self, **kwargs):
+        self.reloads += 1
+
+    async def evaluate(self, script, arg=None):
+        if script in (readiness.HYDRATION_JS, readiness.MUTATION_QUIET_JS, readiness.RAF_JS):
+            return None
+        assert script == DOM_WALKER_V2_JS
+        names = arg.get("subtreeComponents")
+        self.walks.append(names)
+        if not names:
+            return copy.deepcopy(self.raw)
+        return {"subtrees": [
+            {"path": [1, 0], "node": copy.deepcopy(self.raw["children"][1]["children"][0])},
+            {"path": [2], "node": copy.deepcopy(self.raw["children"][2])},
+        ]}
+
+    async def screenshot(self, **kwargs):
+        return b"png"
+
+
+class FakePool:
+    def __init__(self, page):
+        self._page = page
+
+    def page(self, width, height):
+        page = self._page
+
+        class Borrow:
+            async def __aenter__(self):
+                return page
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Borrow()
+
+
+class TestHmrWatchSession:
+    def _session(self, tmp_path, page, timeout_ms=500):
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "ProductCard.vue").write_text("<script setup></script>")
+        config = {"source": {"srcRoot": str(src), "framework": "vue"}}
+        session = HmrWatchSession("http://a", config, ExtractionConfig(framework="vue"),
+                                  str(tmp_path / "out"), hmr_timeout_ms=timeout_ms)
+        return session, src / "ProductCard.vue"
+
+    def test_hot_update_patches_only_component_subtrees(self, tmp_path):
+        page = HmrPage(_page())
+        session, card = self._session(tmp_path, page)
+
+        async def run():
+            assert (await session.start(FakePool(page)))["mode"] == "full"
+            page.hot_update(_page("First v2", "Second v2"))
+            return await session.on_change(str(card))
+
+        report = asyncio.run(run())
+        assert report["mode"] == "patch" and report["patched"] == 2
+        assert page.walks[0] is None and "ProductCard" in page.walks[1] and len(page.walks) == 2
+        saved = json.loads((tmp_path / "out" / "figma-import-payload.json").read_text())
+        _, rebuilt = _build(_page("First v2", "Second v2"))
+        assert saved["tree"] == rebuilt["tree"]
+        patch = json.loads((tmp_path / "out" / "hmr-patch.json").read_text())
+        assert patch["seq"] == 2 and not patch["full"]
+        assert [s["name"] for s in patch["subtrees"]] == ["Main/Productcard", "Main/Productcard"]
+
+    def test_size_change_falls_back_to_full_walk(self, tmp_path):
+        page = HmrPage(_page())
+        session, card = self._session(tmp_path, page)
+
+        async def run():
+            await session.start(FakePool(page))
+            page.hot_update(_page("Tall", height=200))
+            return await session.on_change(str(card))
+
+        report = asyncio.run(run())
+        assert report["mode"] == "full" and report["reason"] == "subtree size changed"
+        assert len(page.walks) == 3 and page.walks[2] is None
+
+    def test_missing_hot_update_reloads_page(self, tmp_path):
+        page = HmrPage(_page())
+        session, card = self._session(tmp_path, page, timeout_ms=50)
+
+        async def run():
+            await session.start(FakePool(page))
+            return await session.on_change(str(card))
+
+        report = asyncio.run(run())
+        assert report["mode"] == "full" and report["reason"] == "no hot update"
+        assert page.reloads == 1
+
+    def test_overlapping_changes_serialized_and_merged(self, tmp_path):
+        page = HmrPage(_page())
+        session, card = self._session(tmp_path, page)
+        header = card.parent / "ShopHeader.vue"
+        header.write_text("<script setup></script>")
+        evaluate = page.evaluate
+
+        async def slow_evaluate(script, arg=None):
+            await asyncio.sleep(0.01)  # 走訪期間讓出 event loop
+            return await evaluate(script, arg)
+
+        page.evaluate = slow_evaluate
+
+        async def run():
+            await session.start(FakePool(page))
+            page.hot_update(_page("First v2", "Second v2"))
+            first = asyncio.create_task(session.on_change(str(card)))
+            await asyncio.sleep(0)
+            # 第一批處理中到達的兩次變更併成一批
+            second = asyncio.create_task(session.on_change(str(header)))
+            third = asyncio.create_task(session.on_change([str(card)]))
+            return await asyncio.gather(first, second, third)
+
+        first, second, third = asyncio.run(run())
+        assert first["mode"] == "patch" and "ProductCard" in first["components"]
+        assert second["mode"] == "patch" and "ShopHeader" in second["components"]
+        assert "ProductCard" in second["components"]
+        assert third is None
+        assert len(page.walks) == 3
+        patch = json.loads((tmp_path / "out" / "hmr-patch.json").read_text())
+        assert patch["seq"] == 3 and patch["changedFiles"] == [str(header), str(card)]
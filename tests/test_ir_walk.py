@@ -0,0 +1,144 @@
+"""Tests for ir_walk module — explicit-stack IR traversal."""
+
+import sys
+
+from airis_pdm.ir_walk import (
+    build_tree,
+    copy_tree,
+    emit_tree,
+    iter_nodes,
+    iter_postorder,
+    visit_all,
+    walk,
+)
+
+
+TREE = {
+    "figmaName": "A",
+    "children": [
+        {"figmaName": "B", "children": [{"figmaName": "C"}, {"figmaName": "D"}]},
+        {"figmaName": "E", "children": None},
+    ],
+}
+
+
+def _names(nodes):
+    return [n["figmaName"] for n in nodes]
+
+
+def _chain(depth):
+    root = {"figmaName": "Root", "figmaType": "FRAME", "children": []}
+    node = root
+    for i in range(depth):
+        child = {"figmaName": f"N{i}", "figmaType": "FRAME", "children": []}
+        node["children"].append(child)
+        node = child
+    return root
+
+
+DEEP = sys.getrecursionlimit() + 500
+
+
+# ─── traversal order ─────────────────────────────────────────────────────────
+
+
+class TestOrder:
+    def test_iter_nodes_is_preorder(self):
+        assert _names(iter_nodes(TREE)) == ["A", "B", "C", "D", "E"]
+
+    def test_iter_nodes_none_root(self):
+        assert list(iter_nodes(None)) == []
+
+    def test_iter_postorder(self):
+        assert _names(iter_postorder(TREE)) == ["C", "D", "B", "E", "A"]
+
+    def test_walk_passes_state_down(self):
+        paths = []
+
+        def visit(node, path):
+            full = f"{path}/{node['figmaName']}" if path else node["figmaName"]
+            paths.append(full)
+            return full
+
+        walk(TREE, visit, "")
+        assert paths == ["A", "A/B", "A/B/C", "A/B/D", "A/E"]
+
+    def test_visit_all_shares_one_pass(self):
+        seen_a, seen_b = [], []
+        visit_all(TREE, [lambda n: seen_a.append(n["figmaName"]), lambda n: seen_b.append(n["figmaName"])])
+        assert seen_a == seen_b == ["A", "B", "C", "D", "E"]
+
+
+# ─── build_tree / emit_tree ──────────────────────────────────────────────────
+
+
+class TestBuildAndEmit:
+    def test_build_tree_drops_none(self):
+        def convert(node):
+            if node["figmaName"] == "C":
+                return None
+            out = {"name": node["figmaName"].lower(), "children": []}
+            return out, out["children"]
+
+        result = build_tree(TREE, convert)
+        assert result == {
+            "name": "a",
+            "children": [
+                {"name": "b", "children": [{"name": "d", "children": []}]},
+                {"name": "e", "children": []},
+            ],
+        }
+
+    def test_copy_tree_is_deep(self):
+        copied = copy_tree(TREE)
+        assert copied == TREE
+        copied["children"][0]["children"][0]["figmaName"] = "X"
+        assert TREE["children"][0]["children"][0]["figmaName"] == "C"
+
+    def test_emit_tree_interleaves_separators(self):
+        def shell(node, depth):
+            kids = node.get("children") or []
+            if not kids:
+                return node["figmaName"]
+            return (f"{node['figmaName']}(", ",", ")", depth + 1, kids)
+
+        chunks = []
+        emit_tree(TREE, shell, chunks.append, 0)
+        assert "".join(chunks) == "A(B(C,D),E)"
+
+
+# ─── depth beyond the recursion limit ───────────────────────────────────────
+
+
+class TestDeepTrees:
+    def test_iter_nodes(self):
+        assert sum(1 for _ in iter_nodes(_chain(DEEP))) == DEEP + 1
+
+    def test_extract_tokens(self):
+        from airis_pdm.token_export import extract_tokens_from_ir
+
+        tree = _chain(DEEP)
+        tree["children"][0]["autoLayout"] = {"spacing": 8}
+        assert extract_tokens_from_ir({"tree": tree})["spacing"] == [8]
+
+    def test_ui_ir_round_trip_and_validate(self):
+        from airis_pdm.figmai.ir_contract import validate_ui_ir
+        from airis_pdm.figmai.ui_ir_to_airis import airis_ir_to_ui_ir, ui_ir_to_airis_ir
+
+        ui = airis_ir_to_ui_ir(_chain(DEEP))
+        result = validate_ui_ir(ui)
+        assert result.valid, result.errors[:3]
+        back = ui_ir_to_airis_ir(result.fixed)
+        assert sum(1 for _ in iter_nodes(back)) == DEEP + 1
+
+    def test_figma_to_ir_and_flatten(self):
+        from airis_pdm.figma_reader import FigmaToIR, IRDiffer
+
+        root = {"type": "FRAME", "name": "Root", "children": []}
+        node = root
+        for i in range(DEEP):
+            child = {"type": "FRAME", "name": f"N{i}", "children": []}
+            node["children"].append(child)
+            node = child
+        ir = FigmaToIR().convert(root)
+        assert len(IRDiffer()._flatten(ir)) == DEEP + 1
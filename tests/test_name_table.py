@@ -0,0 +1,89 @@
+"""
+NameTable 測試：parent-pointer 路徑表的 JSON view 與舊版完整路徑 dict 相同、字串 intern、子樹移除與還原。
+"""
+from airis_pdm.ir_builder import IRBuilderV2
+from airis_pdm.name_table import NameTable
+
+from tests.factories import raw_node
+
+
+class TestNameTable:
+    def test_paths_and_view(self):
+        table = NameTable("/", "http://localhost:5173")
+        page = table.add(-1, "Page", "main.page")
+        header = table.add(page, "Header", "header.top", "AppHeader")
+        table.add(header, "Title", "h1.title")
+
+        assert table.path(2) == "Page/Header/Title"
+        assert dict(table) == {
+            "Page": {"sourceFile": "http://localhost:5173", "selector": "main.page", "componentName": ""},
+            "Page/Header": {"sourceFile": "http://localhost:5173", "selector": "header.top", "componentName": "AppHeader"},
+            "Page/Header/Title": {"sourceFile": "http://localhost:5173", "selector": "h1.title", "componentName": ""},
+        }
+
+    def test_duplicate_paths_keep_first_position_last_value(self):
+        table = NameTable()
+        root = table.add(-1, "List", "ul")
+        table.add(root, "Item", "li.a")
+        table.add(root, "Other", "li.b")
+        table.add(root, "Item", "li.c")
+        assert list(table) == ["List", "List/Item", "List/Other"]
+        assert table["List/Item"]["selector"] == "li.c"
+
+    def test_strings_interned(self):
+        table = NameTable()
+        a = table.add(-1, "Card", "div" + ".card")
+        b = table.add(a, "Card", "".join(["div", ".card"]))
+        assert table._selectors[a] is table._selectors[b]
+        assert table._segments[a] is table._segments[b]
+
+    def test_remove_subtree_and_truncate(self):
+        table = NameTable()
+        root = table.add(-1, "Page", "main")
+        card = table.add(root, "Card", "div.card")
+        table.add(card, "Title", "h3")
+        table.add(root, "Footer", "footer")
+
+        mark = table.mark()
+        table.add(root, "Card", "div.card-v2")
+        table.truncate(mark)
+        assert table["Page/Card"]["selector"] == "div.card"
+
+        table.remove_subtree(card)
+        assert list(table) == ["Page", "Page/Footer"]
+
+    def test_replace_subtree_keeps_position_and_compacts(self):
+        table = NameTable()
+        root = table.add(-1, "Page", "main")
+        card = table.add(root, "Card", "div.card")
+        table.add(card, "Title", "h3")
+        table.add(root, "Footer", "footer")
+
+        for version in range(1, 20):
+            mark = table.mark()
+            new_card = table.add(root, "Card", f"div.card-v{version}")
+            table.add(new_card, "Title", f"h3.v{version}")
+            remap = table.replace_subtree(card, mark)
+            card = remap[new_card] if remap is not None else new_card
+            assert list(table) == ["Page", "Page/Card", "Page/Card/Title", "Page/Footer"]
+            assert table.path(card) == "Page/Card"
+            assert len(table._parents) <= 2 * 4
+        assert table["Page/Card/Title"]["selector"] == "h3.v19"
+
+
+class TestBuilderNameMapping:
+    def test_deep_tree_paths(self):
+        raw = raw_node("section", cls="leaf")
+        for depth in range(30):
+            raw = raw_node("section", [raw, raw_node("aside", cls=f"side-{depth}")], cls=f"level-{depth}")
+        doc = IRBuilderV2(entry_file="src/App.vue").build(raw, {"width": 100, "height": 100})
+
+        mapping = doc["nameMapping"]
+        deepest = "/".join(f"Level{d}" for d in range(29, -1, -1)) + "/Leaf"
+        assert mapping[deepest]["sourceFile"] == "src/App.vue"
+        assert len(mapping) == 61
+
+    def test_plugin_data_shares_interned_selector(self):
+        raw = raw_node("ul", [raw_node("li", cls="row", index=i, tag_count=2) for i in range(2)])
+        first, second = IRBuilderV2().build(raw, {"width": 100, "height": 100})["tree"]["children"]
+        assert first["pluginData"]["selector"] is second["pluginData"]["selector"]
@@ -196,3 +196,92 @@ def test_special_chars_sanitized():
     assert "@" not in name
     assert "#" not in name
     assert "!" not in name
+
+
+# ─── Compiled prefixes / name cache ─────────────────────────────────────────
+
+def test_utility_prefixes_case_insensitive():
+    eng = make_engine(ignore_prefixes=["Card-"])
+    assert eng._is_utility_class("card-body")
+    assert eng._is_utility_class("CARD-BODY")
+    assert not eng._is_utility_class("panel")
+
+
+def test_cached_name_keeps_sibling_numbering():
+    eng = make_engine()
+    names = [
+        eng.resolve_name(parent_path="", tag="li", attrs={"class": "px-2 py-1"},
+                         sibling_index=i, sibling_tag_count=3)
+        for i in range(3)
+    ]
+    assert names == ["ListItem_1", "ListItem_2", "ListItem_3"]
+    assert len(eng._names) == 1
+
+
+def test_name_cache_is_bounded(monkeypatch):
+    eng = make_engine()
+    monkeypatch.setattr(NamingEngine, "NAME_CACHE_SIZE", 4)
+    for i in range(10):
+        eng.resolve_name(parent_path="", tag="div", attrs={"id": f"block-{i}"})
+    assert list(eng._names) == [("div", "", None, f"block-{i}", "", "") for i in range(6, 10)]
+
+
+def test_name_cache_evicts_least_recently_used(monkeypatch):
+    eng = make_engine()
+    monkeypatch.setattr(NamingEngine, "NAME_CACHE_SIZE", 2)
+    for node_id in ("a", "b", "a", "c"):
+        eng.resolve_name(parent_path="", tag="div", attrs={"id": node_id})
+    assert [key[3] for key in eng._names] == ["a", "c"]
+
+
+def test_engine_and_builder_picklable():
+    import pickle
+
+    from airis_pdm.ir_builder import IRBuilderV2
+
+    eng = make_engine(ignore_prefixes=["Card-"])
+    eng.resolve_name(parent_path="", tag="div", attrs={"class": "card-body panel"})
+    clone = pickle.loads(pickle.dumps(eng))
+    assert clone.config.ignore_class_prefixes is clone._prefix_source
+    assert clone.resolve_name(parent_path="", tag="div", attrs={"class": "card-body panel"}) == "Panel"
+    pickle.loads(pickle.dumps(IRBuilderV2(naming_engine=eng)))
+
+
+def test_reassigned_prefixes_invalidate_cache():
+    eng = make_engine()
+    attrs = {"class": "flex card"}
+    assert eng.resolve_name(parent_path="", tag="div", attrs=attrs) == "Card"
+    eng.config.ignore_class_prefixes = ["card"]
+    assert eng.resolve_name(parent_path="", tag="div", attrs=attrs) == "Flex"
+
+
+def test_clear_cache_after_in_place_change():
+    eng = make_engine()
+    attrs = {"class": "flex card"}
+    assert eng.resolve_name(parent_path="", tag="div", attrs=attrs) == "Card"
+    eng.config.ignore_class_prefixes.append("card")
+    eng.clear_cache()
+    assert eng.resolve_name(parent_path="", tag="div", attrs=attrs) == "div"
+
+
+def test_detector_component_name_for_single_file(tmp_path):
+    from airis_pdm.naming_engine import ReactComponentDetector, VueComponentDetector
+
+    sfc = tmp_path / "product-card.vue"
+    sfc.write_text("<script setup>defineOptions({ name: 'ProductTile' })</script>", encoding="utf-8")
+    tsx = tmp_path / "user-menu.tsx"
+    tsx.write_text("export const x = 1;", encoding="utf-8")
+    assert VueComponentDetector(str(tmp_path)).component_name(str(sfc)) == "ProductTile"
+    assert ReactComponentDetector(str(tmp_path)).component_name(str(tsx)) == "UserMenu"
+    assert NamingEngine.to_pascal_case("product-card") == "ProductCard"
+
+
+def test_semantic_tags_reassigned_or_cleared():
+    eng = make_engine()
+    assert eng.resolve_name(parent_path="", tag="nav", attrs={}) == "Nav"
+    eng.config.semantic_tags["nav"] = "Navigation"
+    assert eng.resolve_name(parent_path="", tag="nav", attrs={}) == "Nav"  # 就地修改需 clear_cache
+    eng.clear_cache()
+    assert eng.resolve_name(parent_path="", tag="nav", attrs={}) == "Navigation"
+    eng.config.semantic_tags = {"nav": "Menu"}
+    assert eng.resolve_name(parent_path="", tag="nav", attrs={}) == "Menu"
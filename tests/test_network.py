@@ -0,0 +1,137 @@
+"""
+network 測試：以假的 route／request 驗證資源封鎖、重播快取的錄製與供應、離線模式與 HAR 註冊順序。
+"""
+import asyncio
+
+import pytest
+
+from airis_pdm.dom_extractor import ExtractionConfig
+from airis_pdm.network import BLOCK_TRACKERS, ReplayCache, routing
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="script", method="GET"):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class FakeResponse:
+    status = 200
+    headers = {"content-type": "text/css", "content-encoding": "gzip"}
+
+    async def body(self):
+        return b"body{}"
+
+
+class FakeRoute:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    async def abort(self, error_code=None):
+        self.outcome = ("abort", error_code)
+
+    async def fallback(self):
+        self.outcome = ("fallback",)
+
+    async def fetch(self):
+        return FakeResponse()
+
+    async def fulfill(self, status, headers, body):
+        self.outcome = ("fulfill", status, headers, body)
+
+
+class FakePage:
+    def __init__(self):
+        self.handlers = []
+        self.har = None
+
+    async def route(self, pattern, handler):
+        self.handlers.append(handler)
+
+    async def route_from_har(self, path, not_found):
+        self.har = (path, not_found, len(self.handlers))
+
+    async def unroute_all(self, behavior=None):
+        self.handlers = []
+
+    def is_closed(self):
+        return False
+
+
+def _serve(config, *requests, page_url="http://localhost:5173/"):
+    async def run():
+        page = FakePage()
+        routes = [FakeRoute(r) for r in requests]
+        async with routing(page, config, page_url) as stats:
+            for route in routes:
+                await page.handlers[-1](route)
+        assert page.handlers == []
+        return [r.outcome for r in routes], stats, page
+
+    return asyncio.run(run())
+
+
+class TestBlocking:
+    def test_blocks_by_type_and_pattern(self):
+        config = ExtractionConfig(block_resource_types=("media",), block_url_patterns=BLOCK_TRACKERS)
+        outcomes, stats, _ = _serve(
+            config,
+            FakeRequest("http://localhost:5173/intro.mp4", "media"),
+            FakeRequest("https://www.google-analytics.com/analytics.js"),
+            FakeRequest("http://localhost:5173/src/main.ts"),
+        )
+        assert outcomes == [("abort", "blockedbyclient"), ("abort", "blockedbyclient"), ("fallback",)]
+        assert stats["blocked"] == 2 and stats["passed"] == 1
+
+    def test_unknown_resource_type_rejected(self):
+        with pytest.raises(ValueError, match="unknown resource types"):
+            _serve(ExtractionConfig(block_resource_types=("video",)))
+
+    def test_disabled_config_installs_nothing(self):
+        _, stats, page = _serve(ExtractionConfig())
+        assert page.har is None and stats == {"blocked": 0, "replayed": 0, "recorded": 0, "passed": 0}
+
+
+class TestReplayCache:
+    def test_records_third_party_then_replays(self, tmp_path):
+        config = ExtractionConfig(replay_dir=str(tmp_path))
+        font = FakeRequest("https://fonts.example.com/inter.css", "stylesheet")
+        own = FakeRequest("http://localhost:5173/src/App.vue", "script")
+
+        outcomes, stats, _ = _serve(config, font, own)
+        assert outcomes[0] == ("fulfill", 200, {"content-type": "text/css"}, b"body{}")
+        assert outcomes[1] == ("fallback",)  # 頁面自身 origin 不快取
+        assert stats["recorded"] == 1
+
+        outcomes, stats, _ = _serve(config, font)
+        assert outcomes[0] == ("fulfill", 200, {"content-type": "text/css"}, b"body{}")
+        assert stats["replayed"] == 1 and stats["recorded"] == 0
+
+    def test_client_errors_not_recorded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(FakeResponse, "status", 404)
+        config = ExtractionConfig(replay_dir=str(tmp_path))
+        font = FakeRequest("https://fonts.example.com/missing.woff2", "font")
+
+        for _ in range(2):
+            outcomes, stats, _ = _serve(config, font)
+            assert outcomes[0][:2] == ("fulfill", 404)
+            assert stats["recorded"] == 0 and stats["replayed"] == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_offline_serves_all_origins_and_aborts_misses(self, tmp_path):
+        ReplayCache(tmp_path).put("GET", "http://localhost:5173/", 200, {"content-type": "text/html"}, b"<html>")
+        config = ExtractionConfig(replay_dir=str(tmp_path), replay_offline=True)
+        outcomes, stats, _ = _serve(
+            config,
+            FakeRequest("http://localhost:5173/", "document"),
+            FakeRequest("http://localhost:5173/src/main.ts"),
+        )
+        assert outcomes == [("fulfill", 200, {"content-type": "text/html"}, b"<html>"),
+                            ("abort", "internetdisconnected")]
+        assert stats["replayed"] == 1 and stats["blocked"] == 1
+
+    def test_har_registered_before_handler(self, tmp_path):
+        _, _, page = _serve(ExtractionConfig(har_path=str(tmp_path / "page.har")))
+        assert page.har == (str(tmp_path / "page.har"), "fallback", 0)
@@ -172,6 +172,32 @@ def test_codegen_multi_section_idempotent(tmp_path: Path):
         assert (run1 / rel).read_bytes() == (run2 / rel).read_bytes(), f"Content diff in {rel}"
 
 
+def test_codegen_multi_page_workers_match_serial(tmp_path: Path):
+    """多頁 IR 以 workers=2 產生，與 workers=1 位元組級一致（含合併後的 app.css）。"""
+    from airis_pdm.generator import generate_from_ir
+
+    ir = {
+        "pages": [
+            {
+                "figmaName": f"Page {i}",
+                "figmaType": "FRAME",
+                "children": [
+                    {"figmaName": "Button/Primary", "figmaType": "INSTANCE", "layout": {"width": 80 + i}},
+                    {"figmaName": "Title", "figmaType": "TEXT", "text": {"characters": f"P{i}", "fontSize": 16}},
+                ],
+            }
+            for i in range(4)
+        ]
+    }
+    for target in ("html", "vue", "react", "flutter"):
+        serial, pool = tmp_path / target / "serial", tmp_path / target / "pool"
+        r1 = generate_from_ir(ir, target=target, output_dir=str(serial), workers=1)
+        r2 = generate_from_ir(ir, target=target, output_dir=str(pool), workers=2)
+        assert r1["files"] == r2["files"]
+        for rel in _file_tree(serial):
+            assert (serial / rel).read_bytes() == (pool / rel).read_bytes(), f"{target}: content diff in {rel}"
+
+
 # ---------------------------------------------------------------------------
 # C. Chain-remote mock：RPC 序列、validation、state.json schema
 # ---------------------------------------------------------------------------
@@ -362,6 +388,25 @@ def test_flow_offline_idempotent(tmp_path: Path):
     assert m1 == m2
 
 
+def test_flow_offline_workers_match_serial(tmp_path: Path):
+    """離線 flow 以 process pool 平行輸出，檔案樹與內容與單 process 位元組級一致。"""
+    pages = [{"id": f"1:{i}", "name": f"[Page] Screen {i}"} for i in range(4)]
+    fpath = tmp_path / "figma.json"
+    fpath.write_text(json.dumps(_figma_file_json(pages)), encoding="utf-8")
+    for run_name, workers in (("serial", 1), ("pool", 2)):
+        run_flow_from_file_json(
+            figma_file_json_path=str(fpath),
+            output_dir=str(tmp_path / run_name),
+            framework="both",
+            fidelity="semantic",
+            workers=workers,
+        )
+    serial, pool = tmp_path / "serial", tmp_path / "pool"
+    assert _file_tree(serial) == _file_tree(pool)
+    for rel in _file_tree(serial):
+        assert (serial / rel).read_bytes() == (pool / rel).read_bytes(), f"Content diff in {rel}"
+
+
 # ---------------------------------------------------------------------------
 # E. Flow live 五頁碰撞：manifest + router 字串級對拍
 # ---------------------------------------------------------------------------
@@ -0,0 +1,96 @@
+"""
+readiness 測試：步驟解析、goto 的 wait_until、各步驟耗時報告與舊的 networkidle 行為。
+"""
+import asyncio
+
+import pytest
+
+from airis_pdm import readiness
+from airis_pdm.dom_extractor import ExtractionConfig
+
+
+class RecordingPage:
+    def __init__(self):
+        self.calls = []
+
+    async def goto(self, url, **kwargs):
+        self.calls.append(("goto", kwargs["wait_until"]))
+
+    async def wait_for_selector(self, selector, **kwargs):
+        self.calls.append(("selector", selector))
+
+    async def wait_for_timeout(self, ms):
+        self.calls.append(("sleep", ms))
+
+    async def evaluate(self, script, arg=None):
+        name = {
+            readiness.HYDRATION_JS: "hydration",
+            readiness.MUTATION_QUIET_JS: "mutation",
+            readiness.RAF_JS: "raf",
+        }[script]
+        self.calls.append((name, arg))
+        return {"quiet": True} if name == "mutation" else None
+
+
+def _load(config):
+    page = RecordingPage()
+    report = asyncio.run(readiness.load_and_wait(page, "http://a", config))
+    return page.calls, report
+
+
+class TestResolveSteps:
+    def test_auto_alias_expands(self):
+        assert readiness.resolve_steps("auto") == ["hydration", "mutation", "raf"]
+
+    def test_custom_list_deduplicated(self):
+        assert readiness.resolve_steps("mutation, raf,mutation") == ["mutation", "raf"]
+
+    def test_unknown_step_raises(self):
+        with pytest.raises(ValueError, match="unknown readiness step"):
+            readiness.resolve_steps("mutation,sleepy")
+
+
+class TestLoadAndWait:
+    def test_auto_skips_networkidle_and_fixed_sleep(self):
+        calls, report = _load(ExtractionConfig(ready_quiet_ms=50, ready_timeout_ms=800))
+        assert calls == [
+            ("goto", "load"),
+            ("hydration", {"timeoutMs": 800}),
+            ("mutation", {"quietMs": 50, "timeoutMs": 800}),
+            ("raf", None),
+        ]
+        assert list(report["steps"]) == ["goto", "hydration", "mutation", "raf"]
+        assert report["strategy"] == "auto"
+        assert report["details"] == {"mutation": {"quiet": True}}
+        assert report["totalMs"] >= 0
+
+    def test_networkidle_keeps_legacy_behaviour(self):
+        calls, _ = _load(ExtractionConfig(readiness="networkidle", wait_for_selector="#app"))
+        assert calls == [("goto", "networkidle"), ("selector", "#app"), ("sleep", 500)]
+
+    def test_selector_runs_first_and_html_skips_hydration(self):
+        calls, _ = _load(ExtractionConfig(wait_for_selector="#ready", framework="html"))
+        assert [c[0] for c in calls] == ["goto", "selector", "mutation", "raf"]
+
+    def test_registered_step_is_timed(self):
+        async def fonts(page, config):
+            page.calls.append(("fonts", None))
+            return "loaded"
+
+        readiness.register_step("fonts", fonts)
+        try:
+            calls, report = _load(ExtractionConfig(readiness="fonts,raf"))
+        finally:
+            del readiness.STEPS["fonts"]
+        assert calls == [("goto", "load"), ("fonts", None), ("raf", None)]
+        assert report["details"]["fonts"] == "loaded"
+        assert "ready in" in readiness.format_report(report)
+
+    def test_settle_after_resize(self):
+        page = RecordingPage()
+        asyncio.run(readiness.settle(page, ExtractionConfig(resize_settle_ms=120)))
+        assert page.calls == [("mutation", {"quietMs": 100, "timeoutMs": 120}), ("raf", None)]
+
+        page = RecordingPage()
+        asyncio.run(readiness.settle(page, ExtractionConfig(readiness="networkidle", resize_settle_ms=120)))
+        assert page.calls == [("sleep", 120)]
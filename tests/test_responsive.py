@@ -0,0 +1,107 @@
+"""
+responsive 測試：斷點差異只記錄變動，apply_breakpoint 可由 base tree 還原各斷點 IR。
+"""
+import argparse
+import asyncio
+import copy
+from unittest.mock import AsyncMock, patch
+
+from airis_pdm import cli
+from airis_pdm.ir_builder import IRBuilderV2
+from airis_pdm.responsive import REMOVE_KEY, apply_breakpoint, diff_breakpoint, index_tree, merge_breakpoints
+
+from tests.factories import raw_node
+
+
+def _page(width, mobile=False):
+    nav = [] if mobile else [raw_node("nav", text="Menu", width=width)]
+    burger = [raw_node("button", text="☰", width=40)] if mobile else []
+    title = raw_node("h1", text="Title", width=width / 2, styles={"fontSize": 32 if not mobile else 20})
+    return raw_node("main", width=width, children=[
+        raw_node("header", nav + burger + [title], width=width, styles={"backgroundColor": "rgb(255, 255, 255)"}),
+        raw_node("section", [raw_node("p", text="Body", index=i, width=width) for i in range(3)],
+                 width=width, styles={"backgroundColor": "rgb(240, 240, 240)"}),
+    ])
+
+
+def _ir(raw, width):
+    return IRBuilderV2(style_strategy="inline").build(raw, {"width": width, "height": 900})
+
+
+class TestResponsiveDiff:
+    def test_roundtrip(self):
+        desktop, mobile = _ir(_page(1440), 1440), _ir(_page(375, mobile=True), 375)
+        breakpoint = diff_breakpoint(desktop["tree"], mobile["tree"])
+
+        assert breakpoint["hidden"] == ["Main/Header/Nav"]
+        assert [(a["parent"], a["index"], a["node"]["htmlTag"]) for a in breakpoint["added"]] == [
+            ("Main/Header", 0, "button"),
+        ]
+        assert apply_breakpoint(desktop["tree"], breakpoint) == mobile["tree"]
+
+    def test_delta_is_minimal(self):
+        desktop, mobile = _ir(_page(1440), 1440), _ir(_page(375, mobile=True), 375)
+        nodes = diff_breakpoint(desktop["tree"], mobile["tree"])["nodes"]
+        assert nodes["Main"] == {"layout": {"width": 375}}
+        assert nodes["Main/Header/Heading1"] == {"layout": {"width": 187.5}, "text": {"fontSize": 20}}
+        assert set(nodes) == set(index_tree(mobile["tree"])) - {"Main/Header/Button"}
+
+    def test_identical_trees_have_no_delta(self):
+        doc = _ir(_page(1440), 1440)
+        assert diff_breakpoint(doc["tree"], copy.deepcopy(doc["tree"])) == {"nodes": {}, "hidden": [], "added": []}
+
+    def test_removed_keys(self):
+        base = {"figmaName": "root", "layout": {"width": 1}, "styles": {"opacity": 0.5, "fills": []}}
+        other = {"figmaName": "root", "layout": {"width": 1}, "styles": {"fills": []}}
+        breakpoint = diff_breakpoint(base, other)
+        assert breakpoint["nodes"] == {"root": {"styles": {REMOVE_KEY: ["opacity"]}}}
+        assert apply_breakpoint(base, breakpoint) == other
+
+    def test_duplicate_sibling_names(self):
+        base = {"figmaName": "r", "children": [{"figmaName": "item", "layout": {"w": i}} for i in range(3)]}
+        other = copy.deepcopy(base)
+        other["children"][2]["layout"]["w"] = 9
+        assert list(diff_breakpoint(base, other)["nodes"]) == ["r/item#3"]
+
+    def test_hidden_sibling_keeps_same_named_paths(self):
+        def page(width, first_visible):
+            cards = [raw_node("p", text=f"Card {i}", index=i, width=width) for i in range(3)]
+            return raw_node("main", cards if first_visible else cards[1:], width=width)
+
+        desktop, mobile = _ir(page(1440, True), 1440), _ir(page(375, False), 375)
+        breakpoint = diff_breakpoint(desktop["tree"], mobile["tree"])
+        assert breakpoint["hidden"] == ["Main/Paragraph"]
+        assert breakpoint["added"] == []
+        assert set(breakpoint["nodes"]) == {"Main", "Main/Paragraph#2", "Main/Paragraph#3"}
+        assert all(set(delta) == {"layout"} for delta in breakpoint["nodes"].values())
+        assert apply_breakpoint(desktop["tree"], breakpoint) == mobile["tree"]
+
+    def test_merge_breakpoints(self):
+        desktop, tablet, mobile = _ir(_page(1440), 1440), _ir(_page(768), 768), _ir(_page(375, mobile=True), 375)
+        merged = merge_breakpoints(desktop, [tablet, mobile])
+        assert merged["tree"] is desktop["tree"]
+        assert merged["responsive"]["base"] == {"width": 1440, "height": 900}
+        assert [bp["viewport"]["width"] for bp in merged["responsive"]["breakpoints"]] == [768, 375]
+        assert "Main/Header/Button" in merged["nameMapping"]
+        for doc, bp in zip((tablet, mobile), merged["responsive"]["breakpoints"]):
+            assert apply_breakpoint(merged["tree"], bp) == doc["tree"]
+
+
+class TestProcessUrlViewports:
+    def test_single_load_merged_ir(self):
+        results = [
+            {"tree": _page(w, mobile=w < 500), "viewport": {"width": w, "height": 900}, "screenshot": b""}
+            for w in (375, 1440)
+        ]
+        args = argparse.Namespace(viewport=None, selector=None, root=None, chunk_nodes=0, capture_images=False)
+        viewports = cli._parse_viewports("375x900, 1440X900")
+        with patch("airis_pdm.cli.extract_dom_tree_viewports", new_callable=AsyncMock, return_value=results) as mock:
+            ir_doc, result = asyncio.run(cli.process_url_to_ir("http://a", args, {}, viewports=viewports))
+
+        assert mock.await_count == 1
+        assert mock.await_args.args[1] == [(375, 900), (1440, 900)]
+        assert ir_doc["viewport"]["width"] == 375
+        breakpoint = ir_doc["responsive"]["breakpoints"][0]
+        assert breakpoint["viewport"]["width"] == 1440
+        assert breakpoint["hidden"] == ["Main/Header/Button"]
+        assert result["breakpoints"] == results[1:]
@@ -0,0 +1,159 @@
+"""
+Snapshot 讀寫測試：單次序列化輸出與 json.dump 相同、compact／壓縮格式、原子寫入，以及延遲讀取。
+"""
+import gzip
+import json
+
+import pytest
+
+from airis_pdm.ir_builder import IRBuilderV2, save_ir
+from airis_pdm.snapshot import (
+    SnapshotReader,
+    load_snapshot,
+    resolve_snapshot_path,
+    snapshot_options,
+    write_atomic,
+    write_snapshot,
+)
+from airis_pdm.story_sync import StorySyncState
+from airis_pdm.token_export import export_tokens
+
+RAW = {
+    "tag": "div",
+    "classes": ["page"],
+    "styles": {"backgroundColor": "rgb(255, 255, 255)"},
+    "rect": {"x": 0, "y": 0, "width": 400, "height": 300},
+    "children": [
+        {
+            "tag": "button",
+            "classes": ["btn-primary"],
+            "text": "登入\n送出",
+            "styles": {"backgroundColor": "rgb(37, 99, 235)", "color": "rgb(255, 255, 255)"},
+            "rect": {"x": 10, "y": 10, "width": 120, "height": 40},
+        },
+    ],
+}
+
+
+@pytest.fixture
+def ir_doc():
+    doc = IRBuilderV2().build(RAW, {"width": 400, "height": 300})
+    doc["nameMapping"] = dict(doc["nameMapping"])  # JSON view，便於與 json.dumps 比對
+    doc["responsive"] = {"breakpoints": []}  # tree 之後還有欄位
+    return doc
+
+
+class TestWriteSnapshot:
+    def test_pretty_output_matches_json_dump(self, tmp_path, ir_doc):
+        ir_path, mapping_path = save_ir(ir_doc, tmp_path)
+
+        assert ir_path == str(tmp_path / "figma-import-payload.json")
+        assert (tmp_path / "figma-import-payload.json").read_text(encoding="utf-8") == json.dumps(
+            ir_doc, indent=2, ensure_ascii=False
+        )
+        assert (tmp_path / "plugin-payload.json").read_text(encoding="utf-8") == json.dumps(
+            ir_doc["tree"], indent=2, ensure_ascii=False
+        )
+        assert (tmp_path / "name-mapping.json").read_text(encoding="utf-8") == json.dumps(
+            ir_doc["nameMapping"], indent=2, ensure_ascii=False
+        )
+
+    def test_compact_output(self, tmp_path, ir_doc):
+        write_snapshot(ir_doc, tmp_path, compact=True)
+        text = (tmp_path / "figma-import-payload.json").read_text(encoding="utf-8")
+        assert text == json.dumps(ir_doc, ensure_ascii=False, separators=(",", ":"))
+        assert json.loads((tmp_path / "plugin-payload.json").read_text(encoding="utf-8")) == ir_doc["tree"]
+
+    def test_gzip_replaces_plain_files(self, tmp_path, ir_doc):
+        write_snapshot(ir_doc, tmp_path)
+        ir_path, mapping_path = write_snapshot(ir_doc, tmp_path, compact=True, compression="gzip")
+
+        assert ir_path.endswith("figma-import-payload.json.gz")
+        assert mapping_path.endswith("name-mapping.json.gz")
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "figma-import-payload.json.gz", "name-mapping.json.gz", "plugin-payload.json.gz",
+        ]
+        assert json.loads(gzip.decompress((tmp_path / "plugin-payload.json.gz").read_bytes())) == ir_doc["tree"]
+
+    def test_zstd_round_trip(self, tmp_path, ir_doc):
+        pytest.importorskip("zstandard")
+        write_snapshot(ir_doc, tmp_path, compression="zstd")
+        assert load_snapshot(tmp_path) == ir_doc
+
+    def test_unknown_compression_writes_nothing(self, tmp_path, ir_doc):
+        with pytest.raises(ValueError):
+            write_snapshot(ir_doc, tmp_path, compression="brotli")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_no_temp_files_left(self, tmp_path, ir_doc):
+        write_snapshot(ir_doc, tmp_path)
+        assert not [p for p in tmp_path.iterdir() if p.name.startswith(".")]
+
+    def test_write_atomic_text_and_mode(self, tmp_path):
+        target = tmp_path / "App.vue"
+        write_atomic(target, "<div>\r\n一</div>\n", mode=0o100640)
+        assert target.read_bytes() == "<div>\r\n一</div>\n".encode("utf-8")
+        assert target.stat().st_mode & 0o777 == 0o640
+        write_atomic(target, b"\x00")
+        assert target.read_bytes() == b"\x00"
+        assert [p.name for p in tmp_path.iterdir()] == ["App.vue"]
+
+    def test_snapshot_options(self):
+        assert snapshot_options({}) == {"compact": False, "compression": None}
+        config = {"export": {"snapshotFormat": "compact", "snapshotCompression": "gzip"}}
+        assert snapshot_options(config) == {"compact": True, "compression": "gzip"}
+
+    def test_name_table_materialized_on_write(self, tmp_path):
+        doc = IRBuilderV2().build(RAW, {"width": 400, "height": 300})
+        write_snapshot(doc, tmp_path)
+        mapping = json.loads((tmp_path / "name-mapping.json").read_text(encoding="utf-8"))
+        assert mapping == dict(doc["nameMapping"])
+        assert list(mapping) == ["div", "div/Button"]
+
+
+class TestReadSnapshot:
+    def test_resolve_prefers_existing_variant(self, tmp_path, ir_doc):
+        assert resolve_snapshot_path(tmp_path) is None
+        write_snapshot(ir_doc, tmp_path, compression="gzip")
+        assert resolve_snapshot_path(tmp_path) == tmp_path / "figma-import-payload.json.gz"
+        assert resolve_snapshot_path(tmp_path / "figma-import-payload.json") == tmp_path / "figma-import-payload.json.gz"
+
+    def test_reader_is_lazy(self, tmp_path, ir_doc):
+        write_snapshot(ir_doc, tmp_path, compression="gzip")
+        reader = SnapshotReader(tmp_path)
+        assert reader.exists()
+        assert reader.name_mapping == ir_doc["nameMapping"]
+        assert reader.tree == ir_doc["tree"]
+        assert "figma-import-payload.json" not in reader._cache
+        assert reader.doc == ir_doc
+
+    def test_missing_snapshot(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_snapshot(tmp_path)
+        assert not SnapshotReader(tmp_path).exists()
+
+    def test_consumers_read_compressed(self, tmp_path, ir_doc):
+        write_snapshot(ir_doc, tmp_path, compact=True, compression="gzip")
+        out = export_tokens(str(tmp_path), str(tmp_path / "tokens.json"))
+        assert json.loads(open(out, encoding="utf-8").read())
+
+        (tmp_path / ".stories-sync-state.json").write_text(
+            json.dumps({"version": 1, "order": ["a"], "stories": {}}), encoding="utf-8"
+        )
+        root = StorySyncState.load(tmp_path).previous_root()
+        assert root == ir_doc["tree"]
+
+    def test_codegen_reads_compressed_snapshot(self, tmp_path, ir_doc, capsys):
+        from argparse import Namespace
+
+        from airis_pdm.cli import cmd_codegen
+
+        write_snapshot(ir_doc, tmp_path / "snap", compression="gzip")
+        out = tmp_path / "generated"
+        args = Namespace(
+            ir_file=str(tmp_path / "snap" / "figma-import-payload.json"), target="html", output=str(out),
+            page=None, with_utility_css=False, dedupe_styles=False, workers=1, cache_dir=None,
+        )
+        cmd_codegen(args, {})
+        assert "找不到" not in capsys.readouterr().out
+        assert (out / "index.html").is_file()
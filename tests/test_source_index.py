@@ -0,0 +1,161 @@
+"""
+SourceIndex／MappingSuffixIndex 測試：id／class 查表、持久化索引依 mtime 失效、寫回後重新索引，
+以及 ``_find_mapping`` 後綴索引與逐一掃描結果相同。
+"""
+import os
+import random
+
+from airis_pdm.code_patcher import CodePatcher, MappingSuffixIndex
+from airis_pdm.ir_builder import IRBuilderV2
+from airis_pdm.source_index import SourceIndex, split_selector
+
+
+def _tree(root):
+    (root / "components").mkdir()
+    (root / "components" / "Login.vue").write_text(
+        '<form id="login-form" class="card card--wide"><button class="btn btn-primary">Go</button></form>',
+        encoding="utf-8",
+    )
+    (root / "styles.css").write_text(".btn-primary { color: red; }\n#login-form, .card:hover { }\n", encoding="utf-8")
+    (root / "Card.module.css").write_text(".card { padding: 8px; }\n", encoding="utf-8")
+    (root / "notes.txt").write_text('class="btn-primary"', encoding="utf-8")
+
+
+class TestSourceIndex:
+    def test_lookup_by_id_and_class(self, tmp_path):
+        _tree(tmp_path)
+        index = SourceIndex(str(tmp_path)).build()
+        vue = str(tmp_path / "components" / "Login.vue")
+        css = str(tmp_path / "styles.css")
+
+        assert index.find("#login-form") == sorted([vue, css], key=index.files.index)
+        assert index.find(".btn-primary", {".vue"}) == [vue]
+        assert index.find(".btn-primary", {".css"}) == [css]
+        assert set(index.find(".card", {".css"})) == {css, str(tmp_path / "Card.module.css")}
+        assert index.find(".btn") == [vue]
+        assert index.find("#missing") == []
+        assert index.stats["files"] == 3
+
+    def test_split_selector(self):
+        assert split_selector("div#login-form.card.card--wide") == (["login-form"], ["card", "card--wide"])
+        assert split_selector(".btn-primary") == ([], ["btn-primary"])
+        assert split_selector("div.bg-[#fff].w-[1.5rem]") == ([], ["bg-[#fff]", "w-[1.5rem]"])
+        assert split_selector("div") is None
+        assert split_selector("main .card") is None
+
+    def test_compound_selectors_use_index(self, tmp_path, monkeypatch):
+        _tree(tmp_path)
+        index = SourceIndex(str(tmp_path)).build()
+        vue = str(tmp_path / "components" / "Login.vue")
+        monkeypatch.setattr(index, "_text_search", lambda text: (_ for _ in ()).throw(AssertionError(text)))
+
+        assert index.find("form#login-form.card.card--wide", {".vue"}) == [vue]
+        assert index.find("button.btn.btn-primary", {".vue"}) == [vue]
+        assert index.find("button.btn.missing") == []
+        # class 拆解不一致時仍可依 id 找到
+        assert index.find("form#login-form.unknown", {".vue"}) == [vue]
+
+    def test_persisted_index_reuses_unchanged_files(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        _tree(src)
+        cache = str(tmp_path / "index.json")
+        SourceIndex(str(src), cache_path=cache).build()
+
+        again = SourceIndex(str(src), cache_path=cache).build()
+        assert again.stats == {"files": 3, "read": 0, "reused": 3}
+
+        login = src / "components" / "Login.vue"
+        login.write_text('<form id="signup-form"></form>', encoding="utf-8")
+        st = login.stat()
+        os.utime(login, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        third = SourceIndex(str(src), cache_path=cache).build()
+        assert third.stats == {"files": 3, "read": 1, "reused": 2}
+        assert third.find("#signup-form") == [str(login)]
+        assert third.find("#login-form") == [str(src / "styles.css")]
+
+    def test_refresh_after_write(self, tmp_path):
+        _tree(tmp_path)
+        index = SourceIndex(str(tmp_path)).build()
+        login = tmp_path / "components" / "Login.vue"
+        login.write_text('<form id="login-form" class="panel"></form>', encoding="utf-8")
+        index.refresh(str(login))
+        assert index.find(".panel") == [str(login)]
+        assert index.find(".btn-primary", {".vue"}) == []
+
+    def test_patcher_builds_index_once(self, tmp_path, monkeypatch):
+        _tree(tmp_path)
+        calls = []
+        original = SourceIndex.build
+
+        def counting_build(self):
+            calls.append(1)
+            return original(self)
+
+        monkeypatch.setattr(SourceIndex, "build", counting_build)
+        mapping = {
+            "Page/Login": {"selector": "#login-form"},
+            "Page/Login/Button": {"selector": ".btn-primary"},
+        }
+        diff = {
+            "Page/Login": {"text.fontSize": {"before": None, "after": 24}},
+            "Page/Login/Button": {"text.fontSize": {"before": None, "after": 18}},
+        }
+        summary = CodePatcher(mapping, "tailwind", src_root=str(tmp_path)).apply_changes(diff)
+        assert len(calls) == 1
+        login = tmp_path / "components" / "Login.vue"
+        assert list(summary) == [str(login)]
+        content = login.read_text(encoding="utf-8")
+        assert "text-[24px]" in content and "text-[18px]" in content
+
+
+    def test_builder_mapping_patches_source(self, tmp_path):
+        _tree(tmp_path)
+        raw = {
+            "tag": "form",
+            "attrs": {"id": "login-form", "class": "card card--wide"},
+            "layout": {"x": 0, "y": 0, "width": 300, "height": 200},
+            "children": [{
+                "tag": "button",
+                "attrs": {"class": "btn btn-primary"},
+                "layout": {"x": 0, "y": 0, "width": 100, "height": 40},
+                "children": [],
+            }],
+        }
+        mapping = dict(IRBuilderV2().build(raw, {"width": 300, "height": 200})["nameMapping"])
+        assert [m["selector"] for m in mapping.values()] == ["form#login-form.card.card--wide", "button.btn.btn-primary"]
+        diff = {name: {"text.fontSize": {"before": None, "after": 12 + i}} for i, name in enumerate(mapping)}
+
+        summary = CodePatcher(mapping, "tailwind", src_root=str(tmp_path)).apply_changes(diff)
+        login = tmp_path / "components" / "Login.vue"
+        assert list(summary) == [str(login)]
+        content = login.read_text(encoding="utf-8")
+        assert 'class="card card--wide text-[12px]"' in content
+        assert 'class="btn btn-primary text-[13px]"' in content
+
+
+class TestMappingSuffixIndex:
+    @staticmethod
+    def _linear(mapping, figma_name):
+        for key in mapping:
+            if key.endswith(figma_name) or figma_name.endswith(key.split("/")[-1]):
+                return key
+        return None
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(7)
+        words = ["Page", "Card", "Title", "Button", "Btn", "Icon", "on", "Row"]
+        mapping = {}
+        for _ in range(300):
+            mapping["/".join(rng.choice(words) for _ in range(rng.randint(1, 4)))] = {}
+        index = MappingSuffixIndex(mapping)
+        queries = ["", "Title", "Card/Title", "XButton", "ton", "Missing", "Page/Row/Icon", "n"]
+        queries += ["/".join(rng.choice(words) for _ in range(rng.randint(1, 3))) for _ in range(200)]
+        for query in queries:
+            assert index.find(query) == self._linear(mapping, query), query
+
+    def test_patcher_find_mapping(self):
+        patcher = CodePatcher({"Page/Header": {"selector": "header"}, "Page/Card/Title": {"selector": "h3"}})
+        assert patcher._find_mapping("Card/Title") == {"selector": "h3"}
+        assert patcher._find_mapping("Frame/Header") == {"selector": "header"}
+        assert patcher._find_mapping("Footer") is None
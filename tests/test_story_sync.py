@@ -0,0 +1,63 @@
+"""Tests for story_sync — incremental Storybook sync state."""
+
+import json
+
+from airis_pdm.story_sync import STATE_FILENAME, StorySyncState, fingerprint, stories_for_changed_files
+
+
+STORIES = [
+    {"id": "button--primary", "importPath": "./src/components/Button.stories.tsx"},
+    {"id": "button--secondary", "importPath": "./src/components/Button.stories.tsx"},
+    {"id": "card--default", "importPath": "./src/components/Card.stories.ts"},
+    {"id": "legacy--story"},
+]
+
+
+class TestChangedFiles:
+    def test_matches_story_file_and_component_stem(self):
+        assert stories_for_changed_files(STORIES, ["src/components/Button.vue"]) == {"button--primary", "button--secondary"}
+        assert stories_for_changed_files(STORIES, ["/abs/repo/src/components/Card.stories.ts"]) == {"card--default"}
+        assert stories_for_changed_files(STORIES, ["src/styles/card.module.css"]) == {"card--default"}
+
+    def test_unrelated_change_selects_nothing(self):
+        assert stories_for_changed_files(STORIES, ["README.md"]) == set()
+
+
+class TestState:
+    def _subtree(self, x=0):
+        return {"figmaName": "Button/Primary", "layout": {"x": x, "y": 0, "width": 10}, "children": []}
+
+    def test_round_trip_and_position_independent_hash(self, tmp_path):
+        state = StorySyncState(tmp_path)
+        state.order = ["button--primary"]
+        state.record("button--primary", "Button/Primary", self._subtree(0), "t1", "p1")
+        state.save()
+        (tmp_path / "plugin-payload.json").write_text(json.dumps({"children": [self._subtree(900)]}))
+
+        loaded = StorySyncState.load(tmp_path)
+        assert loaded.stories["button--primary"]["probe"] == "p1"
+        root = loaded.previous_root()
+        assert list(loaded.previous_subtrees(root)) == ["button--primary"]
+
+    def test_record_keeps_unmeasured_fields(self, tmp_path):
+        state = StorySyncState(tmp_path)
+        state.record("a", "A", self._subtree(), "t1", "p1")
+        state.record("a", "A", self._subtree(), None, None)
+        assert state.stories["a"]["treeHash"] == "t1" and state.stories["a"]["probe"] == "p1"
+
+    def test_edited_payload_is_not_reused(self, tmp_path):
+        state = StorySyncState(tmp_path)
+        state.order = ["a"]
+        state.record("a", "A", self._subtree(), "t1", "p1")
+        edited = self._subtree()
+        edited["figmaName"] = "Edited"
+        assert state.previous_subtrees({"children": [edited]}) == {}
+
+    def test_corrupt_or_mismatched_files_start_empty(self, tmp_path):
+        (tmp_path / STATE_FILENAME).write_text("{not json")
+        assert StorySyncState.load(tmp_path).stories == {}
+        (tmp_path / STATE_FILENAME).write_text(json.dumps({"version": 99, "order": [], "stories": {}}))
+        assert StorySyncState.load(tmp_path).order == []
+
+    def test_fingerprint_is_key_order_independent(self):
+        assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
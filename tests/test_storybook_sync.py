@@ -63,6 +63,10 @@ def make_args(url="http://localhost:6006", filter_regex=None):
     args.viewport = None
     args.selector = None
     args.root = None
+    args.concurrency = 1
+    args.workers = 1
+    args.incremental = False
+    args.changed = None
     return args
 
 
@@ -308,3 +312,148 @@ class TestCmdPushStoriesFilter:
         payload = json.loads((tmp_path / "plugin-payload.json").read_text())
         # 只有 "Primary" 符合正規表示式
         assert len(payload["children"]) == 1
+
+
+# ─── --concurrency / --workers ───────────────────────────────────────────────
+
+class TestCmdPushStoriesConcurrency:
+
+    @patch("airis_pdm.cli.build_ir_from_extraction")
+    @patch("requests.get")
+    def test_bounded_fan_out_keeps_story_order(self, mock_get, mock_build, tmp_path, capsys):
+        from airis_pdm.cli import cmd_push_stories
+        import copy
+
+        mock_get.return_value = make_stories_response()
+        mock_build.side_effect = lambda *a, **kw: copy.deepcopy(MINIMAL_IR_DOC)
+        in_flight = {"now": 0, "max": 0}
+        # 先開始的 story 最後完成，驗證輸出仍依 story 順序
+        delays = {"button--primary": 0.03, "button--secondary": 0.02, "input--default": 0.0}
+
+        async def fake_extract(url, extraction_config, pool=None):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(delays[url.split("id=")[1].split("&")[0]])
+            in_flight["now"] -= 1
+            return MINIMAL_EXTRACTION
+
+        args = make_args()
+        args.concurrency = 2
+        args.workers = 1
+        config = {"source": {"framework": "html"}, "export": {"snapshotDir": str(tmp_path)}}
+        with patch("airis_pdm.cli.extract_dom_tree", side_effect=fake_extract):
+            asyncio.run(cmd_push_stories(args, config))
+
+        assert in_flight["max"] == 2
+        payload = json.loads((tmp_path / "plugin-payload.json").read_text())
+        assert [c["figmaName"] for c in payload["children"]] == ["Button/Primary", "Button/Secondary", "Input/Default"]
+        assert [c["layout"]["x"] for c in payload["children"]] == [0, 900, 1800]
+        out = capsys.readouterr().out
+        assert "3/3 stories" in out and "0 failed" in out
+
+    @patch("airis_pdm.cli.extract_dom_tree", new_callable=AsyncMock)
+    @patch("requests.get")
+    def test_ir_built_in_worker_processes(self, mock_get, mock_extract, tmp_path, capsys):
+        from airis_pdm.cli import cmd_push_stories
+
+        mock_get.return_value = make_stories_response()
+        mock_extract.side_effect = [MINIMAL_EXTRACTION, Exception("timeout"), MINIMAL_EXTRACTION]
+
+        args = make_args()
+        args.concurrency = 3
+        args.workers = 2
+        config = {"source": {"framework": "html"}, "export": {"snapshotDir": str(tmp_path)}}
+        asyncio.run(cmd_push_stories(args, config))
+
+        payload = json.loads((tmp_path / "plugin-payload.json").read_text())
+        assert [c["figmaName"] for c in payload["children"]] == ["Button/Primary", "Input/Default"]
+        out = capsys.readouterr().out
+        assert "2/3 stories" in out and "1 failed" in out
+        assert "Button/Secondary: timeout" in out
+
+
+# ─── --incremental / --changed ───────────────────────────────────────────────
+
+def _story_extraction(story_id, version=1):
+    return {**MINIMAL_EXTRACTION, "tree": {"tag": "div", "story": story_id, "v": version, "children": []}, "probe": f"{story_id}-{version}"}
+
+
+class TestCmdPushStoriesIncremental:
+
+    def _sync(self, tmp_path, versions, mock_build, **arg_overrides):
+        """以 versions（story id → 版本）模擬 DOM 內容跑一次 push-stories，回傳被擷取的 story id。"""
+        from airis_pdm.cli import cmd_push_stories
+        import copy
+
+        extracted = []
+
+        async def fake_extract(url, extraction_config, pool=None):
+            sid = url.split("id=")[1].split("&")[0]
+            extracted.append(sid)
+            return _story_extraction(sid, versions[sid])
+
+        async def fake_probe(url, extraction_config, pool=None):
+            sid = url.split("id=")[1].split("&")[0]
+            return f"{sid}-{versions[sid]}"
+
+        mock_build.side_effect = lambda *a, **kw: copy.deepcopy(MINIMAL_IR_DOC)
+        args = make_args()
+        for key, value in arg_overrides.items():
+            setattr(args, key, value)
+        config = {"source": {"framework": "html"}, "export": {"snapshotDir": str(tmp_path)}}
+        with patch("airis_pdm.cli.extract_dom_tree", side_effect=fake_extract), \
+                patch("airis_pdm.cli.probe_dom_hash", side_effect=fake_probe):
+            asyncio.run(cmd_push_stories(args, config))
+        return extracted
+
+    @patch("airis_pdm.cli.build_ir_from_extraction")
+    @patch("requests.get")
+    def test_probe_skips_unchanged_stories(self, mock_get, mock_build, tmp_path):
+        mock_get.return_value = make_stories_response()
+        versions = {"button--primary": 1, "button--secondary": 1, "input--default": 1}
+        assert len(self._sync(tmp_path, versions, mock_build)) == 3
+        first = json.loads((tmp_path / "plugin-payload.json").read_text())
+
+        versions["button--secondary"] = 2
+        mock_build.reset_mock()
+        assert self._sync(tmp_path, versions, mock_build, incremental=True) == ["button--secondary"]
+        assert mock_build.call_count == 1
+        second = json.loads((tmp_path / "plugin-payload.json").read_text())
+        assert [c["figmaName"] for c in second["children"]] == [c["figmaName"] for c in first["children"]]
+        assert [c["layout"]["x"] for c in second["children"]] == [0, 900, 1800]
+
+    @patch("airis_pdm.cli.build_ir_from_extraction")
+    @patch("requests.get")
+    def test_changed_files_hint_limits_extraction(self, mock_get, mock_build, tmp_path):
+        stories = copy_stories_with_import_paths()
+        mock_get.return_value = make_stories_response(stories)
+        versions = {"button--primary": 1, "button--secondary": 1, "input--default": 1}
+        self._sync(tmp_path, versions, mock_build)
+
+        extracted = self._sync(tmp_path, versions, mock_build, changed=["src/Input.vue"])
+        assert extracted == ["input--default"]
+        payload = json.loads((tmp_path / "plugin-payload.json").read_text())
+        assert len(payload["children"]) == 3
+
+    @patch("airis_pdm.cli.build_ir_from_extraction")
+    @patch("requests.get")
+    def test_identical_tree_reuses_previous_ir(self, mock_get, mock_build, tmp_path):
+        mock_get.return_value = make_stories_response()
+        versions = {"button--primary": 1, "button--secondary": 1, "input--default": 1}
+        self._sync(tmp_path, versions, mock_build)
+        state = json.loads((tmp_path / ".stories-sync-state.json").read_text())
+        state["stories"]["input--default"]["probe"] = "stale"
+        (tmp_path / ".stories-sync-state.json").write_text(json.dumps(state))
+
+        mock_build.reset_mock()
+        assert self._sync(tmp_path, versions, mock_build, incremental=True) == ["input--default"]
+        assert mock_build.call_count == 0
+
+
+def copy_stories_with_import_paths():
+    import copy
+
+    data = copy.deepcopy(STORIES_JSON)
+    for sid, story in data["stories"].items():
+        story["importPath"] = f"./src/{story['kind']}.stories.ts"
+    return data
@@ -66,6 +66,35 @@ class TestChangeHandlerFilter:
             # 第二個位置參數是 loop
             assert mock_run.call_args[0][1] is self.loop
 
+    def test_with_path_passes_changed_file(self):
+        received = []
+
+        async def on_change(path):
+            received.append(path)
+
+        handler = ChangeHandler(on_change, self.loop, debounce=0.0, with_path=True)
+        with patch("asyncio.run_coroutine_threadsafe") as mock_run:
+            handler.on_modified(make_event("/src/components/Card.vue"))
+            self.loop.run_until_complete(mock_run.call_args[0][0])
+        assert received == [["/src/components/Card.vue"]]
+
+    def test_with_path_collects_paths_within_window(self):
+        received = []
+
+        async def on_change(paths):
+            received.append(paths)
+
+        handler = ChangeHandler(on_change, self.loop, debounce=0.05, with_path=True)
+        with patch("asyncio.run_coroutine_threadsafe") as mock_run:
+            handler.on_modified(make_event("/src/components/Card.vue"))
+            handler.on_modified(make_event("/src/components/Header.vue"))
+            handler.on_modified(make_event("/src/components/Card.vue"))
+            assert mock_run.call_count == 0
+            handler._flush_timer.join()
+            assert mock_run.call_count == 1
+            self.loop.run_until_complete(mock_run.call_args[0][0])
+        assert received == [["/src/components/Card.vue", "/src/components/Header.vue"]]
+
 
 # ─── ChangeHandler debounce 邏輯 ─────────────────────────────────────────────
 